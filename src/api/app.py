@@ -1,5 +1,8 @@
 """FastAPI application factory."""
 
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -7,8 +10,27 @@ from fastapi.templating import Jinja2Templates
 from pathlib import Path
 
 from .routers import portfolio, market_data, analysis, auth
-from .middleware import AuthenticationMiddleware, ErrorHandlingMiddleware
+from .middleware import AuthenticationMiddleware, ErrorHandlingMiddleware, RequestPriorityMiddleware
 from .websocket import websocket_endpoint
+from ..data_sources.yahoo_finance import shutdown_yahoo_executor
+from ..storage.connections import create_async_storage_resources, create_storage_resources
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[Dict[str, Any]]:
+    """Create storage pools once at startup and close them on shutdown.
+
+    Routers use the async pools; the sync pools back get_data_repository for
+    any code that still needs the blocking DataRepository.
+    """
+    storage = create_storage_resources()
+    async_storage = await create_async_storage_resources()
+    try:
+        yield {"storage": storage, "async_storage": async_storage}
+    finally:
+        await async_storage.close()
+        storage.close()
+        shutdown_yahoo_executor()
 
 
 def create_app() -> FastAPI:
@@ -16,7 +38,8 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="ML Portfolio Analyzer API",
         description="Advanced financial analysis system with ML-powered risk assessment",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     # Add CORS middleware
@@ -31,6 +54,7 @@ def create_app() -> FastAPI:
     # Add custom middleware
     app.add_middleware(ErrorHandlingMiddleware)
     app.add_middleware(AuthenticationMiddleware)
+    app.add_middleware(RequestPriorityMiddleware)
     
     # Static files and templates
     static_dir = Path(__file__).parent.parent / "web" / "static"
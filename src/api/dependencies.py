@@ -1,10 +1,11 @@
 """Dependency injection for FastAPI endpoints."""
 
 from typing import Optional, Dict, Any
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from ..storage.repository import DataRepository
+from ..storage.async_repository import AsyncDataRepository
 from ..config import settings
 from .services.auth import AuthService
 
@@ -12,9 +13,27 @@ from .services.auth import AuthService
 security = HTTPBearer()
 
 
-def get_data_repository() -> DataRepository:
-    """Get data repository instance."""
-    return DataRepository()
+def get_data_repository(request: Request) -> DataRepository:
+    """Get a data repository bound to the app's shared connection pools."""
+    storage = getattr(request.state, "storage", None)
+    if storage is None:
+        # Lifespan did not run (e.g. the app was mounted without startup events)
+        return DataRepository()
+    return DataRepository(storage)
+
+
+def get_async_data_repository(request: Request) -> AsyncDataRepository:
+    """Get an async data repository bound to the app's shared async pools."""
+    async_storage = getattr(request.state, "async_storage", None)
+    if async_storage is not None:
+        return AsyncDataRepository(async_storage)
+    # Lifespan did not run: share one self-managed repository per app rather
+    # than opening an engine and Redis client on every request
+    repository = getattr(request.app.state, "fallback_async_repository", None)
+    if repository is None:
+        repository = AsyncDataRepository()
+        request.app.state.fallback_async_repository = repository
+    return repository
 
 
 def get_auth_service() -> AuthService:
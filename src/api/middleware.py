@@ -7,6 +7,8 @@ from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from ..data_sources.rate_limit import RequestPriority, request_priority
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,4 +67,13 @@ class AuthenticationMiddleware(BaseHTTPMiddleware):
                 )
         
         response = await call_next(request)
-        return response
\ No newline at end of file
+        return response
+
+
+class RequestPriorityMiddleware(BaseHTTPMiddleware):
+    """Serve API requests at interactive rate limit priority."""
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """Let data source calls made for a request overtake queued backfills."""
+        with request_priority(RequestPriority.INTERACTIVE):
+            return await call_next(request)
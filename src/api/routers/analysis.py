@@ -1,134 +1,141 @@
 """Technical analysis API endpoints."""
 
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
-from ..dependencies import get_data_repository, get_current_user
+from ..dependencies import get_async_data_repository, get_current_user
 from ..models.requests import AnalysisRequest
 from ..models.responses import AnalysisResponse
-from ...storage.repository import DataRepository
+from ...config import settings
+from ...processing.backtest import METRICS, STRATEGIES, backtest
+from ...processing.indicator_cache import IndicatorCache
+from ...processing.indicators import (
+    IndicatorParams,
+    compute_indicators,
+    recommend,
+    technical_signals,
+)
+from ...processing.risk import risk_metrics
+from ...storage.async_repository import AsyncDataRepository
+from ...storage.rollups import floor_datetime
 
 router = APIRouter()
 
 
+def _number(value: Any) -> Optional[float]:
+    """Round an indicator value for JSON; NaN (not enough bars) becomes None."""
+    value = float(value)
+    return None if math.isnan(value) else round(value, 4)
+
+
 @router.post("/{symbol}", response_model=AnalysisResponse)
 async def run_technical_analysis(
     symbol: str,
     analysis_request: AnalysisRequest,
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> AnalysisResponse:
-    """Run technical analysis on a symbol."""
+    """Run technical analysis on a symbol's stored daily closes."""
+    symbol = symbol.upper()
+    params = IndicatorParams()
+    end_date = datetime.now()
+    # Start on a month boundary so the window keeps its first bar, letting
+    # cached indicator series be extended as new bars arrive
+    start_date = floor_datetime(end_date - timedelta(days=settings.ANALYSIS_LOOKBACK_DAYS), '1mo')
     try:
-        # Mock technical analysis results
-        analysis_results = {
-            "symbol": symbol.upper(),
-            "indicators": {
-                "sma_20": 172.45,
-                "sma_50": 168.30,
-                "ema_12": 174.20,
-                "ema_26": 170.15,
-                "rsi": 65.8,
-                "macd": {
-                    "macd_line": 2.15,
-                    "signal_line": 1.85,
-                    "histogram": 0.30
-                },
-                "bollinger_bands": {
-                    "upper": 178.50,
-                    "middle": 172.45,
-                    "lower": 166.40
-                }
-            },
-            "signals": [
-                {
-                    "type": "BUY",
-                    "indicator": "MACD",
-                    "strength": "STRONG",
-                    "description": "MACD line crossed above signal line"
-                },
-                {
-                    "type": "NEUTRAL",
-                    "indicator": "RSI", 
-                    "strength": "MODERATE",
-                    "description": "RSI in neutral territory (65.8)"
-                },
-                {
-                    "type": "BUY",
-                    "indicator": "SMA",
-                    "strength": "MODERATE", 
-                    "description": "Price above 20-day SMA"
-                }
-            ],
-            "risk_metrics": {
-                "volatility": 0.28,
-                "beta": 1.15,
-                "sharpe_ratio": 1.42,
-                "max_drawdown": -0.12,
-                "var_95": -0.035
-            },
-            "recommendation": {
-                "action": "BUY",
-                "confidence": 0.75,
-                "target_price": 185.00,
-                "stop_loss": 165.00,
-                "reasoning": "Strong momentum indicators and favorable risk metrics support bullish outlook"
-            }
-        }
-        
-        return AnalysisResponse(**analysis_results)
-        
+        series = await repository.get_primary_series(symbol, start_date, end_date)
+        benchmark = None
+        if settings.ANALYSIS_BENCHMARK_SYMBOL and settings.ANALYSIS_BENCHMARK_SYMBOL != symbol:
+            benchmark = await repository.get_primary_series(settings.ANALYSIS_BENCHMARK_SYMBOL, start_date, end_date)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to run analysis: {str(e)}"
         )
 
+    if series is None or len(series) < params.min_bars:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"At least {params.min_bars} stored bars are needed to analyze {symbol}"
+        )
+
+    if settings.INDICATOR_CACHE_ENABLED and repository.cache is not None:
+        columns = await IndicatorCache(repository.cache).compute(series, params)
+    else:
+        columns = {name: rows[0] for name, rows in compute_indicators(series.close, params).items()}
+    values = {name: column[-2:] for name, column in columns.items()}
+    close = float(series.close[-1])
+    signals = technical_signals(close, values, params)
+    latest = {name: _number(pair[-1]) for name, pair in values.items()}
+    indicators: Dict[str, Any] = {
+        name: latest[name] for name in (
+            [f"sma_{period}" for period in params.sma_periods]
+            + [f"ema_{period}" for period in params.ema_periods]
+            + ["rsi"]
+        )
+    }
+    indicators["macd"] = {
+        "macd_line": latest["macd_line"],
+        "signal_line": latest["macd_signal"],
+        "histogram": latest["macd_histogram"]
+    }
+    indicators["bollinger_bands"] = {
+        "upper": latest["bollinger_upper"],
+        "middle": latest["bollinger_middle"],
+        "lower": latest["bollinger_lower"]
+    }
+    risk = {name: _number(value) if value is not None else None
+            for name, value in risk_metrics(series, benchmark).items()}
+
+    return AnalysisResponse(
+        symbol=symbol,
+        indicators=indicators,
+        signals=signals,
+        risk_metrics=risk,
+        recommendation=recommend(signals, values)
+    )
+
 
 @router.get("/{symbol}/backtest", response_model=Dict[str, Any])
 async def get_backtest_results(
     symbol: str,
+    strategy: str = Query("sma_cross", description=f"Strategy: {', '.join(STRATEGIES)}"),
+    metric: str = Query("sharpe_ratio", description="Metric ranking the parameter combinations"),
+    top: int = Query(10, ge=1, le=100, description="Best combinations to list"),
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> Dict[str, Any]:
-    """Get backtesting results for a symbol's strategy."""
+    """Backtest a strategy's parameter grid on stored daily bars and report the best combination."""
+    symbol = symbol.upper()
+    if metric not in METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported metric '{metric}'; expected one of {', '.join(METRICS)}"
+        )
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=settings.BACKTEST_LOOKBACK_DAYS)
     try:
-        # Mock backtest results
-        backtest_results = {
-            "symbol": symbol.upper(),
-            "strategy": "Technical Analysis Combined",
-            "period": "2023-01-01 to 2024-01-01",
-            "performance": {
-                "total_return": 0.156,
-                "annual_return": 0.156,
-                "sharpe_ratio": 1.25,
-                "max_drawdown": -0.085,
-                "win_rate": 0.62,
-                "profit_factor": 1.45
-            },
-            "trades": {
-                "total_trades": 24,
-                "winning_trades": 15,
-                "losing_trades": 9,
-                "average_win": 0.034,
-                "average_loss": -0.018,
-                "largest_win": 0.087,
-                "largest_loss": -0.032
-            },
-            "monthly_returns": [
-                {"month": "2023-01", "return": 0.023},
-                {"month": "2023-02", "return": -0.012},
-                {"month": "2023-03", "return": 0.045},
-                {"month": "2023-04", "return": 0.018},
-                {"month": "2023-05", "return": -0.008},
-                {"month": "2023-06", "return": 0.031}
-            ]
-        }
-        
-        return backtest_results
-        
+        series = await repository.get_primary_series(symbol, start_date, end_date)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get backtest results: {str(e)}"
-        )
\ No newline at end of file
+        )
+    if series is None or len(series) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No stored bars to backtest {symbol}"
+        )
+
+    try:
+        sweep = await asyncio.to_thread(backtest, series, strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    results = sweep.report(sweep.best(metric))
+    results["combinations_tested"] = len(sweep.combos)
+    results["top_results"] = sweep.ranking(metric, top)
+    return results
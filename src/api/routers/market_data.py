@@ -1,21 +1,33 @@
 """Market data API endpoints."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+import pandas as pd
 
-from ..dependencies import get_data_repository, get_optional_user
+from ..dependencies import get_async_data_repository, get_optional_user
 from ..models.responses import MarketDataResponse, HistoricalDataResponse
-from ...storage.repository import DataRepository
+from ...data_sources.series import OHLCVSeries
+from ...processing.resampling import check_resample_interval, resample_series
+from ...storage.async_repository import AsyncDataRepository
 
 router = APIRouter()
 
 
+def _bars_to_rows(series: OHLCVSeries) -> List[Dict[str, Any]]:
+    """Convert bars to the historical endpoint's rows."""
+    return [
+        {"date": bar.timestamp.strftime("%Y-%m-%d"), "open": bar.open, "high": bar.high,
+         "low": bar.low, "close": bar.close, "volume": bar.volume}
+        for bar in series
+    ]
+
+
 @router.get("/{symbol}", response_model=MarketDataResponse)
 async def get_market_data(
     symbol: str,
     user: Optional[Dict[str, Any]] = Depends(get_optional_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> MarketDataResponse:
     """Get current market data for a symbol."""
     try:
@@ -79,15 +91,29 @@ async def get_market_data(
 async def get_historical_data(
     symbol: str,
     days: int = Query(30, ge=1, le=365, description="Number of days of historical data"),
+    interval: str = Query("1d", description="Bar interval: 1d, 1w or 1mo"),
     user: Optional[Dict[str, Any]] = Depends(get_optional_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> HistoricalDataResponse:
     """Get historical market data for a symbol."""
     try:
-        # Generate mock historical data
+        timeframe = check_resample_interval(interval, None)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
-        
+        stored = await repository.get_primary_series(symbol.upper(), start_date, end_date, timeframe.name)
+        if stored is not None:
+            return HistoricalDataResponse(
+                symbol=symbol.upper(),
+                data=_bars_to_rows(stored),
+                start_date=start_date.strftime("%Y-%m-%d"),
+                end_date=end_date.strftime("%Y-%m-%d")
+            )
+
+        # Nothing stored: generate mock historical data
         # Create mock price data with some variation
         base_price = 100.00
         historical_data = []
@@ -107,6 +133,13 @@ async def get_historical_data(
                 "volume": 1000000 + (i * 50000)
             })
         
+        if timeframe.name != "1d":
+            daily = pd.DataFrame(historical_data)
+            daily["timestamp"] = pd.to_datetime(daily.pop("date"))
+            historical_data = _bars_to_rows(
+                resample_series(OHLCVSeries.from_dataframe(daily, symbol.upper(), "mock"), timeframe)
+            )
+
         return HistoricalDataResponse(
             symbol=symbol.upper(),
             data=historical_data,
@@ -1,16 +1,26 @@
 """Portfolio management API endpoints."""
 
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from uuid import uuid4
 
-from ..dependencies import get_data_repository, get_current_user
+from ..dependencies import get_async_data_repository, get_current_user
 from ..models.requests import PortfolioCreateRequest, PortfolioUpdateRequest
 from ..models.responses import PortfolioResponse, PortfolioListResponse
-from ...storage.repository import DataRepository
+from ...config import settings
+from ...processing.risk import covariance, evaluate_portfolios, load_return_matrix, portfolio_performance
+from ...storage.async_repository import AsyncDataRepository
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MOCK_PORTFOLIO_IDS = ("portfolio_1", "portfolio_2")
+
 
 def _get_mock_portfolio_data(portfolio_id: str) -> Dict[str, Any]:
     """Get mock portfolio data by ID."""
@@ -51,19 +61,58 @@ def _get_mock_portfolio_data(portfolio_id: str) -> Dict[str, Any]:
     return portfolios.get(portfolio_id)
 
 
+def _holdings(portfolio: Dict[str, Any]) -> Dict[str, float]:
+    return {holding["symbol"]: holding["shares"] for holding in portfolio["holdings"]}
+
+
+async def _with_market_performance(
+    portfolios: List[Dict[str, Any]],
+    repository: AsyncDataRepository
+) -> List[Dict[str, Any]]:
+    """Value holdings at their latest stored close and compute performance from stored bars.
+
+    Portfolios holding a symbol without stored bars keep their saved figures.
+    """
+    holdings = {portfolio["id"]: _holdings(portfolio) for portfolio in portfolios if portfolio["holdings"]}
+    if not holdings:
+        return portfolios
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=settings.RISK_LOOKBACK_DAYS)
+    try:
+        matrix = await load_return_matrix(
+            repository, [symbol for items in holdings.values() for symbol in items], start_date, end_date
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load bars for portfolio performance: {e}")
+        return portfolios
+    covered = {name: items for name, items in holdings.items() if set(items) <= set(matrix.symbols)}
+    if len(matrix) < 2 or not covered:
+        return portfolios
+    performance = portfolio_performance(matrix, covered)
+    latest = dict(zip(matrix.symbols, matrix.closes[-1].tolist()))
+    for portfolio in portfolios:
+        figures = performance.get(portfolio["id"])
+        if figures is None:
+            continue
+        portfolio["total_value"] = figures.pop("total_value")
+        portfolio["performance"] = figures
+        for holding in portfolio["holdings"]:
+            holding["value"] = round(holding["shares"] * latest[holding["symbol"]], 2)
+    return portfolios
+
+
 @router.get("/", response_model=PortfolioListResponse)
 async def list_portfolios(
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> PortfolioListResponse:
     """List all portfolios for the current user."""
     try:
-        # For demo purposes, return mock data
-        portfolios = [
-            _get_mock_portfolio_data("portfolio_1"),
-            _get_mock_portfolio_data("portfolio_2")
-        ]
-        
+        # For demo purposes, return mock holdings valued from stored bars
+        portfolios = await _with_market_performance(
+            [_get_mock_portfolio_data(portfolio_id) for portfolio_id in MOCK_PORTFOLIO_IDS], repository
+        )
+
         return PortfolioListResponse(portfolios=portfolios)
     except Exception as e:
         raise HTTPException(
@@ -76,7 +125,7 @@ async def list_portfolios(
 async def create_portfolio(
     portfolio_data: PortfolioCreateRequest,
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> PortfolioResponse:
     """Create a new portfolio."""
     try:
@@ -105,11 +154,57 @@ async def create_portfolio(
         )
 
 
+@router.get("/risk", response_model=Dict[str, Any])
+async def get_portfolio_risk(
+    portfolio_ids: Optional[List[str]] = Query(None, description="Portfolios to evaluate; all when omitted"),
+    confidence: Optional[float] = Query(None, gt=0.5, lt=1.0, description="VaR confidence level"),
+    horizon: int = Query(1, ge=1, le=60, description="VaR horizon in trading days"),
+    paths: Optional[int] = Query(None, ge=1000, le=1000000, description="Monte Carlo paths"),
+    seed: Optional[int] = Query(None, description="Seed for reproducible Monte Carlo results"),
+    user: Dict[str, Any] = Depends(get_current_user),
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
+) -> Dict[str, Any]:
+    """Evaluate covariance, VaR and beta for many portfolios in one batch."""
+    portfolios = [_get_mock_portfolio_data(portfolio_id) for portfolio_id in portfolio_ids or MOCK_PORTFOLIO_IDS]
+    if any(portfolio is None for portfolio in portfolios):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Portfolio not found")
+    holdings = {portfolio["id"]: _holdings(portfolio) for portfolio in portfolios}
+    benchmark = settings.ANALYSIS_BENCHMARK_SYMBOL
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=settings.RISK_LOOKBACK_DAYS)
+    symbols = [symbol for items in holdings.values() for symbol in items] + ([benchmark] if benchmark else [])
+    try:
+        matrix = await load_return_matrix(repository, symbols, start_date, end_date)
+        risk = await asyncio.to_thread(
+            evaluate_portfolios, matrix, holdings, benchmark, confidence, horizon, paths, None, seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to evaluate portfolio risk: {str(e)}"
+        )
+
+    _, correlation = covariance(matrix.returns)
+    return {
+        "benchmark": benchmark if benchmark in matrix.symbols else None,
+        "bars": len(matrix),
+        "portfolios": risk,
+        "correlation": {
+            "symbols": matrix.symbols,
+            "matrix": [
+                [None if math.isnan(value) else round(value, 4) for value in row] for row in correlation.tolist()
+            ]
+        }
+    }
+
+
 @router.get("/{portfolio_id}", response_model=PortfolioResponse)
 async def get_portfolio(
     portfolio_id: str,
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> PortfolioResponse:
     """Get portfolio details by ID."""
     try:
@@ -131,6 +226,7 @@ async def get_portfolio(
                     "ytd_return": 15.8
                 }
             }
+            [portfolio] = await _with_market_performance([portfolio], repository)
             return PortfolioResponse(**portfolio)
         else:
             raise HTTPException(
@@ -151,7 +247,7 @@ async def update_portfolio(
     portfolio_id: str,
     portfolio_data: PortfolioUpdateRequest,
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> PortfolioResponse:
     """Update portfolio details."""
     try:
@@ -183,7 +279,7 @@ async def update_portfolio(
 async def delete_portfolio(
     portfolio_id: str,
     user: Dict[str, Any] = Depends(get_current_user),
-    repository: DataRepository = Depends(get_data_repository)
+    repository: AsyncDataRepository = Depends(get_async_data_repository)
 ) -> None:
     """Delete a portfolio."""
     try:
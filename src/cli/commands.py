@@ -1,6 +1,8 @@
 import asyncio
+import numbers
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import typer
 from rich.console import Console
@@ -8,51 +10,67 @@ from rich.table import Table
 import pandas as pd
 
 from ..config import settings
-from ..data_sources.base import DataSourceBase, MarketData
+from ..data_sources.base import DataSourceBase
 from ..data_sources.alpha_vantage import AlphaVantageAdapter
 from ..data_sources.yahoo_finance import YahooFinanceAdapter
+from ..processing.ingestion import WriteBehindQueue
 from ..processing.pipeline import DataPipeline
-from ..processing.validation import StockPrice
+from ..processing.sync import IncrementalSync, SyncReport
+from ..processing.validation import DataSourceResponse, StockPrice
+from ..storage.analytics import summarize_symbols
+from ..storage.backends import create_repository
+from ..storage.parquet_store import ParquetRepository
 from ..storage.repository import DataRepository
+from ..storage.schema import upgrade_schema
+from .utils import load_watchlist, normalize_symbols
 
 app = typer.Typer()
 console = Console()
 
-def get_pipeline() -> DataPipeline:
-    """Get configured data pipeline."""
+def get_pipeline(ingestion: Optional[WriteBehindQueue] = None) -> DataPipeline:
+    """Get configured data pipeline, optionally persisting through a write-behind queue."""
     sources: List[DataSourceBase] = [YahooFinanceAdapter()]
     if settings.ALPHA_VANTAGE_API_KEY and settings.ALPHA_VANTAGE_API_KEY.get_secret_value():
         sources.append(AlphaVantageAdapter())
-    return DataPipeline(sources)
-
-def get_repository() -> DataRepository:
-    """Get configured data repository."""
-    return DataRepository()
-
-def convert_stock_prices_to_market_data(stock_prices: List[StockPrice]) -> List[MarketData]:
-    """Convert StockPrice objects to MarketData objects."""
-    return [
-        MarketData(
-            symbol=sp.symbol,
-            timestamp=sp.timestamp,
-            open=sp.open,
-            high=sp.high,
-            low=sp.low,
-            close=sp.close,
-            volume=sp.volume,
-            source=sp.source
-        )
-        for sp in stock_prices
-    ]
+    return DataPipeline(sources, ingestion=ingestion)
+
+Repository = Union[DataRepository, ParquetRepository]
+
+# Summary columns shown by `analyze`, with their row labels
+ANALYSIS_METRICS = {
+    'first_timestamp': 'Start Date',
+    'last_timestamp': 'End Date',
+    'days': 'Days',
+    'average_price': 'Average Price',
+    'highest_price': 'Highest Price',
+    'lowest_price': 'Lowest Price',
+    'total_volume': 'Total Volume',
+    'price_change': 'Price Change',
+    'change_pct': 'Change %',
+    'volatility_pct': 'Volatility % (annualized)'
+}
+
+def get_repository() -> Repository:
+    """Get the data repository selected by STORAGE_BACKEND."""
+    return create_repository()
 
-def setup_date_range_and_repository(days: int) -> Tuple[DataRepository, datetime, datetime]:
+def setup_date_range_and_repository(days: int) -> Tuple[Repository, datetime, datetime]:
     """Set up repository and date range for data operations."""
     repository = get_repository()
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     return repository, start_date, end_date
 
-def create_market_data_table(title: str, data: List[StockPrice]) -> Table:
+def report_spilled_bars(ingestion: WriteBehindQueue) -> None:
+    """Warn about bars the write-behind queue had to spill to disk."""
+    if ingestion.stats.spilled_bars:
+        console.print(
+            f"[yellow]Warning: {ingestion.stats.spilled_bars} bars could not be saved and were "
+            f"kept in {ingestion.spill_file} for the next run[/yellow]"
+        )
+
+
+def create_market_data_table(title: str, data: Sequence[StockPrice]) -> Table:
     """Create a standardized market data table."""
     table = Table(title=title)
     table.add_column("Timestamp")
@@ -76,6 +94,37 @@ def create_market_data_table(title: str, data: List[StockPrice]) -> Table:
     
     return table
 
+def create_sync_report_table(report: SyncReport) -> Table:
+    """Create a summary table for an incremental sync."""
+    table = Table(title="Incremental Sync")
+    table.add_column("Metric")
+    table.add_column("Value")
+    for metric, value in report.to_dict().items():
+        if metric != 'errors':
+            table.add_row(metric.replace('_', ' ').title(), str(value))
+    return table
+
+def create_analysis_table(summary: pd.DataFrame) -> Table:
+    """Create a comparative table with one column per analyzed symbol."""
+    title = f"Analysis for {', '.join(summary.index)}"
+    table = Table(title=title)
+    table.add_column("Metric")
+    for symbol in summary.index:
+        table.add_column(symbol)
+
+    for column, metric in ANALYSIS_METRICS.items():
+        row = []
+        for value in summary[column]:
+            if pd.isna(value):
+                row.append("-")
+            elif isinstance(value, numbers.Real):
+                row.append(f"{value:,.2f}")
+            else:
+                row.append(str(value))
+        table.add_row(metric, *row)
+
+    return table
+
 def create_search_results_table(title: str, results: List[Dict[str, Any]], limit: int) -> Table:
     """Create a standardized search results table."""
     table = Table(title=title)
@@ -96,35 +145,68 @@ def create_search_results_table(title: str, results: List[Dict[str, Any]], limit
 
 @app.command()
 def fetch(
-    symbol: str = typer.Argument(..., help="Stock symbol to fetch"),
+    symbols: Optional[List[str]] = typer.Argument(None, help="Stock symbols to fetch"),
+    watchlist: Optional[Path] = typer.Option(None, help="File of symbols to fetch, one per line or comma separated"),
     days: int = typer.Option(7, help="Number of days of historical data"),
-    interval: Optional[int] = typer.Option(None, help="Intraday interval in minutes")
+    interval: Optional[int] = typer.Option(None, help="Intraday interval in minutes"),
+    incremental: bool = typer.Option(False, help="Only fetch daily bars missing from storage")
 ) -> None:
-    """Fetch market data for a symbol."""
-    pipeline = get_pipeline()
+    """Fetch market data for one or more symbols."""
+    requested = normalize_symbols(symbols or [])
+    if watchlist is not None:
+        requested = normalize_symbols(requested + load_watchlist(watchlist))
+    if not requested:
+        console.print("[red]Error: Provide at least one symbol or a --watchlist file[/red]")
+        raise typer.Exit(1)
+
     repository, start_date, end_date = setup_date_range_and_repository(days)
+    ingestion = WriteBehindQueue(repository)
+    pipeline = get_pipeline(ingestion)
+
+    if incremental:
+        if interval:
+            console.print("[red]Error: --incremental only applies to daily data[/red]")
+            raise typer.Exit(1)
+
+        async def _sync() -> SyncReport:
+            async with ingestion:
+                return await IncrementalSync(pipeline.data_sources, repository, ingestion=ingestion).sync(
+                    requested, start_date.date(), end_date.date()
+                )
+
+        report = asyncio.run(_sync())
+        report_spilled_bars(ingestion)
+        console.print(create_sync_report_table(report))
+        for error in report.errors:
+            console.print(f"[yellow]Warning: {error}[/yellow]")
+        return
     
-    async def _fetch() -> None:
-        response = await pipeline.fetch_data(
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-            interval=interval
-        )
+    async def _fetch() -> Dict[str, DataSourceResponse]:
+        # The pipeline queues validated bars; leaving the block drains them to storage
+        async with ingestion:
+            if len(requested) > 1 and not interval:
+                return await pipeline.fetch_batch(requested, start_date=start_date, end_date=end_date)
+            responses = await asyncio.gather(*(
+                pipeline.fetch_data(symbol=symbol, start_date=start_date, end_date=end_date, interval=interval)
+                for symbol in requested
+            ))
+            return dict(zip(requested, responses))
         
+    responses = asyncio.run(_fetch())
+    report_spilled_bars(ingestion)
+    failed = 0
+    for symbol, response in responses.items():
         if not response.success:
-            console.print(f"[red]Error: {response.error}[/red]")
-            raise typer.Exit(1)
-            
-        if response.data:
-            market_data = convert_stock_prices_to_market_data(response.data)
-            repository.save_market_data(market_data)
+            console.print(f"[red]Error: {symbol}: {response.error}[/red]")
+            failed += 1
+            continue
         
         # Display results
         table = create_market_data_table(f"Market Data for {symbol}", response.data or [])
         console.print(table)
-        
-    asyncio.run(_fetch())
+
+    if failed == len(responses):
+        raise typer.Exit(1)
 
 @app.command()
 def search(
@@ -155,48 +237,42 @@ def search(
 
 @app.command()
 def analyze(
-    symbol: str = typer.Argument(..., help="Stock symbol to analyze"),
+    symbols: List[str] = typer.Argument(..., help="Stock symbols to analyze and compare"),
     days: int = typer.Option(30, help="Number of days to analyze")
 ) -> None:
-    """Basic price analysis for a symbol."""
+    """Compare price statistics for one or more symbols."""
+    symbols = normalize_symbols(symbols)
     repository, start_date, end_date = setup_date_range_and_repository(days)
-    
-    data = repository.get_market_data(
-        symbol=symbol,
-        start_date=start_date,
-        end_date=end_date
-    )
-    
-    if not data:
+
+    summary = summarize_symbols(repository, symbols, start_date, end_date)
+
+    if summary.empty:
         console.print("[red]No data found[/red]")
         raise typer.Exit(1)
-        
-    # Convert to pandas for analysis
-    df = pd.DataFrame([d.model_dump() for d in data])
-    
-    # Calculate basic statistics
-    stats = {
-        'Start Date': df['timestamp'].min(),
-        'End Date': df['timestamp'].max(),
-        'Days': len(df['timestamp'].unique()),
-        'Average Price': df['close'].mean(),
-        'Highest Price': df['high'].max(),
-        'Lowest Price': df['low'].min(),
-        'Total Volume': df['volume'].sum(),
-        'Price Change': df['close'].iloc[-1] - df['close'].iloc[0],
-        'Change %': ((df['close'].iloc[-1] / df['close'].iloc[0]) - 1) * 100
-    }
-    
-    # Display results
-    table = Table(title=f"Analysis for {symbol}")
-    table.add_column("Metric")
-    table.add_column("Value")
-    
-    for metric, value in stats.items():
-        if isinstance(value, (int, float)):
-            formatted_value = f"{value:,.2f}"
-        else:
-            formatted_value = str(value)
-        table.add_row(metric, formatted_value)
-        
-    console.print(table)
\ No newline at end of file
+
+    console.print(create_analysis_table(summary))
+
+
+@app.command()
+def migrate(
+    revision: str = typer.Argument("head", help="Alembic revision to migrate the database to")
+) -> None:
+    """Apply database schema migrations."""
+    try:
+        upgrade_schema(revision=revision)
+    except Exception as e:
+        console.print(f"[red]Error: Migration failed: {e}[/red]")
+        raise typer.Exit(1)
+    console.print(f"[green]Database migrated to {revision}[/green]")
+
+@app.command("rebuild-rollups")
+def rebuild_rollups(
+    symbols: Optional[List[str]] = typer.Argument(None, help="Symbols to rebuild (default: every stored symbol)")
+) -> None:
+    """Recompute materialized timeframe rollups from the stored bars."""
+    repository = get_repository()
+    if not isinstance(repository, DataRepository):
+        console.print("[yellow]The configured storage backend keeps no rollups[/yellow]")
+        return
+    written = repository.rebuild_rollups(normalize_symbols(symbols) if symbols else None)
+    console.print(f"[green]Rebuilt {written} rollup buckets[/green]")
@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, List, Optional
 
 import pandas as pd
 from rich.console import Console
@@ -72,4 +73,21 @@ def parse_date(date_str: str) -> datetime:
     raise ValueError(
         "Invalid date format. Use YYYY-MM-DD, YYYY/MM/DD, "
         "DD-MM-YYYY, or DD/MM/YYYY"
-    )
\ No newline at end of file
+    )
+
+def load_watchlist(path: Path) -> List[str]:
+    """Read symbols from a watchlist file.
+
+    Symbols may be separated by newlines, commas or whitespace; anything
+    after '#' on a line is a comment.
+    """
+    symbols: List[str] = []
+    for line in path.read_text().splitlines():
+        content = line.split('#', 1)[0].replace(',', ' ')
+        symbols.extend(content.split())
+    return normalize_symbols(symbols)
+
+def normalize_symbols(symbols: Iterable[str]) -> List[str]:
+    """Upper-case symbols and drop blanks and duplicates, keeping order."""
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
@@ -1,4 +1,4 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 import os
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
@@ -24,7 +24,27 @@ class Settings(BaseSettings):
     ALPHA_VANTAGE_DEFAULT_OUTPUTSIZE: str = "full"  # default output size
     ALPHA_VANTAGE_DAILY_TIMESTAMP_FORMAT: str = "%Y-%m-%d"
     ALPHA_VANTAGE_INTRADAY_TIMESTAMP_FORMAT: str = "%Y-%m-%d %H:%M:%S"
+    YAHOO_FINANCE_BACKOFF_MIN: int = 4  # seconds
     YAHOO_FINANCE_BACKOFF_MAX: int = 60  # seconds
+    YAHOO_FINANCE_RETRY_ATTEMPTS: int = 3
+    YAHOO_FINANCE_MAX_WORKERS: int = 8  # threads running blocking yfinance calls
+    BATCH_FETCH_CONCURRENCY: int = 8  # per-symbol calls in flight for sources without a batch endpoint
+    YAHOO_FINANCE_BATCH_SIZE: int = 100  # tickers per yfinance multi-ticker download
+    SYNC_MAX_GAPS_PER_SYMBOL: int = 3  # more gaps than this are fetched as one covering span
+    DATA_SOURCE_TIMEOUT: float = 30.0  # seconds allowed per source call in fetch_data
+    PIPELINE_HEDGING: bool = False  # first good answer wins instead of merging all sources
+    HEDGE_DELAY_SECONDS: Optional[float] = None  # fixed hedge delay; None uses the primary's p95
+    HEDGE_DELAY_DEFAULT: float = 2.0  # seconds, until enough latency samples exist
+    HEDGE_MIN_SAMPLES: int = 20  # successful calls before the p95 is trusted
+    RATE_LIMIT_BACKEND: str = "memory"  # token bucket state: "memory", "file" (per host) or "redis"
+    RATE_LIMIT_DIR: Optional[str] = None  # directory for "file" bucket state; None uses the temp dir
+    SINGLE_FLIGHT_ENABLED: bool = True  # coalesce identical concurrent source calls
+    SINGLE_FLIGHT_REDIS: bool = False  # also share results between processes through Redis
+    SINGLE_FLIGHT_LOCK_TTL: float = 30.0  # seconds a leader may hold a cross-process call
+    SINGLE_FLIGHT_RESULT_TTL: float = 5.0  # seconds a shared result stays readable
+    SINGLE_FLIGHT_POLL_INTERVAL: float = 0.1  # seconds between checks for a shared result
+    MARKET_SESSION_OPEN: str = "09:30"  # exchange-local session open (HH:MM); intraday resampled bars start here
+    MARKET_SESSION_CLOSE: str = "16:00"  # exchange-local session close (HH:MM)
     
     # Database Settings - Use SQLite by default
     POSTGRES_HOST: str = DEFAULT_POSTGRES_HOST
@@ -33,12 +53,61 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = DEFAULT_POSTGRES_USER
     POSTGRES_PASSWORD: Optional[str] = None
     DATABASE_URL: Optional[str] = None
+    BULK_UPSERT_BATCH_SIZE: int = 5000  # rows per INSERT ... ON CONFLICT chunk
+    STORAGE_BACKEND: str = "sql"  # market data store: "sql" (DATABASE_URL) or "parquet"
+    PARQUET_STORE_PATH: str = "data/parquet"  # root of the partitioned Parquet store
+    PARQUET_ROW_GROUP_SIZE: int = 65536  # rows per row group; smaller groups prune more precisely
+    PARQUET_COMPACT_MIN_FILES: int = 4  # part files in a partition before compaction merges them
+    INGESTION_MAX_PENDING_BARS: int = 200000  # buffered bars before put() waits for a flush
+    INGESTION_BATCH_BARS: int = 20000  # pending bars that trigger an immediate flush
+    INGESTION_FLUSH_INTERVAL: float = 1.0  # seconds between time-triggered flushes
+    INGESTION_PUT_TIMEOUT: float = 30.0  # seconds put() waits for space before failing
+    INGESTION_DRAIN_TIMEOUT: float = 60.0  # seconds close() spends draining before spilling
+    INGESTION_SPILL_PATH: Optional[str] = "data/ingestion_spill.jsonl"  # base name of per-process spill files kept across restarts
+    ANALYTICS_ENGINE: str = "duckdb"  # "duckdb" aggregates in place (SQL backends need its sqlite/postgres extension, downloaded on first use; falls back if unavailable), "pandas" loads bars
+    ANALYSIS_LOOKBACK_DAYS: int = 365  # calendar days of closes loaded for technical analysis
+    ANALYSIS_BENCHMARK_SYMBOL: Optional[str] = "SPY"  # beta reference; beta is omitted when it has no stored bars
+    BACKTEST_LOOKBACK_DAYS: int = 3 * 365  # calendar days of bars loaded for backtests
+    BACKTEST_COST_BPS: float = 5.0  # commission and slippage per position change, in basis points
+    BACKTEST_WORKERS: int = 4  # processes for multi-symbol sweeps; 1 runs them in-process
+    RISK_LOOKBACK_DAYS: int = 365  # calendar days of closes loaded for portfolio risk
+    RISK_CONFIDENCE: float = 0.95  # VaR confidence level
+    MONTE_CARLO_PATHS: int = 100000  # simulated paths per Monte Carlo VaR
+    MONTE_CARLO_CHUNK_PATHS: int = 10000  # paths drawn at once; bounds simulation memory
+    MONTE_CARLO_SEED: Optional[int] = None  # fixed seed for reproducible Monte Carlo results
+    DB_POOL_SIZE: int = 10  # persistent connections per process (ignored for SQLite)
+    DB_MAX_OVERFLOW: int = 20  # extra connections allowed under burst load
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a pooled connection is replaced
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers no longer block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # safe with WAL; fsync at checkpoints only
+    SQLITE_CACHE_SIZE_KB: int = 65536  # page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes of the database file read through mmap
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait for locks instead of failing with "database is locked"
+    POSTGRES_PARTITION_BY_MONTH: bool = False  # migrations turn market_data into monthly range partitions
+    POSTGRES_PARTITION_START: str = "2000-01"  # first monthly partition (YYYY-MM); older bars use the default one
+    POSTGRES_PARTITION_MONTHS_AHEAD: int = 3  # future monthly partitions kept ready
+    ROLLUPS_ENABLED: bool = False  # maintain market_data_rollup aggregates on every save; run rebuild-rollups before enabling
+    ROLLUP_TIMEFRAMES: List[str] = ["1d", "1w", "1mo"]  # materialized timeframes; others are aggregated on read
     
     # Redis Settings
     REDIS_HOST: str = DEFAULT_REDIS_HOST
     REDIS_PORT: int = DEFAULT_REDIS_PORT
     REDIS_DB: int = DEFAULT_REDIS_DB
     REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50  # per-process Redis connection pool size
+    MARKET_DATA_CACHE_BUCKET: str = "month"  # range cache bucket: "day" or "month"
+    MARKET_DATA_CACHE_TTL: int = 3600  # seconds
+    # Value codec per cache namespace: "binary" packs bars into fixed-width
+    # blocks, "json" keeps the old encoding; reads accept both
+    CACHE_NAMESPACE_CODECS: Dict[str, str] = {"market_data": "binary", "market_range": "binary"}
+    LOCAL_CACHE_ENABLED: bool = True  # in-process LRU tier in front of Redis for shared resources
+    LOCAL_CACHE_MAX_ENTRIES: int = 10000
+    LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # encoded JSON size of held values
+    LOCAL_CACHE_TTL: int = 60  # seconds; bounds staleness if an invalidation message is missed
+    INDICATOR_STATE_TTL: int = 7 * 24 * 3600  # seconds a streaming indicator snapshot is kept
+    INDICATOR_CACHE_ENABLED: bool = True  # cache computed indicator series per symbol and parameters
+    INDICATOR_CACHE_TTL: int = 24 * 3600  # seconds
     
     # Server Settings
     SERVER_HOST: str = os.environ.get("SERVER_HOST", "0.0.0.0")
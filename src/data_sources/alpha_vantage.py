@@ -1,12 +1,16 @@
 from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Callable, Any, Tuple
-import asyncio
+import hashlib
 from dataclasses import dataclass
+import numpy as np
+import pandas as pd
 from alpha_vantage.timeseries import TimeSeries  # type: ignore[import-untyped]
 
 from ..config import settings
 from .base import DataSourceBase, MarketData
-from .exceptions import APIError, RateLimitError
+from .exceptions import APIError
+from .rate_limit import TokenBucketLimiter, get_rate_limiter
+from .series import OHLCVSeries
 
 # Constants
 SOURCE_NAME = 'alpha_vantage'
@@ -22,14 +26,15 @@ class TimeSeriesConfig:
 
 class AlphaVantageAdapter(DataSourceBase):
     """Alpha Vantage API adapter with rate limiting."""
+
+    source_name = SOURCE_NAME
     
-    def __init__(self) -> None:
+    def __init__(self, limiter: Optional[TokenBucketLimiter] = None) -> None:
         api_key = settings.ALPHA_VANTAGE_API_KEY
         if api_key is None:
             raise ValueError("ALPHA_VANTAGE_API_KEY is required")
         self._client = TimeSeries(key=api_key.get_secret_value())
-        self._request_times: List[datetime] = []
-        self._lock = asyncio.Lock()
+        self._limiter = limiter or self._create_limiter(api_key.get_secret_value())
         self._price_field_map = {
             'open': '1. open',
             'high': '2. high', 
@@ -63,27 +68,20 @@ class AlphaVantageAdapter(DataSourceBase):
             **price_data
         )
 
-    def _cleanup_old_requests(self, current_time: datetime) -> None:
-        """Remove request timestamps older than 1 minute."""
-        self._request_times = [t for t in self._request_times 
-                             if self._is_request_within_window(current_time, t)]
-
-    def _is_request_within_window(self, current_time: datetime, request_time: datetime) -> bool:
-        """Check if request is within the time window."""
-        return current_time - request_time < timedelta(minutes=settings.ALPHA_VANTAGE_RATE_LIMIT_WINDOW_MINUTES)
-
-    def _is_within_rate_limit(self, current_time: datetime) -> bool:
-        """Check if current request would exceed rate limit."""
-        self._cleanup_old_requests(current_time)
-        return len(self._request_times) < settings.ALPHA_VANTAGE_RATE_LIMIT
+    def _create_limiter(self, api_key: str) -> TokenBucketLimiter:
+        """Get the limiter shared by every adapter using this API key."""
+        window_seconds = settings.ALPHA_VANTAGE_RATE_LIMIT_WINDOW_MINUTES * 60
+        # The quota belongs to the key, so the budget is named after a digest of it
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+        return get_rate_limiter(
+            f"{SOURCE_NAME}:{key_id}",
+            rate=settings.ALPHA_VANTAGE_RATE_LIMIT / window_seconds,
+            capacity=settings.ALPHA_VANTAGE_RATE_LIMIT
+        )
 
     async def _manage_rate_limit(self) -> None:
-        """Enforce rate limiting with request tracking."""
-        async with self._lock:
-            now = datetime.now()
-            if not self._is_within_rate_limit(now):
-                raise RateLimitError("Alpha Vantage rate limit exceeded")
-            self._request_times.append(now)
+        """Wait for a request token at the caller's priority."""
+        await self._limiter.acquire()
     
     async def _execute_api_operation(self, operation: Callable[[], Any]) -> Any:
         """Execute operation with rate limiting and error handling."""
@@ -102,21 +100,40 @@ class AlphaVantageAdapter(DataSourceBase):
             return False
         return True
     
-    def _process_time_series_data(self, data: Dict[str, Dict[str, str]], config: TimeSeriesConfig) -> List[MarketData]:
-        """Process time series data into MarketData objects."""
-        market_data = []
-        for timestamp_str, values in data.items():
-            timestamp = datetime.strptime(timestamp_str, config.timestamp_format)
-            
-            if not self._is_date_in_range(timestamp, config.start_date, config.end_date):
-                continue
-                
-            market_data.append(self._create_market_data_from_values(config.symbol, timestamp, values))
-            
-            if config.limit is not None and len(market_data) >= config.limit:
-                break
-                
-        return market_data
+    def _date_range_mask(
+        self,
+        timestamps: pd.DatetimeIndex,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> np.ndarray:
+        """Get a mask of timestamps whose date falls within the specified range."""
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start_date:
+            mask &= timestamps >= pd.Timestamp(start_date)
+        if end_date:
+            mask &= timestamps < pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        return mask
+
+    def _process_time_series_data(self, data: Dict[str, Dict[str, str]], config: TimeSeriesConfig) -> OHLCVSeries:
+        """Process time series data into a columnar series."""
+        if not data:
+            return OHLCVSeries.empty(config.symbol, SOURCE_NAME)
+        timestamps = pd.to_datetime(list(data.keys()), format=config.timestamp_format)
+        mask = self._date_range_mask(timestamps, config.start_date, config.end_date)
+        columns = {
+            field_name: np.array(
+                [values[av_key] for values in data.values()],
+                dtype=np.int64 if field_name == 'volume' else np.float64
+            )
+            for field_name, av_key in self._price_field_map.items()
+        }
+        series = OHLCVSeries(
+            symbol=config.symbol,
+            source=SOURCE_NAME,
+            timestamps=timestamps.to_numpy('datetime64[ns]').view('i8'),
+            **columns
+        ).take(mask)
+        return series[:config.limit] if config.limit is not None else series
             
     def _create_api_operation(self, operation_func: Callable[[], Any]) -> Callable[[], Any]:
         """Create a standardized API operation function."""
@@ -133,9 +150,9 @@ class AlphaVantageAdapter(DataSourceBase):
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         limit: Optional[int] = None
-    ) -> List[MarketData]:
+    ) -> OHLCVSeries:
         """Common time series fetching logic."""
-        def _fetch_data() -> List[MarketData]:
+        def _fetch_data() -> OHLCVSeries:
             data, _ = fetch_function()
             config = TimeSeriesConfig(
                 symbol=symbol,
@@ -153,15 +170,27 @@ class AlphaVantageAdapter(DataSourceBase):
         """Determine Alpha Vantage outputsize parameter based on limit."""
         return 'compact' if limit and limit <= settings.ALPHA_VANTAGE_COMPACT_LIMIT_THRESHOLD else settings.ALPHA_VANTAGE_DEFAULT_OUTPUTSIZE
 
+    def _get_outputsize_for_start(self, start_date: Optional[date]) -> str:
+        """Use compact output when the most recent data points reach back to start_date.
+
+        Weekdays since start_date over-count trading sessions, so compact is
+        only chosen when it is sure to cover the whole window.
+        """
+        if start_date is None:
+            return settings.ALPHA_VANTAGE_DEFAULT_OUTPUTSIZE
+        weekdays = int(np.busday_count(start_date, date.today() + timedelta(days=1)))
+        return self._get_outputsize_for_limit(max(weekdays, 1))
+
     async def get_daily_prices(
         self,
         symbol: str,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
-    ) -> List[MarketData]:
+    ) -> OHLCVSeries:
+        outputsize = self._get_outputsize_for_start(start_date)
         return await self._fetch_time_series(
             symbol=symbol,
-            fetch_function=lambda: self._client.get_daily(symbol=symbol, outputsize=settings.ALPHA_VANTAGE_DEFAULT_OUTPUTSIZE),
+            fetch_function=lambda: self._client.get_daily(symbol=symbol, outputsize=outputsize),
             timestamp_format=settings.ALPHA_VANTAGE_DAILY_TIMESTAMP_FORMAT,
             start_date=start_date,
             end_date=end_date
@@ -172,7 +201,7 @@ class AlphaVantageAdapter(DataSourceBase):
         symbol: str,
         interval: int = 5,
         limit: Optional[int] = None
-    ) -> List[MarketData]:
+    ) -> OHLCVSeries:
         interval_str = f"{interval}min"
         outputsize = self._get_outputsize_for_limit(limit)
         return await self._fetch_time_series(
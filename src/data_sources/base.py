@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
 from datetime import date, datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, TYPE_CHECKING
+import asyncio
+import logging
 
 from pydantic import BaseModel, ConfigDict
 
+from ..config import settings
+
+if TYPE_CHECKING:
+    from .series import OHLCVSeries
+
 class MarketData(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     
@@ -18,6 +25,9 @@ class MarketData(BaseModel):
 
 class DataSourceBase(ABC):
     """Abstract base class for financial data sources."""
+
+    # Value written to the market_data.source column for this source's bars
+    source_name: str = ''
     
     @abstractmethod
     async def get_daily_prices(
@@ -25,18 +35,50 @@ class DataSourceBase(ABC):
         symbol: str,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
-    ) -> List[MarketData]:
-        """Fetch daily price data for a given symbol."""
+    ) -> 'OHLCVSeries':
+        """Fetch daily price data for a given symbol as a columnar series."""
         pass
     
+    async def get_daily_prices_batch(
+        self,
+        symbols: Sequence[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, 'OHLCVSeries']:
+        """Fetch daily price data for many symbols.
+
+        The default makes per-symbol get_daily_prices calls, at most
+        BATCH_FETCH_CONCURRENCY at a time. Symbols that fail are logged and
+        left out of the result; sources with a multi-ticker endpoint should
+        override this.
+        """
+        from .series import OHLCVSeries
+
+        semaphore = asyncio.Semaphore(settings.BATCH_FETCH_CONCURRENCY)
+
+        async def _fetch(symbol: str) -> 'OHLCVSeries':
+            async with semaphore:
+                data = await self.get_daily_prices(symbol, start_date=start_date, end_date=end_date)
+            return OHLCVSeries.from_market_data(data, symbol=symbol)
+
+        unique_symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(_fetch(symbol) for symbol in unique_symbols), return_exceptions=True)
+        batch: Dict[str, OHLCVSeries] = {}
+        for symbol, result in zip(unique_symbols, results):
+            if isinstance(result, BaseException):
+                logging.warning(f"Batch fetch failed for {symbol}: {str(result)}")
+            else:
+                batch[symbol] = result
+        return batch
+    
     @abstractmethod
     async def get_intraday_prices(
         self,
         symbol: str,
         interval: int = 5,  # minutes
         limit: Optional[int] = None
-    ) -> List[MarketData]:
-        """Fetch intraday price data for a given symbol."""
+    ) -> 'OHLCVSeries':
+        """Fetch intraday price data for a given symbol as a columnar series."""
         pass
     
     @abstractmethod
@@ -0,0 +1,292 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import redis
+import redis.asyncio as redis_asyncio
+
+from ..config import settings
+from .exceptions import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Order in which queued callers get tokens; lower goes first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKFILL = 2
+
+
+_current_priority: ContextVar[RequestPriority] = ContextVar(
+    'rate_limit_priority', default=RequestPriority.NORMAL
+)
+
+
+def current_priority() -> RequestPriority:
+    """Get the rate limit priority of the running task."""
+    return _current_priority.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Run a block, and tasks it creates, at the given rate limit priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def _refill(
+    tokens: float,
+    updated: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    requested: float
+) -> Tuple[float, float]:
+    """Refill a bucket and try to take tokens from it.
+
+    Returns the tokens left and the seconds to wait (0.0 when granted).
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    if tokens >= requested:
+        return tokens - requested, 0.0
+    return tokens, (requested - tokens) / rate
+
+
+class BucketBackend(ABC):
+    """Storage for one token bucket's state."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Token bucket rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+
+    @abstractmethod
+    async def try_acquire(self, tokens: float) -> float:
+        """Take tokens if available; otherwise return the seconds until they will be."""
+        pass
+
+
+class MemoryBucket(BucketBackend):
+    """Token bucket shared only within this process."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        super().__init__(rate, capacity)
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def try_acquire(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = _refill(self._tokens, self._updated, now, self.rate, self.capacity, tokens)
+            self._updated = now
+            return wait
+
+
+class FileBucket(BucketBackend):
+    """Token bucket shared by every process on the host through a locked state file."""
+
+    def __init__(self, path: str, rate: float, capacity: float) -> None:
+        super().__init__(rate, capacity)
+        try:
+            import fcntl
+        except ImportError as e:
+            raise ImportError("The file rate limit backend requires fcntl (POSIX only)") from e
+        self._fcntl = fcntl
+        self.path = path
+
+    def _try_acquire_locked(self, tokens: float) -> float:
+        """Read, update and write the bucket state while holding an exclusive lock."""
+        with open(self.path, 'a+') as f:
+            self._fcntl.flock(f, self._fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                now = time.time()
+                try:
+                    state = json.loads(f.read() or '{}')
+                except ValueError:
+                    state = {}
+                left, wait = _refill(
+                    float(state.get('tokens', self.capacity)),
+                    float(state.get('updated', now)),
+                    now, self.rate, self.capacity, tokens
+                )
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({'tokens': left, 'updated': now}))
+                f.flush()
+                return wait
+            finally:
+                self._fcntl.flock(f, self._fcntl.LOCK_UN)
+
+    async def try_acquire(self, tokens: float) -> float:
+        return await asyncio.to_thread(self._try_acquire_locked, tokens)
+
+
+# Refill and take atomically on the server, using the server clock so every
+# client agrees on elapsed time. The wait is returned as a string because Lua
+# numbers are truncated to integers in replies.
+_REDIS_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucket(BucketBackend):
+    """Token bucket shared by every process using the same Redis key.
+
+    Falls back to a per-process bucket while Redis is unreachable. Buckets
+    outlive any one API lifespan, so each keeps its own connection pool
+    rather than borrowing the storage pool closed at shutdown.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        rate: float,
+        capacity: float,
+        client: Optional[redis_asyncio.Redis] = None
+    ) -> None:
+        super().__init__(rate, capacity)
+        self.key = key
+        self._client = client or redis_asyncio.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+        self._script = self._client.register_script(_REDIS_BUCKET_SCRIPT)
+        self._fallback = MemoryBucket(rate, capacity)
+
+    async def try_acquire(self, tokens: float) -> float:
+        try:
+            wait = await self._script(keys=[self.key], args=[self.rate, self.capacity, tokens])
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limit unavailable, using local bucket: {str(e)}")
+            return await self._fallback.try_acquire(tokens)
+        return float(wait)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    wakeup: asyncio.Event = field(compare=False)
+
+
+class TokenBucketLimiter:
+    """Async token bucket that paces callers instead of rejecting them.
+
+    Callers queue by priority (then arrival order) and only the head of the
+    queue draws from the bucket, so interactive requests overtake queued
+    backfills without starving the bucket's other users.
+    """
+
+    def __init__(self, backend: BucketBackend, max_sleep: float = 1.0) -> None:
+        self.backend = backend
+        # Cap each sleep so a newly queued higher-priority caller is noticed soon
+        self.max_sleep = max_sleep
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        """Get the number of callers queued for a token."""
+        return len(self._waiters)
+
+    def _wake_head(self) -> None:
+        if self._waiters:
+            self._waiters[0].wakeup.set()
+
+    async def _wait_turn(self, waiter: _Waiter, tokens: float) -> None:
+        while True:
+            if self._waiters[0] is not waiter:
+                waiter.wakeup.clear()
+                await waiter.wakeup.wait()
+                continue
+            wait = await self.backend.try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(min(wait, self.max_sleep))
+
+    async def acquire(
+        self,
+        priority: Optional[RequestPriority] = None,
+        tokens: float = 1.0,
+        timeout: Optional[float] = None
+    ) -> None:
+        """Wait for tokens, queueing behind callers of higher or equal priority.
+
+        Priority defaults to the one set with request_priority(). Raises
+        RateLimitError if a timeout is given and expires first.
+        """
+        waiter = _Waiter(
+            priority=current_priority() if priority is None else priority,
+            sequence=next(self._sequence),
+            wakeup=asyncio.Event()
+        )
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await asyncio.wait_for(self._wait_turn(waiter, tokens), timeout)
+        except asyncio.TimeoutError:
+            raise RateLimitError(f"Timed out after {timeout}s waiting for a rate limit token")
+        finally:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+            self._wake_head()
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def create_bucket_backend(name: str, rate: float, capacity: float) -> BucketBackend:
+    """Create the bucket backend selected by RATE_LIMIT_BACKEND for a named budget."""
+    backend = settings.RATE_LIMIT_BACKEND
+    if backend == 'file':
+        directory = settings.RATE_LIMIT_DIR or tempfile.gettempdir()
+        filename = 'portfolio_analyzer_ratelimit_' + name.replace(':', '_') + '.json'
+        return FileBucket(os.path.join(directory, filename), rate, capacity)
+    if backend == 'redis':
+        return RedisBucket(f"portfolio_analyzer:ratelimit:{name}", rate, capacity)
+    if backend != 'memory':
+        logger.warning(f"Unknown RATE_LIMIT_BACKEND '{backend}', using memory")
+    return MemoryBucket(rate, capacity)
+
+
+def get_rate_limiter(name: str, rate: float, capacity: float) -> TokenBucketLimiter:
+    """Get the process-wide limiter for a named budget, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucketLimiter(create_bucket_backend(name, rate, capacity))
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,322 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+import pandas as pd
+
+from .base import MarketData
+
+# Column order shared by the pandas and Arrow views
+OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+
+def _to_naive_ns(values: Any) -> np.ndarray:
+    """Convert timestamps to naive wall-clock int64 nanoseconds.
+
+    Time zone aware input keeps its local wall-clock time, matching how
+    timestamps are stored in the database.
+    """
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy('datetime64[ns]').view('i8')
+
+
+@dataclass
+class OHLCVSeries(Sequence[MarketData]):
+    """Columnar OHLCV bars for one symbol and source.
+
+    Timestamps are int64 nanoseconds since the epoch (naive wall-clock),
+    prices float64 and volume int64. The series also behaves as a read-only
+    sequence of MarketData for code that still expects bar objects; bars are
+    built on access, so hot paths should use the arrays directly.
+    """
+    symbol: str
+    source: str
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        for column in PRICE_COLUMNS:
+            setattr(self, column, np.asarray(getattr(self, column), dtype=np.float64))
+        self.volume = np.asarray(self.volume, dtype=np.int64)
+        length = len(self.timestamps)
+        for column in OHLCV_COLUMNS[1:]:
+            if len(getattr(self, column)) != length:
+                raise ValueError(f"Column '{column}' length does not match timestamps")
+
+    @classmethod
+    def empty(cls, symbol: str, source: str) -> 'OHLCVSeries':
+        """Create a series with no bars."""
+        return cls(
+            symbol=symbol,
+            source=source,
+            timestamps=np.empty(0, dtype=np.int64),
+            open=np.empty(0),
+            high=np.empty(0),
+            low=np.empty(0),
+            close=np.empty(0),
+            volume=np.empty(0, dtype=np.int64)
+        )
+
+    @classmethod
+    def from_market_data(
+        cls,
+        data: Sequence[MarketData],
+        symbol: Optional[str] = None,
+        source: Optional[str] = None
+    ) -> 'OHLCVSeries':
+        """Build a series from MarketData bars sharing one symbol and source."""
+        if isinstance(data, OHLCVSeries):
+            return data
+        if not data:
+            return cls.empty(symbol or '', source or '')
+        symbol = symbol or data[0].symbol
+        source = source or data[0].source
+        if any(item.symbol != symbol or item.source != source for item in data):
+            raise ValueError("All bars in a series must share one symbol and source")
+        return cls(
+            symbol=symbol,
+            source=source,
+            timestamps=_to_naive_ns([item.timestamp for item in data]),
+            open=np.fromiter((item.open for item in data), dtype=np.float64, count=len(data)),
+            high=np.fromiter((item.high for item in data), dtype=np.float64, count=len(data)),
+            low=np.fromiter((item.low for item in data), dtype=np.float64, count=len(data)),
+            close=np.fromiter((item.close for item in data), dtype=np.float64, count=len(data)),
+            volume=np.fromiter((item.volume for item in data), dtype=np.int64, count=len(data))
+        )
+
+    @classmethod
+    def group_market_data(cls, data: Sequence[MarketData]) -> List['OHLCVSeries']:
+        """Split mixed MarketData bars into one series per (symbol, source)."""
+        if isinstance(data, OHLCVSeries):
+            return [data]
+        groups: Dict[Tuple[str, str], List[MarketData]] = {}
+        for item in data:
+            groups.setdefault((item.symbol, item.source), []).append(item)
+        return [cls.from_market_data(items) for items in groups.values()]
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        df: pd.DataFrame,
+        symbol: str,
+        source: str
+    ) -> 'OHLCVSeries':
+        """Build a series from a DataFrame with OHLCV columns.
+
+        Timestamps are read from a 'timestamp' column, or from the index when
+        there is no such column. Columns that already have the target dtype
+        are shared with the DataFrame rather than copied.
+        """
+        timestamps = df['timestamp'] if 'timestamp' in df.columns else df.index
+        return cls(
+            symbol=symbol,
+            source=source,
+            timestamps=_to_naive_ns(timestamps),
+            **{
+                column: df[column].to_numpy(
+                    dtype=np.int64 if column == 'volume' else np.float64, copy=False
+                )
+                for column in OHLCV_COLUMNS[1:]
+            }
+        )
+
+    @classmethod
+    def from_frame_by_source(cls, df: pd.DataFrame) -> List['OHLCVSeries']:
+        """Split a long DataFrame with symbol/source columns into series."""
+        if df.empty:
+            return []
+        return [
+            cls.from_dataframe(group, symbol=str(symbol), source=str(source))
+            for (symbol, source), group in df.groupby(['symbol', 'source'], sort=False)
+        ]
+
+    @classmethod
+    def from_arrow(cls, table: Any, symbol: str, source: str) -> 'OHLCVSeries':
+        """Build a series from a pyarrow Table with OHLCV columns."""
+        columns = {
+            column: table.column(column).to_numpy() for column in OHLCV_COLUMNS
+        }
+        timestamps = columns.pop('timestamp')
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype('datetime64[ns]').view(np.int64)
+        return cls(symbol=symbol, source=source, timestamps=timestamps, **columns)
+
+    @classmethod
+    def concat(cls, series: Sequence['OHLCVSeries']) -> 'OHLCVSeries':
+        """Concatenate series for the same symbol and source."""
+        if not series:
+            raise ValueError("At least one series is required")
+        first = series[0]
+        if any(s.symbol != first.symbol or s.source != first.source for s in series):
+            raise ValueError("Only series with the same symbol and source can be concatenated")
+        return cls(
+            symbol=first.symbol,
+            source=first.source,
+            **{
+                name: np.concatenate([getattr(s, name) for s in series])
+                for name in ('timestamps',) + OHLCV_COLUMNS[1:]
+            }
+        )
+
+    @property
+    def datetimes(self) -> np.ndarray:
+        """Get timestamps as a datetime64[ns] view of the int64 column."""
+        return self.timestamps.view('datetime64[ns]')
+
+    def take(self, index: Any) -> 'OHLCVSeries':
+        """Select bars by slice, mask or integer array."""
+        return OHLCVSeries(
+            symbol=self.symbol,
+            source=self.source,
+            timestamps=self.timestamps[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index]
+        )
+
+    def _bar(self, i: int) -> MarketData:
+        """Build the MarketData view of bar i without re-validating it."""
+        return MarketData.model_construct(
+            symbol=self.symbol,
+            timestamp=pd.Timestamp(int(self.timestamps[i])).to_pydatetime(),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=int(self.volume[i]),
+            source=self.source
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @overload
+    def __getitem__(self, index: int) -> MarketData: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'OHLCVSeries': ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MarketData, 'OHLCVSeries']:
+        if isinstance(index, slice):
+            return self.take(index)
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("OHLCVSeries index out of range")
+        return self._bar(index)
+
+    def __iter__(self) -> Iterator[MarketData]:
+        for i in range(len(self)):
+            yield self._bar(i)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OHLCVSeries):
+            return NotImplemented
+        return (
+            self.symbol == other.symbol
+            and self.source == other.source
+            and all(
+                np.array_equal(getattr(self, name), getattr(other, name))
+                for name in ('timestamps',) + OHLCV_COLUMNS[1:]
+            )
+        )
+
+    def filter_dates(self, start: Optional[Any] = None, end: Optional[Any] = None) -> 'OHLCVSeries':
+        """Keep bars with timestamps in [start, end]."""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.timestamps >= pd.Timestamp(start).value
+        if end is not None:
+            mask &= self.timestamps <= pd.Timestamp(end).value
+        return self if mask.all() else self.take(mask)
+
+    def sort(self) -> 'OHLCVSeries':
+        """Get the series ordered by timestamp."""
+        if len(self) < 2 or bool(np.all(self.timestamps[1:] >= self.timestamps[:-1])):
+            return self
+        return self.take(np.argsort(self.timestamps, kind='stable'))
+
+    def latest_per_timestamp(self) -> 'OHLCVSeries':
+        """Get the series ordered by timestamp, keeping the last bar of each duplicate timestamp."""
+        if len(self) < 2:
+            return self
+        order = np.argsort(self.timestamps, kind='stable')
+        ordered = self.timestamps[order]
+        keep = np.append(ordered[1:] != ordered[:-1], True)
+        return self.take(order[keep])
+
+    def aggregate(self, first: np.ndarray, timestamps: np.ndarray) -> 'OHLCVSeries':
+        """Merge runs of consecutive bars into one bar each.
+
+        first holds the increasing start index of every run, beginning with
+        0, and timestamps the merged bars' timestamps. Open is the run's first
+        open, high the max, low the min, close the last close and volume the
+        sum.
+        """
+        if not len(self):
+            return self
+        last = np.append(first[1:] - 1, len(self) - 1)
+        return OHLCVSeries(
+            symbol=self.symbol,
+            source=self.source,
+            timestamps=timestamps,
+            open=self.open[first],
+            high=np.maximum.reduceat(self.high, first),
+            low=np.minimum.reduceat(self.low, first),
+            close=self.close[last],
+            volume=np.add.reduceat(self.volume, first)
+        )
+
+    def to_market_data(self) -> List[MarketData]:
+        """Get the bars as a list of MarketData objects."""
+        return list(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the series as a JSON-serializable dictionary of column lists."""
+        data: Dict[str, Any] = {'symbol': self.symbol, 'source': self.source}
+        data.update({name: getattr(self, name).tolist() for name in ('timestamps',) + OHLCV_COLUMNS[1:]})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'OHLCVSeries':
+        """Build a series from a dictionary produced by to_dict."""
+        return cls(**data)
+
+    def to_dataframe(self, include_metadata: bool = False) -> pd.DataFrame:
+        """Get the bars as a DataFrame whose columns share the series buffers.
+
+        With include_metadata, constant symbol and source columns are added so
+        the frame can be concatenated with frames from other series.
+        """
+        data = {'timestamp': self.datetimes}
+        data.update({column: getattr(self, column) for column in OHLCV_COLUMNS[1:]})
+        df = pd.DataFrame(data, copy=False)
+        if include_metadata:
+            df['symbol'] = self.symbol
+            df['source'] = self.source
+        return df
+
+    def to_arrow(self) -> Any:
+        """Get the bars as a pyarrow Table sharing the series buffers."""
+        try:
+            import pyarrow as pa  # type: ignore[import-untyped]
+        except ImportError as e:
+            raise ImportError("pyarrow is required for Arrow conversion: pip install pyarrow") from e
+        arrays = [pa.array(self.datetimes)]
+        arrays.extend(pa.array(getattr(self, column)) for column in OHLCV_COLUMNS[1:])
+        return pa.Table.from_arrays(
+            arrays,
+            names=list(OHLCV_COLUMNS),
+            metadata={'symbol': self.symbol, 'source': self.source}
+        )
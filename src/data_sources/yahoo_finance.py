@@ -1,14 +1,64 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import date
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import asyncio
+import threading
+import pandas as pd
 import yfinance as yf  # type: ignore[import-untyped]
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential
 
 from ..config import settings
 from .base import DataSourceBase, MarketData
 from .exceptions import APIError
+from .series import OHLCVSeries
+
+SOURCE_NAME = 'yahoo_finance'
+
+# yfinance history() column names mapped to OHLCVSeries columns
+HISTORY_COLUMNS = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume'
+}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_yahoo_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool that runs blocking yfinance calls."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.YAHOO_FINANCE_MAX_WORKERS,
+                thread_name_prefix='yfinance'
+            )
+        return _executor
+
+
+def shutdown_yahoo_executor() -> None:
+    """Shut down the shared yfinance thread pool, if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
 
 class YahooFinanceAdapter(DataSourceBase):
-    """Yahoo Finance API adapter with exponential backoff."""
+    """Yahoo Finance API adapter with exponential backoff.
+
+    yfinance is blocking, so every call runs on a bounded thread pool (the
+    shared YAHOO_FINANCE_MAX_WORKERS pool unless an executor is given) and
+    retries back off with asyncio.sleep, keeping the event loop free.
+    """
+
+    source_name = SOURCE_NAME
+
+    def __init__(self, executor: Optional[Executor] = None) -> None:
+        self._executor = executor
 
     def _create_market_data(self, symbol: str, index: Any, row: Dict[str, Any]) -> MarketData:
         """Create MarketData instance from DataFrame row."""
@@ -20,14 +70,23 @@ class YahooFinanceAdapter(DataSourceBase):
             low=row['Low'],
             close=row['Close'],
             volume=int(row['Volume']),
-            source='yahoo_finance'
+            source=SOURCE_NAME
         )
+
+    def _frame_to_series(self, symbol: str, df: pd.DataFrame) -> OHLCVSeries:
+        """Convert a yfinance history DataFrame into a columnar series."""
+        frame = df[list(HISTORY_COLUMNS)].rename(columns=HISTORY_COLUMNS).dropna()
+        return OHLCVSeries.from_dataframe(frame, symbol=symbol, source=SOURCE_NAME)
     
-    def _make_retry_decorator(self) -> Any:
-        """Create retry decorator with standard settings."""
-        return retry(
-            stop=stop_after_attempt(3),
-            wait=wait_exponential(multiplier=1, min=4, max=settings.YAHOO_FINANCE_BACKOFF_MAX)
+    def _make_retrying(self) -> AsyncRetrying:
+        """Create an asyncio-aware retry controller with standard settings."""
+        return AsyncRetrying(
+            stop=stop_after_attempt(settings.YAHOO_FINANCE_RETRY_ATTEMPTS),
+            wait=wait_exponential(
+                multiplier=1,
+                min=settings.YAHOO_FINANCE_BACKOFF_MIN,
+                max=settings.YAHOO_FINANCE_BACKOFF_MAX
+            )
         )
 
     def _handle_api_error(self, e: Exception) -> None:
@@ -41,42 +100,101 @@ class YahooFinanceAdapter(DataSourceBase):
         except Exception as e:
             self._handle_api_error(e)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=60))
+    async def _run_blocking(self, operation: Callable[[], Any]) -> Any:
+        """Run a blocking yfinance operation on the thread pool."""
+        loop = asyncio.get_running_loop()
+        executor = self._executor or get_yahoo_executor()
+        return await loop.run_in_executor(executor, self._execute_with_error_handling, operation)
+
+    async def _run_with_retry(self, operation: Callable[[], Any]) -> Any:
+        """Run a blocking operation off the event loop, retrying with async backoff."""
+        async for attempt in self._make_retrying():
+            with attempt:
+                return await self._run_blocking(operation)
+
     async def get_daily_prices(
         self,
         symbol: str,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
-    ) -> List[MarketData]:
-        def _get_daily() -> List[MarketData]:
+    ) -> OHLCVSeries:
+        def _get_daily() -> OHLCVSeries:
             ticker = yf.Ticker(symbol)
             df = ticker.history(
                 start=start_date,
                 end=end_date,
                 interval='1d'
             )
-            return [self._create_market_data(symbol, index, row) for index, row in df.iterrows()]
+            return self._frame_to_series(symbol, df)
         
-        result: List[MarketData] = self._execute_with_error_handling(_get_daily)
+        result: OHLCVSeries = await self._run_with_retry(_get_daily)
         return result
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=60))
+    def _split_download(self, symbols: Sequence[str], df: pd.DataFrame) -> Dict[str, OHLCVSeries]:
+        """Split a grouped multi-ticker download into one series per symbol."""
+        batch: Dict[str, OHLCVSeries] = {}
+        if df is None or df.empty:
+            return batch
+        if not isinstance(df.columns, pd.MultiIndex):
+            # A single ticker can come back without the ticker column level
+            series = self._frame_to_series(symbols[0], df)
+            return {symbols[0]: series} if len(series) else batch
+        available = set(df.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol in available:
+                series = self._frame_to_series(symbol, df[[symbol]].droplevel(0, axis=1))
+                if len(series):
+                    batch[symbol] = series
+        return batch
+
+    async def get_daily_prices_batch(
+        self,
+        symbols: Sequence[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, OHLCVSeries]:
+        """Fetch daily prices with yfinance multi-ticker downloads.
+
+        Symbols are downloaded YAHOO_FINANCE_BATCH_SIZE at a time; symbols
+        Yahoo returns no rows for are left out of the result.
+        """
+        unique_symbols = list(dict.fromkeys(symbols))
+        batch: Dict[str, OHLCVSeries] = {}
+        for offset in range(0, len(unique_symbols), settings.YAHOO_FINANCE_BATCH_SIZE):
+            chunk = unique_symbols[offset:offset + settings.YAHOO_FINANCE_BATCH_SIZE]
+
+            def _download(chunk: List[str] = chunk) -> Dict[str, OHLCVSeries]:
+                df = yf.download(
+                    tickers=chunk,
+                    start=start_date,
+                    end=end_date,
+                    interval='1d',
+                    group_by='ticker',
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False
+                )
+                return self._split_download(chunk, df)
+
+            batch.update(await self._run_with_retry(_download))
+        return batch
+
     async def get_intraday_prices(
         self,
         symbol: str,
         interval: int = 5,
         limit: Optional[int] = None
-    ) -> List[MarketData]:
-        def _get_intraday() -> List[MarketData]:
+    ) -> OHLCVSeries:
+        def _get_intraday() -> OHLCVSeries:
             ticker = yf.Ticker(symbol)
             df = ticker.history(
                 period='1d' if limit and limit <= 100 else '7d',
                 interval=f"{interval}m"
             )
-            market_data = [self._create_market_data(symbol, index, row) for index, row in df.iterrows()]
-            return market_data[:limit] if limit else market_data
+            series = self._frame_to_series(symbol, df)
+            return series[:limit] if limit else series
         
-        result: List[MarketData] = self._execute_with_error_handling(_get_intraday)
+        result: OHLCVSeries = await self._run_with_retry(_get_intraday)
         return result
 
 
@@ -101,5 +219,5 @@ class YahooFinanceAdapter(DataSourceBase):
                 pass
             return []
         
-        result: List[Dict[str, str]] = self._execute_with_error_handling(_search)
+        result: List[Dict[str, str]] = await self._run_blocking(_search)
         return result
\ No newline at end of file
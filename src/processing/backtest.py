@@ -0,0 +1,301 @@
+import itertools
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from ..data_sources.series import OHLCVSeries
+from ..storage.analytics import TRADING_DAYS_PER_YEAR
+from .indicators import ema, rsi, sma
+
+NS_PER_YEAR = int(365.25 * 24 * 3600 * 1e9)
+
+# Parameter grids swept when a request names no grid
+DEFAULT_GRIDS: Dict[str, Dict[str, Sequence[float]]] = {
+    # Long while the fast SMA is above the slow one
+    'sma_cross': {'fast': tuple(range(5, 55, 5)), 'slow': tuple(range(20, 220, 10))},
+    # Buy when RSI drops below oversold, sell when it rises above overbought
+    'rsi_reversion': {
+        'period': (7, 10, 14, 21), 'oversold': (20, 25, 30, 35), 'overbought': (65, 70, 75, 80)
+    },
+    # Long while the MACD line is above its signal line
+    'macd': {'fast': (8, 10, 12, 15), 'slow': (21, 26, 30, 35), 'signal': (5, 7, 9, 12)}
+}
+STRATEGIES = tuple(DEFAULT_GRIDS)
+METRICS = ('total_return', 'annual_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'profit_factor')
+
+
+def expand_grid(strategy: str, grid: Optional[Mapping[str, Sequence[float]]] = None) -> List[Dict[str, float]]:
+    """List every parameter combination of a grid, skipping ones that cannot trade.
+
+    Missing parameters take their default grid values. Raises ValueError
+    for unknown strategies or parameters.
+    """
+    if strategy not in DEFAULT_GRIDS:
+        raise ValueError(f"Unknown strategy '{strategy}'; expected one of {', '.join(STRATEGIES)}")
+    grid = {**DEFAULT_GRIDS[strategy], **(grid or {})}
+    unknown = set(grid) - set(DEFAULT_GRIDS[strategy])
+    if unknown:
+        raise ValueError(f"Unknown parameters for {strategy}: {', '.join(sorted(unknown))}")
+    names = list(DEFAULT_GRIDS[strategy])
+    combos = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    if strategy in ('sma_cross', 'macd'):
+        return [combo for combo in combos if combo['fast'] < combo['slow']]
+    return [combo for combo in combos if combo['oversold'] < combo['overbought']]
+
+
+def _column(combos: Sequence[Mapping[str, float]], name: str) -> np.ndarray:
+    return np.array([combo[name] for combo in combos])
+
+
+def _rows(compute: Any, close: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Stack one indicator row per combination, computing each distinct period once."""
+    unique, index = np.unique(periods, return_inverse=True)
+    return np.vstack([compute(close, int(period)) for period in unique])[index]
+
+
+def _hold_until_exit(entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """Turn entry and exit signals into 0/1 positions, holding between them."""
+    state = np.where(entries, 1.0, np.where(exits, 0.0, np.nan))
+    columns = np.arange(state.shape[1])
+    last = np.maximum.accumulate(np.where(np.isnan(state), 0, columns), axis=1)
+    held = state[np.arange(state.shape[0])[:, None], last]
+    return np.nan_to_num(held, nan=0.0)
+
+
+def positions(close: np.ndarray, strategy: str, combos: Sequence[Mapping[str, float]]) -> np.ndarray:
+    """Get (combinations, bars) long/flat positions decided at each bar's close.
+
+    Indicators still warming up never signal, so positions start flat.
+    """
+    if strategy == 'sma_cross':
+        fast = _rows(sma, close, _column(combos, 'fast'))
+        slow = _rows(sma, close, _column(combos, 'slow'))
+        return (fast > slow).astype(np.float64)
+    if strategy == 'macd':
+        line = _rows(ema, close, _column(combos, 'fast')) - _rows(ema, close, _column(combos, 'slow'))
+        signal_periods = _column(combos, 'signal')
+        signal = np.empty_like(line)
+        for period in np.unique(signal_periods):
+            rows = signal_periods == period
+            signal[rows] = ema(line[rows], int(period))
+        return (line > signal).astype(np.float64)
+    strength = _rows(rsi, close, _column(combos, 'period'))
+    return _hold_until_exit(
+        strength < _column(combos, 'oversold')[:, None],
+        strength > _column(combos, 'overbought')[:, None]
+    )
+
+
+def _trade_returns(held: np.ndarray, growth: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get (combinations, max trades) trade returns and a mask of real trades.
+
+    A trade spans the bars a position is held plus the bar it is closed
+    on, so both commissions count against it.
+    """
+    previous = np.concatenate((np.zeros((held.shape[0], 1)), held[:, :-1]), axis=1)
+    entries = (held > 0) & (previous == 0)
+    in_trade = (held > 0) | (previous > 0)
+    trade_ids = np.cumsum(entries, axis=1) * in_trade
+    counts = entries.sum(axis=1)
+    width = int(counts.max(initial=0)) + 1
+    keys = (np.arange(held.shape[0])[:, None] * width + trade_ids)[in_trade]
+    sums = np.bincount(keys, weights=growth[in_trade], minlength=held.shape[0] * width)
+    returns = np.expm1(sums.reshape(held.shape[0], width)[:, 1:])
+    mask = np.arange(width - 1)[None, :] < counts[:, None]
+    return returns, mask
+
+
+@dataclass
+class SweepResult:
+    """Backtest metrics for every parameter combination of one strategy on one symbol.
+
+    metrics and trade statistics hold one value per combination, and
+    monthly_returns one row per combination with a column per month.
+    """
+    symbol: str
+    strategy: str
+    combos: List[Dict[str, float]]
+    start: int
+    end: int
+    metrics: Dict[str, np.ndarray]
+    trades: Dict[str, np.ndarray]
+    months: List[str]
+    monthly_returns: np.ndarray
+
+    def best(self, metric: str = 'sharpe_ratio') -> int:
+        """Get the index of the combination with the highest metric; NaN ranks last."""
+        values = self.metrics[metric]
+        return int(np.argmax(np.where(np.isnan(values), -np.inf, values)))
+
+    def ranking(self, metric: str = 'sharpe_ratio', top: int = 10) -> List[Dict[str, Any]]:
+        """Get the top combinations by a metric with their headline metrics."""
+        values = np.where(np.isnan(self.metrics[metric]), -np.inf, self.metrics[metric])
+        order = np.argsort(-values, kind='stable')[:top]
+        return [
+            {'parameters': self.combos[i], **{name: _number(self.metrics[name][i]) for name in METRICS}}
+            for i in order
+        ]
+
+    def report(self, index: int) -> Dict[str, Any]:
+        """Get the performance, trade and monthly figures of one combination."""
+        return {
+            'symbol': self.symbol,
+            'strategy': self.strategy,
+            'parameters': self.combos[index],
+            'period': f"{_day(self.start)} to {_day(self.end)}",
+            'performance': {name: _number(self.metrics[name][index]) for name in METRICS},
+            'trades': {name: _number(values[index]) for name, values in self.trades.items()},
+            'monthly_returns': [
+                {'month': month, 'return': _number(value)}
+                for month, value in zip(self.months, self.monthly_returns[index])
+            ]
+        }
+
+
+def _number(value: Any) -> Any:
+    """Round a metric for JSON; NaN and infinity (no trades, no losses) become None."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    value = float(value)
+    return round(value, 4) if math.isfinite(value) else None
+
+
+def _day(timestamp: int) -> str:
+    return str(np.datetime64(int(timestamp), 'ns').astype('datetime64[D]'))
+
+
+def backtest(
+    series: OHLCVSeries,
+    strategy: str,
+    grid: Optional[Mapping[str, Sequence[float]]] = None,
+    cost_bps: Optional[float] = None
+) -> SweepResult:
+    """Backtest every combination of a strategy's parameter grid on daily bars.
+
+    Positions are taken at a bar's close and earn the next bar's return;
+    each change of position pays cost_bps of the traded value. The whole
+    grid is evaluated as one (combinations, bars) matrix.
+    """
+    combos = expand_grid(strategy, grid)
+    series = series.latest_per_timestamp()
+    if len(series) < 2 or not combos:
+        raise ValueError(f"Need at least 2 bars and 1 valid parameter combination to backtest {series.symbol}")
+    cost = (settings.BACKTEST_COST_BPS if cost_bps is None else cost_bps) / 10000.0
+    close = series.close
+
+    held = positions(close, strategy, combos)[:, :-1]
+    changes = np.abs(np.diff(held, axis=1, prepend=0.0))
+    # Closing the position after the last bar is not charged
+    returns = held * (close[1:] / close[:-1] - 1.0)[None, :] - cost * changes
+    growth = np.log1p(returns)
+    equity = np.exp(np.cumsum(growth, axis=1))
+
+    total = equity[:, -1] - 1.0
+    years = (series.timestamps[-1] - series.timestamps[0]) / NS_PER_YEAR
+    deviation = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.full(len(combos), np.nan)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+
+    trade_returns, is_trade = _trade_returns(held, growth)
+    wins = is_trade & (trade_returns > 0)
+    losses = is_trade & (trade_returns <= 0)
+    gains = np.where(wins, trade_returns, 0.0).sum(axis=1)
+    lost = -np.where(losses, trade_returns, 0.0).sum(axis=1)
+    win_count, loss_count, trade_count = wins.sum(axis=1), losses.sum(axis=1), is_trade.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        metrics = {
+            'total_return': total,
+            'annual_return': (1.0 + total) ** (1.0 / years) - 1.0 if years > 0 else np.full(len(combos), np.nan),
+            'sharpe_ratio': returns.mean(axis=1) / deviation * np.sqrt(TRADING_DAYS_PER_YEAR),
+            'max_drawdown': (equity / peaks - 1.0).min(axis=1),
+            'win_rate': win_count / trade_count,
+            'profit_factor': gains / lost
+        }
+        trades = {
+            'total_trades': trade_count,
+            'winning_trades': win_count,
+            'losing_trades': loss_count,
+            'average_win': gains / win_count,
+            'average_loss': -lost / loss_count,
+            'largest_win': np.where(wins, trade_returns, -np.inf).max(axis=1, initial=-np.inf),
+            'largest_loss': np.where(losses, trade_returns, np.inf).min(axis=1, initial=np.inf)
+        }
+
+    # Each return is realized on the later bar of its pair
+    month_of = series.timestamps[1:].view('datetime64[ns]').astype('datetime64[M]')
+    starts = np.flatnonzero(np.diff(month_of.view(np.int64), prepend=month_of.view(np.int64)[0] - 1))
+    return SweepResult(
+        symbol=series.symbol,
+        strategy=strategy,
+        combos=combos,
+        start=int(series.timestamps[0]),
+        end=int(series.timestamps[-1]),
+        metrics=metrics,
+        trades=trades,
+        months=[str(month) for month in month_of[starts]],
+        monthly_returns=np.expm1(np.add.reduceat(growth, starts, axis=1))
+    )
+
+
+def _backtest_task(args: Tuple[OHLCVSeries, str, Optional[Mapping[str, Sequence[float]]], Optional[float]]) -> SweepResult:
+    return backtest(*args)
+
+
+def sweep_symbols(
+    series: Sequence[OHLCVSeries],
+    strategy: str,
+    grid: Optional[Mapping[str, Sequence[float]]] = None,
+    cost_bps: Optional[float] = None,
+    workers: Optional[int] = None
+) -> Dict[str, SweepResult]:
+    """Backtest a grid on many symbols, spread over a process pool.
+
+    Each worker sweeps whole symbols, so the vectorized grid stays on one
+    core. With one worker or one symbol everything runs in-process.
+    Workers are spawned rather than forked so they do not inherit native
+    state such as open HTTP sessions from the parent.
+    """
+    workers = settings.BACKTEST_WORKERS if workers is None else workers
+    # Reject a bad grid before starting workers
+    expand_grid(strategy, grid)
+    tasks = [(item, strategy, grid, cost_bps) for item in series]
+    if workers <= 1 or len(tasks) <= 1:
+        return {item.symbol: _backtest_task(task) for item, task in zip(series, tasks)}
+    workers = min(workers, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = list(pool.map(_backtest_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    return {result.symbol: result for result in results}
+
+
+def synthetic_dataset(symbols: int = 20, bars: int = 756, seed: int = 42) -> List[OHLCVSeries]:
+    """Build a deterministic benchmark dataset of daily bars on business days from 2020-01-01.
+
+    Closes follow geometric random walks with a per-symbol drift and
+    volatility, so every strategy finds some winners and some losers.
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = pd.bdate_range("2020-01-01", periods=bars).to_numpy("datetime64[ns]").view("i8")
+    drift = rng.uniform(-0.0002, 0.0008, size=(symbols, 1))
+    volatility = rng.uniform(0.008, 0.03, size=(symbols, 1))
+    close = 100.0 * np.exp(np.cumsum(drift + volatility * rng.standard_normal((symbols, bars)), axis=1))
+    spread = close * volatility * rng.uniform(0.2, 1.0, size=(symbols, bars))
+    opens = np.concatenate((close[:, :1], close[:, :-1]), axis=1)
+    volume = rng.integers(100_000, 5_000_000, size=(symbols, bars))
+    return [
+        OHLCVSeries(
+            symbol=f"SYN{i:03d}",
+            source="synthetic",
+            timestamps=timestamps.copy(),
+            open=opens[i],
+            high=np.maximum(opens[i], close[i]) + spread[i],
+            low=np.minimum(opens[i], close[i]) - spread[i],
+            close=close[i],
+            volume=volume[i].astype(np.int64)
+        )
+        for i in range(symbols)
+    ]
@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..data_sources.series import OHLCVSeries
+from ..storage.cache import NAMESPACE_INDICATOR
+from .indicators import IndicatorParams, atr, ema, rolling_std, rsi, sma
+from .streaming_indicators import (
+    StreamingATR,
+    StreamingBollinger,
+    StreamingEMA,
+    StreamingIndicator,
+    StreamingMACD,
+    StreamingRollingStats,
+    StreamingRSI,
+    call_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Streaming indicator class restoring the tail state of each indicator kind
+_STREAMING: Dict[str, Any] = {
+    'sma': StreamingRollingStats,
+    'ema': StreamingEMA,
+    'rsi': StreamingRSI,
+    'macd': StreamingMACD,
+    'bollinger': StreamingBollinger,
+    'atr': StreamingATR
+}
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """One indicator and its parameter tuple, e.g. IndicatorSpec('macd', (12, 26, 9))."""
+    name: str
+    args: Tuple[Any, ...]
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:{','.join(str(arg) for arg in self.args)}"
+
+    @property
+    def columns(self) -> List[str]:
+        """Get the output names, matching the batch engine's."""
+        if self.name in ('sma', 'ema'):
+            return [f"{self.name}_{self.args[0]}"]
+        if self.name == 'macd':
+            return ['macd_line', 'macd_signal', 'macd_histogram']
+        if self.name == 'bollinger':
+            return ['bollinger_upper', 'bollinger_middle', 'bollinger_lower']
+        return [self.name]
+
+    def compute(self, series: OHLCVSeries) -> Dict[str, np.ndarray]:
+        """Compute the full series with the batch engine."""
+        close = series.close
+        if self.name == 'sma':
+            outputs = [sma(close, *self.args)[0]]
+        elif self.name == 'ema':
+            outputs = [ema(close, *self.args)[0]]
+        elif self.name == 'rsi':
+            outputs = [rsi(close, *self.args)[0]]
+        elif self.name == 'macd':
+            fast, slow, signal = self.args
+            line = ema(close, fast)[0] - ema(close, slow)[0]
+            signal_line = ema(line, signal)[0]
+            outputs = [line, signal_line, line - signal_line]
+        elif self.name == 'bollinger':
+            period, width = self.args
+            middle = sma(close, period)[0]
+            band = width * rolling_std(close, period)[0]
+            outputs = [middle + band, middle, middle - band]
+        else:
+            outputs = [atr(series.high, series.low, close, *self.args)[0]]
+        return dict(zip(self.columns, outputs))
+
+    def tail_state(self, series: OHLCVSeries) -> StreamingIndicator:
+        """Get the streaming state after the last bar of a series."""
+        if self.name == 'atr':
+            (period,) = self.args
+            return StreamingATR.from_history(period, series.high, series.low, series.close)
+        return _STREAMING[self.name].from_history(*self.args, series.close)
+
+    def restore(self, state: Dict[str, Any]) -> StreamingIndicator:
+        indicator = _STREAMING[self.name](*self.args)
+        indicator.load_state(state)
+        return indicator
+
+    def step(self, indicator: Any, high: float, low: float, close: float) -> Tuple[float, ...]:
+        """Apply one bar and get the new value of each column, NaN while warming up."""
+        if self.name == 'atr':
+            value = indicator.update(high, low, close)
+        else:
+            value = indicator.update(close)
+        if self.name == 'sma':
+            value = value[0] if value else None
+        if value is None:
+            return (np.nan,) * len(self.columns)
+        values = value if isinstance(value, tuple) else (value,)
+        return tuple(np.nan if item is None else item for item in values)
+
+
+def indicator_specs(params: IndicatorParams) -> List[IndicatorSpec]:
+    """Split a parameter set into the indicators it computes."""
+    specs = [IndicatorSpec('sma', (period,)) for period in params.sma_periods]
+    specs += [IndicatorSpec('ema', (period,)) for period in params.ema_periods]
+    specs += [
+        IndicatorSpec('rsi', (params.rsi_period,)),
+        IndicatorSpec('macd', (params.macd_fast, params.macd_slow, params.macd_signal)),
+        IndicatorSpec('bollinger', (params.bollinger_period, params.bollinger_width)),
+        IndicatorSpec('atr', (params.atr_period,))
+    ]
+    return specs
+
+
+def fingerprint(series: OHLCVSeries, count: int) -> str:
+    """Hash the timestamps, highs, lows and closes of the first count bars."""
+    digest = hashlib.blake2b(digest_size=16)
+    for values in (series.timestamps, series.high, series.low, series.close):
+        digest.update(np.ascontiguousarray(values[:count]).tobytes())
+    return digest.hexdigest()
+
+
+def _encode(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else value for value in values.tolist()]
+
+
+def _decode(values: List[Optional[float]]) -> np.ndarray:
+    return np.array(values, dtype=np.float64)
+
+
+class IndicatorCache:
+    """Computed indicator series cached per (symbol, source, indicator, params, last bar).
+
+    Entries live in Redis and the in-process tier of a RedisCache or
+    AsyncRedisCache. Each entry keeps the streaming state after its last
+    bar, so when newer bars arrive the latest entry for the indicator is
+    extended bar by bar instead of recomputed. An entry is only reused
+    when its bars hash the same as the start of the requested series, so
+    revised bars or a different window fall back to a full computation.
+    """
+
+    def __init__(self, cache: Any, expiration: Optional[int] = None) -> None:
+        self.cache = cache
+        self.expiration = expiration or settings.INDICATOR_CACHE_TTL
+
+    def _key(self, series: OHLCVSeries, spec: IndicatorSpec, last: Optional[int] = None) -> str:
+        key = f"{NAMESPACE_INDICATOR}:{series.symbol}:{series.source}:{spec.key}"
+        return f"{key}:{'head' if last is None else last}"
+
+    async def get(self, series: OHLCVSeries, spec: IndicatorSpec) -> Dict[str, np.ndarray]:
+        """Get one indicator over every bar of a time-ordered series."""
+        if not len(series):
+            return spec.compute(series)
+        last = int(series.timestamps[-1])
+        previous = None
+        try:
+            entry = await call_cache(self.cache.get_json, self._key(series, spec, last))
+            if entry is None or entry.get('fingerprint') != fingerprint(series, len(series)):
+                entry = None
+                head = await call_cache(self.cache.get_json, self._key(series, spec))
+                if head is not None and head.get('timestamp', last) < last:
+                    previous = await call_cache(self.cache.get_json, self._key(series, spec, head['timestamp']))
+        except Exception as e:
+            logger.warning(f"Indicator cache read failed for {series.symbol} {spec.key}: {e}")
+            return spec.compute(series)
+
+        try:
+            if entry is not None:
+                columns = {name: _decode(values) for name, values in entry['columns'].items()}
+                self.cache.indicator_stats.record(spec.name, 'hits')
+                return columns
+            extended = self._extend(series, spec, previous)
+        except (KeyError, TypeError, ValueError) as e:
+            # Recompute below; storing the result replaces the unreadable entry
+            logger.warning(f"Discarding unreadable indicator cache entry for {series.symbol} {spec.key}: {e}")
+            extended = None
+        if extended is not None:
+            self.cache.indicator_stats.record(spec.name, 'extensions')
+            await self._store(series, spec, *extended)
+            return extended[0]
+
+        self.cache.indicator_stats.record(spec.name, 'misses')
+        columns = spec.compute(series)
+        await self._store(series, spec, columns, spec.tail_state(series))
+        return columns
+
+    def _extend(
+        self,
+        series: OHLCVSeries,
+        spec: IndicatorSpec,
+        entry: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[Dict[str, np.ndarray], StreamingIndicator]]:
+        """Continue a stored entry over the newer bars of a series, or None if it does not fit."""
+        if entry is None:
+            return None
+        count = entry['count']
+        if count >= len(series) or entry['fingerprint'] != fingerprint(series, count):
+            return None
+        indicator = spec.restore(entry['state'])
+        new = [
+            spec.step(indicator, high, low, close)
+            for high, low, close in zip(
+                series.high[count:].tolist(), series.low[count:].tolist(), series.close[count:].tolist()
+            )
+        ]
+        columns = {
+            name: np.concatenate((_decode(entry['columns'][name]), [row[i] for row in new]))
+            for i, name in enumerate(spec.columns)
+        }
+        return columns, indicator
+
+    async def _store(
+        self,
+        series: OHLCVSeries,
+        spec: IndicatorSpec,
+        columns: Dict[str, np.ndarray],
+        indicator: StreamingIndicator
+    ) -> None:
+        last = int(series.timestamps[-1])
+        entry = {
+            'count': len(series),
+            'fingerprint': fingerprint(series, len(series)),
+            'columns': {name: _encode(values) for name, values in columns.items()},
+            'state': indicator.to_state()
+        }
+        try:
+            await call_cache(self.cache.set_json, self._key(series, spec, last), entry, self.expiration)
+            await call_cache(self.cache.set_json, self._key(series, spec), {'timestamp': last}, self.expiration)
+        except Exception as e:
+            logger.warning(f"Indicator cache write failed for {series.symbol} {spec.key}: {e}")
+
+    async def compute(
+        self,
+        series: OHLCVSeries,
+        params: IndicatorParams = IndicatorParams()
+    ) -> Dict[str, np.ndarray]:
+        """Get every indicator of a parameter set, named as by compute_indicators plus atr."""
+        columns: Dict[str, np.ndarray] = {}
+        for part in await asyncio.gather(*(self.get(series, spec) for spec in indicator_specs(params))):
+            columns.update(part)
+        return columns
@@ -0,0 +1,274 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+from ..data_sources.base import MarketData
+from ..data_sources.series import OHLCVSeries
+
+RSI_OVERBOUGHT = 70.0
+RSI_OVERSOLD = 30.0
+
+# Memoized intermediate arrays keyed by (kind, period), shared by parameter sets
+Memo = Dict[Tuple[str, int], np.ndarray]
+
+
+@dataclass(frozen=True)
+class IndicatorParams:
+    """One parameter set for the indicator engine."""
+    sma_periods: Tuple[int, ...] = (20, 50)
+    ema_periods: Tuple[int, ...] = (12, 26)
+    rsi_period: int = 14
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    bollinger_period: int = 20
+    bollinger_width: float = 2.0
+    atr_period: int = 14
+
+    @property
+    def min_bars(self) -> int:
+        """Get the bars needed before every indicator has a value."""
+        return max(self.sma_periods + (self.bollinger_period, self.rsi_period + 1, self.macd_slow))
+
+
+def _as_matrix(closes: np.ndarray) -> np.ndarray:
+    """View closes as a (rows, bars) float64 matrix."""
+    return np.atleast_2d(np.asarray(closes, dtype=np.float64))
+
+
+def _window_sums(values: np.ndarray, period: int) -> np.ndarray:
+    """Get trailing window sums along the last axis; column i sums bars i..i+period-1."""
+    totals = np.cumsum(values, axis=1)
+    totals = np.concatenate((np.zeros((values.shape[0], 1)), totals), axis=1)
+    return totals[:, period:] - totals[:, :-period]
+
+
+def sma(closes: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average of each row; NaN until period bars exist."""
+    values = _as_matrix(closes)
+    out = np.full(values.shape, np.nan)
+    if period <= values.shape[1]:
+        out[:, period - 1:] = _window_sums(values, period) / period
+    return out
+
+
+def rolling_std(closes: np.ndarray, period: int) -> np.ndarray:
+    """Population standard deviation over trailing windows of each row."""
+    values = _as_matrix(closes)
+    out = np.full(values.shape, np.nan)
+    if period <= values.shape[1]:
+        # Centering first keeps the sum-of-squares formula from cancelling
+        centered = values - values.mean(axis=1, keepdims=True)
+        mean = _window_sums(centered, period) / period
+        variance = _window_sums(centered * centered, period) / period - mean * mean
+        out[:, period - 1:] = np.sqrt(np.clip(variance, 0.0, None))
+    return out
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: np.ndarray) -> np.ndarray:
+    """Run y[t] = alpha * x[t] + (1 - alpha) * y[t-1] along each row, starting from seed."""
+    smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=1, zi=(1.0 - alpha) * seed[:, None])
+    return smoothed
+
+
+def ema(closes: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average of each row with alpha 2 / (period + 1), seeded with the first close."""
+    values = _as_matrix(closes)
+    if not values.shape[1]:
+        return values.copy()
+    return _smooth(values, 2.0 / (period + 1), values[:, 0])
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing: the mean of the first period values, then alpha 1 / period."""
+    out = np.full(values.shape, np.nan)
+    if period > values.shape[1]:
+        return out
+    seed = values[:, :period].mean(axis=1)
+    out[:, period - 1] = seed
+    if values.shape[1] > period:
+        out[:, period:] = _smooth(values[:, period:], 1.0 / period, seed)
+    return out
+
+
+def rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder's relative strength index of each row; NaN for the first period bars."""
+    values = _as_matrix(closes)
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < 2:
+        return out
+    changes = np.diff(values, axis=1)
+    gains = wilder(np.clip(changes, 0.0, None), period)
+    losses = wilder(np.clip(-changes, 0.0, None), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        strength = 100.0 - 100.0 / (1.0 + gains / losses)
+    # No losses: 100 on any gain, 50 for a flat window
+    strength = np.where(losses == 0, np.where(gains > 0, 100.0, 50.0), strength)
+    out[:, 1:] = np.where(np.isnan(gains), np.nan, strength)
+    return out
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range of each row; the first bar has no previous close and uses high - low."""
+    high, low, close = _as_matrix(high), _as_matrix(low), _as_matrix(close)
+    ranges = high - low
+    if ranges.shape[1] > 1:
+        previous = close[:, :-1]
+        ranges[:, 1:] = np.maximum(
+            ranges[:, 1:], np.maximum(np.abs(high[:, 1:] - previous), np.abs(low[:, 1:] - previous))
+        )
+    return ranges
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder's average true range of each row; NaN for the first period - 1 bars."""
+    return wilder(true_range(high, low, close), period)
+
+
+def _memo(memo: Memo, kind: str, period: int, values: np.ndarray) -> np.ndarray:
+    key = (kind, period)
+    if key not in memo:
+        compute = {'sma': sma, 'ema': ema, 'std': rolling_std, 'rsi': rsi}[kind]
+        memo[key] = compute(values, period)
+    return memo[key]
+
+
+def compute_indicators(
+    closes: np.ndarray,
+    params: IndicatorParams = IndicatorParams(),
+    memo: Optional[Memo] = None
+) -> Dict[str, np.ndarray]:
+    """Compute every indicator of a parameter set over rows of closes.
+
+    Returns (rows, bars) arrays named sma_<n>, ema_<n>, rsi, macd_line,
+    macd_signal, macd_histogram and bollinger_upper/middle/lower. Moving
+    averages are computed once per period and shared through memo, which
+    callers can pass to reuse them across parameter sets.
+    """
+    values = _as_matrix(closes)
+    memo = {} if memo is None else memo
+    result = {f"sma_{period}": _memo(memo, 'sma', period, values) for period in params.sma_periods}
+    result.update({f"ema_{period}": _memo(memo, 'ema', period, values) for period in params.ema_periods})
+    result['rsi'] = _memo(memo, 'rsi', params.rsi_period, values)
+
+    line = _memo(memo, 'ema', params.macd_fast, values) - _memo(memo, 'ema', params.macd_slow, values)
+    signal = ema(line, params.macd_signal)
+    result.update(macd_line=line, macd_signal=signal, macd_histogram=line - signal)
+
+    middle = _memo(memo, 'sma', params.bollinger_period, values)
+    band = params.bollinger_width * _memo(memo, 'std', params.bollinger_period, values)
+    result.update(bollinger_upper=middle + band, bollinger_middle=middle, bollinger_lower=middle - band)
+    return result
+
+
+def evaluate_batch(
+    closes: Mapping[str, np.ndarray],
+    param_sets: Sequence[IndicatorParams] = (IndicatorParams(),)
+) -> Dict[str, List[Dict[str, np.ndarray]]]:
+    """Evaluate many symbols against many parameter sets at once.
+
+    Symbols with the same number of bars are stacked into one matrix, and
+    each distinct moving average, RSI and band is computed once per matrix
+    for every parameter set using it. Returns, per symbol, one dict per
+    parameter set with the last two values of each indicator (previous,
+    latest), enough to evaluate crossovers.
+    """
+    by_length: Dict[int, List[str]] = defaultdict(list)
+    for symbol, values in closes.items():
+        by_length[len(values)].append(symbol)
+
+    results: Dict[str, List[Dict[str, np.ndarray]]] = {symbol: [] for symbol in closes}
+    for symbols in by_length.values():
+        matrix = np.vstack([np.asarray(closes[symbol], dtype=np.float64) for symbol in symbols])
+        memo: Memo = {}
+        for params in param_sets:
+            tails = {
+                name: _tail(values) for name, values in compute_indicators(matrix, params, memo).items()
+            }
+            for row, symbol in enumerate(symbols):
+                results[symbol].append({name: tail[row] for name, tail in tails.items()})
+    return results
+
+
+def _tail(values: np.ndarray) -> np.ndarray:
+    """Get the last two columns, NaN-padded for series shorter than two bars."""
+    tail = np.full((values.shape[0], 2), np.nan)
+    count = min(values.shape[1], 2)
+    if count:
+        tail[:, 2 - count:] = values[:, -count:]
+    return tail
+
+
+def primary_series(bars: Sequence[MarketData]) -> Optional[OHLCVSeries]:
+    """Pick the source with the most bars, ordered by timestamp, or None without bars."""
+    series = [item for item in OHLCVSeries.group_market_data(bars) if len(item)]
+    if not series:
+        return None
+    return max(series, key=len).latest_per_timestamp()
+
+
+def _signal(kind: str, indicator: str, strength: str, description: str) -> Dict[str, str]:
+    return {"type": kind, "indicator": indicator, "strength": strength, "description": description}
+
+
+def technical_signals(close: float, values: Mapping[str, np.ndarray], params: IndicatorParams) -> List[Dict[str, str]]:
+    """Derive BUY/SELL/NEUTRAL signals from (previous, latest) indicator values."""
+    signals = []
+    previous_histogram, histogram = values['macd_histogram']
+    if histogram > 0:
+        crossed = previous_histogram <= 0
+        signals.append(_signal(
+            "BUY", "MACD", "STRONG" if crossed else "MODERATE",
+            "MACD line crossed above signal line" if crossed else "MACD line above signal line"
+        ))
+    elif histogram < 0:
+        crossed = previous_histogram >= 0
+        signals.append(_signal(
+            "SELL", "MACD", "STRONG" if crossed else "MODERATE",
+            "MACD line crossed below signal line" if crossed else "MACD line below signal line"
+        ))
+
+    strength = values['rsi'][-1]
+    if strength > RSI_OVERBOUGHT:
+        signals.append(_signal("SELL", "RSI", "MODERATE", f"RSI overbought ({strength:.1f})"))
+    elif strength < RSI_OVERSOLD:
+        signals.append(_signal("BUY", "RSI", "MODERATE", f"RSI oversold ({strength:.1f})"))
+    elif not np.isnan(strength):
+        signals.append(_signal("NEUTRAL", "RSI", "MODERATE", f"RSI in neutral territory ({strength:.1f})"))
+
+    period = min(params.sma_periods)
+    average = values[f"sma_{period}"][-1]
+    if close > average:
+        signals.append(_signal("BUY", "SMA", "MODERATE", f"Price above {period}-day SMA"))
+    elif close < average:
+        signals.append(_signal("SELL", "SMA", "MODERATE", f"Price below {period}-day SMA"))
+
+    if close > values['bollinger_upper'][-1]:
+        signals.append(_signal("SELL", "BOLLINGER", "MODERATE", "Price above upper Bollinger band"))
+    elif close < values['bollinger_lower'][-1]:
+        signals.append(_signal("BUY", "BOLLINGER", "MODERATE", "Price below lower Bollinger band"))
+    return signals
+
+
+def recommend(signals: Sequence[Mapping[str, str]], values: Mapping[str, np.ndarray]) -> Dict[str, Any]:
+    """Summarize signals into an action, with the Bollinger bands as target and stop.
+
+    A BUY targets the upper band and stops at the lower one; a SELL (short)
+    targets the lower band and stops at the upper one. A HOLD opens no
+    position, so it has neither.
+    """
+    buys = sum(signal["type"] == "BUY" for signal in signals)
+    sells = sum(signal["type"] == "SELL" for signal in signals)
+    action = "BUY" if buys > sells else "SELL" if sells > buys else "HOLD"
+    upper, lower = float(values['bollinger_upper'][-1]), float(values['bollinger_lower'][-1])
+    target, stop = {"BUY": (upper, lower), "SELL": (lower, upper)}.get(action, (None, None))
+    return {
+        "action": action,
+        "confidence": round(max(buys, sells) / len(signals), 2) if signals else 0.0,
+        "target_price": target,
+        "stop_loss": stop,
+        "reasoning": f"{buys} of {len(signals)} signals bullish, {sells} bearish"
+    }
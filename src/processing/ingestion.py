@@ -0,0 +1,332 @@
+import asyncio
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..config import settings
+from ..data_sources.series import OHLCVSeries
+from .latency import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, str]
+
+
+class IngestionQueueFull(Exception):
+    """Raised when bars cannot be queued before the put timeout."""
+    pass
+
+
+async def save_series(repository: Any, series: OHLCVSeries) -> None:
+    """Save a series through a sync or async repository without blocking the loop."""
+    save = repository.bulk_save_market_data
+    if inspect.iscoroutinefunction(save):
+        await save(series)
+    else:
+        await asyncio.to_thread(save, series)
+
+
+@dataclass
+class IngestionStats:
+    """Counters and flush latency for a write-behind queue."""
+    enqueued_bars: int = 0
+    flushed_bars: int = 0
+    # Duplicate (source, symbol, timestamp) bars merged away before writing
+    coalesced_bars: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    # Puts that had to wait for a flush to free queue space
+    backpressure_waits: int = 0
+    spilled_bars: int = 0
+    flush_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, name: str, amount: int = 1) -> None:
+        """Increase one counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the counters and flush latency as a plain dictionary."""
+        with self._lock:
+            counters: Dict[str, Any] = {
+                'enqueued_bars': self.enqueued_bars,
+                'flushed_bars': self.flushed_bars,
+                'coalesced_bars': self.coalesced_bars,
+                'flushes': self.flushes,
+                'failed_flushes': self.failed_flushes,
+                'backpressure_waits': self.backpressure_waits,
+                'spilled_bars': self.spilled_bars
+            }
+        counters['flush_latency'] = self.flush_latency.to_dict()
+        return counters
+
+
+class WriteBehindQueue:
+    """Bounded write-behind buffer in front of a repository.
+
+    put() returns as soon as bars are buffered. Bars are grouped per source
+    and symbol, so many small fetches become one deduplicated write each,
+    and flushed once batch_size bars are pending or every flush_interval
+    seconds. When max_pending bars are buffered, put() waits for a flush
+    (backpressure) and raises IngestionQueueFull after put_timeout.
+
+    A failed flush keeps its bars buffered for the next attempt. close()
+    drains the buffer; whatever cannot be written is spilled to a file of
+    this instance next to spill_path, so processes sharing the path never
+    overwrite each other. start() claims every spill file there with an
+    atomic rename, so two starting processes never replay the same bars,
+    and deletes the claimed files once their bars are written or spilled
+    again.
+    """
+
+    def __init__(
+        self,
+        repository: Any,
+        max_pending: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        put_timeout: Optional[float] = None,
+        spill_path: Optional[Union[str, Path]] = None
+    ) -> None:
+        self.repository = repository
+        self.max_pending = max_pending or settings.INGESTION_MAX_PENDING_BARS
+        self.batch_size = batch_size or settings.INGESTION_BATCH_BARS
+        self.flush_interval = flush_interval or settings.INGESTION_FLUSH_INTERVAL
+        self.put_timeout = put_timeout or settings.INGESTION_PUT_TIMEOUT
+        spill_path = spill_path if spill_path is not None else settings.INGESTION_SPILL_PATH
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._instance = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Spill files this instance claimed at start(); removed by close()
+        self._claimed: List[Path] = []
+        self.stats = IngestionStats()
+        self._pending: Dict[SeriesKey, List[OHLCVSeries]] = {}
+        # Buffered plus in-flight bars; space is only released once written
+        self._pending_bars = 0
+        self._space = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._task: Optional['asyncio.Task[None]'] = None
+        self._closed = False
+
+    @property
+    def spill_file(self) -> Optional[Path]:
+        """Get the file this instance spills unwritten bars to."""
+        if self.spill_path is None:
+            return None
+        return self.spill_path.with_name(f"{self.spill_path.stem}.{self._instance}{self.spill_path.suffix}")
+
+    @property
+    def pending_bars(self) -> int:
+        """Get the number of bars not yet written."""
+        return self._pending_bars
+
+    async def start(self) -> None:
+        """Load bars spilled by a previous shutdown and start the flush loop."""
+        if self._task is not None:
+            return
+        self._closed = False
+        for series in await asyncio.to_thread(self._load_spill):
+            self._buffer(series)
+        self._task = asyncio.create_task(self._run())
+
+    async def __aenter__(self) -> 'WriteBehindQueue':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _buffer(self, series: OHLCVSeries) -> None:
+        self._pending.setdefault((series.source, series.symbol), []).append(series)
+        self._pending_bars += len(series)
+        if self._pending_bars >= self.batch_size:
+            self._flush_requested.set()
+
+    async def put(self, series: Union[OHLCVSeries, Sequence[OHLCVSeries]]) -> None:
+        """Buffer series for writing, waiting while the queue is full."""
+        if self._closed:
+            raise RuntimeError("Ingestion queue is closed")
+        items = [series] if isinstance(series, OHLCVSeries) else [item for item in series if len(item)]
+        bars = sum(len(item) for item in items)
+        if not bars:
+            return
+
+        def has_space() -> bool:
+            # An oversized put is still accepted once the queue is empty
+            return self._pending_bars + bars <= self.max_pending or not self._pending_bars
+
+        async with self._space:
+            if not has_space():
+                self.stats.record('backpressure_waits')
+                self._flush_requested.set()
+                try:
+                    await asyncio.wait_for(self._space.wait_for(has_space), self.put_timeout)
+                except asyncio.TimeoutError:
+                    raise IngestionQueueFull(
+                        f"Ingestion queue full: {self._pending_bars} bars pending"
+                    ) from None
+            for item in items:
+                self._buffer(item)
+        self.stats.record('enqueued_bars', bars)
+
+    async def flush(self) -> int:
+        """Write every buffered bar now; returns the number of bars written."""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            written = 0
+            released = 0
+            try:
+                for key in list(batch):
+                    parts = batch[key]
+                    merged = OHLCVSeries.concat(parts).latest_per_timestamp()
+                    await save_series(self.repository, merged)
+                    del batch[key]
+                    raw = sum(len(part) for part in parts)
+                    written += len(merged)
+                    released += raw
+                    self.stats.record('coalesced_bars', raw - len(merged))
+            except BaseException as e:
+                # Put unwritten bars back ahead of anything queued meanwhile
+                self._requeue(batch)
+                if not isinstance(e, Exception):
+                    raise
+                self.stats.record('failed_flushes')
+                self.stats.flush_latency.record_failure()
+                logger.warning(f"Write-behind flush failed, keeping {self._count(batch)} bars queued: {str(e)}")
+            else:
+                self.stats.record('flushes')
+                self.stats.flush_latency.observe(time.perf_counter() - started)
+            self.stats.record('flushed_bars', written)
+            async with self._space:
+                self._pending_bars -= released
+                self._space.notify_all()
+            return written
+
+    def _requeue(self, batch: Dict[SeriesKey, List[OHLCVSeries]]) -> None:
+        for key, parts in self._pending.items():
+            batch.setdefault(key, []).extend(parts)
+        self._pending = batch
+
+    @staticmethod
+    def _count(batch: Dict[SeriesKey, List[OHLCVSeries]]) -> int:
+        return sum(len(part) for parts in batch.values() for part in parts)
+
+    async def _run(self) -> None:
+        """Flush on the batch size trigger or every flush_interval."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            failures = self.stats.failed_flushes
+            await self.flush()
+            failed = self.stats.failed_flushes > failures
+            if self._closed and (failed or not self._pending_bars):
+                # Drained, or the store is failing and the rest will be spilled
+                return
+            if failed:
+                # Back off instead of retrying on every batch-size trigger
+                await asyncio.sleep(self.flush_interval)
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting bars, drain the buffer and spill whatever is left."""
+        if self._task is None:
+            return
+        self._closed = True
+        self._flush_requested.set()
+        timeout = timeout if timeout is not None else settings.INGESTION_DRAIN_TIMEOUT
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Write-behind drain timed out after {timeout}s")
+        finally:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            # A flush cancelled mid-write has requeued its unwritten bars
+            await asyncio.to_thread(self._write_spill, [
+                part for parts in self._pending.values() for part in parts
+            ])
+
+    def _spill_files(self) -> List[Path]:
+        """List unclaimed spill files, and files claimed by processes that have exited."""
+        assert self.spill_path is not None
+        directory, stem, suffix = self.spill_path.parent, self.spill_path.stem, self.spill_path.suffix
+        # The bare spill_path is still read for files spilled by older versions
+        files = [path for path in [self.spill_path, *directory.glob(f"{stem}.*{suffix}")] if path.is_file()]
+        for path in directory.glob(f"{stem}.*.claimed"):
+            pid = path.name[len(stem) + 1:].split('-', 1)[0]
+            if pid.isdigit() and not _process_alive(int(pid)):
+                files.append(path)
+        return files
+
+    def _load_spill(self) -> List[OHLCVSeries]:
+        """Claim and read bars spilled by earlier close() calls of any process."""
+        if self.spill_path is None or not self.spill_path.parent.is_dir():
+            return []
+        series = []
+        for path in self._spill_files():
+            claimed = path.with_name(f"{self.spill_path.stem}.{self._instance}.{len(self._claimed)}.claimed")
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                # Another process claimed it first
+                continue
+            self._claimed.append(claimed)
+            with claimed.open() as handle:
+                for line in handle:
+                    if line.strip():
+                        series.append(OHLCVSeries.from_dict(json.loads(line)))
+        if series:
+            logger.info(f"Loaded {sum(len(item) for item in series)} spilled bars from {len(self._claimed)} file(s)")
+        return series
+
+    def _write_spill(self, series: List[OHLCVSeries]) -> None:
+        """Replace this instance's spill file with the bars that could not be written.
+
+        Claimed files are removed afterwards; their bars were either written
+        or are part of the new spill.
+        """
+        spill_file = self.spill_file
+        if spill_file is None:
+            if series:
+                logger.error(f"Dropped {sum(len(item) for item in series)} unwritten bars; no spill path")
+            return
+        if series:
+            spill_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = spill_file.with_suffix('.tmp')
+            with tmp_path.open('w') as handle:
+                for item in series:
+                    handle.write(json.dumps(item.to_dict()) + '\n')
+            os.replace(tmp_path, spill_file)
+            bars = sum(len(item) for item in series)
+            self.stats.record('spilled_bars', bars)
+            logger.warning(f"Spilled {bars} unwritten bars to {spill_file}")
+        else:
+            spill_file.unlink(missing_ok=True)
+        for path in self._claimed:
+            path.unlink(missing_ok=True)
+        self._claimed = []
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process with this pid runs on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,78 @@
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+# Upper bounds in seconds of each histogram bucket; a final overflow bucket
+# catches anything slower
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75,
+    1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0
+)
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket latency histogram for one data source.
+
+    Successful calls are recorded with observe(); failures and timeouts are
+    only counted so they do not skew the percentiles used for hedging.
+    """
+    bounds: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    failures: int = 0
+    timeouts: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, seconds: float) -> None:
+        """Record the latency of one successful call."""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def record_failure(self, timed_out: bool = False) -> None:
+        """Count a failed or timed out call."""
+        with self._lock:
+            self.failures += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100) by interpolating within buckets."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = self.count * q / 100.0
+            cumulative = 0
+            for i, bucket_count in enumerate(self.counts):
+                if bucket_count and cumulative + bucket_count >= target:
+                    lower = self.bounds[i - 1] if i > 0 else 0.0
+                    upper = self.bounds[i] if i < len(self.bounds) else self.max_seconds
+                    fraction = (target - cumulative) / bucket_count
+                    return min(lower + (upper - lower) * fraction, self.max_seconds)
+                cumulative += bucket_count
+            return self.max_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export bucket counts and summary percentiles."""
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ['le_inf']
+        return {
+            'count': self.count,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'mean_seconds': self.total_seconds / self.count if self.count else 0.0,
+            'max_seconds': self.max_seconds,
+            'p50_seconds': self.percentile(50),
+            'p95_seconds': self.percentile(95),
+            'p99_seconds': self.percentile(99),
+            'buckets': dict(zip(labels, self.counts))
+        }
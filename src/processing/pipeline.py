@@ -1,31 +1,270 @@
+import asyncio
 import logging
-from typing import List, Optional
-from datetime import datetime
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+from datetime import datetime, timedelta
 
 import pandas as pd
-from pydantic import ValidationError
 
-from ..data_sources.base import DataSourceBase, MarketData
+from ..config import settings
+from ..data_sources.base import DataSourceBase
+from ..data_sources.series import OHLCVSeries
 from ..data_sources.exceptions import DataSourceError
-from .validation import StockPrice, DataSourceResponse
+from .ingestion import IngestionQueueFull, WriteBehindQueue, save_series
+from .latency import LatencyHistogram
+from .resampling import Timeframe, check_resample_interval, resample_batch
+from .single_flight import SingleFlight, get_single_flight
+from .validation import DataSourceResponse, LazyStockPrices, validate_market_frame
 from .transforms import clean_market_data
 
+if TYPE_CHECKING:
+    from ..storage.async_repository import AsyncDataRepository
+    from ..storage.parquet_store import ParquetRepository
+
 logger = logging.getLogger(__name__)
 
+
+def _flight_bound(value: Optional[datetime], interval: Optional[int]) -> str:
+    """Format a range bound at the precision the source call uses.
+
+    Callers derive ranges from datetime.now(), so bounds are cut to the
+    date for daily requests and to the interval boundary for intraday ones;
+    otherwise identical fetches would never share a single-flight key.
+    """
+    if value is None:
+        return ''
+    if not interval:
+        return value.date().isoformat()
+    midnight = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    step = timedelta(minutes=interval)
+    return (midnight + (value - midnight) // step * step).isoformat()
+
+@dataclass
+class FetchRequest:
+    """Parameters passed to every data source for one fetch."""
+    symbol: str
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    interval: Optional[int] = None
+
 class DataPipeline:
-    """Data processing pipeline for market data."""
+    """Data processing pipeline for market data.
+
+    Sources are queried concurrently, each bounded by a timeout. By default
+    every source's answer is merged; with hedging enabled the first source
+    is asked alone and the next one is only fired once the hedge delay
+    passes without a good answer, and the loser is cancelled. Per-source
+    latency histograms drive the default hedge delay.
+
+    Identical concurrent source calls (same source, symbol, interval and
+    range) are coalesced through a process-wide single-flight group, so a
+    burst of requests for one chart costs one upstream call.
+
+    When a repository is given, validated data is persisted through it
+    without blocking the event loop: an AsyncDataRepository is awaited and a
+    ParquetRepository (see STORAGE_BACKEND) runs on a worker thread. With
+    an ingestion queue, data is handed to it for write-behind instead.
+    """
     
-    def __init__(self, data_sources: List[DataSourceBase]):
+    def __init__(
+        self,
+        data_sources: List[DataSourceBase],
+        repository: Optional[Union['AsyncDataRepository', 'ParquetRepository']] = None,
+        hedging: Optional[bool] = None,
+        hedge_delay: Optional[float] = None,
+        source_timeout: Optional[float] = None,
+        single_flight: Optional[SingleFlight] = None,
+        ingestion: Optional[WriteBehindQueue] = None
+    ):
         self.data_sources = data_sources
+        self.repository = repository
+        self.hedging = settings.PIPELINE_HEDGING if hedging is None else hedging
+        self.hedge_delay = hedge_delay if hedge_delay is not None else settings.HEDGE_DELAY_SECONDS
+        self.source_timeout = source_timeout or settings.DATA_SOURCE_TIMEOUT
+        self.source_names = self._unique_source_names(data_sources)
+        self.latency: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram() for name in self.source_names
+        }
+        if single_flight is None and settings.SINGLE_FLIGHT_ENABLED:
+            single_flight = get_single_flight()
+        self.single_flight = single_flight
+        self.ingestion = ingestion
+
+    def _unique_source_names(self, data_sources: List[DataSourceBase]) -> List[str]:
+        """Name each source by class, suffixing duplicates with their position."""
+        names = [type(source).__name__ for source in data_sources]
+        return [
+            f"{name}#{i}" if names.count(name) > 1 else name
+            for i, name in enumerate(names)
+        ]
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-source latency histograms for tuning the hedge delay."""
+        return {name: histogram.to_dict() for name, histogram in self.latency.items()}
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """Get single-flight counters, including upstream calls saved."""
+        return self.single_flight.stats.to_dict() if self.single_flight else {}
+
+    def _current_hedge_delay(self, index: int) -> float:
+        """Get how long to wait on source index before firing the next one."""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        histogram = self.latency[self.source_names[index]]
+        if histogram.count >= settings.HEDGE_MIN_SAMPLES:
+            return histogram.percentile(95)
+        return settings.HEDGE_DELAY_DEFAULT
+
+    async def _request_source(self, source: DataSourceBase, request: FetchRequest) -> Any:
+        """Call the price endpoint of one source matching the request."""
+        if request.interval:
+            return await source.get_intraday_prices(
+                symbol=request.symbol,
+                interval=request.interval
+            )
+        return await source.get_daily_prices(
+            symbol=request.symbol,
+            start_date=request.start_date.date() if request.start_date else None,
+            end_date=request.end_date.date() if request.end_date else None
+        )
+
+    async def _load_source(self, index: int, request: FetchRequest) -> List[OHLCVSeries]:
+        """Call one source and convert its answer to series."""
+        data = await self._request_source(self.data_sources[index], request)
+        # Sources that still return MarketData lists are converted here
+        return OHLCVSeries.group_market_data(data)
+
+    def _flight_key(self, index: int, request: FetchRequest) -> str:
+        """Build the single-flight key of one source call."""
+        return '|'.join([
+            self.source_names[index],
+            request.symbol,
+            str(request.interval or 'daily'),
+            _flight_bound(request.start_date, request.interval),
+            _flight_bound(request.end_date, request.interval)
+        ])
+
+    async def _call_source(self, index: int, request: FetchRequest) -> List[OHLCVSeries]:
+        """Call one source with a timeout, recording its latency."""
+        name = self.source_names[index]
+        histogram = self.latency[name]
+        if self.single_flight is not None:
+            call = self.single_flight.do(
+                self._flight_key(index, request),
+                lambda: self._load_source(index, request)
+            )
+        else:
+            call = self._load_source(index, request)
+        started = time.perf_counter()
+        try:
+            series = await asyncio.wait_for(call, timeout=self.source_timeout)
+        except asyncio.TimeoutError:
+            histogram.record_failure(timed_out=True)
+            raise asyncio.TimeoutError(f"{name} timed out after {self.source_timeout:g}s")
+        except Exception:
+            histogram.record_failure()
+            raise
+        histogram.observe(time.perf_counter() - started)
+        return series
+
+    def _source_error(self, error: BaseException) -> str:
+        """Log a source failure and get its message."""
+        if isinstance(error, DataSourceError):
+            logger.warning(f"Data source error: {str(error)}")
+        else:
+            logger.error(f"Unexpected error: {str(error)}")
+        return str(error)
+
+    async def _fetch_all(self, request: FetchRequest) -> Tuple[List[OHLCVSeries], List[str]]:
+        """Query every source concurrently and merge all answers."""
+        results = await asyncio.gather(
+            *(self._call_source(i, request) for i in range(len(self.data_sources))),
+            return_exceptions=True
+        )
+        all_series: List[OHLCVSeries] = []
+        errors: List[str] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(self._source_error(result))
+            else:
+                all_series.extend(result)
+        return all_series, errors
+
+    async def _fetch_hedged(self, request: FetchRequest) -> Tuple[List[OHLCVSeries], List[str]]:
+        """Return the first non-empty answer, firing sources in order as hedges."""
+        pending: Dict['asyncio.Task[List[OHLCVSeries]]', int] = {}
+        errors: List[str] = []
+        next_index = 0
+
+        def _launch() -> None:
+            nonlocal next_index
+            pending[asyncio.create_task(self._call_source(next_index, request))] = next_index
+            next_index += 1
+
+        _launch()
+        try:
+            while pending:
+                has_hedge = next_index < len(self.data_sources)
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self._current_hedge_delay(next_index - 1) if has_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    _launch()
+                    continue
+                for task in done:
+                    pending.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        errors.append(self._source_error(error))
+                    elif any(len(item) for item in task.result()):
+                        return task.result(), errors
+                if not pending and next_index < len(self.data_sources):
+                    _launch()
+            return [], errors
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _persist(self, series: List[OHLCVSeries]) -> None:
+        """Queue validated series for write-behind, or persist them through the repository."""
+        if self.ingestion is not None:
+            try:
+                await self.ingestion.put(series)
+                return
+            except (IngestionQueueFull, RuntimeError) as e:
+                logger.warning(f"Write-behind queue unavailable, writing inline: {str(e)}")
+        if self.repository is None:
+            return
+        try:
+            for item in series:
+                await save_series(self.repository, item)
+        except Exception as e:
+            logger.warning(f"Failed to persist market data: {str(e)}")
+
+    def _to_frame(self, series: List[OHLCVSeries]) -> pd.DataFrame:
+        """Stack series into one long DataFrame with symbol and source columns."""
+        frames = [item.to_dataframe(include_metadata=True) for item in series if len(item)]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
         
     async def fetch_data(
         self,
         symbol: str,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        interval: Optional[int] = None
+        interval: Optional[int] = None,
+        timeframe: Optional[str] = None
     ) -> DataSourceResponse:
-        """Fetch and process market data from all configured sources."""
+        """Fetch and process market data from all configured sources.
+
+        With a timeframe ('1h', '1w', ...), bars fetched at interval are
+        persisted as-is and returned resampled to it.
+        """
         
         if not self.data_sources:
             return DataSourceResponse(
@@ -47,75 +286,61 @@ class DataPipeline:
                 error="Symbol cannot be empty"
             )
         
-        all_data: List[MarketData] = []
-        errors = []
-        
-        for source in self.data_sources:
-            try:
-                if interval:
-                    data = await source.get_intraday_prices(
-                        symbol=symbol,
-                        interval=interval
-                    )
-                else:
-                    data = await source.get_daily_prices(
-                        symbol=symbol,
-                        start_date=start_date.date() if start_date else None,
-                        end_date=end_date.date() if end_date else None
-                    )
-                all_data.extend(data)
-                
-            except DataSourceError as e:
-                logger.warning(f"Data source error: {str(e)}")
-                errors.append(str(e))
-                continue
-                
-            except Exception as e:
-                logger.error(f"Unexpected error: {str(e)}")
-                errors.append(str(e))
-                continue
-                
-        if not all_data and errors:
+        try:
+            target = check_resample_interval(timeframe, interval) if timeframe else None
+        except ValueError as e:
+            return DataSourceResponse(success=False, error=str(e))
+
+        request = FetchRequest(symbol=symbol, start_date=start_date, end_date=end_date, interval=interval)
+        if self.hedging:
+            all_series, errors = await self._fetch_hedged(request)
+        else:
+            all_series, errors = await self._fetch_all(request)
+        return await self._process(all_series, errors, target)
+
+    async def _process(
+        self,
+        all_series: List[OHLCVSeries],
+        errors: List[str],
+        timeframe: Optional[Timeframe] = None
+    ) -> DataSourceResponse:
+        """Clean, validate and persist one symbol's series from every source, then resample them."""
+        if not any(len(item) for item in all_series) and errors:
             return DataSourceResponse(
                 success=False,
                 error=f"All data sources failed: {'; '.join(errors)}"
             )
             
         try:
-            # Convert to pandas DataFrame for processing
-            df = pd.DataFrame([d.model_dump() for d in all_data])
+            # Stack the columnar series into a DataFrame for processing
+            df = self._to_frame(all_series)
             
             # Clean and validate data
             df = clean_market_data(df)
             
-            # Convert back to StockPrice models
-            validated_data = []
-            for _, row in df.iterrows():
-                try:
-                    price = StockPrice(
-                        symbol=row['symbol'],
-                        timestamp=row['timestamp'],
-                        open=row['open'],
-                        high=row['high'],
-                        low=row['low'],
-                        close=row['close'],
-                        volume=row['volume'],
-                        source=row['source']
-                    )
-                    validated_data.append(price)
-                except ValidationError as e:
-                    logger.warning(f"Validation error for row: {str(e)}")
-                    continue
-                    
-            if not validated_data:
+            # Apply the StockPrice rules to the whole frame at once
+            df, report = validate_market_frame(df)
+            if report.rejected:
+                logger.warning(f"Rejected {report.rejected} of {report.total} rows: {report.rejections}")
+
+            if df.empty:
                 return DataSourceResponse(
                     success=False,
-                    error="No valid data after processing"
+                    error="No valid data after processing",
+                    report=report
                 )
                 
+            series = OHLCVSeries.from_frame_by_source(df)
+            await self._persist(series)
+            if timeframe is not None:
+                # Aggregates of valid bars are valid, so they skip re-validation
+                series = resample_batch(series, timeframe)
+                df = self._to_frame(series)
             return DataSourceResponse(
                 success=True,
-                data=validated_data
+                data=LazyStockPrices(df),
+                series=series,
+                report=report
             )
             
         except Exception as e:
@@ -123,4 +348,64 @@ class DataPipeline:
             return DataSourceResponse(
                 success=False,
                 error=f"Processing error: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def _fetch_source_batch(
+        self,
+        index: int,
+        symbols: List[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Dict[str, OHLCVSeries]:
+        """Call one source's batch endpoint with a timeout."""
+        name = self.source_names[index]
+        try:
+            return await asyncio.wait_for(
+                self.data_sources[index].get_daily_prices_batch(
+                    symbols,
+                    start_date=start_date.date() if start_date else None,
+                    end_date=end_date.date() if end_date else None
+                ),
+                timeout=self.source_timeout
+            )
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"{name} timed out after {self.source_timeout:g}s")
+
+    async def fetch_batch(
+        self,
+        symbols: List[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        timeframe: Optional[str] = None
+    ) -> Dict[str, DataSourceResponse]:
+        """Fetch and process daily data for many symbols with one batch call per source.
+
+        Returns one response per requested symbol, processed exactly like
+        fetch_data; hedging does not apply to batches. A timeframe ('1w',
+        '1mo') resamples the returned bars.
+        """
+        symbols = list(dict.fromkeys(symbol.strip() for symbol in symbols if symbol and symbol.strip()))
+        if not self.data_sources:
+            return {symbol: DataSourceResponse(success=False, error="No data sources configured") for symbol in symbols}
+        if start_date and end_date and start_date > end_date:
+            return {symbol: DataSourceResponse(success=False, error="Start date must be before end date") for symbol in symbols}
+        try:
+            target = check_resample_interval(timeframe, None) if timeframe else None
+        except ValueError as e:
+            return {symbol: DataSourceResponse(success=False, error=str(e)) for symbol in symbols}
+
+        results = await asyncio.gather(
+            *(self._fetch_source_batch(i, symbols, start_date, end_date) for i in range(len(self.data_sources))),
+            return_exceptions=True
+        )
+        errors: List[str] = []
+        by_symbol: Dict[str, List[OHLCVSeries]] = {symbol: [] for symbol in symbols}
+        for result in results:
+            if isinstance(result, BaseException):
+                errors.append(self._source_error(result))
+                continue
+            for symbol, series in result.items():
+                if symbol in by_symbol:
+                    by_symbol[symbol].append(series)
+
+        return {symbol: await self._process(all_series, errors, target) for symbol, all_series in by_symbol.items()}
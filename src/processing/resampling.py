@@ -0,0 +1,207 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from ..data_sources.series import OHLCV_COLUMNS, OHLCVSeries
+from ..storage.rollups import TIMEFRAMES as CALENDAR_TIMEFRAMES
+from ..storage.rollups import bucket_starts as calendar_bucket_starts
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+MINUTES_PER_DAY = 24 * 60
+_INTRADAY_PATTERN = re.compile(r'^(\d+)\s*(m|min|h)$')
+
+
+@dataclass(frozen=True)
+class Timeframe:
+    """A bar interval: a fixed number of minutes, or a calendar unit ('1d', '1w', '1mo')."""
+    name: str
+    minutes: Optional[int] = None
+
+    @property
+    def is_intraday(self) -> bool:
+        return self.minutes is not None
+
+
+def parse_timeframe(value: Union[str, int, Timeframe]) -> Timeframe:
+    """Parse '5m', '15min', '1h', '1d', '1w', '1mo' or a number of minutes."""
+    if isinstance(value, Timeframe):
+        return value
+    if isinstance(value, int):
+        minutes = value
+    else:
+        name = value.strip().lower()
+        if name in CALENDAR_TIMEFRAMES:
+            return Timeframe(name)
+        match = _INTRADAY_PATTERN.match(name)
+        if match is None:
+            raise ValueError(f"Unsupported timeframe '{value}'")
+        minutes = int(match.group(1)) * (60 if match.group(2) == 'h' else 1)
+    if not 0 < minutes < MINUTES_PER_DAY:
+        raise ValueError(f"Intraday timeframes must be between 1 minute and 1 day, got {minutes} minutes")
+    return Timeframe(f"{minutes}m", minutes)
+
+
+def _parse_clock(value: str) -> time:
+    return datetime.strptime(value, '%H:%M').time()
+
+
+def _minutes_since_midnight(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+@dataclass(frozen=True)
+class TradingSession:
+    """Exchange-local regular trading hours that intraday buckets align to."""
+    open: time = time(9, 30)
+    close: time = time(16, 0)
+
+    @classmethod
+    def from_settings(cls) -> 'TradingSession':
+        """Build the session from MARKET_SESSION_OPEN and MARKET_SESSION_CLOSE."""
+        return cls(_parse_clock(settings.MARKET_SESSION_OPEN), _parse_clock(settings.MARKET_SESSION_CLOSE))
+
+    def contains(self, timestamps: np.ndarray) -> np.ndarray:
+        """Get a mask of int64 ns timestamps falling in [open, close)."""
+        minute_of_day = (np.asarray(timestamps, dtype=np.int64) // NS_PER_MINUTE) % MINUTES_PER_DAY
+        return (
+            (minute_of_day >= _minutes_since_midnight(self.open))
+            & (minute_of_day < _minutes_since_midnight(self.close))
+        )
+
+
+def bucket_starts(
+    timestamps: np.ndarray,
+    timeframe: Union[str, int, Timeframe],
+    session: Optional[TradingSession] = None
+) -> np.ndarray:
+    """Get the start of the bucket holding each int64 ns timestamp.
+
+    Intraday buckets are counted from the session open, so hourly bars of
+    a 09:30 session start at 09:30, 10:30, ... and the last one is cut
+    short by the close. Calendar buckets start at midnight, on Monday and
+    on the 1st.
+    """
+    timeframe = parse_timeframe(timeframe)
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not timeframe.is_intraday:
+        return calendar_bucket_starts(timestamps, timeframe.name)
+    session = session or TradingSession.from_settings()
+    width = int(timeframe.minutes or 0) * NS_PER_MINUTE
+    anchor = (
+        timestamps // (MINUTES_PER_DAY * NS_PER_MINUTE) * (MINUTES_PER_DAY * NS_PER_MINUTE)
+        + _minutes_since_midnight(session.open) * NS_PER_MINUTE
+    )
+    return anchor + np.floor_divide(timestamps - anchor, width) * width
+
+
+def _regular_hours(series: OHLCVSeries, timeframe: Timeframe, session: TradingSession) -> OHLCVSeries:
+    """Drop bars outside the session; daily and coarser bars are kept as they carry no time of day."""
+    if not timeframe.is_intraday or not len(series):
+        return series
+    mask = session.contains(series.timestamps)
+    return series if mask.all() else series.take(mask)
+
+
+def resample_series(
+    series: OHLCVSeries,
+    timeframe: Union[str, int, Timeframe],
+    session: Optional[TradingSession] = None,
+    regular_hours: bool = False
+) -> OHLCVSeries:
+    """Convert bars to a coarser timeframe with first/max/min/last/sum semantics.
+
+    Bars are stamped with their bucket start. With regular_hours, intraday
+    bars outside the session are dropped before aggregating.
+    """
+    return resample_batch([series], timeframe, session, regular_hours)[0]
+
+
+def resample_batch(
+    series: Sequence[OHLCVSeries],
+    timeframe: Union[str, int, Timeframe],
+    session: Optional[TradingSession] = None,
+    regular_hours: bool = False
+) -> List[OHLCVSeries]:
+    """Resample many series in one vectorized pass.
+
+    The series are stacked into shared columns, bucketed and reduced
+    together, then split back; the result is in input order.
+    """
+    timeframe = parse_timeframe(timeframe)
+    session = session or TradingSession.from_settings()
+    items = [series_item.sort() for series_item in series]
+    if regular_hours:
+        items = [_regular_hours(item, timeframe, session) for item in items]
+    if not items:
+        return []
+
+    lengths = np.array([len(item) for item in items])
+    stacked = OHLCVSeries(
+        symbol='',
+        source='',
+        **{
+            name: np.concatenate([getattr(item, name) for item in items])
+            for name in ('timestamps',) + OHLCV_COLUMNS[1:]
+        }
+    )
+    groups = np.repeat(np.arange(len(items)), lengths)
+    starts = bucket_starts(stacked.timestamps, timeframe, session)
+    new_run = np.ones(len(stacked), dtype=bool)
+    new_run[1:] = (starts[1:] != starts[:-1]) | (groups[1:] != groups[:-1])
+    first = np.flatnonzero(new_run)
+    merged = stacked.aggregate(first, starts[first])
+
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(groups[first], minlength=len(items)))))
+    resampled = []
+    for i, item in enumerate(items):
+        part = merged.take(slice(bounds[i], bounds[i + 1]))
+        part.symbol, part.source = item.symbol, item.source
+        resampled.append(part)
+    return resampled
+
+
+def resample_frame(
+    df: pd.DataFrame,
+    timeframe: Union[str, int, Timeframe],
+    session: Optional[TradingSession] = None,
+    regular_hours: bool = False
+) -> pd.DataFrame:
+    """Resample an OHLCV DataFrame.
+
+    A long frame with symbol and source columns is resampled per
+    (symbol, source) in one batch and keeps those columns; otherwise the
+    frame is one series with timestamps in a 'timestamp' column or the
+    index.
+    """
+    if df.empty:
+        return df
+    if {'symbol', 'source'}.issubset(df.columns):
+        batch = OHLCVSeries.from_frame_by_source(df)
+        frames = [
+            item.to_dataframe(include_metadata=True)
+            for item in resample_batch(batch, timeframe, session, regular_hours)
+        ]
+        return pd.concat(frames, ignore_index=True)
+    series = OHLCVSeries.from_dataframe(df, symbol='', source='')
+    return resample_series(series, timeframe, session, regular_hours).to_dataframe()
+
+
+def check_resample_interval(timeframe: Union[str, int, Timeframe], interval: Optional[int]) -> Timeframe:
+    """Check bars of a fetch interval (minutes, None for daily) can be resampled to a timeframe.
+
+    Raises ValueError when the timeframe is finer than the bars or does not
+    hold a whole number of them.
+    """
+    timeframe = parse_timeframe(timeframe)
+    if not timeframe.is_intraday:
+        return timeframe
+    if interval is None:
+        raise ValueError(f"Cannot resample daily bars to {timeframe.name}")
+    if (timeframe.minutes or 0) % interval:
+        raise ValueError(f"Cannot resample {interval}-minute bars to {timeframe.name}")
+    return timeframe
@@ -0,0 +1,316 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.stats import norm
+
+from ..config import settings
+from ..data_sources.series import OHLCVSeries
+from ..storage.analytics import TRADING_DAYS_PER_YEAR
+
+logger = logging.getLogger(__name__)
+
+# Holdings of one portfolio: symbol -> shares
+Holdings = Mapping[str, float]
+
+
+@dataclass
+class ReturnMatrix:
+    """Closes of many symbols aligned on shared timestamps, one column per symbol."""
+    symbols: List[str]
+    timestamps: np.ndarray
+    closes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def returns(self) -> np.ndarray:
+        """Get (bars - 1, symbols) simple returns."""
+        return self.closes[1:] / self.closes[:-1] - 1.0
+
+    def column(self, symbol: str) -> int:
+        return self.symbols.index(symbol)
+
+    def shares(self, portfolios: Sequence[Holdings]) -> np.ndarray:
+        """Get a (portfolios, symbols) share matrix; raises ValueError for symbols without bars."""
+        index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        missing = sorted({symbol for holdings in portfolios for symbol in holdings} - set(index))
+        if missing:
+            raise ValueError(f"No aligned bars for {', '.join(missing)}")
+        matrix = np.zeros((len(portfolios), len(self.symbols)))
+        for row, holdings in enumerate(portfolios):
+            for symbol, count in holdings.items():
+                matrix[row, index[symbol]] = count
+        return matrix
+
+
+def align_closes(series: Sequence[OHLCVSeries]) -> ReturnMatrix:
+    """Align closes of several series on the union of their timestamps.
+
+    A symbol without a bar at a timestamp carries its previous close
+    forward; timestamps before every symbol has traded are dropped.
+    """
+    series = [item.latest_per_timestamp() for item in series if len(item)]
+    if not series:
+        return ReturnMatrix([], np.empty(0, dtype=np.int64), np.empty((0, 0)))
+    timestamps = np.unique(np.concatenate([item.timestamps for item in series]))
+    closes = np.full((len(timestamps), len(series)), np.nan)
+    for column, item in enumerate(series):
+        closes[np.searchsorted(timestamps, item.timestamps), column] = item.close
+    # Forward fill: index of the last row with a close, per column
+    rows = np.where(np.isnan(closes), 0, np.arange(len(timestamps))[:, None])
+    closes = closes[np.maximum.accumulate(rows, axis=0), np.arange(len(series))]
+    complete = ~np.isnan(closes).any(axis=1)
+    first = int(np.argmax(complete)) if complete.any() else len(timestamps)
+    return ReturnMatrix([item.symbol for item in series], timestamps[first:], closes[first:])
+
+
+async def load_return_matrix(
+    repository: Any,
+    symbols: Sequence[str],
+    start_date: datetime,
+    end_date: datetime
+) -> ReturnMatrix:
+    """Load stored daily bars for symbols concurrently and align their closes.
+
+    Symbols without stored bars are left out of the matrix.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    loaded = await asyncio.gather(*(
+        repository.get_primary_series(symbol, start_date, end_date) for symbol in symbols
+    ))
+    series = []
+    for symbol, item in zip(symbols, loaded):
+        if item is None:
+            logger.warning(f"No stored bars for {symbol}; leaving it out of the risk matrix")
+            continue
+        series.append(item)
+    return align_closes(series)
+
+
+def covariance(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the sample covariance and correlation matrices of (bars, symbols) returns."""
+    cov = np.atleast_2d(np.cov(returns, rowvar=False, ddof=1))
+    deviation = np.sqrt(np.diag(cov))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(deviation, deviation)
+    return cov, corr
+
+
+def parametric_var(
+    weights: np.ndarray,
+    mean: np.ndarray,
+    cov: np.ndarray,
+    confidence: float,
+    horizon: int = 1
+) -> np.ndarray:
+    """Variance-covariance VaR of each (portfolios, symbols) weight row, as a loss fraction."""
+    portfolio_mean = weights @ mean * horizon
+    deviation = np.sqrt(np.einsum('pi,ij,pj->p', weights, cov, weights) * horizon)
+    return -(portfolio_mean + norm.ppf(1.0 - confidence) * deviation)
+
+
+def historical_var(values: np.ndarray, confidence: float, horizon: int = 1) -> np.ndarray:
+    """Historical VaR from (bars, portfolios) values over overlapping horizon-bar windows."""
+    if len(values) <= horizon:
+        return np.full(values.shape[1], np.nan)
+    returns = values[horizon:] / values[:-horizon] - 1.0
+    return -np.quantile(returns, 1.0 - confidence, axis=0)
+
+
+def beta(returns: np.ndarray, benchmark: np.ndarray) -> np.ndarray:
+    """Beta of each (bars, portfolios) return column against benchmark returns; NaN if it is flat."""
+    variance = benchmark.var(ddof=1) if len(benchmark) > 1 else 0.0
+    if not variance > 0:
+        return np.full(returns.shape[1], np.nan)
+    centered = benchmark - benchmark.mean()
+    return centered @ (returns - returns.mean(axis=0)) / (len(benchmark) - 1) / variance
+
+
+def _factor(cov: np.ndarray) -> np.ndarray:
+    """Get L with L @ L.T == cov, tolerating positive semi-definite matrices."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
+
+
+@dataclass
+class MonteCarloResult:
+    """Simulated VaR and expected shortfall per portfolio, as loss fractions."""
+    var: np.ndarray
+    cvar: np.ndarray
+    paths: int
+    seconds: float
+
+    @property
+    def paths_per_second(self) -> float:
+        return self.paths / self.seconds if self.seconds else float('nan')
+
+
+def monte_carlo_var(
+    weights: np.ndarray,
+    log_returns: np.ndarray,
+    confidence: float,
+    paths: Optional[int] = None,
+    horizon: int = 1,
+    chunk_paths: Optional[int] = None,
+    seed: Optional[int] = None
+) -> MonteCarloResult:
+    """Simulate horizon returns of many portfolios from a multivariate normal fit of log returns.
+
+    Paths are drawn in chunks and only the worst tail of each portfolio is
+    kept between chunks, so memory is bounded by chunk_paths and the tail
+    size rather than the path count. With a seed the result is
+    reproducible and does not depend on chunk_paths. VaR is the k-th
+    worst return with k = ceil(paths * (1 - confidence)); CVaR is the mean
+    of those k.
+    """
+    paths = paths or settings.MONTE_CARLO_PATHS
+    chunk_paths = chunk_paths or settings.MONTE_CARLO_CHUNK_PATHS
+    seed = settings.MONTE_CARLO_SEED if seed is None else seed
+    rng = np.random.default_rng(seed)
+    mean = log_returns.mean(axis=0) * horizon
+    factor = _factor(np.atleast_2d(np.cov(log_returns, rowvar=False, ddof=1)) * horizon)
+    tail_size = max(1, math.ceil(paths * (1.0 - confidence)))
+
+    started = time.perf_counter()
+    tail = np.empty((0, weights.shape[0]))
+    for offset in range(0, paths, chunk_paths):
+        count = min(chunk_paths, paths - offset)
+        simulated = mean + rng.standard_normal((count, len(mean))) @ factor.T
+        returns = np.expm1(simulated) @ weights.T
+        tail = np.concatenate((tail, returns))
+        if len(tail) > tail_size:
+            tail = np.partition(tail, tail_size - 1, axis=0)[:tail_size]
+    elapsed = time.perf_counter() - started
+    return MonteCarloResult(
+        var=-tail.max(axis=0),
+        cvar=-tail.mean(axis=0),
+        paths=paths,
+        seconds=elapsed
+    )
+
+
+def _finite(value: Any) -> Optional[float]:
+    """Convert a figure for JSON; NaN and infinity become None."""
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def evaluate_portfolios(
+    matrix: ReturnMatrix,
+    portfolios: Mapping[str, Holdings],
+    benchmark: Optional[str] = None,
+    confidence: Optional[float] = None,
+    horizon: int = 1,
+    paths: Optional[int] = None,
+    chunk_paths: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Compute risk figures for many portfolios over one aligned return matrix.
+
+    Every portfolio is a row of one share matrix, so values, returns, VaR
+    and the Monte Carlo paths are shared matrix operations. VaR figures
+    are positive loss fractions of the current value over horizon bars.
+    Figures that cannot be estimated, such as beta without the benchmark
+    in the matrix, are None.
+    """
+    confidence = settings.RISK_CONFIDENCE if confidence is None else confidence
+    names = list(portfolios)
+    if len(matrix) < 3:
+        raise ValueError("At least 3 aligned bars are needed to estimate risk")
+    shares = matrix.shares([portfolios[name] for name in names])
+    values = matrix.closes @ shares.T
+    latest = values[-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weights = shares * matrix.closes[-1] / latest[:, None]
+    returns = matrix.returns
+    cov, _ = covariance(returns)
+    portfolio_returns = values[1:] / values[:-1] - 1.0
+
+    parametric = parametric_var(weights, returns.mean(axis=0), cov, confidence, horizon)
+    historical = historical_var(values, confidence, horizon)
+    simulated = monte_carlo_var(weights, np.log1p(returns), confidence, paths, horizon, chunk_paths, seed)
+    betas = (
+        beta(portfolio_returns, returns[:, matrix.column(benchmark)])
+        if benchmark in matrix.symbols else np.full(len(names), np.nan)
+    )
+    volatility = portfolio_returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)
+    return {
+        name: {
+            'value': _finite(latest[i]),
+            'weights': {
+                symbol: _finite(weights[i, j]) for j, symbol in enumerate(matrix.symbols) if shares[i, j]
+            },
+            'volatility': _finite(volatility[i]),
+            'parametric_var': _finite(parametric[i]),
+            'historical_var': _finite(historical[i]),
+            'monte_carlo_var': _finite(simulated.var[i]),
+            'monte_carlo_cvar': _finite(simulated.cvar[i]),
+            'beta': _finite(betas[i]),
+            'confidence': confidence,
+            'horizon': horizon,
+            'paths': simulated.paths
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def portfolio_performance(matrix: ReturnMatrix, portfolios: Mapping[str, Holdings]) -> Dict[str, Dict[str, float]]:
+    """Get value and percent total, daily and year-to-date returns of many portfolios."""
+    names = list(portfolios)
+    values = matrix.closes @ matrix.shares([portfolios[name] for name in names]).T
+    years = matrix.timestamps.view('datetime64[ns]').astype('datetime64[Y]')
+    year_start = int(np.searchsorted(years, years[-1]))
+    # The year's first bar counts from the previous close when there is one
+    ytd_base = values[max(year_start - 1, 0)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = (values[-1] / values[0] - 1.0) * 100.0
+        daily = (values[-1] / values[-2] - 1.0) * 100.0 if len(values) > 1 else np.zeros(len(names))
+        ytd = (values[-1] / ytd_base - 1.0) * 100.0
+    return {
+        name: {
+            'total_value': round(float(values[-1, i]), 2),
+            'total_return': round(float(total[i]), 2),
+            'daily_change': round(float(daily[i]), 2),
+            'ytd_return': round(float(ytd[i]), 2)
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def risk_metrics(series: OHLCVSeries, benchmark: Optional[OHLCVSeries] = None) -> Dict[str, Optional[float]]:
+    """Annualized volatility and Sharpe ratio, max drawdown, 95% daily VaR and beta of one symbol.
+
+    VaR is the 5th percentile daily return. Beta is None without a
+    benchmark sharing at least three timestamps.
+    """
+    closes = series.close
+    returns = np.diff(closes) / closes[:-1]
+    deviation = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    drawdown = closes / np.maximum.accumulate(closes) - 1.0
+    beta_value = None
+    if benchmark is not None:
+        shared, own, other = np.intersect1d(series.timestamps, benchmark.timestamps, return_indices=True)
+        if len(shared) > 2:
+            paired = np.column_stack((closes[own], benchmark.close[other]))
+            paired_returns = paired[1:] / paired[:-1] - 1.0
+            value = beta(paired_returns[:, :1], paired_returns[:, 1])[0]
+            beta_value = None if np.isnan(value) else float(value)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = returns.mean() / deviation * np.sqrt(TRADING_DAYS_PER_YEAR) if len(returns) > 1 else np.nan
+    return {
+        "volatility": float(deviation * np.sqrt(TRADING_DAYS_PER_YEAR)),
+        "beta": beta_value,
+        "sharpe_ratio": float(sharpe),
+        "max_drawdown": float(drawdown.min()),
+        "var_95": float(np.percentile(returns, 5)) if len(returns) else float('nan')
+    }
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as redis_asyncio
+
+from ..config import settings
+from ..data_sources.series import OHLCVSeries
+
+logger = logging.getLogger(__name__)
+
+# Delete the lock only if this process still owns it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def encode_series_list(series: List[OHLCVSeries]) -> str:
+    """Serialize source results for sharing through Redis."""
+    return json.dumps([item.to_dict() for item in series])
+
+
+def decode_series_list(payload: Any) -> List[OHLCVSeries]:
+    """Deserialize source results shared through Redis."""
+    return [OHLCVSeries.from_dict(item) for item in json.loads(payload)]
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters showing how many upstream calls coalescing saved."""
+    calls: int = 0
+    upstream_calls: int = 0
+    # Callers that joined a call already in flight in this process
+    coalesced: int = 0
+    # Callers served a result another process fetched
+    shared: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, name: str) -> None:
+        """Increment one counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Get the counters as a plain dictionary."""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'upstream_calls': self.upstream_calls,
+                'coalesced': self.coalesced,
+                'shared': self.shared,
+                'saved': self.coalesced + self.shared
+            }
+
+
+class RedisFlightShare:
+    """Share one upstream call per key between processes through Redis.
+
+    The first process to take the key's lock makes the call and publishes the
+    result for a few seconds; others poll for it until the lock goes away,
+    then call upstream themselves. Redis errors fall back to a direct call.
+    The share lives in the process-wide group, so it opens its own client
+    instead of using the API's storage pool.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis_asyncio.Redis] = None,
+        encode: Callable[[Any], str] = encode_series_list,
+        decode: Callable[[Any], Any] = decode_series_list,
+        lock_ttl: Optional[float] = None,
+        result_ttl: Optional[float] = None,
+        poll_interval: Optional[float] = None
+    ) -> None:
+        self._client = client or redis_asyncio.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+        self._release = self._client.register_script(_RELEASE_LOCK_SCRIPT)
+        self.encode = encode
+        self.decode = decode
+        self.lock_ttl = lock_ttl or settings.SINGLE_FLIGHT_LOCK_TTL
+        self.result_ttl = result_ttl or settings.SINGLE_FLIGHT_RESULT_TTL
+        self.poll_interval = poll_interval or settings.SINGLE_FLIGHT_POLL_INTERVAL
+
+    async def _lead(self, lock_key: str, result_key: str, token: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Make the upstream call while holding the lock and publish its result."""
+        try:
+            result = await fn()
+            try:
+                await self._client.set(result_key, self.encode(result), px=int(self.result_ttl * 1000))
+            except redis.RedisError as e:
+                logger.warning(f"Failed to share single-flight result: {str(e)}")
+            return result
+        finally:
+            try:
+                await self._release(keys=[lock_key], args=[token])
+            except redis.RedisError as e:
+                logger.warning(f"Failed to release single-flight lock: {str(e)}")
+
+    async def _follow(self, lock_key: str, result_key: str) -> Optional[Any]:
+        """Poll for the leader's result until its lock is released or expires."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_ttl
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            payload = await self._client.get(result_key)
+            if payload is not None:
+                return self.decode(payload)
+            if not await self._client.exists(lock_key):
+                # Give a result written just before the release one more look
+                payload = await self._client.get(result_key)
+                return self.decode(payload) if payload is not None else None
+        return None
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Get the result for key and whether it came from another process."""
+        lock_key = f"portfolio_analyzer:singleflight:lock:{key}"
+        result_key = f"portfolio_analyzer:singleflight:result:{key}"
+        token = uuid.uuid4().hex
+        try:
+            payload = await self._client.get(result_key)
+            if payload is not None:
+                return self.decode(payload), True
+            acquired = await self._client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except redis.RedisError as e:
+            logger.warning(f"Redis single-flight unavailable, calling upstream: {str(e)}")
+            return await fn(), False
+
+        if acquired:
+            return await self._lead(lock_key, result_key, token, fn), False
+        try:
+            result = await self._follow(lock_key, result_key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis single-flight unavailable, calling upstream: {str(e)}")
+            result = None
+        if result is not None:
+            return result, True
+        # The leader failed or took too long; make the call here
+        return await fn(), False
+
+
+class _Flight:
+    """One in-flight upstream call and the number of callers awaiting it."""
+
+    def __init__(self, task: 'asyncio.Task[Any]') -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one upstream call.
+
+    Callers with the same key while a call is in flight await its result
+    (or exception) instead of starting their own. The call is cancelled
+    only when every caller awaiting it has been cancelled.
+    """
+
+    def __init__(self, share: Optional[RedisFlightShare] = None) -> None:
+        self.share = share
+        self.stats = SingleFlightStats()
+        self._flights: Dict[str, _Flight] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Get the number of distinct calls currently running."""
+        return len(self._flights)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if self.share is None:
+            self.stats.record('upstream_calls')
+            return await fn()
+        result, from_peer = await self.share.run(key, fn)
+        self.stats.record('shared' if from_peer else 'upstream_calls')
+        return result
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Get fn()'s result, sharing it with concurrent callers of the same key."""
+        self.stats.record('calls')
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._run(key, fn)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.stats.record('coalesced')
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group shared by every pipeline."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            share = RedisFlightShare() if settings.SINGLE_FLIGHT_REDIS else None
+            _single_flight = SingleFlight(share)
+        return _single_flight
@@ -0,0 +1,486 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+from collections import deque
+from dataclasses import asdict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data_sources.base import MarketData
+from ..data_sources.series import OHLCVSeries
+from .indicators import IndicatorParams, ema, true_range, wilder
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingIndicator:
+    """Constant-size indicator state updated one bar at a time.
+
+    Subclasses list their state attributes in _fields; to_state and
+    load_state turn them into a JSON-safe dict and back.
+    """
+    _fields: Tuple[str, ...] = ()
+
+    def to_state(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        for name in self._fields:
+            setattr(self, name, state[name])
+
+
+class StreamingEMA(StreamingIndicator):
+    """Exponential moving average with alpha 2 / (period + 1), seeded with the first value."""
+    _fields = ('value',)
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.value: Optional[float] = None
+
+    @classmethod
+    def from_history(cls, period: int, values: np.ndarray) -> 'StreamingEMA':
+        """Get the state after values, computed with the batch engine."""
+        average = cls(period)
+        if len(values):
+            average.value = float(ema(values, period)[0, -1])
+        return average
+
+    def update(self, value: float) -> float:
+        self.value = value if self.value is None else self.value + self.alpha * (value - self.value)
+        return self.value
+
+
+class _Wilder(StreamingIndicator):
+    """Wilder smoothing: the mean of the first period values, then alpha 1 / period."""
+    _fields = ('count', 'total', 'value')
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value: Optional[float] = None
+
+    @classmethod
+    def from_history(cls, period: int, values: np.ndarray) -> '_Wilder':
+        smoothed = cls(period)
+        smoothed.count = min(len(values), period)
+        smoothed.total = float(values[:period].sum())
+        if len(values) >= period:
+            smoothed.value = float(wilder(values[None, :], period)[0, -1])
+        return smoothed
+
+    def update(self, value: float) -> Optional[float]:
+        if self.value is not None:
+            self.value += (value - self.value) / self.period
+            return self.value
+        self.count += 1
+        self.total += value
+        if self.count == self.period:
+            self.value = self.total / self.period
+        return self.value
+
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder's relative strength index; None until period changes are seen."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.previous: Optional[float] = None
+        self.gains = _Wilder(period)
+        self.losses = _Wilder(period)
+        self.value: Optional[float] = None
+
+    @classmethod
+    def from_history(cls, period: int, closes: np.ndarray) -> 'StreamingRSI':
+        """Get the state after closes, computed with the batch engine."""
+        strength = cls(period)
+        if len(closes):
+            changes = np.diff(closes)
+            strength.load_state({
+                'previous': float(closes[-1]),
+                'gains': _Wilder.from_history(period, np.clip(changes, 0.0, None)).to_state(),
+                'losses': _Wilder.from_history(period, np.clip(-changes, 0.0, None)).to_state()
+            })
+        return strength
+
+    def update(self, close: float) -> Optional[float]:
+        if self.previous is None:
+            self.previous = close
+            return None
+        change = close - self.previous
+        self.previous = close
+        gain = self.gains.update(max(change, 0.0))
+        loss = self.losses.update(max(-change, 0.0))
+        self.value = _strength(gain, loss)
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'previous': self.previous, 'gains': self.gains.to_state(), 'losses': self.losses.to_state()}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.previous = state['previous']
+        self.gains.load_state(state['gains'])
+        self.losses.load_state(state['losses'])
+        self.value = _strength(self.gains.value, self.losses.value)
+
+
+def _strength(gain: Optional[float], loss: Optional[float]) -> Optional[float]:
+    if gain is None or loss is None:
+        return None
+    if loss == 0:
+        # No losses: 100 on any gain, 50 for a flat window
+        return 100.0 if gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD line, signal line and histogram from fast, slow and signal EMAs."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    @classmethod
+    def from_history(cls, fast: int, slow: int, signal: int, closes: np.ndarray) -> 'StreamingMACD':
+        """Get the state after closes, computed with the batch engine."""
+        macd = cls(fast, slow, signal)
+        if len(closes):
+            fast_line, slow_line = ema(closes, fast)[0], ema(closes, slow)[0]
+            macd.load_state({
+                'fast': float(fast_line[-1]),
+                'slow': float(slow_line[-1]),
+                'signal': float(ema(fast_line - slow_line, signal)[0, -1])
+            })
+        return macd
+
+    @property
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        if self.fast.value is None or self.slow.value is None or self.signal.value is None:
+            return None
+        line = self.fast.value - self.slow.value
+        return line, self.signal.value, line - self.signal.value
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        return line, signal, line - signal
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'fast': self.fast.value, 'slow': self.slow.value, 'signal': self.signal.value}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.fast.value, self.slow.value, self.signal.value = state['fast'], state['slow'], state['signal']
+
+
+class StreamingRollingStats(StreamingIndicator):
+    """Mean and population standard deviation over the last period values.
+
+    Running sums are kept relative to an anchor value so the
+    sum-of-squares formula does not cancel, and are recomputed from the
+    window every period updates so rounding cannot drift.
+    """
+    _fields = ('anchor', 'total', 'total_sq', 'since_refresh')
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.window: deque = deque(maxlen=period)
+        self.anchor = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.since_refresh = 0
+
+    @classmethod
+    def from_history(cls, period: int, values: np.ndarray) -> 'StreamingRollingStats':
+        """Get the state after values; only the last period of them matter."""
+        stats = cls(period)
+        for value in values[-period:].tolist():
+            stats.update(value)
+        return stats
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period
+
+    def update(self, value: float) -> Optional[Tuple[float, float]]:
+        if len(self.window) == self.period:
+            dropped = self.window[0] - self.anchor
+            self.total -= dropped
+            self.total_sq -= dropped * dropped
+        self.window.append(value)
+        self.since_refresh += 1
+        if self.since_refresh >= self.period:
+            self._refresh()
+        else:
+            added = value - self.anchor
+            self.total += added
+            self.total_sq += added * added
+        return self.value
+
+    def _refresh(self) -> None:
+        self.anchor = self.window[-1]
+        deviations = [item - self.anchor for item in self.window]
+        self.total = sum(deviations)
+        self.total_sq = sum(item * item for item in deviations)
+        self.since_refresh = 0
+
+    @property
+    def value(self) -> Optional[Tuple[float, float]]:
+        """Get (mean, std), or None until the window is full."""
+        if not self.ready:
+            return None
+        mean = self.total / self.period
+        variance = self.total_sq / self.period - mean * mean
+        return self.anchor + mean, max(variance, 0.0) ** 0.5
+
+    def to_state(self) -> Dict[str, Any]:
+        state = super().to_state()
+        state['window'] = list(self.window)
+        return state
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        super().load_state(state)
+        self.window = deque(state['window'], maxlen=self.period)
+
+
+class StreamingBollinger(StreamingIndicator):
+    """Bollinger bands: the rolling mean plus and minus width standard deviations."""
+
+    def __init__(self, period: int = 20, width: float = 2.0) -> None:
+        self.width = width
+        self.stats = StreamingRollingStats(period)
+
+    @classmethod
+    def from_history(cls, period: int, width: float, closes: np.ndarray) -> 'StreamingBollinger':
+        """Get the state after closes; only the last period of them matter."""
+        bands = cls(period, width)
+        bands.stats = StreamingRollingStats.from_history(period, closes)
+        return bands
+
+    @property
+    def value(self) -> Optional[Tuple[float, float, float]]:
+        """Get (upper, middle, lower), or None until the window is full."""
+        stats = self.stats.value
+        if stats is None:
+            return None
+        middle, deviation = stats
+        return middle + self.width * deviation, middle, middle - self.width * deviation
+
+    def update(self, close: float) -> Optional[Tuple[float, float, float]]:
+        self.stats.update(close)
+        return self.value
+
+    def to_state(self) -> Dict[str, Any]:
+        return self.stats.to_state()
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.stats.load_state(state)
+
+
+class StreamingATR(StreamingIndicator):
+    """Wilder's average true range; None until period bars are seen."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.previous: Optional[float] = None
+        self.ranges = _Wilder(period)
+
+    @classmethod
+    def from_history(
+        cls, period: int, high: np.ndarray, low: np.ndarray, close: np.ndarray
+    ) -> 'StreamingATR':
+        """Get the state after the bars, computed with the batch engine."""
+        average = cls(period)
+        if len(close):
+            average.previous = float(close[-1])
+            average.ranges = _Wilder.from_history(period, true_range(high, low, close)[0])
+        return average
+
+    @property
+    def value(self) -> Optional[float]:
+        return self.ranges.value
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        true_range = high - low
+        if self.previous is not None:
+            true_range = max(true_range, abs(high - self.previous), abs(low - self.previous))
+        self.previous = close
+        return self.ranges.update(true_range)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {'previous': self.previous, 'ranges': self.ranges.to_state()}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        self.previous = state['previous']
+        self.ranges.load_state(state['ranges'])
+
+
+def _nan(value: Optional[float]) -> float:
+    return float('nan') if value is None else value
+
+
+def stream_key(symbol: str, source: str, params: IndicatorParams) -> str:
+    """Get the snapshot key of a (symbol, source, parameter set) stream."""
+    digest = hashlib.sha1(json.dumps(asdict(params), sort_keys=True).encode()).hexdigest()[:12]
+    return f"{symbol}:{source}:{digest}"
+
+
+class IndicatorStream:
+    """Every indicator of a parameter set, updated bar by bar for one symbol.
+
+    Values use the batch engine's names (sma_<n>, ema_<n>, rsi, macd_*,
+    bollinger_*) plus atr, and are NaN until enough bars are seen. A bar
+    with the latest timestamp again replaces it, so a forming bar can be
+    updated tick by tick; older bars are ignored.
+    """
+
+    def __init__(self, symbol: str, source: str, params: IndicatorParams = IndicatorParams()) -> None:
+        self.symbol = symbol
+        self.source = source
+        self.params = params
+        self.timestamp: Optional[int] = None
+        self.windows = {
+            period: StreamingRollingStats(period) for period in sorted(set(params.sma_periods))
+        }
+        self.emas = {period: StreamingEMA(period) for period in sorted(set(params.ema_periods))}
+        self.rsi = StreamingRSI(params.rsi_period)
+        self.macd = StreamingMACD(params.macd_fast, params.macd_slow, params.macd_signal)
+        self.bollinger = StreamingBollinger(params.bollinger_period, params.bollinger_width)
+        self.atr = StreamingATR(params.atr_period)
+        # Component state before the latest bar, restored when that bar is revised
+        self._previous: Optional[Dict[str, Any]] = None
+
+    @property
+    def key(self) -> str:
+        return stream_key(self.symbol, self.source, self.params)
+
+    def _components(self) -> Dict[str, StreamingIndicator]:
+        components: Dict[str, StreamingIndicator] = {f"sma_{p}": item for p, item in self.windows.items()}
+        components.update({f"ema_{p}": item for p, item in self.emas.items()})
+        components.update(rsi=self.rsi, macd=self.macd, bollinger=self.bollinger, atr=self.atr)
+        return components
+
+    def _component_state(self) -> Dict[str, Any]:
+        return {name: item.to_state() for name, item in self._components().items()}
+
+    def _load_components(self, state: Dict[str, Any]) -> None:
+        for name, item in self._components().items():
+            item.load_state(state[name])
+
+    def update(self, bar: MarketData) -> Dict[str, float]:
+        """Apply one bar and get the latest indicator values."""
+        return self.update_values(pd.Timestamp(bar.timestamp).value, bar.high, bar.low, bar.close)
+
+    def update_values(self, timestamp: int, high: float, low: float, close: float) -> Dict[str, float]:
+        """Apply one bar given its int64 ns timestamp and get the latest indicator values."""
+        if self.timestamp is not None and timestamp < self.timestamp:
+            return self.values
+        if timestamp == self.timestamp and self._previous is not None:
+            self._load_components(self._previous)
+        else:
+            self._previous = self._component_state()
+        self.timestamp = timestamp
+        for window in self.windows.values():
+            window.update(close)
+        for average in self.emas.values():
+            average.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.atr.update(high, low, close)
+        return self.values
+
+    def update_series(self, series: OHLCVSeries) -> Dict[str, float]:
+        """Apply every bar of a series in timestamp order, e.g. to warm up from history."""
+        series = series.sort()
+        for timestamp, high, low, close in zip(
+            series.timestamps.tolist(), series.high.tolist(), series.low.tolist(), series.close.tolist()
+        ):
+            self.update_values(timestamp, high, low, close)
+        return self.values
+
+    @property
+    def values(self) -> Dict[str, float]:
+        values = {f"sma_{p}": _nan(item.value[0] if item.value else None) for p, item in self.windows.items()}
+        values.update({f"ema_{p}": _nan(item.value) for p, item in self.emas.items()})
+        values['rsi'] = _nan(self.rsi.value)
+        macd = self.macd.value or (None, None, None)
+        values.update(macd_line=_nan(macd[0]), macd_signal=_nan(macd[1]), macd_histogram=_nan(macd[2]))
+        bands = self.bollinger.value or (None, None, None)
+        values.update(
+            bollinger_upper=_nan(bands[0]), bollinger_middle=_nan(bands[1]), bollinger_lower=_nan(bands[2])
+        )
+        values['atr'] = _nan(self.atr.value)
+        return values
+
+    def to_state(self) -> Dict[str, Any]:
+        """Get a JSON-safe snapshot of the stream."""
+        return {
+            'symbol': self.symbol,
+            'source': self.source,
+            'params': asdict(self.params),
+            'timestamp': self.timestamp,
+            'components': self._component_state(),
+            'previous': self._previous
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'IndicatorStream':
+        """Resume a stream from a to_state snapshot."""
+        saved = state['params']
+        params = IndicatorParams(
+            sma_periods=tuple(saved['sma_periods']),
+            ema_periods=tuple(saved['ema_periods']),
+            rsi_period=saved['rsi_period'],
+            macd_fast=saved['macd_fast'],
+            macd_slow=saved['macd_slow'],
+            macd_signal=saved['macd_signal'],
+            bollinger_period=saved['bollinger_period'],
+            bollinger_width=saved['bollinger_width'],
+            atr_period=saved['atr_period']
+        )
+        stream = cls(state['symbol'], state['source'], params)
+        stream._load_components(state['components'])
+        stream.timestamp = state['timestamp']
+        stream._previous = state['previous']
+        return stream
+
+
+async def call_cache(method: Any, *args: Any) -> Any:
+    """Call a sync or async cache method without blocking the loop."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    return await asyncio.to_thread(method, *args)
+
+
+async def load_stream(
+    cache: Any,
+    symbol: str,
+    source: str,
+    params: IndicatorParams = IndicatorParams()
+) -> Optional[IndicatorStream]:
+    """Resume a stream snapshotted by any worker, or None to warm one up from history."""
+    try:
+        state = await call_cache(cache.get_indicator_state, stream_key(symbol, source, params))
+    except Exception as e:
+        logger.warning(f"Failed to load indicator state for {symbol}: {e}")
+        return None
+    if state is None:
+        return None
+    try:
+        return IndicatorStream.from_state(state)
+    except (KeyError, TypeError) as e:
+        logger.warning(f"Discarding unreadable indicator state for {symbol}: {e}")
+        return None
+
+
+async def save_stream(cache: Any, stream: IndicatorStream, expiration: Optional[int] = None) -> None:
+    """Snapshot a stream to a sync or async Redis cache."""
+    try:
+        await call_cache(cache.set_indicator_state, stream.key, stream.to_state(), expiration)
+    except Exception as e:
+        logger.warning(f"Failed to save indicator state for {stream.symbol}: {e}")
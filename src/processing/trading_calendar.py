@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+from pandas.tseries.offsets import CustomBusinessDay
+
+DateInterval = Tuple[date, date]
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE market holidays (regular rules, no one-off closures)."""
+    rules = [
+        # NYSE stays open on Dec 31 when Jan 1 falls on a Saturday
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-06-19', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+
+class TradingCalendar:
+    """Trading sessions used to decide which daily bars should exist."""
+
+    def __init__(self, holidays: AbstractHolidayCalendar = NYSEHolidayCalendar()) -> None:
+        self._offset = CustomBusinessDay(calendar=holidays)
+
+    def sessions(self, start: date, end: date) -> pd.DatetimeIndex:
+        """Get trading session dates in [start, end]."""
+        if start > end:
+            return pd.DatetimeIndex([])
+        return pd.date_range(start, end, freq=self._offset)
+
+    def missing_intervals(
+        self,
+        stored: Iterable[date],
+        start: date,
+        end: date
+    ) -> List[DateInterval]:
+        """Get contiguous runs of sessions in [start, end] with no stored bar.
+
+        Runs are contiguous in session order, so a gap spanning a weekend or
+        holiday is reported as one interval.
+        """
+        sessions = self.sessions(start, end)
+        if sessions.empty:
+            return []
+        stored_index = pd.DatetimeIndex(list(stored)).normalize()
+        missing = ~sessions.isin(stored_index)
+        if not missing.any():
+            return []
+        positions = np.flatnonzero(missing)
+        # A new run starts wherever the previous missing session is not adjacent
+        breaks = np.flatnonzero(np.diff(positions) > 1)
+        starts = np.concatenate(([positions[0]], positions[breaks + 1]))
+        ends = np.concatenate((positions[breaks], [positions[-1]]))
+        return [(sessions[s].date(), sessions[e].date()) for s, e in zip(starts, ends)]
@@ -71,12 +71,11 @@ def remove_price_outliers(
     upper_band = rolling_mean + (rolling_std * std_threshold)
     lower_band = rolling_mean - (rolling_std * std_threshold)
     
-    # Remove outliers - only remove if both bands are valid
+    # Remove outliers - only remove if both bands are valid; rows without
+    # enough history for a deviation (the first row) are kept
     valid_mask = (
         (df_copy['close'] >= lower_band) &
-        (df_copy['close'] <= upper_band) &
-        rolling_std.notna() &
-        rolling_mean.notna()
-    )
+        (df_copy['close'] <= upper_band)
+    ) | rolling_std.isna() | rolling_mean.isna()
     
     return df_copy[valid_mask]
\ No newline at end of file
@@ -1,6 +1,13 @@
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, validator, model_validator
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field, GetCoreSchemaHandler, validator, model_validator
+from pydantic_core import core_schema
+
+from ..data_sources.series import OHLCVSeries
 
 class StockPrice(BaseModel):
     """Stock price data validation model."""
@@ -29,6 +36,138 @@ class StockPrice(BaseModel):
             
         return self
 
+# Vectorized equivalents of the StockPrice field constraints and validator
+SYMBOL_MIN_LENGTH = 1
+SYMBOL_MAX_LENGTH = 10
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+STOCK_PRICE_FIELDS = ('symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'source')
+
+
+@dataclass
+class ValidationReport:
+    """Per-rule rejection counts from validate_market_frame.
+
+    A row failing several rules is counted once per rule, so the rule counts
+    can sum to more than the number of rejected rows.
+    """
+    total: int = 0
+    valid: int = 0
+    rejections: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rejected(self) -> int:
+        """Get the number of rejected rows."""
+        return self.total - self.valid
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the report as a plain dictionary."""
+        return {
+            'total': self.total,
+            'valid': self.valid,
+            'rejected': self.rejected,
+            'rejections': dict(self.rejections)
+        }
+
+
+def _rule_masks(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Get a boolean rejection mask per StockPrice rule."""
+    prices = df[list(PRICE_FIELDS)].to_numpy(dtype=np.float64)
+    open_, high, low, close = prices.T
+    symbol_length = df['symbol'].astype(str).str.len().to_numpy()
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    # Comparisons are written so NaN fails them, as it fails pydantic validation
+    return {
+        'missing_timestamp': df['timestamp'].isna().to_numpy(),
+        'symbol_length': ~((symbol_length >= SYMBOL_MIN_LENGTH) & (symbol_length <= SYMBOL_MAX_LENGTH)),
+        'non_positive_price': ~np.logical_and.reduce(prices > 0, axis=1),
+        'negative_volume': ~(volume >= 0),
+        'high_below_low': high < low,
+        'open_out_of_range': (open_ > high) | (open_ < low),
+        'close_out_of_range': (close > high) | (close < low)
+    }
+
+
+def validate_market_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, ValidationReport]:
+    """Apply the StockPrice rules to a whole frame at once.
+
+    Returns the rows passing every rule and a report of rejections per rule.
+    """
+    if df.empty:
+        return df, ValidationReport()
+    masks = _rule_masks(df)
+    rejected = np.logical_or.reduce(list(masks.values()))
+    report = ValidationReport(
+        total=len(df),
+        valid=int(len(df) - rejected.sum()),
+        rejections={rule: int(mask.sum()) for rule, mask in masks.items() if mask.any()}
+    )
+    return (df[~rejected] if rejected.any() else df), report
+
+
+class LazyStockPrices(Sequence[StockPrice]):
+    """Read-only StockPrice view over a frame that already passed validate_market_frame.
+
+    Models are built on access without re-running validation.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.frame = df
+        self._columns = {name: df[name].to_numpy() for name in STOCK_PRICE_FIELDS}
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value, info: [price.model_dump(mode=info.mode) for price in value],
+                info_arg=True
+            )
+        )
+
+    def _price(self, i: int) -> StockPrice:
+        """Build the StockPrice for row i."""
+        columns = self._columns
+        return StockPrice.model_construct(
+            symbol=str(columns['symbol'][i]),
+            timestamp=pd.Timestamp(columns['timestamp'][i]).to_pydatetime(),
+            open=float(columns['open'][i]),
+            high=float(columns['high'][i]),
+            low=float(columns['low'][i]),
+            close=float(columns['close'][i]),
+            volume=int(columns['volume'][i]),
+            source=str(columns['source'][i])
+        )
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @overload
+    def __getitem__(self, index: int) -> StockPrice: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'LazyStockPrices': ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[StockPrice, 'LazyStockPrices']:
+        if isinstance(index, slice):
+            return LazyStockPrices(self.frame.iloc[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LazyStockPrices index out of range")
+        return self._price(index)
+
+    def __iter__(self) -> Iterator[StockPrice]:
+        for i in range(len(self)):
+            yield self._price(i)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"LazyStockPrices(rows={len(self)})"
+
 class TimeSeriesRequest(BaseModel):
     """Time series data request validation."""
     symbol: str = Field(..., min_length=1, max_length=10)
@@ -51,6 +190,12 @@ class SearchRequest(BaseModel):
 
 class DataSourceResponse(BaseModel):
     """Data source response validation."""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     success: bool
-    data: Optional[List[StockPrice]] = None
-    error: Optional[str] = None
\ No newline at end of file
+    # Pipelines return a LazyStockPrices view; callers may pass a plain list
+    data: Optional[Union[LazyStockPrices, List[StockPrice]]] = None
+    error: Optional[str] = None
+    # Columnar view of data, one series per (symbol, source); never serialized
+    series: Optional[List[OHLCVSeries]] = Field(default=None, exclude=True)
+    report: Optional[ValidationReport] = Field(default=None, exclude=True)
\ No newline at end of file
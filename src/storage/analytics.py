@@ -0,0 +1,355 @@
+import logging
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import ArgumentError
+
+from ..config import settings
+from .parquet_store import PART_PREFIX, PART_SUFFIX, ParquetRepository
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Per-symbol summary columns, in display order
+SUMMARY_COLUMNS = (
+    'first_timestamp', 'last_timestamp', 'days', 'bars', 'average_price', 'highest_price',
+    'lowest_price', 'total_volume', 'price_change', 'change_pct', 'volatility_pct'
+)
+
+_BAR_COLUMNS = 'symbol, source, timestamp, open, high, low, close, volume'
+
+_EMPTY_BARS = (
+    "SELECT NULL::VARCHAR AS symbol, NULL::VARCHAR AS source, NULL::TIMESTAMP AS timestamp, "
+    "NULL::DOUBLE AS open, NULL::DOUBLE AS high, NULL::DOUBLE AS low, NULL::DOUBLE AS close, "
+    "NULL::BIGINT AS volume WHERE false"
+)
+
+# Last close per symbol and day; intraday bars reduce to one daily close
+_DAILY_CTE = """
+daily AS (
+    SELECT symbol, CAST(timestamp AS DATE) AS day, arg_max(close, timestamp) AS close
+    FROM bars
+    GROUP BY symbol, day
+)"""
+
+_SUMMARY_QUERY = """
+WITH bars AS ({bars}),{daily},
+log_returns AS (
+    SELECT symbol, ln(close / lag(close) OVER (PARTITION BY symbol ORDER BY day)) AS log_return
+    FROM daily
+),
+volatility AS (
+    SELECT symbol, stddev_samp(log_return) * sqrt({periods}) * 100 AS volatility_pct
+    FROM log_returns
+    GROUP BY symbol
+),
+totals AS (
+    SELECT
+        symbol,
+        min(timestamp) AS first_timestamp,
+        max(timestamp) AS last_timestamp,
+        count(DISTINCT CAST(timestamp AS DATE)) AS days,
+        count(*) AS bars,
+        avg(close) AS average_price,
+        max(high) AS highest_price,
+        min(low) AS lowest_price,
+        sum(volume) AS total_volume,
+        arg_min(close, timestamp) AS first_close,
+        arg_max(close, timestamp) AS last_close
+    FROM bars
+    GROUP BY symbol
+)
+SELECT
+    totals.symbol, first_timestamp, last_timestamp, days, bars, average_price, highest_price,
+    lowest_price, total_volume,
+    last_close - first_close AS price_change,
+    (last_close / first_close - 1) * 100 AS change_pct,
+    volatility_pct
+FROM totals JOIN volatility USING (symbol)
+ORDER BY totals.symbol
+"""
+
+_RETURNS_QUERY = """
+WITH bars AS ({bars}),{daily},
+returns AS (
+    SELECT
+        symbol, day, close,
+        close / lag(close) OVER w - 1 AS daily_return,
+        close / lag(close, {window}) OVER w - 1 AS window_return,
+        ln(close / lag(close) OVER w) AS log_return
+    FROM daily
+    WINDOW w AS (PARTITION BY symbol ORDER BY day)
+)
+SELECT
+    symbol, day, close, daily_return, window_return,
+    stddev_samp(log_return) OVER (
+        PARTITION BY symbol ORDER BY day ROWS BETWEEN {preceding} PRECEDING AND CURRENT ROW
+    ) * sqrt({periods}) AS window_volatility
+FROM returns
+ORDER BY symbol, day
+"""
+
+_VOLUME_PROFILE_QUERY = """
+WITH bars AS ({bars}),
+bounds AS (
+    SELECT min(low) AS low, greatest(max(high) - min(low), 1e-9) / {bins} AS width FROM bars
+),
+buckets AS (
+    SELECT least(floor((close - bounds.low) / bounds.width), {bins} - 1) AS bucket, volume
+    FROM bars, bounds
+)
+SELECT
+    bounds.low + bucket * bounds.width AS price_low,
+    bounds.low + (bucket + 1) * bounds.width AS price_high,
+    sum(volume) AS volume
+FROM buckets, bounds
+GROUP BY bucket, bounds.low, bounds.width
+ORDER BY bucket
+"""
+
+
+def _import_duckdb() -> Any:
+    """Import duckdb, which the analytics engine requires."""
+    try:
+        import duckdb  # type: ignore[import-untyped]
+    except ImportError as e:
+        raise ImportError("duckdb is required for the analytics engine: pip install duckdb") from e
+    return duckdb
+
+
+def _quote(value: str) -> str:
+    """Quote a string literal for DuckDB SQL."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+class AnalyticsEngine:
+    """Aggregate stored market data inside an embedded DuckDB database.
+
+    Queries scan the SQL database (SQLite or PostgreSQL, attached read-only)
+    or the Parquet store's files directly, so only the aggregated results
+    reach Python. Use for_repository() to target the configured backend.
+    """
+
+    def __init__(self, table_sql: str, attach: Optional[str] = None, extension: Optional[str] = None) -> None:
+        self._duckdb = _import_duckdb()
+        self.error_type = self._duckdb.Error
+        self._connection = self._duckdb.connect(database=':memory:')
+        try:
+            if extension:
+                self._load_extension(extension)
+            if attach:
+                try:
+                    self._connection.execute(attach)
+                except self.error_type as e:
+                    raise ValueError(f"Failed to attach database: {str(e)}") from e
+        except ValueError:
+            self._connection.close()
+            raise
+        self._table_sql = table_sql
+
+    def _load_extension(self, name: str) -> None:
+        """Install (once, downloading it) and load a DuckDB extension."""
+        try:
+            self._connection.install_extension(name)
+            self._connection.load_extension(name)
+        except self.error_type as e:
+            reason = str(e).splitlines()[0]
+            raise ValueError(
+                f"DuckDB {name} extension unavailable ({reason}). DuckDB downloads it on first use; "
+                f"on offline hosts install it beforehand with "
+                f"python -c \"import duckdb; duckdb.connect().install_extension('{name}')\" "
+                f"or set ANALYTICS_ENGINE=pandas"
+            ) from e
+
+    @classmethod
+    def for_database(cls, database_url: Union[str, URL]) -> 'AnalyticsEngine':
+        """Create an engine reading the market_data table of a SQLite or PostgreSQL database."""
+        try:
+            url = make_url(database_url)
+        except ArgumentError as e:
+            raise ValueError(f"Invalid database URL: {str(e)}") from e
+        backend = url.get_backend_name()
+        if backend == 'sqlite':
+            if not url.database or url.database == ':memory:':
+                raise ValueError("In-memory SQLite databases cannot be attached")
+            attach = f"ATTACH {_quote(url.database)} AS market (TYPE sqlite, READ_ONLY)"
+            table = 'market.market_data'
+            extension = 'sqlite'
+        elif backend == 'postgresql':
+            uri = url.set(drivername='postgresql').render_as_string(hide_password=False)
+            attach = f"ATTACH {_quote(uri)} AS market (TYPE postgres, READ_ONLY)"
+            table = 'market.public.market_data'
+            extension = 'postgres'
+        else:
+            raise ValueError(f"Analytics engine does not support '{backend}' databases")
+        return cls(f"SELECT {_BAR_COLUMNS} FROM {table}", attach, extension)
+
+    @classmethod
+    def for_parquet(cls, root: Path) -> 'AnalyticsEngine':
+        """Create an engine reading a Parquet store, keeping the latest write of each bar."""
+        pattern = f"source=*/symbol=*/year=*/{PART_PREFIX}*{PART_SUFFIX}"
+        if not any(root.glob(pattern)):
+            return cls(_EMPTY_BARS)
+        scan = (
+            f"read_parquet({_quote(str(root / pattern))}, hive_partitioning = true, filename = true, "
+            "hive_types = {'source': VARCHAR, 'symbol': VARCHAR})"
+        )
+        return cls(
+            f"SELECT {_BAR_COLUMNS} FROM {scan} "
+            "QUALIFY row_number() OVER (PARTITION BY source, symbol, timestamp ORDER BY filename DESC) = 1"
+        )
+
+    @classmethod
+    def for_repository(cls, repository: Any) -> 'AnalyticsEngine':
+        """Create an engine reading the same data as a repository."""
+        if isinstance(repository, ParquetRepository):
+            return cls.for_parquet(repository.root)
+        engine = getattr(repository, 'engine', None)
+        if engine is None:
+            raise ValueError("Repository has no database to query")
+        return cls.for_database(engine.url)
+
+    def close(self) -> None:
+        """Close the DuckDB connection."""
+        self._connection.close()
+
+    def __enter__(self) -> 'AnalyticsEngine':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _bars_sql(
+        self,
+        symbols: Sequence[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Tuple[str, List[Any]]:
+        """Build the filtered bar relation and its parameters."""
+        conditions = ['list_contains(?, symbol)']
+        params: List[Any] = [list(symbols)]
+        if start_date:
+            conditions.append('timestamp >= ?')
+            params.append(start_date)
+        if end_date:
+            conditions.append('timestamp <= ?')
+            params.append(end_date)
+        return f"SELECT * FROM ({self._table_sql}) WHERE {' AND '.join(conditions)}", params
+
+    def _query(
+        self,
+        template: str,
+        symbols: Sequence[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        **fields: Any
+    ) -> pd.DataFrame:
+        """Run a query template over the filtered bars."""
+        bars, params = self._bars_sql(symbols, start_date, end_date)
+        sql = template.format(bars=bars, daily=_DAILY_CTE, periods=TRADING_DAYS_PER_YEAR, **fields)
+        return self._connection.execute(sql, params).df()
+
+    def summary(
+        self,
+        symbols: Sequence[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Get price, volume and volatility statistics per symbol, indexed by symbol."""
+        frame = self._query(_SUMMARY_QUERY, symbols, start_date, end_date)
+        return frame.set_index('symbol')[list(SUMMARY_COLUMNS)]
+
+    def returns(
+        self,
+        symbols: Sequence[str],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        window: int = 20
+    ) -> pd.DataFrame:
+        """Get daily closes with daily, rolling-window returns and annualized rolling volatility."""
+        window = int(window)
+        if window < 2:
+            raise ValueError("window must be at least 2 days")
+        return self._query(_RETURNS_QUERY, symbols, start_date, end_date, window=window, preceding=window - 1)
+
+    def volume_profile(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        bins: int = 20
+    ) -> pd.DataFrame:
+        """Get traded volume per closing-price bucket for one symbol."""
+        bins = int(bins)
+        if bins < 1:
+            raise ValueError("bins must be positive")
+        return self._query(_VOLUME_PROFILE_QUERY, [symbol], start_date, end_date, bins=bins)
+
+
+def summarize_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Compute the per-symbol summary from loaded bars, matching AnalyticsEngine.summary."""
+    if frame.empty:
+        return pd.DataFrame(columns=list(SUMMARY_COLUMNS))
+    frame = frame.sort_values('timestamp', kind='stable')
+    days = frame['timestamp'].dt.normalize()
+    grouped = frame.groupby('symbol', sort=True)
+    summary = pd.DataFrame({
+        'first_timestamp': grouped['timestamp'].min(),
+        'last_timestamp': grouped['timestamp'].max(),
+        'days': days.groupby(frame['symbol']).nunique(),
+        'bars': grouped.size(),
+        'average_price': grouped['close'].mean(),
+        'highest_price': grouped['high'].max(),
+        'lowest_price': grouped['low'].min(),
+        'total_volume': grouped['volume'].sum()
+    })
+    first_close = grouped['close'].first()
+    last_close = grouped['close'].last()
+    summary['price_change'] = last_close - first_close
+    summary['change_pct'] = (last_close / first_close - 1) * 100
+    daily = frame.groupby(['symbol', days])['close'].last()
+    log_returns = np.log(daily).groupby(level='symbol').diff()
+    summary['volatility_pct'] = (
+        log_returns.groupby(level='symbol').std() * math.sqrt(TRADING_DAYS_PER_YEAR) * 100
+    )
+    return summary[list(SUMMARY_COLUMNS)]
+
+
+def _summarize_loaded(
+    repository: Any,
+    symbols: Sequence[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> pd.DataFrame:
+    """Summarize symbols by loading their bars through the repository."""
+    rows = [
+        bar.model_dump()
+        for symbol in symbols
+        for bar in repository.get_market_data(symbol=symbol, start_date=start_date, end_date=end_date)
+    ]
+    return summarize_frame(pd.DataFrame(rows))
+
+
+def summarize_symbols(
+    repository: Any,
+    symbols: Sequence[str],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> pd.DataFrame:
+    """Summarize symbols in DuckDB when ANALYTICS_ENGINE allows it, else from loaded bars."""
+    if settings.ANALYTICS_ENGINE == 'duckdb':
+        try:
+            engine = AnalyticsEngine.for_repository(repository)
+        except (ImportError, ValueError) as e:
+            logging.warning(f"DuckDB analytics unavailable, loading bars instead: {str(e)}")
+        else:
+            with engine:
+                try:
+                    return engine.summary(symbols, start_date, end_date)
+                except engine.error_type as e:
+                    logging.warning(f"DuckDB analytics failed, loading bars instead: {str(e)}")
+    return _summarize_loaded(repository, symbols, start_date, end_date)
@@ -0,0 +1,257 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from ..config import settings
+from ..data_sources.base import MarketData
+from ..data_sources.series import OHLCVSeries
+from .models import Base, MarketDataModel
+from .cache import AsyncRedisCache, MarketRangeKey, buckets_between
+from .connections import AsyncStorageResources, create_async_database_engine
+from .repository import QueryFilters, RepositoryBase
+
+class AsyncDataRepository(RepositoryBase):
+    """Asyncio data access layer for market data.
+
+    Mirrors DataRepository on top of sqlalchemy.ext.asyncio and redis.asyncio
+    so the FastAPI routers never block the event loop. Pass shared
+    AsyncStorageResources to reuse process-wide pools; without them the
+    repository creates its own engine and creates the schema on first use.
+    """
+
+    def __init__(self, resources: Optional[AsyncStorageResources] = None) -> None:
+        self._schema_ready = resources is not None
+        self._schema_lock = asyncio.Lock()
+        if resources is not None:
+            self.engine: Optional[AsyncEngine] = resources.engine
+            self.Session: Optional[async_sessionmaker[AsyncSession]] = resources.session_factory
+            self.cache: Optional[AsyncRedisCache] = resources.cache
+            return
+        try:
+            if settings.DATABASE_URL is None:
+                raise ValueError("DATABASE_URL is not configured")
+            self.engine = create_async_database_engine(settings.DATABASE_URL)
+            self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+        except Exception as e:
+            logging.warning(f"Database connection failed: {str(e)}. Data will not be persisted.")
+            self.engine = None
+            self.Session = None
+        try:
+            self.cache = AsyncRedisCache()
+        except Exception as e:
+            logging.warning(f"Redis connection failed: {str(e)}. Cache will be disabled.")
+            self.cache = None
+
+    async def _ensure_schema(self) -> None:
+        """Create tables once for standalone repositories."""
+        if self._schema_ready or self.engine is None:
+            return
+        async with self._schema_lock:
+            if not self._schema_ready:
+                async with self.engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                self._schema_ready = True
+
+    async def _get_session(self) -> AsyncSession:
+        """Get a new database session."""
+        if self.Session is None:
+            raise ValueError("Database session is not available")
+        await self._ensure_schema()
+        return self.Session()
+
+    async def _invalidate_cached_ranges(self, data: Sequence[MarketData]) -> None:
+        """Invalidate every cached range bucket touched by the given bars."""
+        if not self.cache or not data:
+            return
+        await self.cache.invalidate_market_ranges(self._touched_range_keys(data))
+
+    async def save_market_data(self, data: Sequence[MarketData]) -> None:
+        """Save market data to database and invalidate cached ranges."""
+        if not self.Session:
+            logging.warning("Database not available, skipping data save")
+            return
+
+        async with await self._get_session() as session:
+            for item in data:
+                await session.merge(MarketDataModel(**self._to_upsert_row(item)))
+            await session.commit()
+        await self._invalidate_cached_ranges(data)
+        await self._refresh_rollups(data)
+
+    async def bulk_save_market_data(
+        self,
+        data: Sequence[MarketData],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """Bulk upsert market data in chunked INSERT ... ON CONFLICT batches."""
+        if not self.Session or self.engine is None:
+            logging.warning("Database not available, skipping data save")
+            return 0
+
+        stmt = self._build_upsert_statement(self.engine.dialect.name)
+        if stmt is None:
+            await self.save_market_data(data)
+            return len(data)
+
+        batch_size = batch_size or settings.BULK_UPSERT_BATCH_SIZE
+        written = 0
+        async with await self._get_session() as session:
+            for offset in range(0, len(data), batch_size):
+                batch = data[offset:offset + batch_size]
+                rows = self._unique_upsert_rows(batch)
+                await session.execute(stmt, rows)
+                await session.commit()
+                await self._invalidate_cached_ranges(batch)
+                written += len(rows)
+        await self._refresh_rollups(data)
+        return written
+
+    async def _refresh_rollups(self, data: Sequence[MarketData]) -> None:
+        """Recompute the rollup buckets touched by saved bars; failures are logged."""
+        timeframes = self._rollup_timeframes()
+        if not timeframes or not data or self.engine is None:
+            return
+        stmt = self._build_rollup_upsert_statement(self.engine.dialect.name)
+        if stmt is None:
+            return
+        try:
+            async with await self._get_session() as session:
+                for filters, touched in self._rollup_refresh_plan(data, timeframes):
+                    rows = (await session.execute(self._build_series_query(filters))).all()
+                    bars = self._rows_to_series(rows, touched.symbol, touched.source)
+                    rollup_rows = self._to_rollup_rows(bars, touched, timeframes)
+                    if rollup_rows:
+                        await session.execute(stmt, rollup_rows)
+                await session.commit()
+        except Exception as e:
+            logging.warning(f"Rollup refresh failed: {str(e)}")
+
+    async def _load_market_data(self, filters: QueryFilters) -> List[MarketData]:
+        """Load market data matching filters straight from the database."""
+        async with await self._get_session() as session:
+            query = self._build_market_data_query(filters)
+            rows = (await session.execute(query)).scalars()
+            return [self._create_market_data(row) for row in rows]
+
+    async def _get_cached_market_data(
+        self,
+        cache: AsyncRedisCache,
+        filters: QueryFilters,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[MarketData]:
+        """Serve a bounded range from bucket-level cache, filling misses from the database."""
+        buckets = buckets_between(start_date, end_date, settings.MARKET_DATA_CACHE_BUCKET)
+        keys = [MarketRangeKey(filters.symbol, filters.source, bucket) for bucket in buckets]
+
+        started = time.perf_counter()
+        cached = await cache.get_market_ranges(keys)
+        missing = [bucket for bucket in buckets if cached.get(bucket) is None]
+        cache.stats.record_read(len(buckets) - len(missing), len(missing), time.perf_counter() - started)
+
+        if missing:
+            started = time.perf_counter()
+            items = await self._load_market_data(self._bucket_span_filters(filters, missing))
+            loaded = self._group_into_buckets(items, missing)
+            cache.stats.record_db_load(time.perf_counter() - started)
+            await cache.set_market_ranges(loaded, filters.symbol, filters.source)
+            cached.update(loaded)
+
+        return self._assemble_range(buckets, cached, start_date, end_date)
+
+    async def get_market_data(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        source: Optional[str] = None
+    ) -> List[MarketData]:
+        """Get market data from cache or database."""
+        if not self.Session:
+            logging.warning("Database not available, returning empty data")
+            return []
+
+        filters = QueryFilters(symbol=symbol, start_date=start_date, end_date=end_date, source=source)
+        if self.cache and start_date and end_date:
+            return await self._get_cached_market_data(self.cache, filters, start_date, end_date)
+        return await self._load_market_data(filters)
+
+    async def get_stored_dates(
+        self,
+        symbols: Sequence[str],
+        source: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, List[date]]:
+        """Get the dates with a stored bar per symbol for one source, in one query."""
+        if not self.Session:
+            logging.warning("Database not available, returning empty coverage")
+            return {symbol: [] for symbol in symbols}
+        async with await self._get_session() as session:
+            result = await session.execute(self._build_coverage_query(symbols, source, start_date, end_date))
+            rows = result.all()
+        return self._group_stored_dates(symbols, rows)
+
+    async def get_series(
+        self,
+        symbol: str,
+        source: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        resolution: Optional[str] = None
+    ) -> OHLCVSeries:
+        """Get market data for one symbol and source as a columnar series.
+
+        With a resolution, whole buckets are read from the coarsest rollup
+        that can serve it.
+        """
+        if not self.Session:
+            logging.warning("Database not available, returning empty data")
+            return OHLCVSeries.empty(symbol, source)
+
+        filters = QueryFilters(symbol=symbol, start_date=start_date, end_date=end_date, source=source)
+        if resolution is not None:
+            query, timeframe = self._build_resolution_query(filters, resolution)
+            async with await self._get_session() as session:
+                rows = (await session.execute(query)).all()
+            return self._rows_to_resolution(rows, filters, resolution, timeframe)
+        async with await self._get_session() as session:
+            rows = (await session.execute(self._build_series_query(filters))).all()
+        return self._rows_to_series(rows, symbol, source)
+
+    async def get_primary_series(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        resolution: str = '1d'
+    ) -> Optional[OHLCVSeries]:
+        """Get the bars of the source with the most stored bars in the range.
+
+        Bars are read at the resolution through get_series(), so daily and
+        coarser reads come from the rollups when they are enabled. Returns
+        None when the range holds no bars.
+        """
+        if not self.Session:
+            logging.warning("Database not available, returning empty data")
+            return None
+        filters = QueryFilters(symbol=symbol, start_date=start_date, end_date=end_date)
+        async with await self._get_session() as session:
+            source = (await session.execute(self._build_primary_source_query(filters))).scalar()
+        if source is None:
+            return None
+        series = await self.get_series(symbol, source, start_date, end_date, resolution)
+        return series if len(series) else None
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get range cache and per-tier counters, or None when caching is disabled."""
+        if not self.cache:
+            return None
+        stats = self.cache.stats.to_dict()
+        stats['tiers'] = self.cache.get_tier_stats()
+        stats['indicators'] = self.cache.indicator_stats.to_dict()
+        return stats
@@ -0,0 +1,17 @@
+from typing import Union
+
+from ..config import settings
+from .parquet_store import ParquetRepository
+from .repository import DataRepository
+
+STORAGE_BACKEND_SQL = 'sql'
+STORAGE_BACKEND_PARQUET = 'parquet'
+
+
+def create_repository() -> Union[DataRepository, ParquetRepository]:
+    """Create the market data repository selected by STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == STORAGE_BACKEND_PARQUET:
+        return ParquetRepository()
+    if settings.STORAGE_BACKEND != STORAGE_BACKEND_SQL:
+        raise ValueError(f"Unknown STORAGE_BACKEND '{settings.STORAGE_BACKEND}'")
+    return DataRepository()
@@ -1,10 +1,38 @@
+import asyncio
 import json
-from typing import Any, Optional, List, Dict
-from dataclasses import dataclass
-from datetime import datetime
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional, List, Dict, Iterable, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 
 import redis
+import redis.asyncio as redis_asyncio
+from redis.client import NEVER_DECODE
 from ..config import settings
+from .codec import CODEC_JSON, CacheValue, decode_bar, decode_bars, encode_bar, encode_bars
+
+logger = logging.getLogger(__name__)
+
+# Range cache bucket granularities
+BUCKET_DAY = 'day'
+BUCKET_MONTH = 'month'
+ALL_SOURCES = '*'
+
+# Key namespaces whose values can use the binary bar codec
+NAMESPACE_MARKET_DATA = 'market_data'
+NAMESPACE_MARKET_RANGE = 'market_range'
+# Key namespaces of streaming indicator snapshots and cached indicator series
+NAMESPACE_INDICATOR_STATE = 'indicator_state'
+NAMESPACE_INDICATOR = 'indicator'
+
+
+def codec_for(namespace: str) -> str:
+    """Get the configured value codec of a cache namespace."""
+    return settings.CACHE_NAMESPACE_CODECS.get(namespace, CODEC_JSON)
 
 @dataclass
 class MarketDataKey:
@@ -15,7 +43,7 @@ class MarketDataKey:
 
     def to_string(self) -> str:
         """Convert to cache key string."""
-        return f"market_data:{self.symbol}:{self.source}:{self.timestamp.isoformat()}"
+        return f"{NAMESPACE_MARKET_DATA}:{self.symbol}:{self.source}:{self.timestamp.isoformat()}"
 
 @dataclass
 class MarketDataConfig:
@@ -24,20 +52,425 @@ class MarketDataConfig:
     data: Dict[str, Any]
     expiration: int = 3600
 
-class RedisCache:
+def bucket_label(timestamp: datetime, granularity: str = BUCKET_MONTH) -> str:
+    """Get the range cache bucket label containing a timestamp."""
+    if granularity == BUCKET_DAY:
+        return timestamp.strftime('%Y-%m-%d')
+    return timestamp.strftime('%Y-%m')
+
+
+def bucket_bounds(label: str) -> Tuple[datetime, datetime]:
+    """Get the [start, end) datetime bounds of a bucket label."""
+    if len(label) == len('YYYY-MM-DD'):
+        start = datetime.strptime(label, '%Y-%m-%d')
+        return start, start + timedelta(days=1)
+    start = datetime.strptime(label, '%Y-%m')
+    if start.month == 12:
+        return start, start.replace(year=start.year + 1, month=1)
+    return start, start.replace(month=start.month + 1)
+
+
+def buckets_between(
+    start: datetime,
+    end: datetime,
+    granularity: str = BUCKET_MONTH
+) -> List[str]:
+    """List bucket labels covering [start, end] in chronological order."""
+    labels = []
+    label = bucket_label(start, granularity)
+    last = bucket_label(end, granularity)
+    while label <= last:
+        labels.append(label)
+        label = bucket_label(bucket_bounds(label)[1], granularity)
+    return labels
+
+
+@dataclass
+class MarketRangeKey:
+    """Market data range cache key for one (symbol, source, bucket)."""
+    symbol: str
+    source: Optional[str]
+    bucket: str
+
+    def to_string(self) -> str:
+        """Convert to cache key string."""
+        return f"{NAMESPACE_MARKET_RANGE}:{self.symbol}:{self.source or ALL_SOURCES}:{self.bucket}"
+
+
+@dataclass
+class CacheStats:
+    """Range cache hit/miss counters with time spent on each path."""
+    hits: int = 0
+    misses: int = 0
+    cache_read_seconds: float = 0.0
+    db_load_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_read(self, hits: int, misses: int, seconds: float) -> None:
+        """Record one range cache lookup."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.cache_read_seconds += seconds
+
+    def record_db_load(self, seconds: float) -> None:
+        """Record time spent loading missed buckets from the database."""
+        with self._lock:
+            self.db_load_seconds += seconds
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of bucket lookups served from cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export counters, including average cost per hit and per miss."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'cache_read_seconds': self.cache_read_seconds,
+            'db_load_seconds': self.db_load_seconds,
+            'avg_seconds_per_lookup': (
+                self.cache_read_seconds / (self.hits + self.misses)
+                if self.hits + self.misses else 0.0
+            ),
+            'avg_db_seconds_per_miss': self.db_load_seconds / self.misses if self.misses else 0.0
+        }
+
+
+def build_key(key_parts: List[str]) -> str:
+    """Build a namespaced Redis key from parts."""
+    return ':'.join(['portfolio_analyzer'] + key_parts)
+
+
+# Pub/sub channel carrying keys other workers must drop from their local tier
+INVALIDATION_CHANNEL = build_key(['cache', 'invalidate'])
+
+
+@dataclass
+class TierStats:
+    """Lookup and eviction counters for one cache tier."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, hits: int = 0, misses: int = 0) -> None:
+        """Record lookups against this tier."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served by this tier."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export counters."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
+
+
+@dataclass
+class IndicatorCacheStats:
+    """Indicator series cache outcomes per indicator.
+
+    A hit serves a stored series as is, an extension continues a stored
+    series over newer bars and a miss computes it from scratch.
+    """
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, indicator: str, outcome: str) -> None:
+        """Record one lookup with outcome 'hits', 'extensions' or 'misses'."""
+        with self._lock:
+            counts = self.counts.setdefault(indicator, {'hits': 0, 'extensions': 0, 'misses': 0})
+            counts[outcome] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export counters per indicator; the hit ratio counts extensions as hits."""
+        with self._lock:
+            return {
+                indicator: dict(
+                    counts,
+                    hit_ratio=(counts['hits'] + counts['extensions']) / sum(counts.values())
+                )
+                for indicator, counts in self.counts.items()
+            }
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with per-entry TTL.
+
+    Holds decoded values, bounded both by entry count and by the encoded
+    size of the values. Cached values are shared between callers and must
+    be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        self.max_entries = max_entries or settings.LOCAL_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.LOCAL_CACHE_MAX_BYTES
+        self.ttl = ttl or settings.LOCAL_CACHE_TTL
+        self.stats = TierStats()
+        self.bytes = 0
+        # key -> (value, encoded size, monotonic expiry)
+        self._entries: 'OrderedDict[str, Tuple[Any, int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get the unexpired entries among keys, refreshing their recency."""
+        found: Dict[str, Any] = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[2] <= now:
+                    self._pop(key)
+                    self.stats.expirations += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[0]
+        self.stats.record(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries to stay within bounds."""
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            if size > self.max_bytes:
+                return
+            expires = time.monotonic() + min(ttl or self.ttl, self.ttl)
+            self._entries[key] = (value, size, expires)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Drop entries, e.g. after a write or an invalidation message."""
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._pop(key)
+                    self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export counters and current size."""
+        exported = self.stats.to_dict()
+        exported.update({'entries': len(self._entries), 'bytes': self.bytes})
+        return exported
+
+
+def decode_market_ranges(
+    keys: List[MarketRangeKey],
+    values: List[Any]
+) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+    """Decode MGET results into bucket label -> cached bars (None on a miss).
+
+    Values may be JSON written before the binary codec or binary bar blocks.
+    """
+    return {key.bucket: decode_bars(value) for key, value in zip(keys, values)}
+
+
+def _decode_state(value: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode a JSON snapshot, treating corrupt values as missing."""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return None
+
+
+def invalidation_keys(keys: Iterable[MarketRangeKey]) -> List[str]:
+    """Get Redis keys to delete for range keys, including all-sources views."""
+    redis_keys = set()
+    for key in keys:
+        redis_keys.add(build_key([key.to_string()]))
+        redis_keys.add(build_key([MarketRangeKey(key.symbol, None, key.bucket).to_string()]))
+    return sorted(redis_keys)
+
+
+class _TieredCacheBase:
+    """Local tier bookkeeping shared by the sync and async Redis caches.
+
+    With a LocalCache, reads go to the local tier first and fill it from
+    Redis (read-through); writes update Redis and the local tier
+    (write-through). Every writer publishes the written keys, with or
+    without a local tier of its own, so other workers drop their local
+    copies.
+    """
+    local: Optional[LocalCache]
+    redis_stats: TierStats
+    indicator_stats: IndicatorCacheStats
+    instance_id: str
+
+    def _init_tiers(self, local_cache: Optional[LocalCache]) -> None:
+        self.local = local_cache
+        self.redis_stats = TierStats()
+        self.indicator_stats = IndicatorCacheStats()
+        self.instance_id = uuid.uuid4().hex
+
+    def _publish_invalidation(self, pipe: Any, redis_keys: List[str]) -> None:
+        """Queue an invalidation message for other workers on a Redis pipeline."""
+        if redis_keys:
+            message = json.dumps({'origin': self.instance_id, 'keys': redis_keys})
+            pipe.publish(INVALIDATION_CHANNEL, message)
+
+    def _handle_invalidation(self, data: Any) -> None:
+        """Drop keys named in an invalidation message from another worker."""
+        if self.local is None:
+            return
+        try:
+            message = json.loads(data)
+        except (TypeError, json.JSONDecodeError):
+            return
+        if message.get('origin') != self.instance_id:
+            self.local.delete(message.get('keys', []))
+
+    def disable_local_tier(self, error: Exception) -> None:
+        """Disable the local tier once invalidations can no longer be received."""
+        logger.warning(f"Cache invalidation listener failed: {str(error)}. Local cache tier disabled.")
+        if self.local is not None:
+            self.local.clear()
+        self.local = None
+
+    def _fill_local(
+        self,
+        remote: List[Tuple[MarketRangeKey, str]],
+        values: List[Any]
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """Decode range buckets read from Redis and keep hits in the local tier."""
+        decoded = decode_market_ranges([key for key, _ in remote], values)
+        hits = 0
+        for (key, redis_key), value in zip(remote, values):
+            if decoded[key.bucket] is not None:
+                hits += 1
+                if self.local is not None:
+                    self.local.set(redis_key, decoded[key.bucket], len(value))
+        self.redis_stats.record(hits=hits, misses=len(remote) - hits)
+        return decoded
+
+    def _decode_market_data(self, redis_key: str, payload: Optional[CacheValue]) -> Optional[Dict[str, Any]]:
+        """Decode a cached bar read from Redis and keep it in the local tier."""
+        bar = decode_bar(payload)
+        self.redis_stats.record(hits=int(bar is not None), misses=int(bar is None))
+        if bar is not None and payload is not None and self.local is not None:
+            self.local.set(redis_key, bar, len(payload))
+        return bar
+
+    def _local_market_data(self, redis_key: str) -> Optional[Dict[str, Any]]:
+        if self.local is None:
+            return None
+        return self.local.get_many([redis_key]).get(redis_key)
+
+    def _local_write(
+        self,
+        ranges: Dict[str, List[Dict[str, Any]]],
+        symbol: str,
+        source: Optional[str],
+        expiration: int
+    ) -> List[Tuple[str, CacheValue]]:
+        """Encode range buckets for Redis, writing them through to the local tier."""
+        encoded = []
+        for bucket, bars in ranges.items():
+            redis_key = build_key([MarketRangeKey(symbol, source, bucket).to_string()])
+            value = encode_bars(bars, codec_for(NAMESPACE_MARKET_RANGE))
+            if self.local is not None:
+                self.local.set(redis_key, bars, len(value), expiration)
+            encoded.append((redis_key, value))
+        return encoded
+
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Get hit ratios and eviction counts per cache tier."""
+        return {
+            'local': self.local.to_dict() if self.local is not None else None,
+            'redis': self.redis_stats.to_dict()
+        }
+
+
+class RedisCache(_TieredCacheBase):
     """Redis cache implementation."""
     
-    def __init__(self) -> None:
-        self.redis = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
+    def __init__(
+        self,
+        connection_pool: Optional[redis.ConnectionPool] = None,
+        local_cache: Optional[LocalCache] = None
+    ) -> None:
+        if connection_pool is not None:
+            self.redis = redis.Redis(connection_pool=connection_pool)
+        else:
+            self.redis = redis.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                decode_responses=True
+            )
+        self.stats = CacheStats()
+        self._init_tiers(local_cache)
+        self._listener: Optional[Any] = None
+
+    def start_invalidation_listener(self) -> None:
+        """Subscribe to invalidations from other workers on a background thread."""
+        if self.local is None or self._listener is not None:
+            return
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: lambda message: self._handle_invalidation(message['data'])})
+        self._listener = pubsub.run_in_thread(
+            sleep_time=1.0,
+            daemon=True,
+            exception_handler=self._on_listener_error
         )
+
+    def _on_listener_error(self, error: Exception, pubsub: Any, thread: Any) -> None:
+        thread.stop()
+        self._listener = None
+        self.disable_local_tier(error)
+
+    def close(self) -> None:
+        """Stop the invalidation listener and disconnect all pooled connections."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self.redis.connection_pool.disconnect()
         
     def _build_key(self, key_parts: List[str]) -> str:
         """Build Redis key from parts."""
-        return ':'.join(['portfolio_analyzer'] + key_parts)
+        return build_key(key_parts)
         
     def get(self, key: str) -> Optional[str]:
         """Get value from cache."""
@@ -47,24 +480,35 @@ class RedisCache:
     def set(
         self,
         key: str,
-        value: str,
+        value: CacheValue,
         expiration: Optional[int] = None
     ) -> None:
         """Set value in cache with optional expiration in seconds."""
-        self.redis.set(
-            self._build_key([key]),
-            value,
-            ex=expiration
-        )
+        redis_key = self._build_key([key])
+        if self.local is not None:
+            self.local.delete([redis_key])
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(redis_key, value, ex=expiration)
+        self._publish_invalidation(pipe, [redis_key])
+        pipe.execute()
         
     def get_json(self, key: str) -> Optional[Any]:
-        """Get JSON value from cache."""
+        """Get JSON value from the local tier, falling back to Redis."""
+        redis_key = self._build_key([key])
+        if self.local is not None:
+            found = self.local.get_many([redis_key])
+            if redis_key in found:
+                return found[redis_key]
         value = self.get(key)
+        self.redis_stats.record(hits=int(bool(value)), misses=int(not value))
         if value:
             try:
-                return json.loads(value)
+                decoded = json.loads(value)
             except json.JSONDecodeError:
                 return None
+            if self.local is not None:
+                self.local.set(redis_key, decoded, len(value))
+            return decoded
         return None
         
     def set_json(
@@ -74,7 +518,10 @@ class RedisCache:
         expiration: Optional[int] = None
     ) -> None:
         """Set JSON value in cache."""
-        self.set(key, json.dumps(value), expiration)
+        encoded = json.dumps(value)
+        self.set(key, encoded, expiration)
+        if self.local is not None:
+            self.local.set(self._build_key([key]), value, len(encoded), expiration)
         
     def get_market_data(
         self,
@@ -82,14 +529,86 @@ class RedisCache:
         source: str,
         timestamp: datetime
     ) -> Optional[Dict[str, Any]]:
-        """Get market data from cache."""
-        key = MarketDataKey(symbol, source, timestamp)
-        return self.get_json(key.to_string())
+        """Get market data from cache, whichever codec wrote it."""
+        redis_key = self._build_key([MarketDataKey(symbol, source, timestamp).to_string()])
+        cached = self._local_market_data(redis_key)
+        if cached is not None:
+            return cached
+        payload = self.redis.execute_command('GET', redis_key, **{NEVER_DECODE: True})
+        return self._decode_market_data(redis_key, payload)
         
     def set_market_data(self, config: MarketDataConfig) -> None:
         """Cache market data."""
-        self.set_json(config.key.to_string(), config.data, config.expiration)
-        
+        self.set(
+            config.key.to_string(),
+            encode_bar(config.data, codec_for(NAMESPACE_MARKET_DATA)),
+            config.expiration
+        )
+
+    def set_market_data_many(self, configs: List[MarketDataConfig]) -> None:
+        """Cache many market data entries in a single pipelined round trip."""
+        if not configs:
+            return
+        codec = codec_for(NAMESPACE_MARKET_DATA)
+        redis_keys = [self._build_key([config.key.to_string()]) for config in configs]
+        if self.local is not None:
+            self.local.delete(redis_keys)
+        pipe = self.redis.pipeline(transaction=False)
+        for redis_key, config in zip(redis_keys, configs):
+            pipe.set(redis_key, encode_bar(config.data, codec), ex=config.expiration)
+        self._publish_invalidation(pipe, redis_keys)
+        pipe.execute()
+
+    def get_market_ranges(
+        self,
+        keys: List[MarketRangeKey]
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """Get cached bucket contents for many range keys with one MGET.
+
+        Returns a mapping of bucket label to its cached bars, or None on a miss.
+        """
+        if not keys:
+            return {}
+        redis_keys = [self._build_key([key.to_string()]) for key in keys]
+        local = self.local.get_many(redis_keys) if self.local is not None else {}
+        remote = [(key, redis_key) for key, redis_key in zip(keys, redis_keys) if redis_key not in local]
+        result = {key.bucket: local[redis_key] for key, redis_key in zip(keys, redis_keys) if redis_key in local}
+        if remote:
+            # Binary bar blocks must not go through the client's UTF-8 decoding
+            values = self.redis.execute_command('MGET', *(redis_key for _, redis_key in remote), **{NEVER_DECODE: True})
+            result.update(self._fill_local(remote, values))
+        return result
+
+    def set_market_ranges(
+        self,
+        ranges: Dict[str, List[Dict[str, Any]]],
+        symbol: str,
+        source: Optional[str],
+        expiration: Optional[int] = None
+    ) -> None:
+        """Cache complete bucket contents in a single pipelined round trip."""
+        if not ranges:
+            return
+        expiration = expiration or settings.MARKET_DATA_CACHE_TTL
+        encoded = self._local_write(ranges, symbol, source, expiration)
+        pipe = self.redis.pipeline(transaction=False)
+        for redis_key, value in encoded:
+            pipe.set(redis_key, value, ex=expiration)
+        self._publish_invalidation(pipe, [redis_key for redis_key, _ in encoded])
+        pipe.execute()
+
+    def invalidate_market_ranges(self, keys: Iterable[MarketRangeKey]) -> None:
+        """Drop cached buckets, including the all-sources view of each bucket."""
+        redis_keys = invalidation_keys(keys)
+        if not redis_keys:
+            return
+        if self.local is not None:
+            self.local.delete(redis_keys)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(*redis_keys)
+        self._publish_invalidation(pipe, redis_keys)
+        pipe.execute()
+
     def get_search_results(
         self,
         query: str,
@@ -108,4 +627,190 @@ class RedisCache:
     ) -> None:
         """Cache symbol search results."""
         key = f"search:{query}:{source}"
-        self.set_json(key, results, expiration)
\ No newline at end of file
+        self.set_json(key, results, expiration)
+
+    def get_indicator_state(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a streaming indicator snapshot.
+
+        Snapshots change on every bar, so they skip the local tier and are
+        always read from Redis.
+        """
+        return _decode_state(self.get(f"{NAMESPACE_INDICATOR_STATE}:{key}"))
+
+    def set_indicator_state(
+        self,
+        key: str,
+        state: Dict[str, Any],
+        expiration: Optional[int] = None
+    ) -> None:
+        """Store a streaming indicator snapshot for any worker to resume."""
+        self.redis.set(
+            self._build_key([f"{NAMESPACE_INDICATOR_STATE}:{key}"]),
+            json.dumps(state),
+            ex=expiration or settings.INDICATOR_STATE_TTL
+        )
+
+
+class AsyncRedisCache(_TieredCacheBase):
+    """Asyncio Redis cache sharing the key layout of RedisCache."""
+
+    def __init__(
+        self,
+        connection_pool: Optional[redis_asyncio.ConnectionPool] = None,
+        local_cache: Optional[LocalCache] = None
+    ) -> None:
+        if connection_pool is not None:
+            self.redis = redis_asyncio.Redis(connection_pool=connection_pool)
+        else:
+            self.redis = redis_asyncio.Redis(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                decode_responses=True
+            )
+        self.stats = CacheStats()
+        self._init_tiers(local_cache)
+        self._listener: Optional['asyncio.Task[None]'] = None
+
+    async def start_invalidation_listener(self) -> None:
+        """Subscribe to invalidations from other workers on a background task."""
+        if self.local is None or self._listener is not None:
+            return
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(INVALIDATION_CHANNEL)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub: Any) -> None:
+        try:
+            async for message in pubsub.listen():
+                if message.get('type') == 'message':
+                    self._handle_invalidation(message['data'])
+        except redis.RedisError as e:
+            self.disable_local_tier(e)
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        """Stop the invalidation listener, close the client and disconnect pooled connections."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.redis.aclose()
+        await self.redis.connection_pool.disconnect()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get value from cache."""
+        result = await self.redis.get(build_key([key]))
+        return result if isinstance(result, str) else None
+
+    async def set(
+        self,
+        key: str,
+        value: CacheValue,
+        expiration: Optional[int] = None
+    ) -> None:
+        """Set value in cache with optional expiration in seconds."""
+        redis_key = build_key([key])
+        if self.local is not None:
+            self.local.delete([redis_key])
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(redis_key, value, ex=expiration)
+            self._publish_invalidation(pipe, [redis_key])
+            await pipe.execute()
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        """Get JSON value from the local tier, falling back to Redis."""
+        redis_key = build_key([key])
+        if self.local is not None:
+            found = self.local.get_many([redis_key])
+            if redis_key in found:
+                return found[redis_key]
+        value = await self.get(key)
+        self.redis_stats.record(hits=int(bool(value)), misses=int(not value))
+        if value:
+            try:
+                decoded = json.loads(value)
+            except json.JSONDecodeError:
+                return None
+            if self.local is not None:
+                self.local.set(redis_key, decoded, len(value))
+            return decoded
+        return None
+
+    async def set_json(
+        self,
+        key: str,
+        value: Any,
+        expiration: Optional[int] = None
+    ) -> None:
+        """Set JSON value in cache."""
+        encoded = json.dumps(value)
+        await self.set(key, encoded, expiration)
+        if self.local is not None:
+            self.local.set(build_key([key]), value, len(encoded), expiration)
+
+    async def get_market_ranges(
+        self,
+        keys: List[MarketRangeKey]
+    ) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """Get cached bucket contents for many range keys with one MGET."""
+        if not keys:
+            return {}
+        redis_keys = [build_key([key.to_string()]) for key in keys]
+        local = self.local.get_many(redis_keys) if self.local is not None else {}
+        remote = [(key, redis_key) for key, redis_key in zip(keys, redis_keys) if redis_key not in local]
+        result = {key.bucket: local[redis_key] for key, redis_key in zip(keys, redis_keys) if redis_key in local}
+        if remote:
+            values = await self.redis.execute_command(
+                'MGET', *(redis_key for _, redis_key in remote), **{NEVER_DECODE: True}
+            )
+            result.update(self._fill_local(remote, values))
+        return result
+
+    async def set_market_ranges(
+        self,
+        ranges: Dict[str, List[Dict[str, Any]]],
+        symbol: str,
+        source: Optional[str],
+        expiration: Optional[int] = None
+    ) -> None:
+        """Cache complete bucket contents in a single pipelined round trip."""
+        if not ranges:
+            return
+        expiration = expiration or settings.MARKET_DATA_CACHE_TTL
+        encoded = self._local_write(ranges, symbol, source, expiration)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for redis_key, value in encoded:
+                pipe.set(redis_key, value, ex=expiration)
+            self._publish_invalidation(pipe, [redis_key for redis_key, _ in encoded])
+            await pipe.execute()
+
+    async def invalidate_market_ranges(self, keys: Iterable[MarketRangeKey]) -> None:
+        """Drop cached buckets, including the all-sources view of each bucket."""
+        redis_keys = invalidation_keys(keys)
+        if not redis_keys:
+            return
+        if self.local is not None:
+            self.local.delete(redis_keys)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*redis_keys)
+            self._publish_invalidation(pipe, redis_keys)
+            await pipe.execute()
+
+    async def get_indicator_state(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a streaming indicator snapshot, always from Redis."""
+        return _decode_state(await self.get(f"{NAMESPACE_INDICATOR_STATE}:{key}"))
+
+    async def set_indicator_state(
+        self,
+        key: str,
+        state: Dict[str, Any],
+        expiration: Optional[int] = None
+    ) -> None:
+        """Store a streaming indicator snapshot for any worker to resume."""
+        await self.redis.set(
+            build_key([f"{NAMESPACE_INDICATOR_STATE}:{key}"]),
+            json.dumps(state),
+            ex=expiration or settings.INDICATOR_STATE_TTL
+        )
@@ -0,0 +1,159 @@
+import json
+import struct
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Cache value encodings selectable per namespace
+CODEC_JSON = 'json'
+CODEC_BINARY = 'binary'
+
+# Binary bar block layout (version 1, little endian):
+#   header    magic, version, metadata encoding, bar count, metadata length
+#   metadata  {"symbol": str, "sources": [str, ...]} as JSON
+#   columns   source index uint16, timestamp int64 (ns), open/high/low/close
+#             float64, volume int64 -- each `count` values long
+BAR_BLOCK_MAGIC = b'PABR'
+BAR_BLOCK_VERSION = 1
+_HEADER = struct.Struct('<4sBBII')
+_META_JSON = 0
+_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ('source_index', '<u2'),
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8')
+)
+
+CacheValue = Union[str, bytes]
+
+
+def _unpack_metadata(encoding: int, payload: bytes) -> Dict[str, Any]:
+    # Every worker must decode every block, so metadata is plain JSON only
+    if encoding != _META_JSON:
+        raise ValueError(f"Unsupported bar block metadata encoding {encoding}")
+    return json.loads(payload)
+
+
+def _timestamp_ns(value: Any) -> int:
+    """Get naive wall-clock nanoseconds from a datetime or ISO string."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int(np.datetime64(value.replace(tzinfo=None), 'ns').astype(np.int64))
+
+
+def pack_bars(bars: List[Dict[str, Any]]) -> bytes:
+    """Pack bar dicts of one symbol into a fixed-width binary block."""
+    sources: Dict[str, int] = {}
+    source_index = [sources.setdefault(bar['source'], len(sources)) for bar in bars]
+    metadata = json.dumps({
+        'symbol': bars[0]['symbol'] if bars else '',
+        'sources': list(sources)
+    }).encode()
+    columns = {
+        'source_index': source_index,
+        'timestamp': [_timestamp_ns(bar['timestamp']) for bar in bars],
+        'open': [bar['open'] for bar in bars],
+        'high': [bar['high'] for bar in bars],
+        'low': [bar['low'] for bar in bars],
+        'close': [bar['close'] for bar in bars],
+        'volume': [bar['volume'] for bar in bars]
+    }
+    parts = [_HEADER.pack(BAR_BLOCK_MAGIC, BAR_BLOCK_VERSION, _META_JSON, len(bars), len(metadata)), metadata]
+    parts.extend(np.asarray(columns[name], dtype=dtype).tobytes() for name, dtype in _COLUMNS)
+    return b''.join(parts)
+
+
+def unpack_bar_columns(payload: bytes) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Unpack a binary block into its metadata and zero-copy column arrays."""
+    magic, version, encoding, count, metadata_length = _HEADER.unpack_from(payload)
+    if magic != BAR_BLOCK_MAGIC:
+        raise ValueError("Not a binary bar block")
+    if version != BAR_BLOCK_VERSION:
+        raise ValueError(f"Unsupported bar block version {version}")
+    offset = _HEADER.size
+    metadata = _unpack_metadata(encoding, payload[offset:offset + metadata_length])
+    offset += metadata_length
+    columns: Dict[str, np.ndarray] = {}
+    for name, dtype in _COLUMNS:
+        columns[name] = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        offset += columns[name].nbytes
+    return metadata, columns
+
+
+def unpack_bars(payload: bytes) -> List[Dict[str, Any]]:
+    """Unpack a binary block into bar dicts accepted by MarketData(**bar)."""
+    metadata, columns = unpack_bar_columns(payload)
+    symbol = metadata['symbol']
+    sources = metadata['sources']
+    timestamps = columns['timestamp'].view('datetime64[ns]').astype('datetime64[us]').tolist()
+    return [
+        {
+            'symbol': symbol,
+            'timestamp': timestamp,
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume,
+            'source': sources[index]
+        }
+        for index, timestamp, open_, high, low, close, volume in zip(
+            columns['source_index'].tolist(),
+            timestamps,
+            columns['open'].tolist(),
+            columns['high'].tolist(),
+            columns['low'].tolist(),
+            columns['close'].tolist(),
+            columns['volume'].tolist()
+        )
+    ]
+
+
+def is_bar_block(payload: Any) -> bool:
+    """Check whether a cached value is a binary bar block."""
+    return isinstance(payload, bytes) and payload[:len(BAR_BLOCK_MAGIC)] == BAR_BLOCK_MAGIC
+
+
+def encode_bars(bars: List[Dict[str, Any]], codec: str = CODEC_JSON) -> CacheValue:
+    """Encode a bar range for the cache with the given codec."""
+    if codec == CODEC_BINARY:
+        return pack_bars(bars)
+    return json.dumps(bars)
+
+
+def decode_bars(payload: Optional[CacheValue]) -> Optional[List[Dict[str, Any]]]:
+    """Decode a cached bar range written by either codec; None if missing or corrupt."""
+    if payload is None:
+        return None
+    try:
+        if is_bar_block(payload):
+            return unpack_bars(payload)  # type: ignore[arg-type]
+        decoded = json.loads(payload)
+    except (ValueError, KeyError, IndexError, struct.error):
+        return None
+    return decoded if isinstance(decoded, list) else None
+
+
+def encode_bar(bar: Dict[str, Any], codec: str = CODEC_JSON) -> CacheValue:
+    """Encode a single cached bar with the given codec."""
+    if codec == CODEC_BINARY:
+        return pack_bars([bar])
+    return json.dumps(bar)
+
+
+def decode_bar(payload: Optional[CacheValue]) -> Optional[Dict[str, Any]]:
+    """Decode a single cached bar written by either codec; None if missing or corrupt."""
+    if payload is None:
+        return None
+    try:
+        if is_bar_block(payload):
+            bars = unpack_bars(payload)  # type: ignore[arg-type]
+            return bars[0] if bars else None
+        decoded = json.loads(payload)
+    except (ValueError, KeyError, IndexError, struct.error):
+        return None
+    return decoded if isinstance(decoded, dict) else None
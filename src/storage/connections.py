@@ -0,0 +1,202 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as redis_asyncio
+from sqlalchemy import create_engine, event, Engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, Session
+
+from ..config import settings
+from .models import Base
+from .schema import ensure_month_partitions
+from .cache import AsyncRedisCache, LocalCache, RedisCache
+
+
+@dataclass
+class StorageResources:
+    """Process-wide database and cache connection pools."""
+    engine: Optional[Engine]
+    session_factory: Optional[sessionmaker[Session]]
+    cache: Optional[RedisCache]
+
+    def close(self) -> None:
+        """Dispose of the engine pool and disconnect pooled Redis connections."""
+        if self.engine is not None:
+            self.engine.dispose()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _engine_pool_options(database_url: str) -> Dict[str, Any]:
+    """Get connection pool options for a database URL."""
+    if make_url(database_url).get_backend_name() == 'sqlite':
+        # SQLite pool classes are chosen by the dialect and reject QueuePool sizing
+        return {}
+    return {
+        'pool_size': settings.DB_POOL_SIZE,
+        'max_overflow': settings.DB_MAX_OVERFLOW,
+        'pool_timeout': settings.DB_POOL_TIMEOUT,
+        'pool_recycle': settings.DB_POOL_RECYCLE,
+        'pool_pre_ping': True
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Tune every new SQLite connection for concurrent reads and bulk writes."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    except Exception as e:
+        # Tuning only; the connection still works with SQLite defaults
+        logging.warning(f"Failed to apply SQLite pragmas: {str(e)}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite_engine(engine: Engine) -> None:
+    """Apply the SQLITE_* pragmas to connections of a SQLite engine; other engines are untouched."""
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _apply_sqlite_pragmas)
+
+
+def create_database_engine(database_url: str) -> Engine:
+    """Create a pooled engine and ensure the schema exists."""
+    engine = create_engine(database_url, **_engine_pool_options(database_url))
+    configure_sqlite_engine(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def create_redis_pool() -> redis.ConnectionPool:
+    """Create a bounded Redis connection pool."""
+    return redis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        decode_responses=True
+    )
+
+
+def _create_local_cache() -> Optional[LocalCache]:
+    """Create the in-process cache tier used in front of the shared Redis pool.
+
+    It is only safe across workers while invalidations are received, so it
+    is dropped again if the pub/sub listener cannot start.
+    """
+    return LocalCache() if settings.LOCAL_CACHE_ENABLED else None
+
+
+def create_storage_resources() -> StorageResources:
+    """Create engine, session factory and Redis pool once per process."""
+    engine: Optional[Engine] = None
+    session_factory: Optional[sessionmaker[Session]] = None
+    try:
+        if settings.DATABASE_URL is None:
+            raise ValueError("DATABASE_URL is not configured")
+        engine = create_database_engine(settings.DATABASE_URL)
+        session_factory = sessionmaker(bind=engine)
+    except Exception as e:
+        logging.warning(f"Database connection failed: {str(e)}. Data will not be persisted.")
+        engine = None
+    if engine is not None:
+        try:
+            ensure_month_partitions(engine)
+        except Exception as e:
+            logging.warning(f"Failed to create monthly market_data partitions: {str(e)}")
+    cache: Optional[RedisCache] = None
+    try:
+        cache = RedisCache(connection_pool=create_redis_pool(), local_cache=_create_local_cache())
+    except Exception as e:
+        logging.warning(f"Redis connection failed: {str(e)}. Cache will be disabled.")
+    if cache is not None and cache.local is not None:
+        try:
+            cache.start_invalidation_listener()
+        except Exception as e:
+            cache.disable_local_tier(e)
+    return StorageResources(engine=engine, session_factory=session_factory, cache=cache)
+
+
+# Async drivers substituted for the sync drivers configured in DATABASE_URL
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg'
+}
+
+
+def to_async_database_url(database_url: str) -> str:
+    """Convert a sync DATABASE_URL into its aiosqlite/asyncpg equivalent."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def create_async_database_engine(database_url: str) -> AsyncEngine:
+    """Create a pooled async engine for a sync-style DATABASE_URL."""
+    async_url = to_async_database_url(database_url)
+    engine = create_async_engine(async_url, **_engine_pool_options(async_url))
+    configure_sqlite_engine(engine.sync_engine)
+    return engine
+
+
+def create_async_redis_pool() -> redis_asyncio.ConnectionPool:
+    """Create a bounded asyncio Redis connection pool."""
+    return redis_asyncio.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        decode_responses=True
+    )
+
+
+@dataclass
+class AsyncStorageResources:
+    """Process-wide async database and cache connection pools."""
+    engine: Optional[AsyncEngine]
+    session_factory: Optional[async_sessionmaker[AsyncSession]]
+    cache: Optional[AsyncRedisCache]
+
+    async def close(self) -> None:
+        """Dispose of the engine pool and disconnect pooled Redis connections."""
+        if self.engine is not None:
+            await self.engine.dispose()
+        if self.cache is not None:
+            await self.cache.close()
+
+
+async def create_async_storage_resources() -> AsyncStorageResources:
+    """Create async engine, session factory and Redis pool once per process."""
+    engine: Optional[AsyncEngine] = None
+    session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    try:
+        if settings.DATABASE_URL is None:
+            raise ValueError("DATABASE_URL is not configured")
+        engine = create_async_database_engine(settings.DATABASE_URL)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    except Exception as e:
+        logging.warning(f"Database connection failed: {str(e)}. Data will not be persisted.")
+        engine = None
+    cache: Optional[AsyncRedisCache] = None
+    try:
+        cache = AsyncRedisCache(connection_pool=create_async_redis_pool(), local_cache=_create_local_cache())
+    except Exception as e:
+        logging.warning(f"Redis connection failed: {str(e)}. Cache will be disabled.")
+    if cache is not None and cache.local is not None:
+        try:
+            await cache.start_invalidation_listener()
+        except Exception as e:
+            cache.disable_local_tier(e)
+    return AsyncStorageResources(engine=engine, session_factory=session_factory, cache=cache)
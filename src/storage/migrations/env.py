@@ -0,0 +1,64 @@
+"""Alembic environment for the market data schema.
+
+Uses a connection passed in config.attributes['connection'] (see
+src.storage.schema.upgrade_schema) or connects to sqlalchemy.url, falling
+back to settings.DATABASE_URL.
+"""
+
+from logging.config import fileConfig
+from typing import Any
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import Connection
+
+from src.config import settings
+from src.storage.models import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+target_metadata = Base.metadata
+
+
+def _database_url() -> str:
+    url = config.get_main_option('sqlalchemy.url') or settings.DATABASE_URL
+    if not url:
+        raise ValueError("DATABASE_URL is not configured")
+    return url
+
+
+def _configure(**options: Any) -> None:
+    # Batch mode lets SQLite emulate ALTER TABLE by copying the table
+    context.configure(target_metadata=target_metadata, render_as_batch=True, **options)
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting."""
+    _configure(url=_database_url(), literal_binds=True, dialect_opts={'paramstyle': 'named'})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run_with_connection(connection: Connection) -> None:
+    _configure(connection=connection)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on the shared connection or a new one."""
+    connection = config.attributes.get('connection')
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+    engine = create_engine(_database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _run_with_connection(connection)
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
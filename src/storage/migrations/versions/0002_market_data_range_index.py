@@ -0,0 +1,33 @@
+"""Composite (symbol, source, timestamp) index for range queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases stamped at the baseline may already have it from create_all
+    op.create_index(
+        'ix_market_data_symbol_source_timestamp',
+        'market_data',
+        ['symbol', 'source', 'timestamp'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_market_data_symbol_source_timestamp', table_name='market_data', if_exists=True)
@@ -0,0 +1,40 @@
+"""Optional monthly range partitioning of market_data on PostgreSQL
+
+Only runs on PostgreSQL with POSTGRES_PARTITION_BY_MONTH enabled; elsewhere
+it is recorded as applied without changes. To partition later, enable the
+setting, downgrade to 0002 and upgrade again.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 09:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.config import settings
+from src.storage.schema import is_partitioned, partition_market_data, unpartition_market_data
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not settings.POSTGRES_PARTITION_BY_MONTH:
+        return
+    if not is_partitioned(bind):
+        partition_market_data(bind)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if is_partitioned(bind):
+        unpartition_market_data(bind)
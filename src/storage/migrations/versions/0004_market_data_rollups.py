@@ -0,0 +1,49 @@
+"""market_data_rollup table for materialized timeframe aggregates
+
+Existing bars are not rolled up here; run `rebuild-rollups` once after
+upgrading a populated database.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases stamped at the baseline may already have it from create_all
+    if sa.inspect(op.get_bind()).has_table('market_data_rollup'):
+        return
+    op.create_table(
+        'market_data_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('timeframe', sa.String(length=4), nullable=False),
+        sa.Column('symbol', sa.String(length=10), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('open', sa.Float(), nullable=False),
+        sa.Column('high', sa.Float(), nullable=False),
+        sa.Column('low', sa.Float(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('volume', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id', name='market_data_rollup_pkey'),
+        sa.UniqueConstraint('timeframe', 'symbol', 'source', 'bucket_start', name='uix_market_data_rollup_key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('market_data_rollup')
@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Mapped, mapped_column
 
 Base: Any = declarative_base()
 
@@ -24,7 +25,37 @@ class MarketDataModel(Base):  # type: ignore[misc]
     __table_args__ = (
         UniqueConstraint('symbol', 'timestamp', 'source',
                         name='uix_market_data_symbol_timestamp_source'),
+        # Serves symbol + source + timestamp range queries ordered by timestamp
+        Index('ix_market_data_symbol_source_timestamp', 'symbol', 'source', 'timestamp'),
     )
     
     def __repr__(self) -> str:
-        return f"<MarketData(symbol='{self.symbol}', timestamp='{self.timestamp}')>"
\ No newline at end of file
+        return f"<MarketData(symbol='{self.symbol}', timestamp='{self.timestamp}')>"
+
+
+class MarketDataRollupModel(Base):  # type: ignore[misc]
+    """SQLAlchemy model for OHLCV aggregates of market data per timeframe bucket."""
+    __tablename__ = 'market_data_rollup'
+
+    # Mapped columns so rollup filters type as SQL expressions, not bools
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    timeframe: Mapped[str] = mapped_column(String(4), nullable=False)
+    symbol: Mapped[str] = mapped_column(String(10), nullable=False)
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    open: Mapped[float] = mapped_column(Float, nullable=False)
+    high: Mapped[float] = mapped_column(Float, nullable=False)
+    low: Mapped[float] = mapped_column(Float, nullable=False)
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    # Summed volume outgrows a 32-bit integer at weekly and monthly buckets
+    volume: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Also serves timeframe + symbol + source range queries ordered by bucket_start
+        UniqueConstraint('timeframe', 'symbol', 'source', 'bucket_start',
+                         name='uix_market_data_rollup_key'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<MarketDataRollup(timeframe='{self.timeframe}', symbol='{self.symbol}', bucket_start='{self.bucket_start}')>"
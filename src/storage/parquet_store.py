@@ -0,0 +1,235 @@
+import logging
+import os
+import time
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..config import settings
+from ..data_sources.base import MarketData
+from ..data_sources.series import OHLCVSeries
+from .rollups import ceil_datetime, floor_datetime, rollup_series
+
+PART_PREFIX = 'part-'
+PART_SUFFIX = '.parquet'
+
+
+def _import_pyarrow() -> Any:
+    """Import pyarrow and its parquet module, which this backend requires."""
+    try:
+        import pyarrow  # type: ignore[import-untyped]
+        import pyarrow.parquet  # type: ignore[import-untyped]
+    except ImportError as e:
+        raise ImportError("pyarrow is required for the Parquet store: pip install pyarrow") from e
+    return pyarrow
+
+
+def _years(series: OHLCVSeries) -> np.ndarray:
+    """Get the calendar year of every bar."""
+    return series.datetimes.astype('datetime64[Y]').astype(np.int64) + 1970
+
+
+class ParquetRepository:
+    """Columnar market data store on local Parquet files.
+
+    Bars are appended as Parquet files partitioned by source, symbol and
+    year (``source=X/symbol=Y/year=Z/part-*.parquet``). Part names start with
+    their write time, so reading files in name order and keeping the last
+    bar per timestamp gives upsert semantics. Reads are memory-mapped and
+    push the timestamp range down to row group statistics. compact() merges
+    the small files left by appends.
+
+    Exposes the same read/write methods as DataRepository; there is no
+    range cache.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None) -> None:
+        self._pa = _import_pyarrow()
+        self.root = Path(root or settings.PARQUET_STORE_PATH)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.cache = None
+
+    def _partition_dir(self, source: str, symbol: str, year: int) -> Path:
+        return self.root / f"source={source}" / f"symbol={symbol}" / f"year={year}"
+
+    def _sources(self, source: Optional[str]) -> List[str]:
+        """Get the sources to read: the given one, or every stored source."""
+        if source is not None:
+            return [source]
+        return sorted(path.name.split('=', 1)[1] for path in self.root.glob('source=*') if path.is_dir())
+
+    def _part_files(
+        self,
+        source: str,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Path]:
+        """List part files of the year partitions overlapping [start_date, end_date], in write order."""
+        symbol_dir = self.root / f"source={source}" / f"symbol={symbol}"
+        files: List[Path] = []
+        for year_dir in sorted(symbol_dir.glob('year=*')):
+            year = int(year_dir.name.split('=', 1)[1])
+            if start_date and year < start_date.year or end_date and year > end_date.year:
+                continue
+            files.extend(sorted(year_dir.glob(f"{PART_PREFIX}*{PART_SUFFIX}")))
+        return files
+
+    def _new_part_path(self, directory: Path) -> Path:
+        return directory / f"{PART_PREFIX}{time.time_ns():020d}-{uuid.uuid4().hex[:8]}{PART_SUFFIX}"
+
+    def _write_part(self, path: Path, series: OHLCVSeries) -> None:
+        """Write a series to a part file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        self._pa.parquet.write_table(
+            series.to_arrow(),
+            tmp_path,
+            row_group_size=settings.PARQUET_ROW_GROUP_SIZE
+        )
+        os.replace(tmp_path, path)
+
+    def _read_files(
+        self,
+        files: List[Path],
+        symbol: str,
+        source: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> OHLCVSeries:
+        """Read part files with memory mapping and timestamp predicate pushdown."""
+        filters = []
+        if start_date:
+            filters.append(('timestamp', '>=', self._pa.scalar(start_date, self._pa.timestamp('ns'))))
+        if end_date:
+            filters.append(('timestamp', '<=', self._pa.scalar(end_date, self._pa.timestamp('ns'))))
+        parts = []
+        for path in files:
+            try:
+                table = self._pa.parquet.read_table(path, memory_map=True, filters=filters or None)
+            except FileNotFoundError:
+                # Removed by a concurrent compaction; its bars live in the compacted file
+                continue
+            if table.num_rows:
+                parts.append(OHLCVSeries.from_arrow(table, symbol=symbol, source=source))
+        if not parts:
+            return OHLCVSeries.empty(symbol, source)
+        return OHLCVSeries.concat(parts).latest_per_timestamp()
+
+    def save_market_data(self, data: Sequence[MarketData]) -> None:
+        """Save market data as new part files."""
+        self.bulk_save_market_data(data)
+
+    def bulk_save_market_data(
+        self,
+        data: Sequence[MarketData],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """Append bars as one part file per (source, symbol, year) partition.
+
+        Accepts an OHLCVSeries or a MarketData list. batch_size is accepted for
+        DataRepository compatibility; files are written whole. Returns the
+        number of rows written.
+        """
+        written = 0
+        for series in OHLCVSeries.group_market_data(data):
+            if not len(series):
+                continue
+            years = _years(series)
+            for year in np.unique(years):
+                part = series.take(years == year).sort()
+                self._write_part(self._new_part_path(self._partition_dir(series.source, series.symbol, int(year))), part)
+                written += len(part)
+        return written
+
+    def get_series(
+        self,
+        symbol: str,
+        source: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        resolution: Optional[str] = None
+    ) -> OHLCVSeries:
+        """Get market data for one symbol and source as a columnar series.
+
+        With a resolution, whole buckets overlapping the range are
+        aggregated on read; the Parquet store keeps no rollups.
+        """
+        if resolution is not None:
+            start_date = floor_datetime(start_date, resolution) if start_date else None
+            end_date = ceil_datetime(end_date, resolution) if end_date else None
+        files = self._part_files(source, symbol, start_date, end_date)
+        series = self._read_files(files, symbol, source, start_date, end_date)
+        return rollup_series(series, resolution) if resolution is not None else series
+
+    def get_market_data(
+        self,
+        symbol: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        source: Optional[str] = None
+    ) -> List[MarketData]:
+        """Get market data ordered by timestamp, from one or every source."""
+        series = [
+            self.get_series(symbol, name, start_date, end_date) for name in self._sources(source)
+        ]
+        bars = [bar for item in series for bar in item]
+        return sorted(bars, key=lambda bar: bar.timestamp) if len(series) > 1 else bars
+
+    def get_stored_dates(
+        self,
+        symbols: Sequence[str],
+        source: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, List[date]]:
+        """Get the dates with a stored bar per symbol for one source."""
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date, datetime.max.time())
+        stored: Dict[str, List[date]] = {}
+        for symbol in symbols:
+            series = self.get_series(symbol, source, start, end)
+            days = np.unique(series.datetimes.astype('datetime64[D]'))
+            stored[symbol] = days.astype('datetime64[D]').tolist()
+        return stored
+
+    def compact(
+        self,
+        symbol: Optional[str] = None,
+        source: Optional[str] = None,
+        min_files: Optional[int] = None
+    ) -> int:
+        """Merge partitions holding at least min_files part files into one file each.
+
+        The merged file takes the name position of the newest part it
+        replaces, so parts appended during compaction still take precedence.
+        Returns the number of partitions compacted.
+        """
+        min_files = min_files or settings.PARQUET_COMPACT_MIN_FILES
+        compacted = 0
+        for source_name in self._sources(source):
+            source_dir = self.root / f"source={source_name}"
+            symbol_dirs = [source_dir / f"symbol={symbol}"] if symbol else sorted(source_dir.glob('symbol=*'))
+            for symbol_dir in symbol_dirs:
+                symbol_name = symbol_dir.name.split('=', 1)[1]
+                for year_dir in sorted(symbol_dir.glob('year=*')):
+                    files = sorted(year_dir.glob(f"{PART_PREFIX}*{PART_SUFFIX}"))
+                    if len(files) < min_files:
+                        continue
+                    merged = self._read_files(files, symbol_name, source_name)
+                    newest_stamp = files[-1].name[len(PART_PREFIX):].split('-', 1)[0]
+                    target = year_dir / f"{PART_PREFIX}{newest_stamp}-compacted{PART_SUFFIX}"
+                    self._write_part(target, merged)
+                    for path in files:
+                        if path != target:
+                            path.unlink(missing_ok=True)
+                    compacted += 1
+                    logging.info(f"Compacted {len(files)} files in {year_dir}")
+        return compacted
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get range cache counters; the Parquet store has no range cache."""
+        return None
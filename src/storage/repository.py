@@ -1,15 +1,30 @@
-from datetime import datetime
-from typing import List, Optional, Any
+from datetime import date, datetime, time as datetime_time, timedelta
+from typing import Dict, List, Optional, Any, Sequence, Set, Tuple
 import logging
+import time
 from dataclasses import dataclass
+import numpy as np
 from sqlalchemy import create_engine, Engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.sql import select
+from sqlalchemy.sql import delete, func, select
 
 from ..config import settings
 from ..data_sources.base import MarketData
-from .models import Base, MarketDataModel
-from .cache import RedisCache, MarketDataKey, MarketDataConfig
+from ..data_sources.series import OHLCVSeries
+from .models import Base, MarketDataModel, MarketDataRollupModel
+from .connections import StorageResources, configure_sqlite_engine
+from .cache import RedisCache, MarketRangeKey, bucket_bounds, bucket_label, buckets_between
+from .rollups import (
+    bucket_starts, ceil_datetime, choose_rollup, floor_datetime, rollup_series, touched_span, validate_timeframe
+)
+
+# Columns overwritten when a bulk upsert hits an existing (symbol, timestamp, source) row
+UPSERT_UPDATE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+UPSERT_CONFLICT_COLUMNS = ('symbol', 'timestamp', 'source')
+UPSERT_CONSTRAINT_NAME = 'uix_market_data_symbol_timestamp_source'
+ROLLUP_CONFLICT_COLUMNS = ('timeframe', 'symbol', 'source', 'bucket_start')
+ROLLUP_CONSTRAINT_NAME = 'uix_market_data_rollup_key'
 
 @dataclass
 class QueryFilters:
@@ -19,22 +34,366 @@ class QueryFilters:
     end_date: Optional[datetime] = None
     source: Optional[str] = None
 
-class DataRepository:
-    """Data access layer for market data."""
+class RepositoryBase:
+    """SQL statements, row mapping and range cache bookkeeping shared by the
+    sync and async repositories."""
+
+    def _build_upsert_statement(self, dialect_name: str) -> Optional[Any]:
+        """Build a dialect-specific INSERT ... ON CONFLICT DO UPDATE statement."""
+        return self._build_on_conflict_update(
+            dialect_name, MarketDataModel, UPSERT_CONSTRAINT_NAME, UPSERT_CONFLICT_COLUMNS, UPSERT_UPDATE_COLUMNS
+        )
+
+    def _build_rollup_upsert_statement(self, dialect_name: str) -> Optional[Any]:
+        """Build the rollup upsert, replacing a bucket's aggregates on conflict."""
+        return self._build_on_conflict_update(
+            dialect_name, MarketDataRollupModel, ROLLUP_CONSTRAINT_NAME, ROLLUP_CONFLICT_COLUMNS,
+            UPSERT_UPDATE_COLUMNS + ('updated_at',)
+        )
+
+    def _build_on_conflict_update(
+        self,
+        dialect_name: str,
+        model: Any,
+        constraint: str,
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str]
+    ) -> Optional[Any]:
+        """Build INSERT ... ON CONFLICT DO UPDATE for a dialect, or None if unsupported."""
+        if dialect_name == 'postgresql':
+            pg_stmt = postgresql.insert(model)
+            return pg_stmt.on_conflict_do_update(
+                constraint=constraint,
+                set_={column: pg_stmt.excluded[column] for column in update_columns}
+            )
+        if dialect_name == 'sqlite':
+            sqlite_stmt = sqlite.insert(model)
+            return sqlite_stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: sqlite_stmt.excluded[column] for column in update_columns}
+            )
+        return None
+
+    def _to_upsert_row(self, item: MarketData) -> Dict[str, Any]:
+        """Convert MarketData into a parameter row for bulk upserts."""
+        return {
+            'symbol': item.symbol,
+            'timestamp': item.timestamp,
+            'open': item.open,
+            'high': item.high,
+            'low': item.low,
+            'close': item.close,
+            'volume': item.volume,
+            'source': item.source
+        }
+
+    def _to_upsert_rows(self, data: Sequence[MarketData]) -> List[Dict[str, Any]]:
+        """Convert bars into parameter rows, reading series columns directly."""
+        if not isinstance(data, OHLCVSeries):
+            return [self._to_upsert_row(item) for item in data]
+        columns = zip(
+            data.datetimes.astype('datetime64[us]').tolist(),
+            data.open.tolist(),
+            data.high.tolist(),
+            data.low.tolist(),
+            data.close.tolist(),
+            data.volume.tolist()
+        )
+        return [
+            {
+                'symbol': data.symbol,
+                'timestamp': timestamp,
+                'open': open_,
+                'high': high,
+                'low': low,
+                'close': close,
+                'volume': volume,
+                'source': data.source
+            }
+            for timestamp, open_, high, low, close, volume in columns
+        ]
+
+    def _unique_upsert_rows(self, data: Sequence[MarketData]) -> List[Dict[str, Any]]:
+        """Convert bars into parameter rows, keeping the last bar per conflict key.
+
+        One INSERT ... ON CONFLICT DO UPDATE cannot touch a row twice, which
+        overlapping fetch windows or a replayed spill would otherwise cause.
+        """
+        rows = {
+            tuple(row[column] for column in UPSERT_CONFLICT_COLUMNS): row
+            for row in self._to_upsert_rows(data)
+        }
+        return list(rows.values())
+
+    def _build_market_data_query(self, filters: QueryFilters) -> Any:
+        """Build market data query with filters."""
+        query = select(MarketDataModel).where(MarketDataModel.symbol == filters.symbol)
+        
+        if filters.start_date:
+            query = query.where(MarketDataModel.timestamp >= filters.start_date)
+        if filters.end_date:
+            query = query.where(MarketDataModel.timestamp <= filters.end_date)
+        if filters.source:
+            query = query.where(MarketDataModel.source == filters.source)
+            
+        return query.order_by(MarketDataModel.timestamp)
+
+    def _build_series_query(self, filters: QueryFilters) -> Any:
+        """Build a column-only market data query for columnar reads."""
+        query: Any = select(
+            MarketDataModel.timestamp,
+            MarketDataModel.open,
+            MarketDataModel.high,
+            MarketDataModel.low,
+            MarketDataModel.close,
+            MarketDataModel.volume
+        ).where(MarketDataModel.symbol == filters.symbol)
+
+        if filters.start_date:
+            query = query.where(MarketDataModel.timestamp >= filters.start_date)
+        if filters.end_date:
+            query = query.where(MarketDataModel.timestamp <= filters.end_date)
+        if filters.source:
+            query = query.where(MarketDataModel.source == filters.source)
+
+        return query.order_by(MarketDataModel.timestamp)
+
+    def _build_primary_source_query(self, filters: QueryFilters) -> Any:
+        """Build a query for the source holding the most bars of a symbol in a range."""
+        query: Any = select(MarketDataModel.source).where(MarketDataModel.symbol == filters.symbol)
+        if filters.start_date:
+            query = query.where(MarketDataModel.timestamp >= filters.start_date)
+        if filters.end_date:
+            query = query.where(MarketDataModel.timestamp <= filters.end_date)
+        return query.group_by(MarketDataModel.source).order_by(
+            func.count().desc(), MarketDataModel.source
+        ).limit(1)
+
+    def _rows_to_series(self, rows: Sequence[Any], symbol: str, source: str) -> OHLCVSeries:
+        """Build a series from (timestamp, open, high, low, close, volume) rows."""
+        if not rows:
+            return OHLCVSeries.empty(symbol, source)
+        timestamps, open_, high, low, close, volume = zip(*rows)
+        return OHLCVSeries(
+            symbol=symbol,
+            source=source,
+            timestamps=np.array(timestamps, dtype='datetime64[ns]').view(np.int64),
+            open=np.array(open_, dtype=np.float64),
+            high=np.array(high, dtype=np.float64),
+            low=np.array(low, dtype=np.float64),
+            close=np.array(close, dtype=np.float64),
+            volume=np.array(volume, dtype=np.int64)
+        )
+
+    def _rollup_timeframes(self) -> List[str]:
+        """Get the materialized rollup timeframes, or none when rollups are disabled."""
+        if not settings.ROLLUPS_ENABLED:
+            return []
+        return [validate_timeframe(timeframe) for timeframe in settings.ROLLUP_TIMEFRAMES]
+
+    def _rollup_refresh_plan(
+        self,
+        data: Sequence[MarketData],
+        timeframes: Sequence[str]
+    ) -> List[Tuple[QueryFilters, OHLCVSeries]]:
+        """Get, per saved (symbol, source), the bar range covering its touched buckets whole."""
+        plan = []
+        for series in OHLCVSeries.group_market_data(data):
+            if len(series):
+                start, end = touched_span(series, timeframes)
+                plan.append((QueryFilters(series.symbol, start, end, series.source), series))
+        return plan
+
+    def _to_rollup_rows(
+        self,
+        bars: OHLCVSeries,
+        touched: OHLCVSeries,
+        timeframes: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        """Aggregate bars into rollup rows, keeping only the buckets holding a touched bar."""
+        rows = []
+        for timeframe in timeframes:
+            rolled = rollup_series(bars, timeframe)
+            rolled = rolled.take(np.isin(rolled.timestamps, bucket_starts(touched.timestamps, timeframe)))
+            for row in self._to_upsert_rows(rolled):
+                row['bucket_start'] = row.pop('timestamp')
+                row['timeframe'] = timeframe
+                rows.append(row)
+        return rows
+
+    def _resolution_filters(self, filters: QueryFilters, resolution: str) -> QueryFilters:
+        """Widen filters to whole buckets of the resolution."""
+        return QueryFilters(
+            symbol=filters.symbol,
+            start_date=floor_datetime(filters.start_date, resolution) if filters.start_date else None,
+            end_date=ceil_datetime(filters.end_date, resolution) if filters.end_date else None,
+            source=filters.source
+        )
+
+    def _build_resolution_query(self, filters: QueryFilters, resolution: str) -> Tuple[Any, Optional[str]]:
+        """Route a range query to the coarsest rollup that can serve the resolution.
+
+        Returns the query and the timeframe it reads, None meaning raw bars.
+        Rows still need rollup_series() when that timeframe is not the
+        resolution itself.
+        """
+        timeframe = choose_rollup(resolution, self._rollup_timeframes())
+        filters = self._resolution_filters(filters, resolution)
+        if timeframe is None:
+            return self._build_series_query(filters), None
+        query = select(
+            MarketDataRollupModel.bucket_start,
+            MarketDataRollupModel.open,
+            MarketDataRollupModel.high,
+            MarketDataRollupModel.low,
+            MarketDataRollupModel.close,
+            MarketDataRollupModel.volume
+        ).where(
+            MarketDataRollupModel.timeframe == timeframe,
+            MarketDataRollupModel.symbol == filters.symbol,
+            MarketDataRollupModel.source == filters.source
+        )
+        if filters.start_date:
+            query = query.where(MarketDataRollupModel.bucket_start >= filters.start_date)
+        if filters.end_date:
+            query = query.where(MarketDataRollupModel.bucket_start <= filters.end_date)
+        return query.order_by(MarketDataRollupModel.bucket_start), timeframe
+
+    def _rows_to_resolution(
+        self,
+        rows: Sequence[Any],
+        filters: QueryFilters,
+        resolution: str,
+        timeframe: Optional[str]
+    ) -> OHLCVSeries:
+        """Build the series at the requested resolution from raw or rollup rows."""
+        series = self._rows_to_series(rows, filters.symbol, filters.source or '')
+        return series if timeframe == resolution else rollup_series(series, resolution)
+
+    def _build_coverage_query(
+        self,
+        symbols: Sequence[str],
+        source: str,
+        start_date: date,
+        end_date: date
+    ) -> Any:
+        """Build a query for stored bar timestamps of many symbols from one source."""
+        return select(MarketDataModel.symbol, MarketDataModel.timestamp).where(
+            MarketDataModel.symbol.in_(list(symbols)),
+            MarketDataModel.source == source,
+            MarketDataModel.timestamp >= datetime.combine(start_date, datetime_time.min),
+            MarketDataModel.timestamp < datetime.combine(end_date + timedelta(days=1), datetime_time.min)
+        )
+
+    def _group_stored_dates(self, symbols: Sequence[str], rows: Sequence[Any]) -> Dict[str, List[date]]:
+        """Group (symbol, timestamp) rows into sorted distinct dates per symbol."""
+        stored: Dict[str, Set[date]] = {symbol: set() for symbol in symbols}
+        for symbol, timestamp in rows:
+            stored[symbol].add(timestamp.date() if isinstance(timestamp, datetime) else timestamp)
+        return {symbol: sorted(dates) for symbol, dates in stored.items()}
+
+    def _extract_timestamp_value(self, row: MarketDataModel) -> datetime:
+        """Extract datetime value from SQLAlchemy model with type conversion."""
+        timestamp_value = getattr(row, 'timestamp')
+        if isinstance(timestamp_value, str):
+            timestamp_value = datetime.fromisoformat(timestamp_value)
+        elif not isinstance(timestamp_value, datetime):
+            raise TypeError(f"Expected datetime or str, got {type(timestamp_value)}")
+        return timestamp_value
+
+    def _create_market_data(self, row: MarketDataModel) -> MarketData:
+        """Create MarketData instance from database row."""
+        timestamp_value = self._extract_timestamp_value(row)
+        
+        return MarketData(
+            symbol=str(row.symbol),
+            timestamp=timestamp_value,
+            open=float(row.open),
+            high=float(row.high),
+            low=float(row.low),
+            close=float(row.close),
+            volume=int(row.volume),
+            source=str(row.source)
+        )
+
+    def _touched_range_keys(self, data: Sequence[MarketData]) -> List[MarketRangeKey]:
+        """Get the range cache keys touched by a set of bars."""
+        granularity = settings.MARKET_DATA_CACHE_BUCKET
+        if isinstance(data, OHLCVSeries):
+            days = np.unique(data.datetimes.astype('datetime64[D]')).astype('datetime64[us]').tolist()
+            buckets = sorted({bucket_label(day, granularity) for day in days})
+            return [MarketRangeKey(data.symbol, data.source, bucket) for bucket in buckets]
+        keys = {
+            (item.symbol, item.source, bucket_label(item.timestamp, granularity))
+            for item in data
+        }
+        return [MarketRangeKey(*key) for key in sorted(keys)]
+
+    def _bucket_span_filters(self, filters: QueryFilters, buckets: List[str]) -> QueryFilters:
+        """Widen filters to cover complete buckets so they can be cached whole."""
+        return QueryFilters(
+            symbol=filters.symbol,
+            start_date=bucket_bounds(buckets[0])[0],
+            end_date=bucket_bounds(buckets[-1])[1],
+            source=filters.source
+        )
+
+    def _group_into_buckets(
+        self,
+        items: List[MarketData],
+        buckets: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Group bars by bucket label, keeping only the requested buckets."""
+        granularity = settings.MARKET_DATA_CACHE_BUCKET
+        grouped: Dict[str, List[Dict[str, Any]]] = {bucket: [] for bucket in buckets}
+        for item in items:
+            bucket = bucket_label(item.timestamp, granularity)
+            if bucket in grouped:
+                grouped[bucket].append(item.model_dump(mode='json'))
+        return grouped
+
+    def _assemble_range(
+        self,
+        buckets: List[str],
+        cached: Dict[str, Optional[List[Dict[str, Any]]]],
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[MarketData]:
+        """Flatten cached buckets into bars within [start_date, end_date]."""
+        result = []
+        for bucket in buckets:
+            for bar in cached[bucket] or []:
+                item = MarketData(**bar)
+                if start_date <= item.timestamp <= end_date:
+                    result.append(item)
+        return result
+
+class DataRepository(RepositoryBase):
+    """Data access layer for market data.
+
+    Pass shared StorageResources to reuse process-wide pools; without them the
+    repository creates its own engine and Redis client.
+    """
     
-    def __init__(self) -> None:
+    def __init__(self, resources: Optional[StorageResources] = None) -> None:
+        if resources is not None:
+            self.engine: Optional[Engine] = resources.engine
+            self.Session: Optional[sessionmaker[Session]] = resources.session_factory
+            self.cache: Optional[RedisCache] = resources.cache
+            return
         try:
             if settings.DATABASE_URL is None:
                 raise ValueError("DATABASE_URL is not configured")
-            self.engine: Optional[Engine] = create_engine(settings.DATABASE_URL)
+            self.engine = create_engine(settings.DATABASE_URL)
+            configure_sqlite_engine(self.engine)
             Base.metadata.create_all(self.engine)
-            self.Session: Optional[sessionmaker[Session]] = sessionmaker(bind=self.engine)
+            self.Session = sessionmaker(bind=self.engine)
         except Exception as e:
             logging.warning(f"Database connection failed: {str(e)}. Data will not be persisted.")
             self.engine = None
             self.Session = None
         try:
-            self.cache: Optional[RedisCache] = RedisCache()
+            self.cache = RedisCache()
         except Exception as e:
             logging.warning(f"Redis connection failed: {str(e)}. Cache will be disabled.")
             self.cache = None
@@ -45,7 +404,7 @@ class DataRepository:
             raise ValueError("Database session is not available")
         return self.Session()
         
-    def save_market_data(self, data: List[MarketData]) -> None:
+    def save_market_data(self, data: Sequence[MarketData]) -> None:
         """Save market data to database and cache."""
         if not self.Session:
             logging.warning("Database not available, skipping data save")
@@ -65,70 +424,147 @@ class DataRepository:
                 )
                 session.merge(model)
                 
-                # Cache the data if cache is available
-                if self.cache:
-                    key = MarketDataKey(item.symbol, item.source, item.timestamp)
-                    config = MarketDataConfig(key=key, data=item.model_dump())
-                    self.cache.set_market_data(config)
-                
             session.commit()
-            
-    def _build_market_data_query(self, session: Session, filters: QueryFilters) -> Any:
-        """Build market data query with filters."""
-        query = select(MarketDataModel).where(MarketDataModel.symbol == filters.symbol)
-        
-        if filters.start_date:
-            query = query.where(MarketDataModel.timestamp >= filters.start_date)
-        if filters.end_date:
-            query = query.where(MarketDataModel.timestamp <= filters.end_date)
-        if filters.source:
-            query = query.where(MarketDataModel.source == filters.source)
-            
-        return query.order_by(MarketDataModel.timestamp)
+        self._invalidate_cached_ranges(data)
+        self._refresh_rollups(data)
 
-    def _extract_timestamp_value(self, row: MarketDataModel) -> datetime:
-        """Extract datetime value from SQLAlchemy model with type conversion."""
-        timestamp_value = getattr(row, 'timestamp')
-        if isinstance(timestamp_value, str):
-            timestamp_value = datetime.fromisoformat(timestamp_value)
-        elif not isinstance(timestamp_value, datetime):
-            raise TypeError(f"Expected datetime or str, got {type(timestamp_value)}")
-        return timestamp_value
+    def _invalidate_cached_ranges(self, data: Sequence[MarketData]) -> None:
+        """Invalidate every cached range bucket touched by the given bars."""
+        if not self.cache or not data:
+            return
+        self.cache.invalidate_market_ranges(self._touched_range_keys(data))
 
-    def _create_market_data(self, row: MarketDataModel) -> MarketData:
-        """Create MarketData instance from database row."""
-        timestamp_value = self._extract_timestamp_value(row)
-        
-        return MarketData(
-            symbol=str(row.symbol),
-            timestamp=timestamp_value,
-            open=float(row.open),
-            high=float(row.high),
-            low=float(row.low),
-            close=float(row.close),
-            volume=int(row.volume),
-            source=str(row.source)
-        )
+    def bulk_save_market_data(
+        self,
+        data: Sequence[MarketData],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """Bulk upsert market data in chunked INSERT ... ON CONFLICT batches.
 
-    def _get_or_create_market_data(self, row: MarketDataModel) -> MarketData:
-        """Get data from cache or create from DB row."""
-        timestamp_value = self._extract_timestamp_value(row)
-        
-        if self.cache:
-            key = MarketDataKey(str(row.symbol), str(row.source), timestamp_value)
-            cached_data = self.cache.get_market_data(str(row.symbol), str(row.source), timestamp_value)
-            
-            if cached_data:
-                return MarketData(**cached_data)
-                
-        data = self._create_market_data(row)
-        
-        if self.cache:
-            key = MarketDataKey(str(row.symbol), str(row.source), timestamp_value)
-            config = MarketDataConfig(key=key, data=data.model_dump())
-            self.cache.set_market_data(config)
+        Accepts an OHLCVSeries or a MarketData list; series rows are built
+        straight from the column arrays. Each chunk is committed separately
+        and its cached range buckets are invalidated with a single Redis call.
+        Dialects without ON CONFLICT support fall back to save_market_data.
+        Returns the number of rows written.
+        """
+        if not self.Session or self.engine is None:
+            logging.warning("Database not available, skipping data save")
+            return 0
+
+        stmt = self._build_upsert_statement(self.engine.dialect.name)
+        if stmt is None:
+            self.save_market_data(data)
+            return len(data)
+
+        batch_size = batch_size or settings.BULK_UPSERT_BATCH_SIZE
+        written = 0
+        with self._get_session() as session:
+            for offset in range(0, len(data), batch_size):
+                batch = data[offset:offset + batch_size]
+                rows = self._unique_upsert_rows(batch)
+                session.execute(stmt, rows)
+                session.commit()
+                self._invalidate_cached_ranges(batch)
+                written += len(rows)
+        self._refresh_rollups(data)
+        return written
+
+    def _refresh_rollups(self, data: Sequence[MarketData]) -> None:
+        """Recompute the rollup buckets touched by saved bars.
+
+        Each touched (symbol, source) reloads only the bars of its touched
+        buckets. Failures are logged and leave the saved bars in place.
+        """
+        timeframes = self._rollup_timeframes()
+        if not timeframes or not data or self.engine is None:
+            return
+        stmt = self._build_rollup_upsert_statement(self.engine.dialect.name)
+        if stmt is None:
+            return
+        try:
+            with self._get_session() as session:
+                for filters, touched in self._rollup_refresh_plan(data, timeframes):
+                    rows = session.execute(self._build_series_query(filters)).all()
+                    bars = self._rows_to_series(rows, touched.symbol, touched.source)
+                    rollup_rows = self._to_rollup_rows(bars, touched, timeframes)
+                    if rollup_rows:
+                        session.execute(stmt, rollup_rows)
+                session.commit()
+        except Exception as e:
+            logging.warning(f"Rollup refresh failed: {str(e)}")
+
+    def rebuild_rollups(self, symbols: Optional[Sequence[str]] = None) -> int:
+        """Recompute every rollup bucket from the stored bars.
+
+        Use after enabling rollups on a populated database. Returns the
+        number of buckets written.
+        """
+        timeframes = self._rollup_timeframes()
+        if not self.Session or self.engine is None or not timeframes:
+            return 0
+        stmt = self._build_rollup_upsert_statement(self.engine.dialect.name)
+        if stmt is None:
+            logging.warning(f"Rollups are not supported on {self.engine.dialect.name}")
+            return 0
+        query: Any = select(MarketDataModel.symbol, MarketDataModel.source).distinct()
+        if symbols:
+            query = query.where(MarketDataModel.symbol.in_(list(symbols)))
+        written = 0
+        with self._get_session() as session:
+            for symbol, source in session.execute(query).all():
+                rows = session.execute(self._build_series_query(QueryFilters(symbol, source=source))).all()
+                bars = self._rows_to_series(rows, symbol, source)
+                session.execute(delete(MarketDataRollupModel).where(
+                    MarketDataRollupModel.symbol == symbol,
+                    MarketDataRollupModel.source == source
+                ))
+                rollup_rows = self._to_rollup_rows(bars, bars, timeframes)
+                if rollup_rows:
+                    session.execute(stmt, rollup_rows)
+                session.commit()
+                written += len(rollup_rows)
+        return written
             
-        return data
+    def _load_market_data(self, filters: QueryFilters) -> List[MarketData]:
+        """Load market data matching filters straight from the database."""
+        with self._get_session() as session:
+            query = self._build_market_data_query(filters)
+            rows = session.execute(query).scalars()
+            return [self._create_market_data(row) for row in rows]
+
+    def _load_range_buckets(
+        self,
+        filters: QueryFilters,
+        buckets: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Load complete bucket contents for cache misses in one SQL query."""
+        items = self._load_market_data(self._bucket_span_filters(filters, buckets))
+        return self._group_into_buckets(items, buckets)
+
+    def _get_cached_market_data(
+        self,
+        cache: RedisCache,
+        filters: QueryFilters,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[MarketData]:
+        """Serve a bounded range from bucket-level cache, filling misses from the database."""
+        buckets = buckets_between(start_date, end_date, settings.MARKET_DATA_CACHE_BUCKET)
+        keys = [MarketRangeKey(filters.symbol, filters.source, bucket) for bucket in buckets]
+
+        started = time.perf_counter()
+        cached = cache.get_market_ranges(keys)
+        missing = [bucket for bucket in buckets if cached.get(bucket) is None]
+        cache.stats.record_read(len(buckets) - len(missing), len(missing), time.perf_counter() - started)
+
+        if missing:
+            started = time.perf_counter()
+            loaded = self._load_range_buckets(filters, missing)
+            cache.stats.record_db_load(time.perf_counter() - started)
+            cache.set_market_ranges(loaded, filters.symbol, filters.source)
+            cached.update(loaded)
+
+        return self._assemble_range(buckets, cached, start_date, end_date)
 
     def get_market_data(
         self,
@@ -137,13 +573,69 @@ class DataRepository:
         end_date: Optional[datetime] = None,
         source: Optional[str] = None
     ) -> List[MarketData]:
-        """Get market data from database."""
+        """Get market data from cache or database.
+
+        Bounded ranges are served from the bucket-level range cache when it is
+        available; open-ended ranges always go to the database.
+        """
         if not self.Session:
             logging.warning("Database not available, returning empty data")
             return []
             
+        filters = QueryFilters(symbol=symbol, start_date=start_date, end_date=end_date, source=source)
+        if self.cache and start_date and end_date:
+            return self._get_cached_market_data(self.cache, filters, start_date, end_date)
+        return self._load_market_data(filters)
+
+    def get_stored_dates(
+        self,
+        symbols: Sequence[str],
+        source: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, List[date]]:
+        """Get the dates with a stored bar per symbol for one source, in one query."""
+        if not self.Session:
+            logging.warning("Database not available, returning empty coverage")
+            return {symbol: [] for symbol in symbols}
         with self._get_session() as session:
-            filters = QueryFilters(symbol=symbol, start_date=start_date, end_date=end_date, source=source)
-            query = self._build_market_data_query(session, filters)
-            rows = session.execute(query).scalars()
-            return [self._get_or_create_market_data(row) for row in rows]
\ No newline at end of file
+            rows = session.execute(self._build_coverage_query(symbols, source, start_date, end_date)).all()
+        return self._group_stored_dates(symbols, rows)
+
+    def get_series(
+        self,
+        symbol: str,
+        source: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        resolution: Optional[str] = None
+    ) -> OHLCVSeries:
+        """Get market data for one symbol and source as a columnar series.
+
+        Reads only the OHLCV columns and never builds ORM or MarketData
+        objects, so it bypasses the range cache. With a resolution ('1d',
+        '1w' or '1mo') whole buckets overlapping the range are returned,
+        read from the coarsest rollup that can serve it.
+        """
+        if not self.Session:
+            logging.warning("Database not available, returning empty data")
+            return OHLCVSeries.empty(symbol, source)
+
+        filters = QueryFilters(symbol=symbol, start_date=start_date, end_date=end_date, source=source)
+        if resolution is not None:
+            query, timeframe = self._build_resolution_query(filters, resolution)
+            with self._get_session() as session:
+                rows = session.execute(query).all()
+            return self._rows_to_resolution(rows, filters, resolution, timeframe)
+        with self._get_session() as session:
+            rows = session.execute(self._build_series_query(filters)).all()
+        return self._rows_to_series(rows, symbol, source)
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get range cache and per-tier counters, or None when caching is disabled."""
+        if not self.cache:
+            return None
+        stats = self.cache.stats.to_dict()
+        stats['tiers'] = self.cache.get_tier_stats()
+        stats['indicators'] = self.cache.indicator_stats.to_dict()
+        return stats
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..data_sources.series import OHLCVSeries
+
+# Rollup timeframes, finest first
+TIMEFRAMES = ('1d', '1w', '1mo')
+# Days between 1970-01-01 (a Thursday) and the Monday starting its week
+_WEEK_OFFSET_DAYS = 3
+_NS_PER_DAY = 24 * 3600 * 10**9
+
+
+def validate_timeframe(timeframe: str) -> str:
+    """Check a rollup timeframe name and return it."""
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unsupported timeframe '{timeframe}'; expected one of {', '.join(TIMEFRAMES)}")
+    return timeframe
+
+
+def bucket_starts(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+    """Get the start of the bucket holding each int64 ns timestamp.
+
+    Days start at midnight, weeks on Monday and months on the 1st.
+    """
+    days = np.asarray(timestamps, dtype=np.int64).view('datetime64[ns]').astype('datetime64[D]')
+    if timeframe == '1w':
+        days = days - (days.view(np.int64) + _WEEK_OFFSET_DAYS) % 7
+    elif timeframe == '1mo':
+        days = days.astype('datetime64[M]').astype('datetime64[D]')
+    elif timeframe != '1d':
+        validate_timeframe(timeframe)
+    return days.astype('datetime64[ns]').view(np.int64)
+
+
+def bucket_ends(starts: np.ndarray, timeframe: str) -> np.ndarray:
+    """Get the exclusive end of buckets given their int64 ns starts."""
+    days = np.asarray(starts, dtype=np.int64).view('datetime64[ns]').astype('datetime64[D]')
+    if timeframe == '1mo':
+        ends = (days.astype('datetime64[M]') + 1).astype('datetime64[D]')
+    else:
+        ends = days + (7 if timeframe == '1w' else 1)
+    return ends.astype('datetime64[ns]').view(np.int64)
+
+
+def floor_datetime(value: datetime, timeframe: str) -> datetime:
+    """Get the start of the bucket holding a datetime."""
+    start = bucket_starts(np.array([pd.Timestamp(value).value]), timeframe)[0]
+    return pd.Timestamp(int(start)).to_pydatetime()
+
+
+def ceil_datetime(value: datetime, timeframe: str) -> datetime:
+    """Get the last instant of the bucket holding a datetime, for inclusive range ends."""
+    start = bucket_starts(np.array([pd.Timestamp(value).value]), timeframe)
+    end = bucket_ends(start, timeframe)[0]
+    return pd.Timestamp(int(end)).to_pydatetime() - timedelta(microseconds=1)
+
+
+def single_interval(series: OHLCVSeries) -> OHLCVSeries:
+    """Drop daily bars stored on days that also hold intraday bars.
+
+    market_data has no interval column. Daily sources stamp their bars at
+    midnight, so a midnight bar sharing its day with other bars is a daily
+    bar saved next to that day's intraday bars; keeping only the intraday
+    bars stops the day's volume being counted twice.
+    """
+    days = np.floor_divide(series.timestamps, _NS_PER_DAY)
+    _, inverse, counts = np.unique(days, return_inverse=True, return_counts=True)
+    mixed = (series.timestamps % _NS_PER_DAY == 0) & (counts[inverse] > 1)
+    return series.take(~mixed) if mixed.any() else series
+
+
+def rollup_series(series: OHLCVSeries, timeframe: str) -> OHLCVSeries:
+    """Aggregate bars into timeframe buckets stamped with their start.
+
+    Open is the first bar's open, high the max, low the min, close the last
+    bar's close and volume the sum. Input may be unordered and may mix a
+    day's daily bar with its intraday bars; see single_interval().
+    """
+    validate_timeframe(timeframe)
+    series = single_interval(series.sort())
+    starts = bucket_starts(series.timestamps, timeframe)
+    first = np.flatnonzero(np.diff(starts, prepend=starts[:1] - 1))
+    return series.aggregate(first, starts[first])
+
+
+def touched_span(series: OHLCVSeries, timeframes: Iterable[str]) -> Tuple[datetime, datetime]:
+    """Get the inclusive datetime range covering every bucket the bars fall in.
+
+    Loading this range gives complete buckets for each timeframe, so their
+    rollups can be recomputed from scratch.
+    """
+    lower, upper = [], []
+    for timeframe in timeframes:
+        starts = bucket_starts(series.timestamps, timeframe)
+        lower.append(starts.min())
+        upper.append(bucket_ends(starts[[starts.argmax()]], timeframe)[0])
+    start = pd.Timestamp(int(min(lower))).to_pydatetime()
+    end = pd.Timestamp(int(max(upper))).to_pydatetime() - timedelta(microseconds=1)
+    return start, end
+
+
+def choose_rollup(resolution: str, enabled: Sequence[str]) -> Optional[str]:
+    """Get the coarsest enabled rollup whose buckets tile the resolution.
+
+    Daily buckets tile every timeframe; weeks and months only tile
+    themselves. Returns None when only raw bars can serve the resolution.
+    """
+    validate_timeframe(resolution)
+    if resolution in enabled:
+        return resolution
+    if '1d' in enabled:
+        return '1d'
+    return None
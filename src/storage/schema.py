@@ -0,0 +1,212 @@
+import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, pool, text
+from sqlalchemy.engine import Connection, Engine
+
+from ..config import settings
+
+MIGRATIONS_DIR = Path(__file__).parent / 'migrations'
+# Schema created by Base.metadata.create_all before migrations were introduced
+BASELINE_REVISION = '0001'
+
+MARKET_DATA_TABLE = 'market_data'
+DEFAULT_PARTITION = 'market_data_default'
+# Index and constraint names that move with the table when it is rebuilt
+_MARKET_DATA_INDEXES = (
+    'market_data_pkey',
+    'uix_market_data_symbol_timestamp_source',
+    'ix_market_data_symbol',
+    'ix_market_data_timestamp',
+    'ix_market_data_symbol_source_timestamp'
+)
+
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    """Build an Alembic config for the market data migrations."""
+    config = Config()
+    config.set_main_option('script_location', str(MIGRATIONS_DIR))
+    url = database_url or settings.DATABASE_URL
+    if url:
+        # ConfigParser interpolates '%', which appears in escaped passwords
+        config.set_main_option('sqlalchemy.url', url.replace('%', '%%'))
+    return config
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Get the migration revision a database is at, or None if unversioned."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def upgrade_schema(database_url: Optional[str] = None, revision: str = 'head') -> None:
+    """Migrate the database to a revision.
+
+    Databases created by create_all before migrations existed are stamped
+    with the baseline revision first, so only later migrations run.
+    """
+    url = database_url or settings.DATABASE_URL
+    if not url:
+        raise ValueError("DATABASE_URL is not configured")
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        with engine.begin() as connection:
+            config = alembic_config(url)
+            config.attributes['connection'] = connection
+            if current_revision(connection) is None and inspect(connection).has_table(MARKET_DATA_TABLE):
+                command.stamp(config, BASELINE_REVISION)
+            command.upgrade(config, revision)
+        ensure_month_partitions(engine)
+    finally:
+        engine.dispose()
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _months(start: date, end: date) -> Iterator[date]:
+    """Yield the first day of every month from start's month through end's month."""
+    month = _month_start(start)
+    while month <= end:
+        yield month
+        month = _next_month(month)
+
+
+def partition_name(month: date) -> str:
+    """Get the name of the monthly market_data partition for a month."""
+    return f"{MARKET_DATA_TABLE}_{month:%Y_%m}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Check whether market_data is a partitioned table (PostgreSQL only)."""
+    if connection.dialect.name != 'postgresql':
+        return False
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {'table': MARKET_DATA_TABLE}).scalar())
+
+
+def _partition_window(today: Optional[date] = None) -> Tuple[date, date]:
+    """Get the first and last month that should have a partition."""
+    start = datetime.strptime(settings.POSTGRES_PARTITION_START, '%Y-%m').date()
+    today = today or date.today()
+    end = _month_start(today)
+    for _ in range(settings.POSTGRES_PARTITION_MONTHS_AHEAD):
+        end = _next_month(end)
+    return start, end
+
+
+def create_month_partitions(connection: Connection, start: date, end: date) -> int:
+    """Attach a partition for every month in [start, end] that lacks one.
+
+    Rows already routed to the default partition for a new month are moved
+    into it first, as PostgreSQL rejects partitions that would overlap them.
+    Returns the number of partitions created.
+    """
+    created = 0
+    for month in _months(start, end):
+        name = partition_name(month)
+        if connection.execute(text("SELECT to_regclass(:name)"), {'name': name}).scalar() is not None:
+            continue
+        lower, upper = f"'{month.isoformat()}'", f"'{_next_month(month).isoformat()}'"
+        connection.execute(text(
+            f"CREATE TABLE {name} (LIKE {MARKET_DATA_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        connection.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE timestamp >= {lower} AND timestamp < {upper} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ))
+        connection.execute(text(
+            f"ALTER TABLE {MARKET_DATA_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"
+        ))
+        created += 1
+    return created
+
+
+def ensure_month_partitions(engine: Engine, today: Optional[date] = None) -> int:
+    """Keep POSTGRES_PARTITION_MONTHS_AHEAD future partitions ready on a partitioned market_data."""
+    if engine.dialect.name != 'postgresql' or not settings.POSTGRES_PARTITION_BY_MONTH:
+        return 0
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            return 0
+        created = create_month_partitions(connection, *_partition_window(today))
+    if created:
+        logging.info(f"Created {created} monthly market_data partitions")
+    return created
+
+
+def _retire_table(connection: Connection, suffix: str) -> str:
+    """Rename market_data and its indexes out of the way; returns the new table name."""
+    retired = f"{MARKET_DATA_TABLE}_{suffix}"
+    connection.execute(text(f"ALTER TABLE {MARKET_DATA_TABLE} RENAME TO {retired}"))
+    for index in _MARKET_DATA_INDEXES:
+        connection.execute(text(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_{suffix}"))
+    return retired
+
+
+def _create_table(connection: Connection, sequence: str, partitioned: bool) -> None:
+    """Create market_data with its constraints and indexes, optionally range partitioned by timestamp."""
+    # Unique constraints on a partitioned table must include the partition key
+    primary_key = 'id, timestamp' if partitioned else 'id'
+    partition_clause = ' PARTITION BY RANGE (timestamp)' if partitioned else ''
+    connection.execute(text(f"""
+        CREATE TABLE {MARKET_DATA_TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{sequence}'::regclass),
+            symbol VARCHAR(10) NOT NULL,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            open DOUBLE PRECISION NOT NULL,
+            high DOUBLE PRECISION NOT NULL,
+            low DOUBLE PRECISION NOT NULL,
+            close DOUBLE PRECISION NOT NULL,
+            volume INTEGER NOT NULL,
+            source VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT market_data_pkey PRIMARY KEY ({primary_key}),
+            CONSTRAINT uix_market_data_symbol_timestamp_source UNIQUE (symbol, timestamp, source)
+        ){partition_clause}
+    """))
+    connection.execute(text(f"CREATE INDEX ix_market_data_symbol ON {MARKET_DATA_TABLE} (symbol)"))
+    connection.execute(text(f"CREATE INDEX ix_market_data_timestamp ON {MARKET_DATA_TABLE} (timestamp)"))
+    connection.execute(text(
+        f"CREATE INDEX ix_market_data_symbol_source_timestamp ON {MARKET_DATA_TABLE} (symbol, source, timestamp)"
+    ))
+
+
+def _rebuild_table(connection: Connection, partitioned: bool) -> None:
+    """Copy market_data into a new (un)partitioned table that takes over its sequence and names."""
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': MARKET_DATA_TABLE}
+    ).scalar()
+    if sequence is None:
+        raise ValueError("market_data.id has no owned sequence")
+    retired = _retire_table(connection, 'old')
+    _create_table(connection, sequence, partitioned)
+    if partitioned:
+        connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {MARKET_DATA_TABLE} DEFAULT"))
+        create_month_partitions(connection, *_partition_window())
+    columns = 'id, symbol, timestamp, open, high, low, close, volume, source, created_at'
+    connection.execute(text(f"INSERT INTO {MARKET_DATA_TABLE} ({columns}) SELECT {columns} FROM {retired}"))
+    connection.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {MARKET_DATA_TABLE}.id"))
+    connection.execute(text(f"DROP TABLE {retired} CASCADE"))
+
+
+def partition_market_data(connection: Connection) -> None:
+    """Convert market_data into a table range partitioned by month on timestamp (PostgreSQL)."""
+    _rebuild_table(connection, partitioned=True)
+
+
+def unpartition_market_data(connection: Connection) -> None:
+    """Convert a partitioned market_data back into a single table (PostgreSQL)."""
+    _rebuild_table(connection, partitioned=False)
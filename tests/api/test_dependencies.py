@@ -0,0 +1,29 @@
+"""Tests for API dependency providers."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.api.dependencies import get_async_data_repository
+
+
+def test_async_repository_fallback_shared_per_app():
+    """Test requests without lifespan pools share one fallback repository."""
+    app = SimpleNamespace(state=SimpleNamespace())
+    requests = [SimpleNamespace(state=SimpleNamespace(), app=app) for _ in range(3)]
+
+    with patch('src.api.dependencies.AsyncDataRepository') as repository_class:
+        repositories = [get_async_data_repository(request) for request in requests]
+
+    repository_class.assert_called_once_with()
+    assert all(repository is repositories[0] for repository in repositories)
+
+
+def test_async_repository_uses_lifespan_pools():
+    """Test requests with lifespan pools get a repository bound to them."""
+    async_storage = object()
+    request = SimpleNamespace(state=SimpleNamespace(async_storage=async_storage), app=SimpleNamespace(state=SimpleNamespace()))
+
+    with patch('src.api.dependencies.AsyncDataRepository') as repository_class:
+        get_async_data_repository(request)
+
+    repository_class.assert_called_once_with(async_storage)
@@ -104,7 +104,7 @@ class TestCLIWorkflowIntegration:
         
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Run analyze command
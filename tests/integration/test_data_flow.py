@@ -126,7 +126,7 @@ class TestDataFlowIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.set_market_data = Mock()
+        mock_cache.invalidate_market_ranges = Mock()
         mock_redis.return_value = mock_cache
         
         # Create repository
@@ -136,8 +136,10 @@ class TestDataFlowIntegration:
         # Test saving with cache
         repository.save_market_data(sample_market_data)
         
-        # Verify cache calls
-        assert mock_cache.set_market_data.call_count == len(sample_market_data)
+        # Verify the touched range bucket is invalidated in one call
+        mock_cache.invalidate_market_ranges.assert_called_once()
+        keys = list(mock_cache.invalidate_market_ranges.call_args[0][0])
+        assert [key.bucket for key in keys] == ["2023-01"]
 
     @pytest.mark.asyncio
     @patch('src.storage.repository.create_engine')
@@ -173,7 +175,7 @@ class TestDataFlowIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Create repository
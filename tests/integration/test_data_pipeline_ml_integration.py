@@ -200,7 +200,7 @@ class TestDataPipelineMLIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Create repository
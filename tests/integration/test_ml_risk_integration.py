@@ -174,7 +174,7 @@ class TestMLRiskIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Create repository
@@ -337,7 +337,7 @@ class TestMLRiskIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Mock the repository creation in the CLI
@@ -350,7 +350,7 @@ class TestMLRiskIntegration:
             
             # Test the analyze command with sufficient data for risk calculations
             try:
-                analyze("AAPL", days=20)  # More days for better risk calculations
+                analyze(["AAPL"], days=20)  # More days for better risk calculations
                 analysis_successful = True
             except Exception:
                 analysis_successful = False
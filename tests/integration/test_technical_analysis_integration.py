@@ -129,7 +129,7 @@ class TestTechnicalAnalysisIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Create repository
@@ -205,7 +205,7 @@ class TestTechnicalAnalysisIntegration:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data = Mock(return_value=None)
+        mock_cache.get_market_ranges = Mock(return_value={})
         mock_redis.return_value = mock_cache
         
         # Mock the repository creation in the CLI
@@ -218,7 +218,7 @@ class TestTechnicalAnalysisIntegration:
             
             # Test the analyze command (simulating CLI call)
             try:
-                analyze("AAPL", days=10)
+                analyze(["AAPL"], days=10)
                 # If no exception raised, the integration works
                 analysis_successful = True
             except Exception:
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
+
+
+@pytest.fixture
+def series(sample_market_data: List[MarketData]) -> OHLCVSeries:
+    """Create a columnar series from the sample bars."""
+    return OHLCVSeries.from_market_data(sample_market_data)
+
+
+class TestOHLCVSeries:
+    """Test columnar OHLCV series functionality."""
+
+    def test_from_market_data_columns(self, series: OHLCVSeries, sample_market_data: List[MarketData]) -> None:
+        """Test bars are stored as typed column arrays."""
+        assert series.symbol == "AAPL"
+        assert series.source == "test"
+        assert series.timestamps.dtype == np.int64
+        assert series.close.dtype == np.float64
+        assert series.volume.dtype == np.int64
+        assert series.close.tolist() == [item.close for item in sample_market_data]
+
+    def test_market_data_view(self, series: OHLCVSeries, sample_market_data: List[MarketData]) -> None:
+        """Test the series behaves as a sequence of MarketData."""
+        assert len(series) == len(sample_market_data)
+        assert series[0] == sample_market_data[0]
+        assert series[-1] == sample_market_data[-1]
+        assert series.to_market_data() == sample_market_data
+        assert isinstance(series[1:3], OHLCVSeries)
+        assert len(series[1:3]) == 2
+
+    def test_index_out_of_range(self, series: OHLCVSeries) -> None:
+        """Test integer indexing past the end raises IndexError."""
+        with pytest.raises(IndexError):
+            series[len(series)]
+
+    def test_mixed_bars_rejected(self, sample_market_data: List[MarketData]) -> None:
+        """Test a series cannot mix symbols or sources."""
+        mixed = sample_market_data + [sample_market_data[0].model_copy(update={'source': 'other'})]
+
+        with pytest.raises(ValueError):
+            OHLCVSeries.from_market_data(mixed)
+
+        groups = OHLCVSeries.group_market_data(mixed)
+        assert sorted((s.source, len(s)) for s in groups) == [("other", 1), ("test", 5)]
+
+    def test_dataframe_round_trip_shares_buffers(self, series: OHLCVSeries) -> None:
+        """Test pandas conversion in both directions avoids copying columns."""
+        df = series.to_dataframe()
+
+        assert np.shares_memory(df['close'].to_numpy(), series.close)
+        back = OHLCVSeries.from_dataframe(df, symbol=series.symbol, source=series.source)
+        assert back == series
+        assert np.shares_memory(back.close, series.close)
+
+    def test_from_dataframe_tz_aware_index(self) -> None:
+        """Test time zone aware indexes keep their wall-clock time."""
+        index = pd.date_range('2023-01-03 09:30', periods=2, freq='D', tz='America/New_York')
+        df = pd.DataFrame({
+            'open': [1.0, 2.0], 'high': [1.0, 2.0], 'low': [1.0, 2.0],
+            'close': [1.0, 2.0], 'volume': [10, 20]
+        }, index=index)
+
+        result = OHLCVSeries.from_dataframe(df, symbol="AAPL", source="test")
+
+        assert result[0].timestamp == datetime(2023, 1, 3, 9, 30)
+
+    def test_arrow_round_trip(self, series: OHLCVSeries) -> None:
+        """Test Arrow conversion round trips."""
+        pytest.importorskip("pyarrow")
+
+        table = series.to_arrow()
+
+        assert table.column_names == ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        assert OHLCVSeries.from_arrow(table, symbol=series.symbol, source=series.source) == series
+
+    def test_filter_and_concat(self, series: OHLCVSeries) -> None:
+        """Test date filtering and concatenation."""
+        filtered = series.filter_dates(datetime(2023, 1, 1, 10), datetime(2023, 1, 1, 12))
+
+        assert [item.timestamp.hour for item in filtered] == [10, 11]
+        assert len(OHLCVSeries.concat([series[:2], series[2:]])) == len(series)
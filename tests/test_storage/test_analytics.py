@@ -0,0 +1,166 @@
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+import pytest
+
+from src.config import settings
+from src.data_sources.base import MarketData
+from src.storage.analytics import AnalyticsEngine, summarize_frame, summarize_symbols
+from src.storage.parquet_store import ParquetRepository
+
+
+@pytest.fixture
+def daily_bars() -> List[MarketData]:
+    """Create ten daily bars for two symbols."""
+    start = datetime(2023, 1, 2, 16)
+    return [
+        MarketData(
+            symbol=symbol,
+            timestamp=start + timedelta(days=i),
+            open=base + i,
+            high=base + i + 2,
+            low=base + i - 2,
+            close=base + i * step,
+            volume=1000 * (i + 1),
+            source="test"
+        )
+        for symbol, base, step in (("AAPL", 100.0, 1.0), ("MSFT", 200.0, -2.0))
+        for i in range(10)
+    ]
+
+
+@pytest.fixture
+def parquet_repository(tmp_path: Path, daily_bars: List[MarketData]) -> ParquetRepository:
+    """Create a Parquet store holding the daily bars."""
+    pytest.importorskip("pyarrow")
+    repository = ParquetRepository(tmp_path / "store")
+    repository.bulk_save_market_data(daily_bars)
+    return repository
+
+
+class TestSummarizeFrame:
+    """Test the pandas summary used when DuckDB is unavailable."""
+
+    def test_summary_statistics(self, daily_bars: List[MarketData]) -> None:
+        """Test per-symbol statistics over loaded bars."""
+        summary = summarize_frame(pd.DataFrame([bar.model_dump() for bar in daily_bars]))
+
+        assert list(summary.index) == ["AAPL", "MSFT"]
+        aapl = summary.loc["AAPL"]
+        assert aapl["days"] == 10
+        assert aapl["bars"] == 10
+        assert aapl["total_volume"] == 55000
+        assert aapl["highest_price"] == 111.0
+        assert aapl["price_change"] == 9.0
+        assert aapl["change_pct"] == pytest.approx(9.0)
+        assert summary.loc["MSFT", "price_change"] == -18.0
+
+        closes = [100.0 + i for i in range(10)]
+        returns = pd.Series([math.log(b / a) for a, b in zip(closes, closes[1:])])
+        assert aapl["volatility_pct"] == pytest.approx(returns.std() * math.sqrt(252) * 100)
+
+    def test_intraday_bars_reduce_to_daily_closes(self, sample_market_data: List[MarketData]) -> None:
+        """Test one day of hourly bars counts as one day with no return history."""
+        summary = summarize_frame(pd.DataFrame([bar.model_dump() for bar in sample_market_data]))
+
+        assert summary.loc["AAPL", "days"] == 1
+        assert summary.loc["AAPL", "bars"] == 5
+        assert pd.isna(summary.loc["AAPL", "volatility_pct"])
+
+    def test_empty_frame(self) -> None:
+        """Test no bars give an empty summary."""
+        assert summarize_frame(pd.DataFrame()).empty
+
+
+class TestSummarizeSymbols:
+    """Test engine selection for repository summaries."""
+
+    def test_pandas_engine_loads_through_repository(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        parquet_repository: ParquetRepository
+    ) -> None:
+        """Test the pandas engine summarizes bars read from the repository."""
+        monkeypatch.setattr(settings, 'ANALYTICS_ENGINE', 'pandas')
+
+        summary = summarize_symbols(parquet_repository, ["AAPL", "MSFT", "GOOG"])
+
+        assert list(summary.index) == ["AAPL", "MSFT"]
+        assert summary.loc["MSFT", "total_volume"] == 55000
+
+
+class TestAnalyticsEngine:
+    """Test aggregations pushed down into DuckDB."""
+
+    @pytest.fixture(autouse=True)
+    def require_duckdb(self) -> None:
+        pytest.importorskip("duckdb")
+
+    def test_parquet_summary_matches_pandas(
+        self,
+        parquet_repository: ParquetRepository,
+        daily_bars: List[MarketData]
+    ) -> None:
+        """Test DuckDB over Parquet files matches the pandas summary."""
+        parquet_repository.bulk_save_market_data([daily_bars[0].model_copy(update={'close': 90.0})])
+        loaded = [
+            bar.model_dump() for symbol in ("AAPL", "MSFT") for bar in parquet_repository.get_market_data(symbol)
+        ]
+        expected = summarize_frame(pd.DataFrame(loaded))
+
+        with AnalyticsEngine.for_repository(parquet_repository) as engine:
+            summary = engine.summary(["AAPL", "MSFT"])
+
+        assert summary.loc["AAPL", "price_change"] == 19.0
+        pd.testing.assert_frame_equal(summary, expected, check_dtype=False, check_names=False)
+
+    def test_sqlite_summary(self, tmp_path: Path, daily_bars: List[MarketData]) -> None:
+        """Test DuckDB reads the SQLite market_data table in place."""
+        from sqlalchemy import create_engine
+
+        from src.storage.models import Base
+
+        database_url = f"sqlite:///{tmp_path / 'market.db'}"
+        sql_engine = create_engine(database_url)
+        Base.metadata.create_all(sql_engine)
+        pd.DataFrame([bar.model_dump() for bar in daily_bars]).to_sql(
+            'market_data', sql_engine, if_exists='append', index=False
+        )
+
+        try:
+            engine = AnalyticsEngine.for_database(database_url)
+        except ValueError as e:
+            pytest.skip(str(e))
+        with engine:
+            summary = engine.summary(["AAPL"], datetime(2023, 1, 5), datetime(2023, 1, 8, 23))
+
+        assert summary.loc["AAPL", "days"] == 4
+        assert summary.loc["AAPL", "total_volume"] == 4000 + 5000 + 6000 + 7000
+
+    def test_windowed_returns(self, parquet_repository: ParquetRepository) -> None:
+        """Test rolling-window returns over daily closes."""
+        with AnalyticsEngine.for_repository(parquet_repository) as engine:
+            returns = engine.returns(["AAPL"], window=5)
+
+        assert len(returns) == 10
+        assert pd.isna(returns["window_return"].iloc[4])
+        assert returns["window_return"].iloc[5] == pytest.approx(105.0 / 100.0 - 1)
+        assert returns["daily_return"].iloc[1] == pytest.approx(0.01)
+
+    def test_volume_profile(self, parquet_repository: ParquetRepository) -> None:
+        """Test every bar's volume lands in one price bucket."""
+        with AnalyticsEngine.for_repository(parquet_repository) as engine:
+            profile = engine.volume_profile("AAPL", bins=4)
+
+        assert profile["volume"].sum() == 55000
+        assert len(profile) <= 4
+        assert (profile["price_high"] > profile["price_low"]).all()
+
+    def test_empty_store(self, tmp_path: Path) -> None:
+        """Test an empty Parquet store gives an empty summary."""
+        pytest.importorskip("pyarrow")
+        with AnalyticsEngine.for_repository(ParquetRepository(tmp_path)) as engine:
+            assert engine.summary(["AAPL"]).empty
@@ -0,0 +1,269 @@
+import json
+from datetime import datetime
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.storage.codec import BAR_BLOCK_MAGIC
+from src.storage.cache import (
+    INVALIDATION_CHANNEL, CacheStats, LocalCache, MarketRangeKey, RedisCache,
+    bucket_bounds, bucket_label, buckets_between
+)
+
+BAR = {
+    "symbol": "AAPL", "timestamp": "2023-01-03T00:00:00", "open": 1.0, "high": 2.0,
+    "low": 0.5, "close": 1.5, "volume": 10, "source": "test"
+}
+
+
+class TestRangeBuckets:
+    """Test range cache bucket helpers."""
+
+    def test_bucket_label_month_and_day(self) -> None:
+        """Test bucket labels for both granularities."""
+        timestamp = datetime(2023, 2, 14, 15, 30)
+
+        assert bucket_label(timestamp) == "2023-02"
+        assert bucket_label(timestamp, "day") == "2023-02-14"
+
+    def test_bucket_bounds_wraps_year(self) -> None:
+        """Test December buckets end at the next January."""
+        assert bucket_bounds("2023-12") == (datetime(2023, 12, 1), datetime(2024, 1, 1))
+        assert bucket_bounds("2023-12-31") == (datetime(2023, 12, 31), datetime(2024, 1, 1))
+
+    def test_buckets_between(self) -> None:
+        """Test bucket enumeration across a year boundary."""
+        buckets = buckets_between(datetime(2023, 11, 15), datetime(2024, 2, 1))
+
+        assert buckets == ["2023-11", "2023-12", "2024-01", "2024-02"]
+
+    def test_range_key_all_sources(self) -> None:
+        """Test range keys without a source use the all-sources marker."""
+        assert MarketRangeKey("AAPL", None, "2023-01").to_string() == "market_range:AAPL:*:2023-01"
+
+
+class TestRedisRangeCache:
+    """Test RedisCache range operations against a mocked client."""
+
+    @pytest.fixture
+    def cache(self) -> Any:
+        """Create a RedisCache with a mocked Redis client."""
+        with patch('src.storage.cache.redis.Redis') as mock_redis:
+            mock_redis.return_value = Mock()
+            return RedisCache()
+
+    def test_get_market_ranges_single_mget(self, cache: Any) -> None:
+        """Test all buckets are read with one MGET."""
+        bars = [{"symbol": "AAPL", "close": 1.0}]
+        cache.redis.execute_command.return_value = [json.dumps(bars).encode(), None]
+        keys = [MarketRangeKey("AAPL", "test", "2023-01"), MarketRangeKey("AAPL", "test", "2023-02")]
+
+        result = cache.get_market_ranges(keys)
+
+        cache.redis.execute_command.assert_called_once()
+        assert cache.redis.execute_command.call_args[0][0] == "MGET"
+        assert result == {"2023-01": bars, "2023-02": None}
+
+    def test_set_market_ranges_pipelined(self, cache: Any) -> None:
+        """Test bucket writes go through one pipeline."""
+        pipe = Mock()
+        cache.redis.pipeline.return_value = pipe
+
+        cache.set_market_ranges({"2023-01": [], "2023-02": []}, "AAPL", "test", expiration=60)
+
+        assert pipe.set.call_count == 2
+        pipe.execute.assert_called_once()
+
+    def test_indicator_state_round_trip(self, cache: Any) -> None:
+        """Test indicator snapshots are written with a TTL and read straight from Redis."""
+        cache.set_indicator_state("AAPL:test:abc", {"timestamp": 1}, expiration=60)
+        cache.redis.get.return_value = json.dumps({"timestamp": 1})
+
+        assert cache.get_indicator_state("AAPL:test:abc") == {"timestamp": 1}
+        cache.redis.set.assert_called_once_with(
+            "portfolio_analyzer:indicator_state:AAPL:test:abc", json.dumps({"timestamp": 1}), ex=60
+        )
+        cache.redis.get.return_value = "not json"
+        assert cache.get_indicator_state("AAPL:test:abc") is None
+
+    def test_invalidate_includes_all_sources_bucket(self, cache: Any) -> None:
+        """Test invalidation also drops the all-sources view."""
+        pipe = Mock()
+        cache.redis.pipeline.return_value = pipe
+
+        cache.invalidate_market_ranges([MarketRangeKey("AAPL", "test", "2023-01")])
+
+        deleted = pipe.delete.call_args[0]
+        assert set(deleted) == {
+            "portfolio_analyzer:market_range:AAPL:test:2023-01",
+            "portfolio_analyzer:market_range:AAPL:*:2023-01"
+        }
+
+
+class TestCacheStats:
+    """Test range cache counters."""
+
+    def test_hit_ratio(self) -> None:
+        """Test hit ratio and averages."""
+        stats = CacheStats()
+        stats.record_read(hits=3, misses=1, seconds=0.004)
+        stats.record_db_load(0.02)
+
+        exported = stats.to_dict()
+        assert exported["hit_ratio"] == 0.75
+        assert exported["avg_db_seconds_per_miss"] == pytest.approx(0.02)
+
+
+class TestLocalCache:
+    """Test the in-process LRU/TTL tier."""
+
+    def test_lru_eviction_by_entries(self) -> None:
+        """Test the least recently used entry is evicted first."""
+        local = LocalCache(max_entries=2, max_bytes=1000, ttl=60)
+        local.set("a", 1, size=1)
+        local.set("b", 2, size=1)
+        local.get_many(["a"])
+        local.set("c", 3, size=1)
+
+        assert local.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+        assert local.stats.evictions == 1
+
+    def test_eviction_by_bytes(self) -> None:
+        """Test entries are evicted to stay within the byte budget."""
+        local = LocalCache(max_entries=100, max_bytes=10, ttl=60)
+        local.set("a", "x", size=6)
+        local.set("b", "y", size=6)
+        local.set("too_big", "z", size=11)
+
+        assert local.get_many(["a", "b", "too_big"]) == {"b": "y"}
+        assert local.bytes == 6
+
+    def test_expired_entries_miss(self) -> None:
+        """Test entries past their TTL are dropped on read."""
+        local = LocalCache(max_entries=10, max_bytes=100, ttl=60)
+        local.set("a", 1, size=1, ttl=0.001)
+
+        with patch('src.storage.cache.time.monotonic', return_value=float('inf')):
+            assert local.get_many(["a"]) == {}
+        assert local.stats.expirations == 1
+        assert local.stats.misses == 1
+
+
+class TestTwoTierCache:
+    """Test read-through, write-through and invalidation across tiers."""
+
+    @pytest.fixture
+    def cache(self) -> Any:
+        """Create a RedisCache with a local tier and a mocked Redis client."""
+        with patch('src.storage.cache.redis.Redis') as mock_redis:
+            mock_redis.return_value = Mock()
+            return RedisCache(local_cache=LocalCache(max_entries=100, max_bytes=10000, ttl=60))
+
+    def test_get_json_read_through(self, cache: Any) -> None:
+        """Test a Redis hit fills the local tier so the next read skips Redis."""
+        cache.redis.get.return_value = json.dumps({"price": 1.0})
+
+        assert cache.get_json("quote") == {"price": 1.0}
+        assert cache.get_json("quote") == {"price": 1.0}
+
+        cache.redis.get.assert_called_once()
+        tiers = cache.get_tier_stats()
+        assert tiers["local"]["hits"] == 1
+        assert tiers["redis"]["hits"] == 1
+
+    def test_set_json_write_through_publishes(self, cache: Any) -> None:
+        """Test writes fill the local tier and tell other workers to drop the key."""
+        pipe = Mock()
+        cache.redis.pipeline.return_value = pipe
+
+        cache.set_json("quote", {"price": 2.0}, expiration=30)
+
+        assert cache.get_json("quote") == {"price": 2.0}
+        cache.redis.get.assert_not_called()
+        channel, message = pipe.publish.call_args[0]
+        assert channel == INVALIDATION_CHANNEL
+        assert json.loads(message)["keys"] == ["portfolio_analyzer:quote"]
+
+    def test_ranges_served_from_local_tier(self, cache: Any) -> None:
+        """Test only buckets missing locally are read with MGET."""
+        cache.redis.pipeline.return_value = Mock()
+        bars = [BAR]
+        cache.set_market_ranges({"2023-01": bars}, "AAPL", "test", expiration=60)
+        cache.redis.execute_command.return_value = [None]
+        keys = [MarketRangeKey("AAPL", "test", "2023-01"), MarketRangeKey("AAPL", "test", "2023-02")]
+
+        result = cache.get_market_ranges(keys)
+
+        assert result == {"2023-01": bars, "2023-02": None}
+        assert cache.redis.execute_command.call_args[0] == ("MGET", "portfolio_analyzer:market_range:AAPL:test:2023-02")
+
+    def test_invalidation_from_other_worker(self, cache: Any) -> None:
+        """Test messages from other workers drop local entries; our own are ignored."""
+        cache.local.set("portfolio_analyzer:quote", 1, size=1)
+
+        cache._handle_invalidation(json.dumps({"origin": cache.instance_id, "keys": ["portfolio_analyzer:quote"]}))
+        assert len(cache.local) == 1
+
+        cache._handle_invalidation(json.dumps({"origin": "other", "keys": ["portfolio_analyzer:quote"]}))
+        assert len(cache.local) == 0
+        assert cache.local.stats.invalidations == 1
+
+    def test_writer_without_local_tier_invalidates_readers(self, cache: Any) -> None:
+        """Test a CLI-style writer with no local tier still tells workers to drop their copies."""
+        cache.redis.pipeline.return_value = Mock()
+        cache.set_market_ranges({"2023-01": [BAR]}, "AAPL", "test", expiration=60)
+        with patch('src.storage.cache.redis.Redis') as mock_redis:
+            mock_redis.return_value = Mock()
+            writer = RedisCache()
+        pipe = Mock()
+        writer.redis.pipeline.return_value = pipe
+
+        writer.set_market_ranges({"2023-01": [{**BAR, "close": 9.0}]}, "AAPL", "test", expiration=60)
+        channel, message = pipe.publish.call_args[0]
+        cache._handle_invalidation(message)
+
+        assert channel == INVALIDATION_CHANNEL
+        assert len(cache.local) == 0
+
+
+    def test_set_json_without_local_tier_invalidates_readers(self, cache: Any) -> None:
+        """Test plain key writes from a writer with no local tier also reach other workers."""
+        cache.redis.pipeline.return_value = Mock()
+        cache.set_json("quote", {"price": 1.0})
+        with patch('src.storage.cache.redis.Redis') as mock_redis:
+            mock_redis.return_value = Mock()
+            writer = RedisCache()
+        pipe = Mock()
+        writer.redis.pipeline.return_value = pipe
+
+        writer.set_json("quote", {"price": 2.0}, expiration=30)
+        cache._handle_invalidation(pipe.publish.call_args[0][1])
+
+        pipe.set.assert_called_once_with("portfolio_analyzer:quote", json.dumps({"price": 2.0}), ex=30)
+        assert len(cache.local) == 0
+
+
+class TestBinaryRangeCache:
+    """Test the binary codec through RedisCache."""
+
+    @pytest.fixture
+    def cache(self) -> Any:
+        """Create a RedisCache with a mocked Redis client."""
+        with patch('src.storage.cache.redis.Redis') as mock_redis:
+            mock_redis.return_value = Mock()
+            return RedisCache()
+
+    def test_ranges_written_as_binary_blocks(self, cache: Any) -> None:
+        """Test range buckets use the configured binary codec and read back."""
+        pipe = Mock()
+        cache.redis.pipeline.return_value = pipe
+
+        cache.set_market_ranges({"2023-01": [BAR]}, "AAPL", "test", expiration=60)
+
+        payload = pipe.set.call_args[0][1]
+        assert payload.startswith(BAR_BLOCK_MAGIC)
+        cache.redis.execute_command.return_value = [payload]
+        result = cache.get_market_ranges([MarketRangeKey("AAPL", "test", "2023-01")])
+        assert result["2023-01"][0]["timestamp"] == datetime(2023, 1, 3)
+        assert result["2023-01"][0]["close"] == 1.5
@@ -0,0 +1,94 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from src.data_sources.base import MarketData
+from src.storage.codec import (
+    BAR_BLOCK_MAGIC,
+    CODEC_BINARY,
+    CODEC_JSON,
+    decode_bar,
+    decode_bars,
+    encode_bar,
+    encode_bars,
+    unpack_bar_columns,
+)
+
+
+@pytest.fixture
+def bars(sample_market_data: List[MarketData]) -> List[Dict[str, Any]]:
+    """Bars as the range cache stores them."""
+    return [item.model_dump(mode='json') for item in sample_market_data]
+
+
+class TestBarCodec:
+    """Test the versioned binary bar codec."""
+
+    def test_binary_round_trip(self, bars: List[Dict[str, Any]], sample_market_data: List[MarketData]) -> None:
+        """Test binary blocks decode to bars equal to the originals."""
+        payload = encode_bars(bars, CODEC_BINARY)
+
+        assert isinstance(payload, bytes) and payload.startswith(BAR_BLOCK_MAGIC)
+        decoded = decode_bars(payload)
+        assert decoded is not None
+        assert [MarketData(**bar) for bar in decoded] == sample_market_data
+
+    def test_binary_smaller_than_json(self, bars: List[Dict[str, Any]]) -> None:
+        """Test the binary encoding is more compact than JSON."""
+        assert len(encode_bars(bars, CODEC_BINARY)) < len(encode_bars(bars, CODEC_JSON).encode()) / 2
+
+    def test_columns_are_zero_copy(self, bars: List[Dict[str, Any]]) -> None:
+        """Test column arrays are views over the payload."""
+        metadata, columns = unpack_bar_columns(encode_bars(bars, CODEC_BINARY))  # type: ignore[arg-type]
+
+        assert metadata == {'symbol': 'AAPL', 'sources': ['test']}
+        assert columns['close'].dtype == np.float64
+        assert not columns['close'].flags.owndata
+
+    def test_mixed_sources(self, bars: List[Dict[str, Any]]) -> None:
+        """Test all-sources buckets keep each bar's source."""
+        bars[1]['source'] = 'other'
+
+        decoded = decode_bars(encode_bars(bars, CODEC_BINARY))
+
+        assert decoded is not None
+        assert [bar['source'] for bar in decoded[:3]] == ['test', 'other', 'test']
+
+    def test_reads_legacy_json(self, bars: List[Dict[str, Any]]) -> None:
+        """Test JSON entries written before the binary codec still decode."""
+        assert decode_bars(json.dumps(bars)) == bars
+        assert decode_bars(json.dumps(bars).encode()) == bars
+        assert decode_bar(json.dumps(bars[0]).encode()) == bars[0]
+
+    def test_single_bar(self, bars: List[Dict[str, Any]]) -> None:
+        """Test single bars round trip through the binary codec."""
+        decoded = decode_bar(encode_bar(bars[0], CODEC_BINARY))
+
+        assert decoded is not None
+        assert decoded['timestamp'] == datetime(2023, 1, 1, 9, 30)
+
+    def test_corrupt_payloads_miss(self) -> None:
+        """Test truncated, unknown-version and garbage payloads decode as misses."""
+        assert decode_bars(BAR_BLOCK_MAGIC + b'\x01') is None
+        assert decode_bars(BAR_BLOCK_MAGIC + b'\x63' + b'\x00' * 10) is None
+        assert decode_bars(b'\xff\xfe') is None
+        assert decode_bars(None) is None
+
+    def test_metadata_is_json(self, bars: List[Dict[str, Any]]) -> None:
+        """Test block metadata is JSON so every worker can decode it."""
+        payload = encode_bars(bars, CODEC_BINARY)
+        assert isinstance(payload, bytes)
+        metadata, _ = unpack_bar_columns(payload)
+
+        assert payload[5] == 0
+        assert metadata == {'symbol': 'AAPL', 'sources': ['test']}
+
+    def test_unknown_metadata_encoding_misses(self, bars: List[Dict[str, Any]]) -> None:
+        """Test blocks with a metadata encoding other than JSON decode as misses."""
+        payload = encode_bars(bars, CODEC_BINARY)
+        assert isinstance(payload, bytes)
+
+        assert decode_bars(payload[:5] + b'\x01' + payload[6:]) is None
@@ -0,0 +1,82 @@
+from typing import Any, List
+from unittest.mock import Mock, patch
+
+from src.data_sources.base import MarketData
+from sqlalchemy import text
+
+from src.storage.connections import (
+    StorageResources,
+    _engine_pool_options,
+    create_database_engine,
+    create_storage_resources,
+)
+from src.storage.repository import DataRepository
+
+
+class TestStorageResources:
+    """Test process-wide storage pools."""
+
+    def test_sqlite_has_no_pool_sizing(self) -> None:
+        """Test SQLite engines are created without QueuePool options."""
+        assert _engine_pool_options("sqlite:///portfolio_data.db") == {}
+
+    def test_postgres_pool_sizing_from_settings(self) -> None:
+        """Test Postgres engines use configured pool sizes."""
+        with patch('src.storage.connections.settings') as mock_settings:
+            mock_settings.DB_POOL_SIZE = 7
+            mock_settings.DB_MAX_OVERFLOW = 3
+            mock_settings.DB_POOL_TIMEOUT = 5
+            mock_settings.DB_POOL_RECYCLE = 60
+
+            options = _engine_pool_options("postgresql://user:pw@localhost/db")
+
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 3
+        assert options["pool_pre_ping"] is True
+
+    def test_sqlite_pragmas_applied(self, tmp_path: Any) -> None:
+        """Test SQLite connections run in WAL mode with the tuned pragmas."""
+        engine = create_database_engine(f"sqlite:///{tmp_path / 'wal.db'}")
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        engine.dispose()
+
+    def test_create_storage_resources(self, tmp_path: Any) -> None:
+        """Test resources build an engine, session factory and pooled cache."""
+        with patch('src.storage.connections.settings') as mock_settings:
+            mock_settings.DATABASE_URL = f"sqlite:///{tmp_path / 'pool.db'}"
+            mock_settings.REDIS_MAX_CONNECTIONS = 4
+            resources = create_storage_resources()
+
+        assert resources.engine is not None
+        assert resources.session_factory is not None
+        assert resources.cache is not None
+        assert resources.cache.redis.connection_pool.max_connections == 4
+        resources.close()
+
+    @patch('src.storage.repository.create_engine')
+    @patch('src.storage.repository.RedisCache')
+    def test_repository_reuses_shared_resources(self, mock_redis: Any, mock_create_engine: Any, sample_market_data: List[MarketData]) -> None:
+        """Test a repository built from resources creates no new connections."""
+        session_factory = Mock()
+        cache = Mock()
+        resources = StorageResources(engine=Mock(), session_factory=session_factory, cache=cache)
+
+        repo = DataRepository(resources)
+
+        mock_create_engine.assert_not_called()
+        mock_redis.assert_not_called()
+        assert repo.Session is session_factory
+        assert repo.cache is cache
+
+    def test_close_disposes_pools(self) -> None:
+        """Test close releases engine and Redis pools."""
+        engine = Mock()
+        cache = Mock()
+
+        StorageResources(engine=engine, session_factory=Mock(), cache=cache).close()
+
+        engine.dispose.assert_called_once()
+        cache.close.assert_called_once()
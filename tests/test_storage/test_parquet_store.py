@@ -0,0 +1,72 @@
+from datetime import date, datetime
+from pathlib import Path
+from typing import List
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
+from src.storage.parquet_store import ParquetRepository
+
+
+@pytest.fixture
+def repository(tmp_path: Path) -> ParquetRepository:
+    """Create a Parquet store in a temporary directory."""
+    return ParquetRepository(tmp_path / "store")
+
+
+def _parts(repository: ParquetRepository) -> List[Path]:
+    return sorted(repository.root.rglob("part-*.parquet"))
+
+
+class TestParquetRepository:
+    """Test the partitioned Parquet storage backend."""
+
+    def test_round_trip_partitioned(self, repository: ParquetRepository, sample_market_data: List[MarketData]) -> None:
+        """Test bars are written under source/symbol/year partitions and read back."""
+        assert repository.bulk_save_market_data(sample_market_data) == 5
+
+        parts = _parts(repository)
+        assert len(parts) == 1
+        assert parts[0].parent.relative_to(repository.root) == Path("source=test/symbol=AAPL/year=2023")
+        assert repository.get_market_data("AAPL") == sample_market_data
+
+    def test_timestamp_range_filter(self, repository: ParquetRepository, sample_market_data: List[MarketData]) -> None:
+        """Test reads return only bars within the requested range."""
+        repository.bulk_save_market_data(OHLCVSeries.from_market_data(sample_market_data))
+
+        series = repository.get_series("AAPL", "test", datetime(2023, 1, 1, 10), datetime(2023, 1, 1, 12))
+
+        assert [bar.timestamp.hour for bar in series] == [10, 11]
+
+    def test_later_writes_win(self, repository: ParquetRepository, sample_market_data: List[MarketData]) -> None:
+        """Test re-saving a bar replaces the earlier value on read."""
+        repository.bulk_save_market_data(sample_market_data)
+        repository.bulk_save_market_data([sample_market_data[0].model_copy(update={'close': 103.5})])
+
+        data = repository.get_market_data("AAPL", source="test")
+
+        assert len(data) == 5
+        assert data[0].close == 103.5
+
+    def test_compaction_merges_parts(self, repository: ParquetRepository, sample_market_data: List[MarketData]) -> None:
+        """Test compaction leaves one file per partition with the same contents."""
+        for item in sample_market_data:
+            repository.bulk_save_market_data([item])
+        repository.bulk_save_market_data([sample_market_data[0].model_copy(update={'close': 103.5})])
+        before = repository.get_market_data("AAPL")
+
+        assert repository.compact(min_files=2) == 1
+        assert len(_parts(repository)) == 1
+        assert repository.get_market_data("AAPL") == before
+        assert before[0].close == 103.5
+
+    def test_stored_dates(self, repository: ParquetRepository, sample_market_data: List[MarketData]) -> None:
+        """Test coverage lookups report stored dates per symbol."""
+        repository.bulk_save_market_data(sample_market_data)
+
+        stored = repository.get_stored_dates(["AAPL", "MSFT"], "test", date(2023, 1, 1), date(2023, 1, 31))
+
+        assert stored == {"AAPL": [date(2023, 1, 1)], "MSFT": []}
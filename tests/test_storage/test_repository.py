@@ -1,8 +1,16 @@
+from datetime import date, datetime
 from typing import Any, List
 from unittest.mock import Mock, patch
 
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.storage.cache import INVALIDATION_CHANNEL, CacheStats, LocalCache, RedisCache, bucket_label
+from src.storage.models import Base
 from src.storage.repository import DataRepository
 from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
 
 
 class TestDataRepository:
@@ -146,7 +154,7 @@ class TestDataRepository:
         mock_session_maker = Mock(return_value=mock_session)
         
         mock_cache = Mock()
-        mock_cache.get_market_data.return_value = None  # Cache miss
+        mock_cache.get_market_ranges.return_value = {}  # Cache miss
         mock_redis.return_value = mock_cache
         
         # Create repository
@@ -158,4 +166,196 @@ class TestDataRepository:
         
         # Verify results
         assert len(result) == len(sample_market_data)
-        assert all(isinstance(item, MarketData) for item in result)
\ No newline at end of file
+        assert all(isinstance(item, MarketData) for item in result)
+
+class TestBulkSaveMarketData:
+    """Test the bulk INSERT ... ON CONFLICT ingest path."""
+
+    @pytest.fixture
+    def sqlite_repository(self, tmp_path: Any) -> DataRepository:
+        """Create a repository backed by a temporary SQLite file without cache."""
+        with patch('src.storage.repository.RedisCache'):
+            repo = DataRepository()
+        repo.engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+        Base.metadata.create_all(repo.engine)
+        repo.Session = sessionmaker(bind=repo.engine)
+        repo.cache = None
+        return repo
+
+    def test_bulk_save_inserts_rows(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test bulk save writes every row."""
+        written = sqlite_repository.bulk_save_market_data(sample_market_data, batch_size=2)
+
+        assert written == len(sample_market_data)
+        result = sqlite_repository.get_market_data("AAPL")
+        assert [item.timestamp for item in result] == [item.timestamp for item in sample_market_data]
+
+    def test_bulk_save_updates_on_conflict(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test bulk save overwrites existing (symbol, timestamp, source) rows."""
+        sqlite_repository.bulk_save_market_data(sample_market_data)
+        updated = [item.model_copy(update={'close': item.close + 1}) for item in sample_market_data]
+
+        sqlite_repository.bulk_save_market_data(updated)
+
+        result = sqlite_repository.get_market_data("AAPL")
+        assert len(result) == len(sample_market_data)
+        assert [item.close for item in result] == [item.close for item in updated]
+
+    def test_bulk_save_keeps_last_duplicate_in_batch(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test a bar repeated within one batch is upserted once, with its last values."""
+        repeated = sample_market_data[1].model_copy(update={'close': 500.0})
+        data = sample_market_data + [repeated]
+
+        rows = sqlite_repository._unique_upsert_rows(data)
+        written = sqlite_repository.bulk_save_market_data(data)
+
+        assert len(rows) == len(sample_market_data)
+        assert written == len(sample_market_data)
+        result = sqlite_repository.get_market_data("AAPL")
+        assert [item.close for item in result] == [item.close for item in sample_market_data[:1]] + [500.0] + [
+            item.close for item in sample_market_data[2:]
+        ]
+
+    def test_bulk_save_invalidates_cache_per_chunk(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test bulk save issues one cache call per committed chunk."""
+        mock_cache = Mock()
+        sqlite_repository.cache = mock_cache
+
+        sqlite_repository.bulk_save_market_data(sample_market_data, batch_size=2)
+
+        assert mock_cache.invalidate_market_ranges.call_count == 3
+        mock_cache.set_market_data.assert_not_called()
+
+    def test_save_without_local_tier_invalidates_readers(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test a CLI-style save with no local tier drops buckets from an API worker's local tier."""
+        with patch('src.storage.cache.redis.Redis') as mock_redis:
+            mock_redis.return_value = Mock()
+            reader = RedisCache(local_cache=LocalCache(max_entries=100, max_bytes=100000, ttl=60))
+            writer = RedisCache()
+        reader.redis.pipeline.return_value = Mock()
+        buckets = {bucket_label(item.timestamp) for item in sample_market_data}
+        reader.set_market_ranges({bucket: [] for bucket in buckets}, "AAPL", sample_market_data[0].source, expiration=60)
+        pipe = Mock()
+        writer.redis.pipeline.return_value = pipe
+        sqlite_repository.cache = writer
+
+        sqlite_repository.save_market_data(sample_market_data)
+        for channel, message in (call[0] for call in pipe.publish.call_args_list):
+            assert channel == INVALIDATION_CHANNEL
+            reader._handle_invalidation(message)
+
+        assert pipe.publish.called
+        assert len(reader.local) == 0
+
+    def test_bulk_save_no_database(self, sample_market_data: List[MarketData]) -> None:
+        """Test bulk save when database is unavailable."""
+        repo = DataRepository()
+        repo.engine = None
+        repo.Session = None
+        repo.cache = None
+
+        assert repo.bulk_save_market_data(sample_market_data) == 0
+
+
+class TestRangeCachedMarketData:
+    """Test bucket-level range caching in get_market_data."""
+
+    @pytest.fixture
+    def cached_repository(self, tmp_path: Any, sample_market_data: List[MarketData]) -> DataRepository:
+        """Create a SQLite-backed repository with a mocked range cache."""
+        with patch('src.storage.repository.RedisCache'):
+            repo = DataRepository()
+        repo.engine = create_engine(f"sqlite:///{tmp_path / 'cached.db'}")
+        Base.metadata.create_all(repo.engine)
+        repo.Session = sessionmaker(bind=repo.engine)
+        repo.cache = None
+        repo.bulk_save_market_data(sample_market_data)
+        repo.cache = Mock()
+        repo.cache.stats = CacheStats()
+        return repo
+
+    def test_range_miss_loads_and_fills_bucket(self, cached_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test a miss reads SQL once and caches the whole bucket."""
+        cache = cached_repository.cache
+        cache.get_market_ranges.return_value = {}
+
+        result = cached_repository.get_market_data("AAPL", datetime(2023, 1, 1, 10), datetime(2023, 1, 1, 12))
+
+        assert [item.timestamp.hour for item in result] == [10, 11]
+        ranges = cache.set_market_ranges.call_args[0][0]
+        assert list(ranges) == ["2023-01"]
+        assert len(ranges["2023-01"]) == len(sample_market_data)
+        assert cache.stats.misses == 1
+
+    def test_range_hit_skips_database(self, cached_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test a full hit is served without touching SQL."""
+        cache = cached_repository.cache
+        cache.get_market_ranges.return_value = {
+            "2023-01": [item.model_dump(mode='json') for item in sample_market_data]
+        }
+        cached_repository.Session = Mock(side_effect=AssertionError("database should not be queried"))
+
+        result = cached_repository.get_market_data("AAPL", datetime(2023, 1, 1), datetime(2023, 1, 31))
+
+        assert len(result) == len(sample_market_data)
+        cache.set_market_ranges.assert_not_called()
+        assert cached_repository.get_cache_stats()["hits"] == 1
+
+
+class TestSeriesStorage:
+    """Test columnar OHLCVSeries reads and writes."""
+
+    @pytest.fixture
+    def sqlite_repository(self, tmp_path: Any) -> DataRepository:
+        """Create a repository backed by a temporary SQLite file without cache."""
+        with patch('src.storage.repository.RedisCache'):
+            repo = DataRepository()
+        repo.engine = create_engine(f"sqlite:///{tmp_path / 'series.db'}")
+        Base.metadata.create_all(repo.engine)
+        repo.Session = sessionmaker(bind=repo.engine)
+        repo.cache = None
+        return repo
+
+    def test_series_round_trip(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test a series is written and read back column for column."""
+        series = OHLCVSeries.from_market_data(sample_market_data)
+
+        assert sqlite_repository.bulk_save_market_data(series, batch_size=2) == len(series)
+
+        assert sqlite_repository.get_series("AAPL", "test") == series
+        assert sqlite_repository.get_market_data("AAPL") == sample_market_data
+
+    def test_get_series_date_filter(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test columnar reads honour the date range."""
+        sqlite_repository.bulk_save_market_data(sample_market_data)
+
+        result = sqlite_repository.get_series(
+            "AAPL", "test", datetime(2023, 1, 1, 10), datetime(2023, 1, 1, 12)
+        )
+
+        assert [item.timestamp.hour for item in result] == [10, 11]
+
+    def test_series_invalidates_touched_buckets(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test series writes invalidate the buckets computed from the timestamp column."""
+        sqlite_repository.cache = Mock()
+
+        sqlite_repository.bulk_save_market_data(OHLCVSeries.from_market_data(sample_market_data))
+
+        keys = sqlite_repository.cache.invalidate_market_ranges.call_args[0][0]
+        assert [(key.symbol, key.source, key.bucket) for key in keys] == [("AAPL", "test", "2023-01")]
+
+    def test_get_stored_dates(self, sqlite_repository: DataRepository, sample_market_data: List[MarketData]) -> None:
+        """Test stored coverage is returned as distinct dates per requested symbol."""
+        sqlite_repository.bulk_save_market_data(sample_market_data)
+
+        coverage = sqlite_repository.get_stored_dates(["AAPL", "MSFT"], "test", date(2023, 1, 1), date(2023, 1, 1))
+
+        assert coverage == {"AAPL": [date(2023, 1, 1)], "MSFT": []}
+        assert sqlite_repository.get_stored_dates(["AAPL"], "other", date(2023, 1, 1), date(2023, 1, 2)) == {"AAPL": []}
+
+    def test_get_series_no_database(self) -> None:
+        """Test columnar reads when database is unavailable."""
+        repo = DataRepository()
+        repo.Session = None
+
+        assert len(repo.get_series("AAPL", "test")) == 0
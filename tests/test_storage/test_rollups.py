@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Any, Iterator, List
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from src.data_sources.series import OHLCVSeries
+from src.storage.models import Base, MarketDataRollupModel
+from src.storage.repository import DataRepository
+from src.storage.rollups import bucket_starts, choose_rollup, rollup_series
+
+
+def daily_series(start: str, days: int, close_offset: float = 0.0) -> OHLCVSeries:
+    """Create one bar per calendar day with closes rising by one each day."""
+    timestamps = pd.date_range(start, periods=days, freq="D").as_unit("ns").asi8
+    close = np.arange(days, dtype=np.float64) + 100.0 + close_offset
+    return OHLCVSeries(
+        symbol="AAPL",
+        source="test",
+        timestamps=timestamps,
+        open=close - 0.5,
+        high=close + 1.0,
+        low=close - 1.0,
+        close=close,
+        volume=np.full(days, 1000, dtype=np.int64)
+    )
+
+
+def rollup_rows(repository: DataRepository, timeframe: str) -> List[Any]:
+    with repository._get_session() as session:
+        return session.execute(
+            select(MarketDataRollupModel)
+            .where(MarketDataRollupModel.timeframe == timeframe)
+            .order_by(MarketDataRollupModel.bucket_start)
+        ).scalars().all()
+
+
+@pytest.fixture
+def sqlite_repository(tmp_path: Any) -> Iterator[DataRepository]:
+    """Create a repository with rollups enabled, backed by a temporary SQLite file without cache."""
+    with patch('src.storage.repository.RedisCache'):
+        repo = DataRepository()
+    repo.engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(repo.engine)
+    repo.Session = sessionmaker(bind=repo.engine)
+    repo.cache = None
+    with patch('src.storage.repository.settings.ROLLUPS_ENABLED', True):
+        yield repo
+
+
+class TestRollupSeries:
+    """Test bucketing and OHLCV aggregation."""
+
+    def test_weeks_start_on_monday(self) -> None:
+        """Test weekly buckets start on the Monday at or before each bar."""
+        series = daily_series("2023-01-01", 9)  # Sunday 1st through Monday 9th
+
+        starts = bucket_starts(series.timestamps, "1w").view("datetime64[ns]").astype("datetime64[D]")
+
+        assert str(starts[0]) == "2022-12-26"
+        assert set(str(day) for day in starts[1:8]) == {"2023-01-02"}
+        assert str(starts[8]) == "2023-01-09"
+
+    def test_monthly_aggregation(self) -> None:
+        """Test first/max/min/last/sum per month, regardless of input order."""
+        series = daily_series("2023-01-30", 4)
+        shuffled = series.take(np.array([3, 1, 0, 2]))
+
+        rolled = rollup_series(shuffled, "1mo")
+
+        assert rolled.datetimes.astype("datetime64[D]").astype(str).tolist() == ["2023-01-01", "2023-02-01"]
+        assert rolled.open.tolist() == [99.5, 101.5]
+        assert rolled.high.tolist() == [102.0, 104.0]
+        assert rolled.low.tolist() == [99.0, 101.0]
+        assert rolled.close.tolist() == [101.0, 103.0]
+        assert rolled.volume.tolist() == [2000, 2000]
+
+    def test_daily_bar_beside_intraday_bars_counted_once(self) -> None:
+        """Test a day holding a midnight daily bar and intraday bars rolls up from the intraday bars only."""
+        daily = daily_series("2023-01-02", 2)
+        intraday = daily_series("2023-01-03", 2)
+        intraday.timestamps[:] = pd.to_datetime(["2023-01-03 09:30", "2023-01-03 10:30"]).as_unit("ns").asi8
+        mixed = OHLCVSeries.concat([daily, intraday])
+
+        rolled = rollup_series(mixed, "1d")
+
+        assert rolled.volume.tolist() == [1000, 2000]
+        assert rolled.close.tolist() == [100.0, 101.0]
+        assert rollup_series(mixed, "1w").volume.tolist() == [3000]
+
+    def test_choose_rollup(self) -> None:
+        """Test routing prefers the resolution itself, then daily rollups, then raw bars."""
+        assert choose_rollup("1w", ["1d", "1w", "1mo"]) == "1w"
+        assert choose_rollup("1mo", ["1d", "1w"]) == "1d"
+        assert choose_rollup("1mo", ["1w"]) is None
+        with pytest.raises(ValueError):
+            choose_rollup("5m", ["1d"])
+
+
+class TestMaterializedRollups:
+    """Test rollups maintained by the repository on save."""
+
+    def test_bulk_save_maintains_every_timeframe(self, sqlite_repository: DataRepository) -> None:
+        """Test saved bars are rolled up into daily, weekly and monthly buckets."""
+        series = daily_series("2023-01-01", 45)
+        sqlite_repository.bulk_save_market_data(series)
+
+        assert len(rollup_rows(sqlite_repository, "1d")) == 45
+        monthly = rollup_rows(sqlite_repository, "1mo")
+        assert [row.bucket_start for row in monthly] == [datetime(2023, 1, 1), datetime(2023, 2, 1)]
+        assert monthly[0].volume == 31000 and monthly[0].close == 130.0
+        assert len(rollup_rows(sqlite_repository, "1w")) == 8
+
+    def test_incremental_update_touches_affected_buckets(self, sqlite_repository: DataRepository) -> None:
+        """Test a corrected bar refreshes its buckets and leaves the others alone."""
+        sqlite_repository.bulk_save_market_data(daily_series("2023-01-01", 45))
+        before = {row.bucket_start: row.updated_at for row in rollup_rows(sqlite_repository, "1mo")}
+
+        corrected = daily_series("2023-02-10", 1, close_offset=500.0)
+        sqlite_repository.bulk_save_market_data(corrected)
+
+        monthly = rollup_rows(sqlite_repository, "1mo")
+        assert monthly[0].updated_at == before[datetime(2023, 1, 1)]
+        assert monthly[1].high == 601.0 and monthly[1].volume == 14000
+
+    def test_get_series_routes_to_rollup(self, sqlite_repository: DataRepository) -> None:
+        """Test rollup reads match aggregating the raw bars, via any eligible rollup."""
+        series = daily_series("2023-01-01", 90)
+        sqlite_repository.bulk_save_market_data(series)
+        expected = rollup_series(series.filter_dates(datetime(2023, 1, 2), datetime(2023, 2, 5, 23, 59)), "1w")
+
+        weekly = sqlite_repository.get_series("AAPL", "test", datetime(2023, 1, 4), datetime(2023, 2, 1), resolution="1w")
+        with patch('src.storage.repository.settings.ROLLUP_TIMEFRAMES', ["1d"]):
+            from_daily = sqlite_repository.get_series(
+                "AAPL", "test", datetime(2023, 1, 4), datetime(2023, 2, 1), resolution="1w"
+            )
+        with patch('src.storage.repository.settings.ROLLUPS_ENABLED', False):
+            from_raw = sqlite_repository.get_series(
+                "AAPL", "test", datetime(2023, 1, 4), datetime(2023, 2, 1), resolution="1w"
+            )
+
+        assert weekly == expected
+        assert from_daily == expected
+        assert from_raw == expected
+
+    def test_rebuild_rollups(self, sqlite_repository: DataRepository) -> None:
+        """Test rollups can be rebuilt for bars saved while they were disabled."""
+        with patch('src.storage.repository.settings.ROLLUPS_ENABLED', False):
+            sqlite_repository.bulk_save_market_data(daily_series("2023-01-01", 10))
+        assert rollup_rows(sqlite_repository, "1d") == []
+
+        written = sqlite_repository.rebuild_rollups()
+
+        assert written == 10 + 3 + 1
+        assert len(rollup_rows(sqlite_repository, "1w")) == 3
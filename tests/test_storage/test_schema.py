@@ -0,0 +1,101 @@
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+
+from src.storage.models import Base
+from src.storage.repository import QueryFilters, RepositoryBase
+from src.storage.schema import _months, current_revision, partition_name, upgrade_schema
+
+RANGE_INDEX = 'ix_market_data_symbol_source_timestamp'
+
+
+@pytest.fixture
+def migrated_engine(tmp_path: Path) -> Engine:
+    """Create a SQLite database through the migrations."""
+    database_url = f"sqlite:///{tmp_path / 'market.db'}"
+    upgrade_schema(database_url)
+    engine = create_engine(database_url)
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine: Engine, source: Optional[str]) -> List[str]:
+    """Get SQLite's plan for the repository's market data range query."""
+    filters = QueryFilters(
+        symbol="AAPL",
+        start_date=datetime(2023, 1, 1),
+        end_date=datetime(2023, 3, 31),
+        source=source
+    )
+    query = RepositoryBase()._build_market_data_query(filters)
+    sql = str(query.compile(engine, compile_kwargs={'literal_binds': True}))
+    with engine.connect() as connection:
+        return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+class TestMigrations:
+    """Test the Alembic migrations for the market data schema."""
+
+    def test_upgrade_creates_range_index(self, migrated_engine: Engine) -> None:
+        """Test a fresh database ends at head with the composite index."""
+        indexes = {index['name']: index['column_names'] for index in inspect(migrated_engine).get_indexes('market_data')}
+
+        assert indexes[RANGE_INDEX] == ['symbol', 'source', 'timestamp']
+        with migrated_engine.connect() as connection:
+            assert current_revision(connection) == '0004'
+
+    def test_existing_database_is_stamped(self, tmp_path: Path) -> None:
+        """Test a database made by create_all is adopted instead of re-created."""
+        database_url = f"sqlite:///{tmp_path / 'legacy.db'}"
+        engine = create_engine(database_url)
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume, source) "
+                "VALUES ('AAPL', '2023-01-03 00:00:00', 1, 1, 1, 1, 1, 'test')"
+            ))
+
+        upgrade_schema(database_url)
+
+        with engine.connect() as connection:
+            assert current_revision(connection) == '0004'
+            assert connection.execute(text("SELECT count(*) FROM market_data")).scalar() == 1
+        engine.dispose()
+
+
+class TestRangeQueryPlan:
+    """Guard the index use of the repository's hot range query."""
+
+    def test_source_range_query_uses_composite_index(self, migrated_engine: Engine) -> None:
+        """Test symbol + source + timestamp range is one index range scan with no sort."""
+        plan = query_plan(migrated_engine, source="test")
+
+        assert any(
+            step.startswith(f"SEARCH market_data USING INDEX {RANGE_INDEX}")
+            and "timestamp>" in step and "timestamp<" in step
+            for step in plan
+        ), plan
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+
+    def test_all_sources_range_query_is_index_range_scan(self, migrated_engine: Engine) -> None:
+        """Test symbol + timestamp range without a source still avoids a scan and a sort."""
+        plan = query_plan(migrated_engine, source=None)
+
+        assert any(step.startswith("SEARCH market_data USING INDEX") and "timestamp>" in step for step in plan), plan
+        assert not any(step.startswith("SCAN") or "TEMP B-TREE" in step for step in plan), plan
+
+
+class TestMonthlyPartitions:
+    """Test monthly partition naming helpers."""
+
+    def test_months_span_year_boundary(self) -> None:
+        """Test month iteration and partition names across a year end."""
+        months = list(_months(date(2023, 11, 15), date(2024, 2, 1)))
+
+        assert [partition_name(month) for month in months] == [
+            "market_data_2023_11", "market_data_2023_12", "market_data_2024_01", "market_data_2024_02"
+        ]
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime, date, timedelta
@@ -5,7 +7,8 @@ from typing import Any, Tuple, Generator
 
 from src.data_sources.alpha_vantage import AlphaVantageAdapter, TimeSeriesConfig
 from src.data_sources.base import MarketData
-from src.data_sources.exceptions import APIError, RateLimitError
+from src.data_sources.exceptions import APIError
+from src.data_sources.rate_limit import MemoryBucket, TokenBucketLimiter
 
 
 class TestTimeSeriesConfig:
@@ -61,15 +64,14 @@ class TestAlphaVantageAdapter:
     def adapter(self, mock_settings: Any) -> AlphaVantageAdapter:
         """Create AlphaVantageAdapter instance for testing."""
         with patch('src.data_sources.alpha_vantage.TimeSeries'):
-            return AlphaVantageAdapter()
+            return AlphaVantageAdapter(limiter=TokenBucketLimiter(MemoryBucket(rate=100.0, capacity=100)))
 
     def test_adapter_initialization_success(self, mock_settings: Any) -> None:
         """Test successful adapter initialization."""
         with patch('src.data_sources.alpha_vantage.TimeSeries') as mock_ts:
             adapter = AlphaVantageAdapter()
             assert hasattr(adapter, '_client')
-            assert hasattr(adapter, '_request_times')
-            assert hasattr(adapter, '_lock')
+            assert hasattr(adapter, '_limiter')
             mock_ts.assert_called_once_with(key="test_api_key")
 
     def test_adapter_initialization_no_api_key(self) -> None:
@@ -136,66 +138,35 @@ class TestAlphaVantageAdapter:
         assert result.volume == 1500000
         assert result.source == "alpha_vantage"
 
-    def test_cleanup_old_requests(self, adapter: AlphaVantageAdapter) -> None:
-        """Test cleanup of old request timestamps."""
-        now = datetime.now()
-        old_time = now - timedelta(minutes=2)
-        recent_time = now - timedelta(seconds=30)
-        
-        adapter._request_times = [old_time, recent_time]
-        adapter._cleanup_old_requests(now)
-        
-        # Old request should be removed
-        assert len(adapter._request_times) == 1
-        assert adapter._request_times[0] == recent_time
-
-    def test_is_request_within_window(self, adapter: AlphaVantageAdapter) -> None:
-        """Test request time window checking."""
-        current_time = datetime.now()
-        
-        # Recent request should be within window
-        recent_time = current_time - timedelta(seconds=30)
-        assert adapter._is_request_within_window(current_time, recent_time)
-        
-        # Old request should be outside window
-        old_time = current_time - timedelta(minutes=2)
-        assert not adapter._is_request_within_window(current_time, old_time)
+    def test_shared_limiter_per_api_key(self, mock_settings: Any) -> None:
+        """Test adapters using the same API key share one rate limit budget."""
+        with patch('src.data_sources.alpha_vantage.TimeSeries'):
+            first = AlphaVantageAdapter()
+            second = AlphaVantageAdapter()
 
-    def test_is_within_rate_limit(self, adapter: AlphaVantageAdapter) -> None:
-        """Test rate limit checking."""
-        now = datetime.now()
-        
-        # Empty request list should be within limit
-        adapter._request_times = []
-        assert adapter._is_within_rate_limit(now)
-        
-        # List below limit should be within limit
-        adapter._request_times = [now - timedelta(seconds=30)] * 3
-        assert adapter._is_within_rate_limit(now)
-        
-        # List at limit should exceed limit
-        adapter._request_times = [now - timedelta(seconds=30)] * 5
-        assert not adapter._is_within_rate_limit(now)
+        assert first._limiter is second._limiter
+        assert first._limiter.backend.capacity == 5
+        assert first._limiter.backend.rate == pytest.approx(5 / 60)
 
     @pytest.mark.asyncio
     async def test_manage_rate_limit_success(self, adapter: AlphaVantageAdapter) -> None:
-        """Test successful rate limit management."""
-        adapter._request_times = []
-        
+        """Test a request token is taken from the bucket."""
         await adapter._manage_rate_limit()
-        
-        # Should add current time to request list
-        assert len(adapter._request_times) == 1
+
+        assert adapter._limiter.backend._tokens == pytest.approx(99, abs=0.1)
 
     @pytest.mark.asyncio
-    async def test_manage_rate_limit_exceeded(self, adapter: AlphaVantageAdapter) -> None:
-        """Test rate limit exceeded."""
-        # Fill up the rate limit
-        now = datetime.now()
-        adapter._request_times = [now - timedelta(seconds=30)] * 5
-        
-        with pytest.raises(RateLimitError, match="Alpha Vantage rate limit exceeded"):
-            await adapter._manage_rate_limit()
+    async def test_manage_rate_limit_waits(self, mock_settings: Any) -> None:
+        """Test an exhausted budget paces the request instead of failing."""
+        limiter = TokenBucketLimiter(MemoryBucket(rate=20.0, capacity=1), max_sleep=0.01)
+        with patch('src.data_sources.alpha_vantage.TimeSeries'):
+            adapter = AlphaVantageAdapter(limiter=limiter)
+
+        await adapter._manage_rate_limit()
+        start = time.monotonic()
+        await adapter._manage_rate_limit()
+
+        assert time.monotonic() - start >= 0.04
 
     @pytest.mark.asyncio
     async def test_execute_api_operation_success(self, adapter: AlphaVantageAdapter) -> None:
@@ -203,7 +174,6 @@ class TestAlphaVantageAdapter:
         def mock_operation() -> str:
             return "success"
         
-        adapter._request_times = []  # Reset rate limit
         result = await adapter._execute_api_operation(mock_operation)
         
         assert result == "success"
@@ -214,8 +184,6 @@ class TestAlphaVantageAdapter:
         def mock_operation() -> None:
             raise Exception("API Error")
         
-        adapter._request_times = []  # Reset rate limit
-        
         with pytest.raises(APIError, match="Alpha Vantage API error: API Error"):
             await adapter._execute_api_operation(mock_operation)
 
@@ -366,7 +334,6 @@ class TestAlphaVantageAdapter:
         }
         
         adapter._client.get_daily = Mock(return_value=(mock_data, {}))
-        adapter._request_times = []  # Reset rate limit
         
         result = await adapter.get_daily_prices("AAPL")
         
@@ -374,6 +341,17 @@ class TestAlphaVantageAdapter:
         assert result[0].symbol == "AAPL"
         assert result[0].source == "alpha_vantage"
 
+    @pytest.mark.asyncio
+    async def test_get_daily_prices_recent_window_uses_compact(self, adapter: AlphaVantageAdapter) -> None:
+        """Test a start date within the last 100 data points requests compact output."""
+        adapter._client.get_daily = Mock(return_value=({}, {}))
+
+        await adapter.get_daily_prices("AAPL", start_date=date.today() - timedelta(days=5))
+        await adapter.get_daily_prices("AAPL", start_date=date.today() - timedelta(days=400))
+
+        outputsizes = [call.kwargs['outputsize'] for call in adapter._client.get_daily.call_args_list]
+        assert outputsizes == ['compact', 'full']
+
     @pytest.mark.asyncio
     async def test_get_intraday_prices(self, adapter: AlphaVantageAdapter) -> None:
         """Test intraday price retrieval."""
@@ -388,7 +366,6 @@ class TestAlphaVantageAdapter:
         }
         
         adapter._client.get_intraday = Mock(return_value=(mock_data, {}))
-        adapter._request_times = []  # Reset rate limit
         
         result = await adapter.get_intraday_prices("AAPL", interval=5)
         
@@ -409,7 +386,6 @@ class TestAlphaVantageAdapter:
         ]
         
         adapter._client.get_symbol_search = Mock(return_value=mock_matches)
-        adapter._request_times = []  # Reset rate limit
         
         result = await adapter.search_symbols("AAPL")
         
@@ -0,0 +1,126 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_sources.series import OHLCVSeries
+from src.processing.backtest import backtest, expand_grid, positions, sweep_symbols, synthetic_dataset
+from src.processing.indicators import sma
+
+
+def daily(close: List[float]) -> OHLCVSeries:
+    """Create daily bars on business days from the closes."""
+    values = np.asarray(close, dtype=np.float64)
+    return OHLCVSeries(
+        symbol="AAPL",
+        source="test",
+        timestamps=pd.bdate_range("2023-01-02", periods=len(values)).as_unit("ns").asi8,
+        open=values,
+        high=values,
+        low=values,
+        close=values,
+        volume=np.full(len(values), 100, dtype=np.int64)
+    )
+
+
+def reference_sma_cross(close: np.ndarray, fast: int, slow: int, cost: float) -> Dict[str, float]:
+    """Walk the bars one at a time, trading at each close."""
+    fast_line, slow_line = sma(close, fast)[0], sma(close, slow)[0]
+    equity, position, trade, trades = 1.0, 0.0, 1.0, []
+    for t in range(len(close) - 1):
+        wanted = 1.0 if fast_line[t] > slow_line[t] else 0.0
+        step = 1.0 + wanted * (close[t + 1] / close[t] - 1.0) - cost * abs(wanted - position)
+        equity *= step
+        if wanted or position:
+            trade *= step
+        if position and not wanted:
+            trades.append(trade - 1.0)
+        if wanted and not position:
+            trade = step
+        position = wanted
+    if position:
+        trades.append(trade - 1.0)
+    return {"total_return": equity - 1.0, "trades": len(trades), "wins": sum(item > 0 for item in trades)}
+
+
+class TestBacktest:
+    """Test the vectorized backtester."""
+
+    def test_matches_bar_by_bar_reference(self) -> None:
+        """Test returns and trade counts equal a loop over the bars, costs included."""
+        series = synthetic_dataset(symbols=1, bars=400, seed=3)[0]
+        sweep = backtest(series, "sma_cross", {"fast": (5, 10), "slow": (20, 40)}, cost_bps=10.0)
+
+        for i, combo in enumerate(sweep.combos):
+            expected = reference_sma_cross(series.close, combo["fast"], combo["slow"], 0.001)
+            assert sweep.metrics["total_return"][i] == pytest.approx(expected["total_return"], rel=1e-9)
+            assert sweep.trades["total_trades"][i] == expected["trades"]
+            assert sweep.trades["winning_trades"][i] == expected["wins"]
+
+    def test_grid_rows_match_single_combinations(self) -> None:
+        """Test each row of a grid sweep equals backtesting that combination alone."""
+        series = synthetic_dataset(symbols=1, bars=300, seed=8)[0]
+        grid = {"fast": (8, 12), "slow": (21, 30), "signal": (5, 9)}
+        sweep = backtest(series, "macd", grid)
+
+        for i, combo in enumerate(sweep.combos):
+            single = backtest(series, "macd", {name: (value,) for name, value in combo.items()})
+            assert single.report(0)["performance"] == sweep.report(i)["performance"]
+            np.testing.assert_allclose(single.monthly_returns[0], sweep.monthly_returns[i])
+
+    def test_rsi_holds_until_exit(self) -> None:
+        """Test an RSI entry is held until the overbought exit, not just while oversold."""
+        close = np.array([10.0, 9.0, 8.0, 7.0, 7.5, 8.0, 9.0, 10.0, 11.0, 10.5])
+
+        held = positions(close, "rsi_reversion", [{"period": 2, "oversold": 20, "overbought": 80}])
+
+        assert held[0].tolist() == [0, 0, 1, 1, 1, 1, 0, 0, 0, 0]
+
+    def test_report_has_mock_metrics(self) -> None:
+        """Test a report carries performance, trade and calendar-month figures."""
+        close = [100.0 + i for i in range(30)] + [130.0 - i for i in range(30)]
+        sweep = backtest(daily(close), "sma_cross", {"fast": (3,), "slow": (10,)}, cost_bps=0.0)
+
+        report = sweep.report(sweep.best())
+
+        assert set(report["performance"]) == {
+            "total_return", "annual_return", "sharpe_ratio", "max_drawdown", "win_rate", "profit_factor"
+        }
+        assert report["trades"]["total_trades"] == 1
+        assert report["trades"]["average_loss"] is None
+        assert [item["month"] for item in report["monthly_returns"]] == ["2023-01", "2023-02", "2023-03"]
+        growth = np.prod([1.0 + item["return"] for item in report["monthly_returns"]])
+        assert growth - 1.0 == pytest.approx(report["performance"]["total_return"], abs=1e-3)
+
+    def test_invalid_grids(self) -> None:
+        """Test unknown strategies and parameters are rejected and crossed periods skipped."""
+        with pytest.raises(ValueError):
+            expand_grid("momentum")
+        with pytest.raises(ValueError):
+            expand_grid("sma_cross", {"window": (5,)})
+        assert expand_grid("sma_cross", {"fast": (10, 30), "slow": (20,)}) == [{"fast": 10, "slow": 20}]
+
+
+class TestSweepSymbols:
+    """Test sweeps over many symbols."""
+
+    def test_process_pool_matches_in_process(self) -> None:
+        """Test worker processes produce the same results as running in-process."""
+        dataset = synthetic_dataset(symbols=3, bars=260)
+        grid = {"fast": (5, 10), "slow": (30, 50)}
+
+        pooled = sweep_symbols(dataset, "sma_cross", grid, workers=2)
+        local = sweep_symbols(dataset, "sma_cross", grid, workers=1)
+
+        assert list(pooled) == ["SYN000", "SYN001", "SYN002"]
+        for symbol, result in local.items():
+            assert pooled[symbol].ranking() == result.ranking()
+
+    def test_synthetic_dataset_is_deterministic(self) -> None:
+        """Test the benchmark dataset is the same for the same seed."""
+        first, second = synthetic_dataset(symbols=2, bars=50), synthetic_dataset(symbols=2, bars=50)
+
+        assert first == second
+        assert first[0] != synthetic_dataset(symbols=2, bars=50, seed=1)[0]
+        assert (first[0].high >= first[0].close).all() and (first[0].low <= first[0].close).all()
@@ -1,8 +1,11 @@
+import asyncio
+
 import pytest
 from datetime import datetime, date
 from typing import Dict, List, Optional
 from abc import ABC
 
+from src.config import settings
 from src.data_sources.base import MarketData, DataSourceBase
 
 
@@ -312,4 +315,52 @@ class TestDataSourceBase:
         # Test search
         search_results = await adapter.search_symbols("AAPL")
         assert len(search_results) == 1
-        assert search_results[0]['symbol'] == "AAPL"
\ No newline at end of file
+        assert search_results[0]['symbol'] == "AAPL"
+
+class TestDailyPricesBatch:
+    """Unit tests for the default per-symbol batch fallback."""
+
+    class CountingSource(DataSourceBase):
+        """Source recording how many calls run at once."""
+
+        def __init__(self) -> None:
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+        async def get_daily_prices(self, symbol: str, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[MarketData]:
+            if symbol == "FAIL":
+                raise ValueError("boom")
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return [MarketData(
+                symbol=symbol, timestamp=datetime(2023, 1, 2), open=1.0, high=1.0,
+                low=1.0, close=1.0, volume=1, source="counting"
+            )]
+
+        async def get_intraday_prices(self, symbol: str, interval: int = 5, limit: Optional[int] = None) -> List[MarketData]:
+            return []
+
+        async def search_symbols(self, query: str) -> List[Dict[str, str]]:
+            return []
+
+    @pytest.mark.asyncio
+    async def test_batch_bounds_concurrency(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the fallback never exceeds BATCH_FETCH_CONCURRENCY calls in flight."""
+        monkeypatch.setattr(settings, 'BATCH_FETCH_CONCURRENCY', 3)
+        source = self.CountingSource()
+        symbols = [f"S{i}" for i in range(10)]
+
+        result = await source.get_daily_prices_batch(symbols)
+
+        assert list(result) == symbols
+        assert all(len(series) == 1 for series in result.values())
+        assert source.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_skips_failed_symbols(self) -> None:
+        """Test symbols whose fetch fails are left out."""
+        result = await self.CountingSource().get_daily_prices_batch(["AAPL", "FAIL", "AAPL"])
+
+        assert list(result) == ["AAPL"]
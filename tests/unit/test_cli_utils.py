@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime
+from typing import Any
 import pandas as pd
 from unittest.mock import patch
 
@@ -7,7 +8,8 @@ from src.cli.utils import (
     display_market_data,
     parse_date,
     format_change,
-    format_volume
+    format_volume,
+    load_watchlist
 )
 
 
@@ -178,4 +180,13 @@ def test_parse_date_edge_cases() -> None:
     
     for date_str, expected in formats_and_dates:
         result = parse_date(date_str)
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+
+
+def test_load_watchlist(tmp_path: Any) -> None:
+    """Test watchlist parsing of comments, separators, case and duplicates."""
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("# tech\naapl, msft\nGOOG  AAPL # again\n\n")
+
+    assert load_watchlist(watchlist) == ["AAPL", "MSFT", "GOOG"]
+
@@ -1,10 +1,17 @@
+import asyncio
+import time
+
 import pytest
 from unittest.mock import Mock, AsyncMock
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List
 
-from src.processing.pipeline import DataPipeline
+from src.config import settings
+from src.processing.pipeline import DataPipeline, FetchRequest
+from src.processing.validation import DataSourceResponse
+from src.processing.single_flight import SingleFlight
 from src.data_sources.base import MarketData, DataSourceBase
+from src.data_sources.series import OHLCVSeries
 
 
 class TestDataPipeline:
@@ -170,3 +177,312 @@ class TestDataPipeline:
         
         assert response.success is False
 
+
+
+class TestDataPipelinePersistence:
+    """Unit tests for persisting through an async repository."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_persists_through_repository(self) -> None:
+        """Test validated data is handed to the async repository."""
+        data = [
+            MarketData(
+                symbol="AAPL", timestamp=datetime(2023, 1, 2), open=100.0, high=105.0,
+                low=99.0, close=102.0, volume=1000, source="test"
+            )
+        ]
+        source = Mock(spec=DataSourceBase)
+        source.get_daily_prices = AsyncMock(return_value=data)
+        repository = Mock()
+        repository.bulk_save_market_data = AsyncMock(return_value=1)
+
+        response = await DataPipeline([source], repository=repository).fetch_data("AAPL")
+
+        assert response.success is True
+        saved = repository.bulk_save_market_data.await_args[0][0]
+        assert [item.symbol for item in saved] == ["AAPL"]
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_enqueues_for_write_behind(self) -> None:
+        """Test validated data goes to the ingestion queue instead of an inline write."""
+        data = [
+            MarketData(
+                symbol="AAPL", timestamp=datetime(2023, 1, 2), open=100.0, high=105.0,
+                low=99.0, close=102.0, volume=1000, source="test"
+            )
+        ]
+        source = Mock(spec=DataSourceBase)
+        source.get_daily_prices = AsyncMock(return_value=data)
+        repository = Mock()
+        repository.bulk_save_market_data = AsyncMock(return_value=1)
+        ingestion = Mock()
+        ingestion.put = AsyncMock()
+
+        response = await DataPipeline([source], repository=repository, ingestion=ingestion).fetch_data("AAPL")
+
+        assert response.success is True
+        queued = ingestion.put.await_args[0][0]
+        assert [item.symbol for item in queued] == ["AAPL"]
+        repository.bulk_save_market_data.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_survives_persistence_failure(self) -> None:
+        """Test persistence errors do not fail the fetch."""
+        data = [
+            MarketData(
+                symbol="AAPL", timestamp=datetime(2023, 1, 2), open=100.0, high=105.0,
+                low=99.0, close=102.0, volume=1000, source="test"
+            )
+        ]
+        source = Mock(spec=DataSourceBase)
+        source.get_daily_prices = AsyncMock(return_value=data)
+        repository = Mock()
+        repository.bulk_save_market_data = AsyncMock(side_effect=Exception("db down"))
+
+        response = await DataPipeline([source], repository=repository).fetch_data("AAPL")
+
+        assert response.success is True
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_returns_series_per_source(self, sample_market_data: List[MarketData]) -> None:
+        """Test columnar sources are merged and returned as one series per source."""
+        other = [item.model_copy(update={'source': 'other', 'timestamp': item.timestamp.replace(year=2022)})
+                 for item in sample_market_data]
+        source1 = Mock(spec=DataSourceBase)
+        source1.get_daily_prices = AsyncMock(return_value=OHLCVSeries.from_market_data(sample_market_data))
+        source2 = Mock(spec=DataSourceBase)
+        source2.get_daily_prices = AsyncMock(return_value=other)
+
+        response = await DataPipeline([source1, source2]).fetch_data("AAPL")
+
+        assert response.success is True
+        assert response.series is not None
+        assert sorted((s.source, len(s)) for s in response.series) == [("other", 5), ("test", 5)]
+        assert "series" not in response.model_dump()
+
+
+class TestDataPipelineValidation:
+    """Unit tests for vectorized validation in fetch_data."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_reports_rejected_rows(self, sample_market_data: List[MarketData]) -> None:
+        """Test rows failing StockPrice rules are dropped and reported."""
+        broken = sample_market_data[0].model_copy(update={'open': -1.0})
+        source = Mock(spec=DataSourceBase)
+        source.get_daily_prices = AsyncMock(return_value=[broken] + sample_market_data[1:])
+
+        response = await DataPipeline([source]).fetch_data("AAPL")
+
+        assert response.success is True
+        assert response.data is not None and len(response.data) == len(sample_market_data) - 1
+        assert response.report is not None
+        assert response.report.rejections == {'non_positive_price': 1}
+
+
+class TestDataPipelineResampling:
+    """Unit tests for returning fetched bars at a coarser timeframe."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_resamples_after_persisting(self, sample_market_data: List[MarketData]) -> None:
+        """Test raw bars are persisted and the response carries resampled bars."""
+        source = Mock(spec=DataSourceBase)
+        source.get_intraday_prices = AsyncMock(return_value=sample_market_data)
+        repository = Mock()
+        repository.bulk_save_market_data = AsyncMock(return_value=5)
+
+        response = await DataPipeline([source], repository=repository).fetch_data(
+            "AAPL", interval=60, timeframe="1d"
+        )
+
+        assert response.success is True
+        assert len(repository.bulk_save_market_data.await_args[0][0]) == len(sample_market_data)
+        assert response.series is not None and len(response.series[0]) == 1
+        assert response.data is not None and response.data[0].volume == sum(item.volume for item in sample_market_data)
+
+    @pytest.mark.asyncio
+    async def test_fetch_data_rejects_finer_timeframe(self) -> None:
+        """Test a timeframe the fetched bars cannot build fails before calling sources."""
+        source = Mock(spec=DataSourceBase)
+        source.get_intraday_prices = AsyncMock(return_value=[])
+
+        response = await DataPipeline([source]).fetch_data("AAPL", interval=60, timeframe="15m")
+
+        assert response.success is False
+        source.get_intraday_prices.assert_not_called()
+
+
+class TestDataPipelineConcurrency:
+    """Unit tests for concurrent fan-out and hedged requests."""
+
+    def _source(self, data: List[MarketData], delay: float) -> Mock:
+        """Create a source answering after a delay and recording cancellation."""
+        source = Mock(spec=DataSourceBase)
+        source.cancelled = False
+
+        async def _get_daily_prices(**kwargs: object) -> List[MarketData]:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                source.cancelled = True
+                raise
+            return data
+
+        source.get_daily_prices = AsyncMock(side_effect=_get_daily_prices)
+        return source
+
+    def _other(self, data: List[MarketData]) -> List[MarketData]:
+        """Copy bars under a second source name a year earlier so they survive de-duplication."""
+        return [
+            item.model_copy(update={'source': 'other', 'timestamp': item.timestamp.replace(year=2022)})
+            for item in data
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sources_queried_concurrently(self, sample_market_data: List[MarketData]) -> None:
+        """Test latency is the slowest source rather than the sum."""
+        pipeline = DataPipeline([
+            self._source(sample_market_data, 0.2),
+            self._source(self._other(sample_market_data), 0.2)
+        ], hedging=False)
+
+        started = time.perf_counter()
+        response = await pipeline.fetch_data("AAPL")
+
+        assert time.perf_counter() - started < 0.35
+        assert response.series is not None and len(response.series) == 2
+
+    @pytest.mark.asyncio
+    async def test_source_timeout(self, sample_market_data: List[MarketData]) -> None:
+        """Test a slow source times out without failing the fetch."""
+        pipeline = DataPipeline([
+            self._source(sample_market_data, 5.0),
+            self._source(self._other(sample_market_data), 0.0)
+        ], hedging=False, source_timeout=0.05)
+
+        response = await pipeline.fetch_data("AAPL")
+
+        assert response.success is True
+        assert response.series is not None and [s.source for s in response.series] == ["other"]
+        stats = pipeline.get_latency_stats()
+        assert stats["Mock#0"]["timeouts"] == 1
+        assert stats["Mock#1"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_fires_and_cancels_loser(self, sample_market_data: List[MarketData]) -> None:
+        """Test a slow primary is hedged by the secondary and then cancelled."""
+        primary = self._source(sample_market_data, 5.0)
+        secondary = self._source(self._other(sample_market_data), 0.0)
+        pipeline = DataPipeline([primary, secondary], hedging=True, hedge_delay=0.05)
+
+        response = await pipeline.fetch_data("AAPL")
+
+        assert response.series is not None and [s.source for s in response.series] == ["other"]
+        assert primary.cancelled is True
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_skips_hedge(self, sample_market_data: List[MarketData]) -> None:
+        """Test the secondary is never called when the primary answers in time."""
+        secondary = self._source(self._other(sample_market_data), 0.0)
+        pipeline = DataPipeline([self._source(sample_market_data, 0.0), secondary], hedging=True, hedge_delay=1.0)
+
+        response = await pipeline.fetch_data("AAPL")
+
+        assert response.series is not None and [s.source for s in response.series] == ["test"]
+        secondary.get_daily_prices.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_hedges_immediately(self, sample_market_data: List[MarketData]) -> None:
+        """Test a failing primary fires the secondary without waiting for the delay."""
+        primary = Mock(spec=DataSourceBase)
+        primary.get_daily_prices = AsyncMock(side_effect=Exception("down"))
+        pipeline = DataPipeline([primary, self._source(sample_market_data, 0.0)], hedging=True, hedge_delay=5.0)
+
+        started = time.perf_counter()
+        response = await pipeline.fetch_data("AAPL")
+
+        assert response.success is True
+        assert time.perf_counter() - started < 1.0
+
+    def test_hedge_delay_tracks_primary_p95(self) -> None:
+        """Test the default hedge delay follows the primary's observed p95."""
+        pipeline = DataPipeline([Mock(spec=DataSourceBase), Mock(spec=DataSourceBase)])
+        pipeline.hedge_delay = None
+        assert pipeline._current_hedge_delay(0) == settings.HEDGE_DELAY_DEFAULT
+
+        for _ in range(settings.HEDGE_MIN_SAMPLES):
+            pipeline.latency["Mock#0"].observe(0.3)
+
+        assert pipeline._current_hedge_delay(0) == pytest.approx(0.3, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_coalesced(self, sample_market_data: List[MarketData]) -> None:
+        """Test concurrent identical fetches share one upstream call."""
+        source = self._source(sample_market_data, 0.05)
+        single_flight = SingleFlight()
+        pipelines = [DataPipeline([source], single_flight=single_flight) for _ in range(3)]
+
+        responses = await asyncio.gather(*(pipeline.fetch_data("AAPL") for pipeline in pipelines))
+
+        assert all(response.success for response in responses)
+        assert source.get_daily_prices.await_count == 1
+        assert pipelines[0].get_coalescing_stats()['saved'] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_ranges_from_separate_now_calls_coalesced(self, sample_market_data: List[MarketData]) -> None:
+        """Test fetches whose ranges come from separate datetime.now() calls share one upstream call."""
+        source = self._source(sample_market_data, 0.05)
+        single_flight = SingleFlight()
+        pipelines = [DataPipeline([source], single_flight=single_flight) for _ in range(3)]
+
+        async def fetch(pipeline: DataPipeline) -> DataSourceResponse:
+            end_date = datetime.now()
+            return await pipeline.fetch_data("AAPL", start_date=end_date - timedelta(days=30), end_date=end_date)
+
+        responses = await asyncio.gather(*(fetch(pipeline) for pipeline in pipelines))
+
+        assert all(response.success for response in responses)
+        assert source.get_daily_prices.await_count == 1
+
+    def test_intraday_flight_key_cut_to_interval(self) -> None:
+        """Test intraday bounds inside one interval give the same key."""
+        pipeline = DataPipeline([Mock(spec=DataSourceBase)], single_flight=SingleFlight())
+        first = FetchRequest("AAPL", datetime(2023, 1, 3, 9, 31, 5, 12), datetime(2023, 1, 3, 10, 2), interval=5)
+        second = FetchRequest("AAPL", datetime(2023, 1, 3, 9, 34, 59), datetime(2023, 1, 3, 10, 4, 1), interval=5)
+        later = FetchRequest("AAPL", datetime(2023, 1, 3, 9, 35), datetime(2023, 1, 3, 10, 4, 1), interval=5)
+
+        assert pipeline._flight_key(0, first) == pipeline._flight_key(0, second)
+        assert pipeline._flight_key(0, first) != pipeline._flight_key(0, later)
+
+
+class TestDataPipelineBatch:
+    """Unit tests for multi-symbol batch fetches."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_batch_one_response_per_symbol(self, sample_market_data: List[MarketData]) -> None:
+        """Test one batch call per source yields a processed response per symbol."""
+        msft = [item.model_copy(update={'symbol': 'MSFT'}) for item in sample_market_data]
+        source = Mock(spec=DataSourceBase)
+        source.get_daily_prices_batch = AsyncMock(return_value={
+            "AAPL": OHLCVSeries.from_market_data(sample_market_data),
+            "MSFT": OHLCVSeries.from_market_data(msft)
+        })
+        pipeline = DataPipeline([source])
+
+        responses = await pipeline.fetch_batch(["AAPL", "MSFT", "NONE", "AAPL"])
+
+        source.get_daily_prices_batch.assert_awaited_once()
+        assert source.get_daily_prices_batch.await_args[0][0] == ["AAPL", "MSFT", "NONE"]
+        assert responses["AAPL"].success and responses["MSFT"].success
+        assert responses["MSFT"].data is not None and responses["MSFT"].data[0].symbol == "MSFT"
+        assert responses["NONE"].success is False
+
+    @pytest.mark.asyncio
+    async def test_fetch_batch_source_failure(self) -> None:
+        """Test a failing batch source is reported for every symbol."""
+        source = Mock(spec=DataSourceBase)
+        source.get_daily_prices_batch = AsyncMock(side_effect=Exception("down"))
+
+        responses = await DataPipeline([source]).fetch_batch(["AAPL", "MSFT"])
+
+        assert all(not response.success and "down" in (response.error or "") for response in responses.values())
@@ -0,0 +1,123 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Sequence
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data_sources.base import DataSourceBase, MarketData
+from src.data_sources.series import OHLCVSeries
+from src.processing.ingestion import WriteBehindQueue
+from src.processing.sync import IncrementalSync
+from src.processing.trading_calendar import TradingCalendar
+from src.storage.models import Base
+from src.storage.repository import DataRepository
+
+
+def daily_bars(symbol: str, sessions: Sequence[date]) -> OHLCVSeries:
+    """Create one valid daily bar per session."""
+    return OHLCVSeries.from_market_data([
+        MarketData(
+            symbol=symbol, timestamp=datetime.combine(day, datetime.min.time()),
+            open=100.0, high=101.0, low=99.0, close=100.5, volume=1000, source="test"
+        )
+        for day in sessions
+    ])
+
+
+class FakeSource(DataSourceBase):
+    """Source serving calendar sessions in the requested window and recording calls."""
+
+    source_name = "test"
+
+    def __init__(self) -> None:
+        self.batch_calls: List[Any] = []
+
+    async def get_daily_prices_batch(
+        self, symbols: Sequence[str], start_date: Any = None, end_date: Any = None
+    ) -> Dict[str, OHLCVSeries]:
+        self.batch_calls.append((list(symbols), start_date, end_date))
+        sessions = TradingCalendar().sessions(start_date, end_date).date
+        return {symbol: daily_bars(symbol, sessions) for symbol in symbols}
+
+    async def get_daily_prices(self, symbol: str, start_date: Any = None, end_date: Any = None) -> Any:
+        return []
+
+    async def get_intraday_prices(self, symbol: str, interval: int = 5, limit: Any = None) -> Any:
+        return []
+
+    async def search_symbols(self, query: str) -> List[Dict[str, str]]:
+        return []
+
+
+class TestIncrementalSync:
+    """Unit tests for gap-aware incremental fetching."""
+
+    @pytest.fixture
+    def repository(self, tmp_path: Any) -> DataRepository:
+        """Create a cache-less SQLite repository."""
+        with patch('src.storage.repository.RedisCache'):
+            repo = DataRepository()
+        repo.engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+        Base.metadata.create_all(repo.engine)
+        repo.Session = sessionmaker(bind=repo.engine)
+        repo.cache = None
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_fetches_only_missing_sessions(self, repository: DataRepository) -> None:
+        """Test symbols sharing a gap are fetched together and only for that gap."""
+        stored_sessions = TradingCalendar().sessions(date(2024, 1, 2), date(2024, 1, 5)).date
+        for symbol in ("AAPL", "MSFT"):
+            repository.bulk_save_market_data(daily_bars(symbol, stored_sessions))
+        source = FakeSource()
+
+        report = await IncrementalSync([source], repository).sync(["AAPL", "MSFT"], date(2024, 1, 2), date(2024, 1, 12))
+
+        assert source.batch_calls == [(["AAPL", "MSFT"], date(2024, 1, 8), date(2024, 1, 13))]
+        assert report.gaps == 2
+        assert report.rows_written == 10
+        assert repository.get_stored_dates(["AAPL"], "test", date(2024, 1, 2), date(2024, 1, 12))["AAPL"][-1] == date(2024, 1, 12)
+
+    @pytest.mark.asyncio
+    async def test_up_to_date_makes_no_requests(self, repository: DataRepository) -> None:
+        """Test a second sync over a filled window does not call the source."""
+        source = FakeSource()
+        sync = IncrementalSync([source], repository)
+        await sync.sync(["AAPL"], date(2024, 1, 2), date(2024, 1, 31))
+
+        report = await sync.sync(["AAPL"], date(2024, 1, 2), date(2024, 1, 31))
+
+        assert len(source.batch_calls) == 1
+        assert report.up_to_date == 1
+        assert report.requests == 0
+
+    @pytest.mark.asyncio
+    async def test_fetched_bars_go_through_write_behind(self, repository: DataRepository, tmp_path: Any) -> None:
+        """Test a sync given an ingestion queue persists through it, not inline."""
+        source = FakeSource()
+        ingestion = WriteBehindQueue(repository, spill_path=tmp_path / "spill.jsonl")
+
+        with patch.object(repository, 'bulk_save_market_data', wraps=repository.bulk_save_market_data) as inline:
+            async with ingestion:
+                report = await IncrementalSync([source], repository, ingestion=ingestion).sync(
+                    ["AAPL"], date(2024, 1, 2), date(2024, 1, 12)
+                )
+            queued_writes = inline.call_count
+
+        assert report.rows_written == 9
+        assert ingestion.stats.enqueued_bars == 9
+        assert queued_writes == 1
+        assert len(repository.get_stored_dates(["AAPL"], "test", date(2024, 1, 2), date(2024, 1, 12))["AAPL"]) == 9
+
+    def test_many_gaps_coalesce(self, repository: DataRepository) -> None:
+        """Test scattered holes beyond SYNC_MAX_GAPS_PER_SYMBOL become one span."""
+        stored = [date(2024, 1, d) for d in (3, 5, 9, 11, 16)]
+
+        missing, groups = IncrementalSync([Mock()], repository)._plan(
+            {"AAPL": stored}, date(2024, 1, 2), date(2024, 1, 19)
+        )
+
+        assert missing["AAPL"] == [(date(2024, 1, 2), date(2024, 1, 19))]
+        assert groups == {(date(2024, 1, 2), date(2024, 1, 19)): ["AAPL"]}
@@ -0,0 +1,133 @@
+import json
+from typing import Any, Dict, Optional
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_sources.series import OHLCVSeries
+from src.processing.indicator_cache import IndicatorCache, IndicatorSpec, indicator_specs
+from src.processing.indicators import IndicatorParams, atr, compute_indicators
+from src.storage.cache import IndicatorCacheStats
+
+
+@pytest.fixture
+def series() -> OHLCVSeries:
+    """Create 200 random-walk daily bars."""
+    rng = np.random.default_rng(5)
+    close = 100.0 + np.cumsum(rng.normal(size=200))
+    spread = rng.uniform(0.1, 2.0, size=200)
+    return OHLCVSeries(
+        symbol="AAPL",
+        source="test",
+        timestamps=pd.date_range("2023-01-02", periods=200, freq="D").as_unit("ns").asi8,
+        open=close,
+        high=close + spread,
+        low=close - spread,
+        close=close,
+        volume=np.full(200, 1000, dtype=np.int64)
+    )
+
+
+class FakeCache:
+    """Sync JSON cache with the indicator counters of RedisCache."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, str] = {}
+        self.indicator_stats = IndicatorCacheStats()
+
+    def get_json(self, key: str) -> Optional[Any]:
+        return json.loads(self.data[key]) if key in self.data else None
+
+    def set_json(self, key: str, value: Any, expiration: Optional[int] = None) -> None:
+        self.data[key] = json.dumps(value)
+
+
+def expected(series: OHLCVSeries, params: IndicatorParams) -> Dict[str, np.ndarray]:
+    values = {name: rows[0] for name, rows in compute_indicators(series.close, params).items()}
+    values["atr"] = atr(series.high, series.low, series.close, params.atr_period)[0]
+    return values
+
+
+def assert_columns(actual: Dict[str, np.ndarray], wanted: Dict[str, np.ndarray]) -> None:
+    assert set(actual) == set(wanted)
+    for name, values in wanted.items():
+        np.testing.assert_allclose(actual[name], values, rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+class TestIndicatorCache:
+    """Test caching and extending computed indicator series."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, series: OHLCVSeries) -> None:
+        """Test the second lookup of the same bars is served from cache."""
+        cache = FakeCache()
+        indicators = IndicatorCache(cache)
+
+        first = await indicators.compute(series)
+        second = await indicators.compute(series)
+
+        assert_columns(first, expected(series, IndicatorParams()))
+        assert_columns(second, first)
+        stats = cache.indicator_stats.to_dict()
+        assert stats["sma"] == {"hits": 2, "extensions": 0, "misses": 2, "hit_ratio": 0.5}
+        assert stats["macd"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_bars_extend_stored_series(self, series: OHLCVSeries) -> None:
+        """Test newer bars continue the stored series and match a full computation."""
+        cache = FakeCache()
+        indicators = IndicatorCache(cache)
+        params = IndicatorParams(sma_periods=(10,), ema_periods=(5,))
+
+        await indicators.compute(series.take(slice(0, 150)), params)
+        await indicators.compute(series.take(slice(0, 180)), params)
+        extended = await indicators.compute(series, params)
+
+        assert_columns(extended, expected(series, params))
+        stats = cache.indicator_stats.to_dict()
+        assert all(counts["extensions"] == 2 and counts["misses"] == 1 for counts in stats.values())
+
+    @pytest.mark.asyncio
+    async def test_extension_across_warm_up(self, series: OHLCVSeries) -> None:
+        """Test a series cached before its indicators warmed up is extended past the warm-up."""
+        cache = FakeCache()
+        indicators = IndicatorCache(cache)
+
+        await indicators.compute(series.take(slice(0, 10)))
+        extended = await indicators.compute(series.take(slice(0, 25)))
+
+        assert_columns(extended, expected(series.take(slice(0, 25)), IndicatorParams()))
+        assert all(counts["extensions"] == counts["misses"] > 0 for counts in cache.indicator_stats.to_dict().values())
+
+    @pytest.mark.asyncio
+    async def test_revised_bars_recompute(self, series: OHLCVSeries) -> None:
+        """Test a stored series is not extended when its bars were revised."""
+        cache = FakeCache()
+        indicators = IndicatorCache(cache)
+        spec = IndicatorSpec("rsi", (14,))
+        await indicators.get(series.take(slice(0, 150)), spec)
+        revised = series.take(slice(0, 200))
+        revised.close[100] += 5.0
+
+        values = await indicators.get(revised, spec)
+
+        assert_columns(values, {"rsi": expected(revised, IndicatorParams())["rsi"]})
+        assert cache.indicator_stats.to_dict()["rsi"]["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_errors_fall_back_to_computing(self, series: OHLCVSeries) -> None:
+        """Test a failing cache still returns computed values."""
+        cache = FakeCache()
+        cache.get_json = Mock(side_effect=ConnectionError("down"))  # type: ignore[method-assign]
+
+        values = await IndicatorCache(cache).compute(series)
+
+        assert_columns(values, expected(series, IndicatorParams()))
+
+    def test_specs_follow_params(self) -> None:
+        """Test a parameter set splits into one spec per indicator and period."""
+        keys = [spec.key for spec in indicator_specs(IndicatorParams())]
+
+        assert keys == ["sma:20", "sma:50", "ema:12", "ema:26", "rsi:14", "macd:12,26,9", "bollinger:20,2.0", "atr:14"]
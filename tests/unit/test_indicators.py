@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
+from src.processing.indicators import (
+    IndicatorParams,
+    compute_indicators,
+    evaluate_batch,
+    primary_series,
+    recommend,
+    rsi,
+    technical_signals,
+)
+from src.processing.risk import risk_metrics
+
+
+@pytest.fixture
+def closes() -> np.ndarray:
+    """Create three random-walk close rows."""
+    rng = np.random.default_rng(7)
+    return 100.0 + np.cumsum(rng.normal(size=(3, 120)), axis=1)
+
+
+def wilder_rsi(closes: pd.Series, period: int) -> np.ndarray:
+    """Reference RSI with Wilder's SMA-seeded smoothing, one bar at a time."""
+    changes = closes.diff().to_numpy()[1:]
+    averages = []
+    for values in (np.clip(changes, 0, None), np.clip(-changes, 0, None)):
+        smoothed = np.full(len(values), np.nan)
+        smoothed[period - 1] = values[:period].mean()
+        for i in range(period, len(values)):
+            smoothed[i] = smoothed[i - 1] + (values[i] - smoothed[i - 1]) / period
+        averages.append(smoothed)
+    return np.concatenate(([np.nan], 100 - 100 / (1 + averages[0] / averages[1])))
+
+
+class TestIndicatorValues:
+    """Compare the vectorized indicators with pandas references."""
+
+    def test_moving_averages_and_bands(self, closes: np.ndarray) -> None:
+        """Test SMA, EMA, MACD and Bollinger rows match pandas rolling/ewm."""
+        result = compute_indicators(closes)
+
+        for row in range(closes.shape[0]):
+            series = pd.Series(closes[row])
+            np.testing.assert_allclose(result['sma_20'][row], series.rolling(20).mean(), equal_nan=True)
+            np.testing.assert_allclose(result['ema_26'][row], series.ewm(span=26, adjust=False).mean())
+            line = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+            np.testing.assert_allclose(result['macd_signal'][row], line.ewm(span=9, adjust=False).mean())
+            upper = series.rolling(20).mean() + 2 * series.rolling(20).std(ddof=0)
+            np.testing.assert_allclose(result['bollinger_upper'][row], upper, equal_nan=True)
+
+    def test_rsi_matches_wilder(self, closes: np.ndarray) -> None:
+        """Test RSI follows Wilder's smoothing and is undefined for the first period bars."""
+        values = rsi(closes, 14)
+
+        np.testing.assert_allclose(values[1], wilder_rsi(pd.Series(closes[1]), 14), equal_nan=True)
+        assert np.isnan(values[:, :14]).all() and not np.isnan(values[:, 14:]).any()
+
+    def test_rsi_without_losses(self) -> None:
+        """Test a rising series has an RSI of 100."""
+        assert rsi(np.arange(1.0, 30.0), 14)[0, -1] == 100.0
+
+
+class TestEvaluateBatch:
+    """Test batches of symbols and parameter sets."""
+
+    def test_batch_matches_single_evaluation(self, closes: np.ndarray) -> None:
+        """Test mixed-length symbols and several parameter sets match one-by-one results."""
+        data: Dict[str, np.ndarray] = {"A": closes[0], "B": closes[1][:80], "C": closes[2]}
+        param_sets = [IndicatorParams(), IndicatorParams(sma_periods=(5,), rsi_period=7, bollinger_period=10)]
+
+        batch = evaluate_batch(data, param_sets)
+
+        for symbol, values in data.items():
+            for params, tails in zip(param_sets, batch[symbol]):
+                single = compute_indicators(values, params)
+                assert set(tails) == set(single)
+                for name, tail in tails.items():
+                    np.testing.assert_allclose(tail, single[name][0, -2:], equal_nan=True)
+
+
+class TestSignals:
+    """Test signals, recommendation and risk metrics."""
+
+    def test_breakout_signals(self) -> None:
+        """Test a pullback followed by a jump crosses MACD up but is overbought and above the band."""
+        closes = np.concatenate((np.linspace(100, 120, 60), [118.0, 119.0, 130.0]))
+        params = IndicatorParams()
+        values = evaluate_batch({"UP": closes}, [params])["UP"][0]
+
+        signals = technical_signals(float(closes[-1]), values, params)
+        recommendation = recommend(signals, values)
+
+        assert [(s["indicator"], s["type"]) for s in signals] == [
+            ("MACD", "BUY"), ("RSI", "SELL"), ("SMA", "BUY"), ("BOLLINGER", "SELL")
+        ]
+        assert signals[0]["strength"] == "STRONG"
+        assert recommendation["action"] == "HOLD" and recommendation["confidence"] == 0.5
+        assert recommendation["target_price"] is None and recommendation["stop_loss"] is None
+
+    def test_recommendation_target_and_stop_follow_action(self) -> None:
+        """Test a BUY targets the upper band and a SELL the lower one, each stopped at the other."""
+        values = {"bollinger_upper": np.array([110.0]), "bollinger_lower": np.array([90.0])}
+        buy = recommend([{"type": "BUY"}, {"type": "BUY"}, {"type": "SELL"}], values)
+        sell = recommend([{"type": "SELL"}, {"type": "SELL"}, {"type": "BUY"}], values)
+
+        assert (buy["action"], buy["target_price"], buy["stop_loss"]) == ("BUY", 110.0, 90.0)
+        assert (sell["action"], sell["target_price"], sell["stop_loss"]) == ("SELL", 90.0, 110.0)
+
+    def test_risk_metrics_with_benchmark(self) -> None:
+        """Test drawdown, VaR and beta against a benchmark moving twice as little."""
+        timestamps = pd.date_range("2023-01-02", periods=5, freq="D").as_unit("ns").asi8
+        series = OHLCVSeries("AAPL", "test", timestamps, *[np.array([100.0, 110.0, 99.0, 108.9, 119.79])] * 4,
+                             volume=np.ones(5, dtype=np.int64))
+        benchmark = OHLCVSeries("SPY", "test", timestamps, *[np.array([100.0, 105.0, 99.75, 104.7375, 109.974375])] * 4,
+                                volume=np.ones(5, dtype=np.int64))
+
+        metrics = risk_metrics(series, benchmark)
+
+        assert metrics["max_drawdown"] == pytest.approx(-0.1)
+        assert metrics["var_95"] < 0
+        assert metrics["beta"] == pytest.approx(2.0)
+        assert risk_metrics(series)["beta"] is None
+
+    def test_primary_series_prefers_largest_source(self) -> None:
+        """Test closes come from the source with the most bars."""
+        start = datetime(2023, 1, 2)
+        bars = [
+            MarketData(symbol="AAPL", timestamp=start + timedelta(days=i), open=1.0, high=1.0, low=1.0,
+                       close=float(i + 1), volume=1, source="big" if i else "small")
+            for i in range(4)
+        ]
+
+        series = primary_series(bars)
+
+        assert series is not None and series.source == "big" and series.close.tolist() == [2.0, 3.0, 4.0]
+        assert primary_series([]) is None
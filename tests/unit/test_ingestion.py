@@ -0,0 +1,167 @@
+import asyncio
+from pathlib import Path
+from typing import List
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
+from src.processing.ingestion import IngestionQueueFull, WriteBehindQueue
+
+
+class FlakyRepository:
+    """Async repository recording writes, failing while `down` is set."""
+
+    def __init__(self) -> None:
+        self.saved: List[OHLCVSeries] = []
+        self.down = False
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def bulk_save_market_data(self, series: OHLCVSeries) -> int:
+        await self.release.wait()
+        if self.down:
+            raise ConnectionError("db down")
+        self.saved.append(series)
+        return len(series)
+
+
+@pytest.fixture
+def series(sample_market_data: List[MarketData]) -> OHLCVSeries:
+    return OHLCVSeries.from_market_data(sample_market_data)
+
+
+class TestWriteBehindQueue:
+    """Test batching, backpressure and draining of the ingestion queue."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_puts_into_one_write(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test puts for one symbol are merged and deduplicated into a single write."""
+        repository = FlakyRepository()
+        queue = WriteBehindQueue(repository, flush_interval=60, spill_path=tmp_path / "spill.jsonl")
+
+        async with queue:
+            await queue.put(series[:3])
+            await queue.put([series[2:]])
+            assert repository.saved == []
+
+        assert repository.saved == [series]
+        stats = queue.stats.to_dict()
+        assert stats['enqueued_bars'] == 6
+        assert stats['flushed_bars'] == 5
+        assert stats['coalesced_bars'] == 1
+        assert stats['flush_latency']['count'] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_flush(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test reaching the batch size flushes without waiting for the interval."""
+        repository = FlakyRepository()
+        async with WriteBehindQueue(repository, batch_size=5, flush_interval=60, spill_path=tmp_path / "s") as queue:
+            await queue.put(series)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert len(repository.saved) == 1
+            assert queue.pending_bars == 0
+
+    @pytest.mark.asyncio
+    async def test_sync_repository_runs_in_thread(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test a blocking repository is written from a worker thread."""
+        repository = Mock()
+        repository.bulk_save_market_data = Mock(return_value=5)
+
+        async with WriteBehindQueue(repository, spill_path=tmp_path / "s") as queue:
+            await queue.put(series)
+
+        repository.bulk_save_market_data.assert_called_once_with(series)
+
+    @pytest.mark.asyncio
+    async def test_backpressure_waits_then_times_out(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test a full queue blocks puts until space frees, then raises."""
+        repository = FlakyRepository()
+        repository.release.clear()
+        queue = WriteBehindQueue(
+            repository, max_pending=5, flush_interval=60, put_timeout=0.05, spill_path=tmp_path / "s"
+        )
+        await queue.start()
+        await queue.put(series)
+
+        with pytest.raises(IngestionQueueFull):
+            await queue.put(series.take([0]))
+        assert queue.stats.backpressure_waits == 1
+
+        waiting = asyncio.create_task(queue.put(series.take([0])))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        queue.put_timeout = 5
+        repository.release.set()
+        await asyncio.wait_for(waiting, 1)
+        await queue.close()
+        assert [len(item) for item in repository.saved] == [5, 1]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_bars(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test bars survive a failed flush and are written by the next one."""
+        repository = FlakyRepository()
+        repository.down = True
+        queue = WriteBehindQueue(repository, spill_path=tmp_path / "s")
+        await queue.put(series)
+
+        assert await queue.flush() == 0
+        assert queue.pending_bars == 5
+        repository.down = False
+        assert await queue.flush() == 5
+        assert queue.stats.failed_flushes == 1
+
+    @pytest.mark.asyncio
+    async def test_unwritten_bars_spill_and_replay(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test close() spills bars it cannot write and the next start() writes them."""
+        spill_path = tmp_path / "spill.jsonl"
+        repository = FlakyRepository()
+        repository.down = True
+
+        async with WriteBehindQueue(repository, flush_interval=0.01, spill_path=spill_path) as queue:
+            await queue.put(series)
+        assert queue.stats.spilled_bars == 5
+        assert queue.spill_file.exists()
+
+        repository.down = False
+        async with WriteBehindQueue(repository, flush_interval=0.01, spill_path=spill_path):
+            pass
+        assert repository.saved == [series]
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_queues_sharing_a_spill_path(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test processes on one spill path keep their own files and never replay or delete each other's bars."""
+        spill_path = tmp_path / "spill.jsonl"
+        failing, healthy = FlakyRepository(), FlakyRepository()
+        failing.down = True
+        running = WriteBehindQueue(healthy, flush_interval=60, spill_path=spill_path)
+        await running.start()
+
+        async with WriteBehindQueue(failing, flush_interval=0.01, spill_path=spill_path) as spilled:
+            await spilled.put(series)
+        # A clean shutdown of another process leaves the spilled bars alone
+        await running.close()
+        assert spilled.spill_file.exists()
+
+        first = WriteBehindQueue(healthy, flush_interval=60, spill_path=spill_path)
+        second = WriteBehindQueue(healthy, flush_interval=60, spill_path=spill_path)
+        await first.start()
+        await second.start()
+        assert (first.pending_bars, second.pending_bars) == (5, 0)
+        await second.close()
+        await first.close()
+        assert healthy.saved == [series]
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_closed_queue_rejects_puts(self, tmp_path: Path, series: OHLCVSeries) -> None:
+        """Test puts after close fail instead of being lost."""
+        queue = WriteBehindQueue(AsyncMock(), spill_path=tmp_path / "s")
+        await queue.start()
+        await queue.close()
+
+        with pytest.raises(RuntimeError):
+            await queue.put(series)
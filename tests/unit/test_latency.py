@@ -0,0 +1,48 @@
+import pytest
+
+from src.processing.latency import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Unit tests for LatencyHistogram."""
+
+    def test_empty_histogram(self) -> None:
+        """Test percentiles of an empty histogram are zero."""
+        histogram = LatencyHistogram()
+
+        assert histogram.percentile(95) == 0.0
+        assert histogram.to_dict()['count'] == 0
+
+    def test_observe_fills_buckets(self) -> None:
+        """Test observations land in the bucket whose bound contains them."""
+        histogram = LatencyHistogram(bounds=(0.1, 1.0))
+
+        for seconds in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(seconds)
+
+        assert histogram.counts == [2, 1, 1]
+        assert histogram.to_dict()['buckets'] == {'le_0.1': 2, 'le_1': 1, 'le_inf': 1}
+        assert histogram.max_seconds == 2.0
+
+    def test_percentile_interpolates(self) -> None:
+        """Test percentiles interpolate within a bucket and never exceed the max."""
+        histogram = LatencyHistogram(bounds=(0.1, 1.0))
+        for _ in range(90):
+            histogram.observe(0.05)
+        for _ in range(10):
+            histogram.observe(0.8)
+
+        assert histogram.percentile(50) == pytest.approx(0.1 * 50 / 90)
+        assert histogram.percentile(95) == pytest.approx(0.55)
+        assert histogram.percentile(100) == pytest.approx(0.8)
+
+    def test_failures_do_not_affect_percentiles(self) -> None:
+        """Test failures and timeouts are counted separately from latencies."""
+        histogram = LatencyHistogram()
+        histogram.observe(0.2)
+        histogram.record_failure()
+        histogram.record_failure(timed_out=True)
+
+        stats = histogram.to_dict()
+        assert (stats['count'], stats['failures'], stats['timeouts']) == (1, 2, 1)
+        assert histogram.percentile(99) <= 0.2
@@ -0,0 +1,98 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+import redis.asyncio as redis_asyncio
+
+from src.data_sources.exceptions import RateLimitError
+from src.data_sources.rate_limit import (
+    FileBucket,
+    MemoryBucket,
+    RedisBucket,
+    RequestPriority,
+    TokenBucketLimiter,
+    current_priority,
+    request_priority,
+)
+
+
+class TestBucketBackends:
+    """Test token bucket state backends."""
+
+    @pytest.mark.asyncio
+    async def test_memory_bucket_grants_then_reports_wait(self) -> None:
+        """Test tokens are granted up to capacity, then a wait is returned."""
+        bucket = MemoryBucket(rate=1.0, capacity=2)
+
+        assert await bucket.try_acquire(1) == 0.0
+        assert await bucket.try_acquire(1) == 0.0
+        assert await bucket.try_acquire(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_invalid_rate(self) -> None:
+        """Test a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            MemoryBucket(rate=0, capacity=1)
+
+    @pytest.mark.asyncio
+    async def test_file_bucket_shared_between_instances(self, tmp_path: Path) -> None:
+        """Test two buckets on the same state file share one budget."""
+        path = str(tmp_path / "bucket.json")
+        first = FileBucket(path, rate=0.1, capacity=2)
+        second = FileBucket(path, rate=0.1, capacity=2)
+
+        assert await first.try_acquire(1) == 0.0
+        assert await second.try_acquire(1) == 0.0
+        assert await first.try_acquire(1) > 0
+
+    @pytest.mark.asyncio
+    async def test_redis_bucket_falls_back_when_unreachable(self) -> None:
+        """Test an unreachable Redis degrades to a per-process bucket."""
+        client = redis_asyncio.Redis(host="localhost", port=1, socket_connect_timeout=0.1)
+        bucket = RedisBucket("test:bucket", rate=0.01, capacity=1, client=client)
+
+        assert await bucket.try_acquire(1) == 0.0
+        assert await bucket.try_acquire(1) > 0
+        await client.aclose()
+
+
+class TestTokenBucketLimiter:
+    """Test the priority-queued async limiter."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_overtakes_backfill(self) -> None:
+        """Test queued interactive callers get tokens before earlier backfills."""
+        limiter = TokenBucketLimiter(MemoryBucket(rate=50.0, capacity=1), max_sleep=0.005)
+        await limiter.acquire()
+        order: List[str] = []
+
+        async def call(name: str, priority: RequestPriority) -> None:
+            await limiter.acquire(priority)
+            order.append(name)
+
+        backfills = [asyncio.create_task(call(f"backfill{i}", RequestPriority.BACKFILL)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("interactive", RequestPriority.INTERACTIVE))
+        await asyncio.gather(*backfills, interactive)
+
+        assert order[0] == "interactive"
+        assert order[1:] == ["backfill0", "backfill1", "backfill2"]
+        assert limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_priority_from_context(self) -> None:
+        """Test the context priority is used when none is passed."""
+        assert current_priority() == RequestPriority.NORMAL
+        with request_priority(RequestPriority.BACKFILL):
+            assert current_priority() == RequestPriority.BACKFILL
+        assert current_priority() == RequestPriority.NORMAL
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_rate_limit_error(self) -> None:
+        """Test a caller that cannot get a token in time fails and leaves the queue."""
+        limiter = TokenBucketLimiter(MemoryBucket(rate=0.01, capacity=1), max_sleep=0.01)
+        await limiter.acquire()
+
+        with pytest.raises(RateLimitError):
+            await limiter.acquire(timeout=0.05)
+        assert limiter.waiting == 0
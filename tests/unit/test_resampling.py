@@ -0,0 +1,152 @@
+from datetime import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_sources.series import OHLCVSeries
+from src.processing.resampling import (
+    TradingSession,
+    check_resample_interval,
+    parse_timeframe,
+    resample_batch,
+    resample_frame,
+    resample_series,
+)
+
+
+def minute_series(symbol: str, start: str, periods: int, freq: str = "5min") -> OHLCVSeries:
+    """Create bars with closes counting up from 100 and a volume of 10 each."""
+    timestamps = pd.date_range(start, periods=periods, freq=freq).as_unit("ns").asi8
+    close = np.arange(periods, dtype=np.float64) + 100.0
+    return OHLCVSeries(
+        symbol=symbol,
+        source="test",
+        timestamps=timestamps,
+        open=close - 0.5,
+        high=close + 1.0,
+        low=close - 1.0,
+        close=close,
+        volume=np.full(periods, 10, dtype=np.int64)
+    )
+
+
+def stamps(series: OHLCVSeries) -> List[str]:
+    return [str(value) for value in pd.DatetimeIndex(series.datetimes).strftime("%Y-%m-%d %H:%M")]
+
+
+class TestParseTimeframe:
+    """Test timeframe parsing."""
+
+    def test_intraday_and_calendar_names(self) -> None:
+        """Test minute, hour and calendar spellings."""
+        assert parse_timeframe("15min").minutes == 15
+        assert parse_timeframe("1h").minutes == 60
+        assert parse_timeframe(30).name == "30m"
+        assert parse_timeframe("1W").is_intraday is False
+
+    def test_invalid_timeframe(self) -> None:
+        """Test unknown names and out-of-range minutes are rejected."""
+        for value in ("2w", "0m", "24h"):
+            with pytest.raises(ValueError):
+                parse_timeframe(value)
+
+    def test_check_resample_interval(self) -> None:
+        """Test only whole multiples of the fetched interval are accepted.
+
+        GET /api/market-data/{symbol}/historical maps these ValueErrors to 400;
+        tests/api cannot import the app until src.api.models exists.
+        """
+        assert check_resample_interval("1h", 15).minutes == 60
+        assert check_resample_interval("1w", None).name == "1w"
+        with pytest.raises(ValueError):
+            check_resample_interval("1h", 7)
+        with pytest.raises(ValueError):
+            check_resample_interval("1h", None)
+        with pytest.raises(ValueError):
+            check_resample_interval("5m", None)
+
+
+class TestResampleSeries:
+    """Test OHLCV aggregation and session alignment."""
+
+    def test_hourly_buckets_align_to_session_open(self) -> None:
+        """Test hourly bars start at 09:30 and the last one is cut by the close."""
+        series = minute_series("AAPL", "2023-01-03 09:30", 78)  # 09:30 through 15:55
+
+        hourly = resample_series(series, "1h", TradingSession())
+
+        assert stamps(hourly)[:2] == ["2023-01-03 09:30", "2023-01-03 10:30"]
+        assert stamps(hourly)[-1] == "2023-01-03 15:30"
+        assert len(hourly) == 7
+        assert hourly.open[0] == 99.5 and hourly.close[0] == 111.0
+        assert hourly.high[0] == 112.0 and hourly.low[0] == 99.0
+        assert hourly.volume.tolist() == [120] * 6 + [60]
+
+    def test_regular_hours_drops_extended_session(self) -> None:
+        """Test pre-market bars are dropped only when regular_hours is set."""
+        series = minute_series("AAPL", "2023-01-03 09:00", 12)  # 09:00 through 09:55
+
+        all_hours = resample_series(series, "30m", TradingSession())
+        regular = resample_series(series, "30m", TradingSession(), regular_hours=True)
+
+        assert stamps(all_hours) == ["2023-01-03 09:00", "2023-01-03 09:30"]
+        assert stamps(regular) == ["2023-01-03 09:30"]
+        assert regular.volume.tolist() == [60]
+
+    def test_custom_session(self) -> None:
+        """Test buckets follow a session that opens on the hour."""
+        series = minute_series("SAP", "2023-01-03 09:00", 24)
+
+        hourly = resample_series(series, "1h", TradingSession(open=time(9, 0), close=time(17, 30)))
+
+        assert stamps(hourly) == ["2023-01-03 09:00", "2023-01-03 10:00"]
+
+    def test_weekly_from_unordered_daily(self) -> None:
+        """Test calendar timeframes accept unordered input."""
+        series = minute_series("AAPL", "2023-01-02", 10, freq="D")
+
+        weekly = resample_series(series.take(np.arange(10)[::-1]), "1w")
+
+        assert stamps(weekly) == ["2023-01-02 00:00", "2023-01-09 00:00"]
+        assert weekly.close.tolist() == [106.0, 109.0]
+
+
+class TestResampleBatch:
+    """Test resampling many series at once."""
+
+    def test_batch_matches_per_series(self) -> None:
+        """Test the stacked pass equals resampling each series on its own."""
+        series = [
+            minute_series("AAPL", "2023-01-03 09:30", 30),
+            minute_series("MSFT", "2023-01-03 09:30", 0),
+            minute_series("GOOG", "2023-01-03 09:30", 7, freq="1min")
+        ]
+
+        batch = resample_batch(series, "15m", TradingSession())
+
+        assert [item.symbol for item in batch] == ["AAPL", "MSFT", "GOOG"]
+        for item, resampled in zip(series, batch):
+            assert resampled == resample_series(item, "15m", TradingSession())
+        assert len(batch[1]) == 0
+
+    def test_adjacent_series_in_same_bucket_stay_apart(self) -> None:
+        """Test series sharing a bucket start are not merged across symbols."""
+        series = [minute_series("AAPL", "2023-01-03", 3, freq="D"), minute_series("MSFT", "2023-01-03", 3, freq="D")]
+
+        batch = resample_batch(series, "1w")
+
+        assert [len(item) for item in batch] == [1, 1]
+        assert [item.volume[0] for item in batch] == [30, 30]
+
+    def test_resample_long_frame(self) -> None:
+        """Test a long frame keeps its symbol and source columns."""
+        frame = pd.concat([
+            minute_series("AAPL", "2023-01-03 09:30", 6).to_dataframe(include_metadata=True),
+            minute_series("MSFT", "2023-01-03 09:30", 6).to_dataframe(include_metadata=True)
+        ], ignore_index=True)
+
+        resampled = resample_frame(frame, "30m", TradingSession())
+
+        assert resampled[["symbol", "volume"]].values.tolist() == [["AAPL", 60], ["MSFT", 60]]
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+
+from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
+from src.processing.backtest import synthetic_dataset
+from src.processing.indicators import primary_series
+from src.processing.risk import (
+    align_closes,
+    beta,
+    covariance,
+    evaluate_portfolios,
+    historical_var,
+    load_return_matrix,
+    monte_carlo_var,
+    parametric_var,
+    portfolio_performance,
+)
+
+
+def daily(symbol: str, start: str, close: List[float]) -> OHLCVSeries:
+    """Create daily bars from closes."""
+    values = np.asarray(close, dtype=np.float64)
+    return OHLCVSeries(
+        symbol=symbol,
+        source="test",
+        timestamps=pd.date_range(start, periods=len(values), freq="D").as_unit("ns").asi8,
+        open=values,
+        high=values,
+        low=values,
+        close=values,
+        volume=np.ones(len(values), dtype=np.int64)
+    )
+
+
+class TestReturnMatrix:
+    """Test aligning closes into one matrix."""
+
+    def test_align_forward_fills_and_trims(self) -> None:
+        """Test gaps carry the previous close and rows before every symbol trades are dropped."""
+        first = daily("AAPL", "2023-01-01", [1.0, 2.0, 3.0, 4.0])
+        second = daily("MSFT", "2023-01-02", [10.0, 20.0, 30.0]).take(np.array([0, 2]))
+
+        matrix = align_closes([first, second])
+
+        assert matrix.symbols == ["AAPL", "MSFT"]
+        assert matrix.closes.tolist() == [[2.0, 10.0], [3.0, 10.0], [4.0, 30.0]]
+        assert matrix.returns[:, 1].tolist() == [0.0, 2.0]
+
+    def test_shares_reject_unknown_symbols(self) -> None:
+        """Test holdings of symbols outside the matrix are reported."""
+        matrix = align_closes([daily("AAPL", "2023-01-01", [1.0, 2.0])])
+
+        assert matrix.shares([{"AAPL": 3.0}]).tolist() == [[3.0]]
+        with pytest.raises(ValueError, match="TSLA"):
+            matrix.shares([{"AAPL": 1.0, "TSLA": 1.0}])
+
+    @pytest.mark.asyncio
+    async def test_load_skips_symbols_without_bars(self) -> None:
+        """Test symbols are loaded together and ones without bars are left out."""
+        start = datetime(2023, 1, 2)
+        bars = [
+            MarketData(symbol="AAPL", timestamp=start + timedelta(days=i), open=1.0, high=1.0, low=1.0,
+                       close=float(i + 1), volume=1, source="test")
+            for i in range(3)
+        ]
+        series = primary_series(bars)
+        repository = AsyncMock()
+        repository.get_primary_series.side_effect = lambda symbol, *args: series if symbol == "AAPL" else None
+
+        matrix = await load_return_matrix(repository, ["AAPL", "TSLA", "AAPL"], start, start + timedelta(days=5))
+
+        assert matrix.symbols == ["AAPL"]
+        assert repository.get_primary_series.await_count == 2
+
+
+class TestRiskMeasures:
+    """Test covariance, VaR and beta."""
+
+    @pytest.fixture
+    def returns(self) -> np.ndarray:
+        """Create correlated normal daily returns for three symbols."""
+        rng = np.random.default_rng(4)
+        cov = np.array([[1.0, 0.5, 0.2], [0.5, 2.0, 0.3], [0.2, 0.3, 1.5]]) * 1e-4
+        return rng.multivariate_normal(np.full(3, 5e-4), cov, size=2000)
+
+    def test_covariance_and_correlation(self, returns: np.ndarray) -> None:
+        """Test the matrices match NumPy's estimators."""
+        cov, corr = covariance(returns)
+
+        np.testing.assert_allclose(cov, np.cov(returns, rowvar=False))
+        np.testing.assert_allclose(corr, np.corrcoef(returns, rowvar=False))
+
+    def test_parametric_and_historical_var(self, returns: np.ndarray) -> None:
+        """Test VaR formulas for a single-asset portfolio."""
+        weights = np.array([[1.0, 0.0, 0.0]])
+        cov, _ = covariance(returns)
+
+        parametric = parametric_var(weights, returns.mean(axis=0), cov, 0.95, horizon=4)
+        values = np.cumprod(1.0 + returns[:, :1], axis=0)
+
+        expected = -(returns[:, 0].mean() * 4 + norm.ppf(0.05) * returns[:, 0].std(ddof=1) * 2)
+        assert parametric[0] == pytest.approx(expected)
+        assert historical_var(values, 0.95)[0] == pytest.approx(-np.quantile(returns[1:, 0], 0.05))
+
+    def test_beta(self) -> None:
+        """Test beta of a portfolio moving twice as much as the benchmark, and of a flat benchmark."""
+        benchmark = np.array([0.01, -0.02, 0.015, 0.005])
+
+        assert beta(np.column_stack((2 * benchmark, benchmark)), benchmark) == pytest.approx([2.0, 1.0])
+        assert np.isnan(beta(benchmark[:, None], np.zeros(4))).all()
+
+    def test_monte_carlo_reproducible_and_chunk_independent(self, returns: np.ndarray) -> None:
+        """Test a seed fixes the result whatever the chunk size, and it converges to the normal VaR."""
+        weights = np.array([[1.0, 0.0, 0.0], [0.2, 0.3, 0.5]])
+        log_returns = np.log1p(returns)
+
+        chunked = monte_carlo_var(weights, log_returns, 0.99, paths=60000, chunk_paths=7000, seed=9)
+        whole = monte_carlo_var(weights, log_returns, 0.99, paths=60000, chunk_paths=60000, seed=9)
+
+        np.testing.assert_allclose(chunked.var, whole.var, rtol=1e-12)
+        np.testing.assert_allclose(chunked.cvar, whole.cvar, rtol=1e-12)
+        cov, _ = covariance(log_returns)
+        expected = parametric_var(weights, log_returns.mean(axis=0), cov, 0.99)
+        np.testing.assert_allclose(chunked.var, expected, rtol=0.05)
+        assert (chunked.cvar > chunked.var).all()
+        assert chunked.paths_per_second > 0
+
+
+class TestEvaluatePortfolios:
+    """Test batched portfolio evaluation."""
+
+    def test_batch_matches_single_portfolios(self) -> None:
+        """Test each portfolio of a batch equals evaluating it alone with the same seed."""
+        matrix = align_closes(synthetic_dataset(symbols=4, bars=300))
+        portfolios = {
+            "growth": {"SYN001": 10.0, "SYN002": 5.0},
+            "single": {"SYN003": 7.0},
+            "market": {"SYN000": 1.0}
+        }
+
+        batch = evaluate_portfolios(matrix, portfolios, benchmark="SYN000", paths=20000, seed=5)
+
+        assert batch["market"]["beta"] == pytest.approx(1.0)
+        assert sum(batch["growth"]["weights"].values()) == pytest.approx(1.0)
+        for name, holdings in portfolios.items():
+            alone = evaluate_portfolios(matrix, {name: holdings}, benchmark="SYN000", paths=20000, seed=5)[name]
+            for figure in ("value", "volatility", "parametric_var", "historical_var", "beta"):
+                assert batch[name][figure] == pytest.approx(alone[figure]), figure
+
+    def test_missing_benchmark_and_short_history(self) -> None:
+        """Test beta is None without the benchmark and too few bars are rejected."""
+        matrix = align_closes(synthetic_dataset(symbols=2, bars=50))
+
+        risk = evaluate_portfolios(matrix, {"p": {"SYN001": 1.0}}, benchmark="SPY", paths=2000, seed=1)
+        assert risk["p"]["beta"] is None
+        with pytest.raises(ValueError):
+            evaluate_portfolios(align_closes([daily("AAPL", "2023-01-01", [1.0, 2.0])]), {"p": {"AAPL": 1.0}})
+
+    def test_portfolio_performance(self) -> None:
+        """Test value, total, daily and year-to-date returns in percent; the year starts from its eve's close."""
+        matrix = align_closes([
+            daily("AAPL", "2022-12-30", [100.0, 110.0, 121.0]),
+            daily("MSFT", "2022-12-30", [50.0, 50.0, 50.0])
+        ])
+
+        performance = portfolio_performance(matrix, {"p": {"AAPL": 1.0, "MSFT": 2.0}})["p"]
+
+        assert performance == {"total_value": 221.0, "total_return": 10.5, "daily_change": 5.24, "ytd_return": 5.24}
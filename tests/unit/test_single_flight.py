@@ -0,0 +1,117 @@
+import asyncio
+from typing import List
+
+import pytest
+import redis.asyncio as redis_asyncio
+
+from src.data_sources.base import MarketData
+from src.data_sources.series import OHLCVSeries
+from src.processing.single_flight import (
+    RedisFlightShare,
+    SingleFlight,
+    decode_series_list,
+    encode_series_list,
+)
+
+
+class TestSingleFlight:
+    """Test in-process call coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self) -> None:
+        """Test callers with the same key await one upstream call."""
+        group = SingleFlight()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "result"
+
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert group.stats.to_dict() == {
+            'calls': 5, 'upstream_calls': 1, 'coalesced': 4, 'shared': 0, 'saved': 4
+        }
+        assert group.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_not_coalesced(self) -> None:
+        """Test distinct keys make their own calls."""
+        group = SingleFlight()
+
+        async def fetch() -> int:
+            await asyncio.sleep(0.01)
+            return 1
+
+        await asyncio.gather(group.do("a", fetch), group.do("b", fetch))
+
+        assert group.stats.upstream_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_shared_with_every_caller(self) -> None:
+        """Test a failed call fails every waiting caller."""
+        group = SingleFlight()
+
+        async def fetch() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_call_survives_until_last_caller_cancels(self) -> None:
+        """Test cancelling one caller keeps the call alive for the others."""
+        group = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fetch() -> str:
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "result"
+
+        first = asyncio.create_task(group.do("key", fetch))
+        second = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "result"
+        assert not cancelled.is_set()
+
+        only = asyncio.create_task(group.do("other", fetch))
+        await asyncio.sleep(0)
+        only.cancel()
+        await asyncio.gather(only, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+
+class TestRedisFlightShare:
+    """Test cross-process result sharing."""
+
+    def test_series_codec_round_trip(self, sample_market_data: List[MarketData]) -> None:
+        """Test source results survive the Redis encoding."""
+        series = [OHLCVSeries.from_market_data(sample_market_data)]
+
+        assert decode_series_list(encode_series_list(series)) == series
+
+    @pytest.mark.asyncio
+    async def test_unreachable_redis_calls_upstream(self) -> None:
+        """Test Redis failures degrade to a direct upstream call."""
+        client = redis_asyncio.Redis(host="localhost", port=1, socket_connect_timeout=0.1)
+        group = SingleFlight(RedisFlightShare(client=client))
+
+        async def fetch() -> List[OHLCVSeries]:
+            return []
+
+        assert await group.do("key", fetch) == []
+        assert group.stats.upstream_calls == 1
+        await client.aclose()
@@ -0,0 +1,149 @@
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_sources.series import OHLCVSeries
+from src.processing.indicators import IndicatorParams, atr, compute_indicators
+from src.processing.streaming_indicators import (
+    IndicatorStream,
+    StreamingATR,
+    StreamingMACD,
+    StreamingRollingStats,
+    StreamingRSI,
+    load_stream,
+    save_stream,
+    stream_key,
+)
+
+
+@pytest.fixture
+def series() -> OHLCVSeries:
+    """Create 200 random-walk daily bars."""
+    rng = np.random.default_rng(11)
+    close = 100.0 + np.cumsum(rng.normal(size=200))
+    spread = rng.uniform(0.1, 2.0, size=200)
+    return OHLCVSeries(
+        symbol="AAPL",
+        source="test",
+        timestamps=pd.date_range("2023-01-02", periods=200, freq="D").as_unit("ns").asi8,
+        open=close,
+        high=close + spread,
+        low=close - spread,
+        close=close,
+        volume=np.full(200, 1000, dtype=np.int64)
+    )
+
+
+def batch_values(series: OHLCVSeries, params: IndicatorParams) -> Dict[str, np.ndarray]:
+    values = {name: array[0] for name, array in compute_indicators(series.close, params).items()}
+    values["atr"] = atr(series.high, series.low, series.close, params.atr_period)[0]
+    return values
+
+
+class FakeCache:
+    """Sync cache storing indicator snapshots as JSON, like RedisCache."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, str] = {}
+
+    def get_indicator_state(self, key: str) -> Optional[Dict[str, Any]]:
+        return json.loads(self.data[key]) if key in self.data else None
+
+    def set_indicator_state(self, key: str, state: Dict[str, Any], expiration: Optional[int] = None) -> None:
+        self.data[key] = json.dumps(state)
+
+
+class TestStreamingMatchesBatch:
+    """Test bar-by-bar updates reproduce the batch engine."""
+
+    def test_every_bar_matches(self, series: OHLCVSeries) -> None:
+        """Test each update equals the batch column for that bar, NaN while warming up."""
+        params = IndicatorParams()
+        expected = batch_values(series, params)
+        stream = IndicatorStream("AAPL", "test", params)
+
+        for i in range(len(series)):
+            values = stream.update_values(
+                int(series.timestamps[i]), series.high[i], series.low[i], series.close[i]
+            )
+            for name, column in expected.items():
+                np.testing.assert_allclose(values[name], column[i], rtol=1e-9, atol=1e-9, err_msg=name)
+
+    def test_rolling_stats_do_not_drift(self) -> None:
+        """Test running sums stay exact over a long stream at a large price level."""
+        values = 1e6 + np.random.default_rng(3).normal(size=5000)
+        stats = StreamingRollingStats(20)
+
+        for value in values:
+            stats.update(value)
+
+        mean, deviation = stats.value or (0.0, 0.0)
+        assert mean == pytest.approx(values[-20:].mean(), rel=1e-12)
+        assert deviation == pytest.approx(values[-20:].std(), rel=1e-6)
+
+    def test_revised_bar_replaces_latest(self, series: OHLCVSeries) -> None:
+        """Test a bar with the latest timestamp again replaces it and older bars are ignored."""
+        stream = IndicatorStream("AAPL", "test")
+        stream.update_series(series.take(slice(0, 100)))
+        last = int(series.timestamps[99])
+        stream.update_values(last, 999.0, 1.0, 500.0)
+
+        revised = stream.update_values(last, series.high[99], series.low[99], series.close[99])
+        stale = stream.update_values(int(series.timestamps[50]), 999.0, 1.0, 500.0)
+
+        fresh = IndicatorStream("AAPL", "test").update_series(series.take(slice(0, 100)))
+        assert revised == pytest.approx(fresh, nan_ok=True)
+        assert stale == pytest.approx(fresh, nan_ok=True)
+
+
+class TestSnapshots:
+    """Test streams resume from snapshots."""
+
+    def test_resume_from_json_state(self, series: OHLCVSeries) -> None:
+        """Test a stream rebuilt from its JSON snapshot continues identically."""
+        params = IndicatorParams(sma_periods=(5, 30), ema_periods=(8,), atr_period=10)
+        stream = IndicatorStream("AAPL", "test", params)
+        stream.update_series(series.take(slice(0, 120)))
+
+        resumed = IndicatorStream.from_state(json.loads(json.dumps(stream.to_state())))
+        rest = series.take(slice(120, 200))
+
+        assert resumed.params == params
+        assert resumed.update_series(rest) == stream.update_series(rest)
+
+    def test_from_history_matches_replay(self, series: OHLCVSeries) -> None:
+        """Test states seeded by the batch engine continue like replaying every bar."""
+        head = series.take(slice(0, 150))
+        closes = [(close,) for close in series.close.tolist()]
+        bars = list(zip(series.high.tolist(), series.low.tolist(), series.close.tolist()))
+        cases = [
+            (StreamingRSI.from_history(14, head.close), StreamingRSI(14), closes),
+            (StreamingMACD.from_history(12, 26, 9, head.close), StreamingMACD(12, 26, 9), closes),
+            (StreamingRollingStats.from_history(20, head.close), StreamingRollingStats(20), closes),
+            (StreamingATR.from_history(14, head.high, head.low, head.close), StreamingATR(14), bars)
+        ]
+
+        for seeded, replayed, inputs in cases:
+            for args in inputs[:len(head)]:
+                replayed.update(*args)
+            for args in inputs[len(head):]:
+                assert seeded.update(*args) == pytest.approx(replayed.update(*args), rel=1e-9)
+
+    @pytest.mark.asyncio
+    async def test_cache_round_trip(self, series: OHLCVSeries) -> None:
+        """Test snapshots saved by one worker are loaded by another under a per-params key."""
+        cache = FakeCache()
+        stream = IndicatorStream("AAPL", "test")
+        stream.update_series(series)
+
+        await save_stream(cache, stream)
+        loaded = await load_stream(cache, "AAPL", "test")
+        missing = await load_stream(cache, "AAPL", "test", IndicatorParams(rsi_period=7))
+
+        assert loaded is not None
+        assert loaded.values == pytest.approx(stream.values, nan_ok=True)
+        assert missing is None
+        assert stream_key("AAPL", "test", IndicatorParams()) != stream_key("AAPL", "test", IndicatorParams(rsi_period=7))
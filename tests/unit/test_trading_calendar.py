@@ -0,0 +1,40 @@
+from datetime import date
+
+from src.processing.trading_calendar import TradingCalendar
+
+
+class TestTradingCalendar:
+    """Unit tests for TradingCalendar."""
+
+    def test_sessions_exclude_weekends_and_holidays(self) -> None:
+        """Test a full year has the NYSE session count and skips market holidays."""
+        sessions = TradingCalendar().sessions(date(2024, 1, 1), date(2024, 12, 31))
+
+        assert len(sessions) == 252
+        for holiday in (date(2024, 1, 1), date(2024, 3, 29), date(2024, 6, 19), date(2024, 7, 4), date(2024, 12, 25)):
+            assert holiday not in set(sessions.date)
+
+    def test_saturday_new_year_keeps_previous_friday_open(self) -> None:
+        """Test Jan 1 on a Saturday closes no session, while on a Sunday it moves to Monday."""
+        sessions = set(TradingCalendar().sessions(date(2021, 12, 27), date(2023, 1, 6)).date)
+
+        assert date(2021, 12, 31) in sessions
+        assert date(2023, 1, 2) not in sessions
+
+    def test_missing_intervals(self) -> None:
+        """Test missing sessions are grouped into runs that span weekends."""
+        stored = [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 8)]
+
+        intervals = TradingCalendar().missing_intervals(stored, date(2024, 1, 1), date(2024, 1, 12))
+
+        assert intervals == [
+            (date(2024, 1, 4), date(2024, 1, 5)),
+            (date(2024, 1, 9), date(2024, 1, 12))
+        ]
+
+    def test_fully_covered(self) -> None:
+        """Test no intervals are reported when every session is stored."""
+        calendar = TradingCalendar()
+        stored = list(calendar.sessions(date(2024, 1, 1), date(2024, 1, 31)).date)
+
+        assert calendar.missing_intervals(stored, date(2024, 1, 1), date(2024, 1, 31)) == []
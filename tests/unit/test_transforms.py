@@ -251,6 +251,14 @@ class TestRemovePriceOutliers:
         assert len(result) < len(df)
         assert result['close'].max() < 200.0
 
+    def test_remove_outliers_keeps_first_row(self) -> None:
+        """Test the first row, which has no deviation yet, is not dropped."""
+        df = pd.DataFrame({'close': [100.0] * 25})
+
+        result = remove_price_outliers(df, window=20)
+
+        assert len(result) == 25
+
     def test_remove_outliers_custom_parameters(self) -> None:
         """Test with custom window and threshold."""
         prices = [100.0] * 10 + [200.0] + [100.0] * 10
@@ -1,12 +1,15 @@
 import pytest
 from datetime import datetime
+import pandas as pd
 from pydantic import ValidationError
 
 from src.processing.validation import (
     StockPrice,
     TimeSeriesRequest,
     SearchRequest,
-    DataSourceResponse
+    DataSourceResponse,
+    LazyStockPrices,
+    validate_market_frame
 )
 
 
@@ -319,4 +322,71 @@ class TestDataSourceResponse:
         response = DataSourceResponse(success=False, data=[], error="Error message")
         assert response.success is False
         assert response.data == []
-        assert response.error == "Error message"
\ No newline at end of file
+        assert response.error == "Error message"
+
+
+class TestValidateMarketFrame:
+    """Unit tests for vectorized frame validation."""
+
+    @pytest.fixture
+    def frame(self) -> pd.DataFrame:
+        """Create a frame with one valid row and one row per broken rule."""
+        return pd.DataFrame({
+            'symbol': ['AAPL', 'AAPL', 'AAPL', 'AAPL', 'TOOLONGSYMBOL', 'AAPL', 'AAPL'],
+            'timestamp': pd.date_range('2023-01-01', periods=7, freq='D'),
+            'open': [100.0, 100.0, 110.0, 100.0, 100.0, -1.0, 100.0],
+            'high': [105.0, 95.0, 105.0, 105.0, 105.0, 105.0, 105.0],
+            'low': [99.0, 99.0, 99.0, 99.0, 99.0, 99.0, 99.0],
+            'close': [102.0, 97.0, 102.0, 106.0, 102.0, 102.0, 102.0],
+            'volume': [1000, 1000, 1000, 1000, 1000, 1000, -5],
+            'source': ['test'] * 7
+        })
+
+    def test_matches_stock_price_rules(self, frame: pd.DataFrame) -> None:
+        """Test the frame validator keeps exactly the rows StockPrice accepts."""
+        accepted = []
+        for i, row in enumerate(frame.to_dict('records')):
+            try:
+                StockPrice(**row)
+                accepted.append(i)
+            except ValidationError:
+                pass
+
+        valid, _ = validate_market_frame(frame)
+
+        assert list(valid.index) == accepted == [0]
+
+    def test_rejection_report(self, frame: pd.DataFrame) -> None:
+        """Test rejections are counted per rule."""
+        _, report = validate_market_frame(frame)
+
+        assert report.total == 7
+        assert report.valid == 1
+        assert report.rejected == 6
+        assert report.rejections == {
+            'symbol_length': 1,
+            'non_positive_price': 1,
+            'negative_volume': 1,
+            'high_below_low': 1,
+            'open_out_of_range': 3,
+            'close_out_of_range': 2
+        }
+
+    def test_empty_frame(self) -> None:
+        """Test an empty frame validates to an empty report."""
+        valid, report = validate_market_frame(pd.DataFrame())
+
+        assert valid.empty
+        assert report.to_dict() == {'total': 0, 'valid': 0, 'rejected': 0, 'rejections': {}}
+
+    def test_lazy_stock_prices(self, frame: pd.DataFrame) -> None:
+        """Test StockPrice objects are built on access and serialize like a list."""
+        valid, _ = validate_market_frame(frame)
+        prices = LazyStockPrices(valid)
+
+        response = DataSourceResponse(success=True, data=prices)
+
+        assert response.data is prices
+        assert len(response.data) == 1
+        assert response.data[0] == StockPrice(**frame.iloc[0].to_dict())
+        assert response.model_dump(mode='json')['data'][0]['timestamp'] == '2023-01-01T00:00:00'
@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, patch
 from datetime import datetime
@@ -162,4 +166,92 @@ class TestYahooFinanceAdapter:
         
         # Should handle missing data gracefully or raise appropriate error
         with pytest.raises((KeyError, ValueError, TypeError)):
-            adapter._create_market_data("TEST", timestamp, row_data)
\ No newline at end of file
+            adapter._create_market_data("TEST", timestamp, row_data)
+
+
+class TestYahooFinanceBatch:
+    """Unit tests for multi-ticker batch downloads."""
+
+    def _download_frame(self, symbols: Any) -> Any:
+        """Build a grouped yf.download() frame; MISSING has only NaN rows."""
+        import pandas as pd
+
+        index = pd.date_range('2023-01-02', periods=3, freq='D')
+        frames = {}
+        for symbol in symbols:
+            value = float('nan') if symbol == 'MISSING' else 100.0
+            frames[symbol] = pd.DataFrame({
+                'Open': value, 'High': value, 'Low': value, 'Close': value, 'Volume': 1000.0
+            }, index=index)
+        return pd.concat(frames, axis=1)
+
+    @patch('src.data_sources.yahoo_finance.yf.download')
+    @pytest.mark.asyncio
+    async def test_batch_uses_multi_ticker_download(self, mock_download: Mock, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test symbols are downloaded in chunks and split per ticker."""
+        from src.config import settings
+        monkeypatch.setattr(settings, 'YAHOO_FINANCE_BATCH_SIZE', 2)
+        mock_download.side_effect = lambda tickers, **kwargs: self._download_frame(tickers)
+
+        result = await YahooFinanceAdapter().get_daily_prices_batch(["AAPL", "MSFT", "MISSING"])
+
+        assert mock_download.call_count == 2
+        assert [call.kwargs['tickers'] for call in mock_download.call_args_list] == [["AAPL", "MSFT"], ["MISSING"]]
+        assert sorted(result) == ["AAPL", "MSFT"]
+        assert len(result["AAPL"]) == 3
+        assert result["MSFT"].source == "yahoo_finance"
+
+
+class TestYahooFinanceEventLoop:
+    """Unit tests for running blocking yfinance calls off the event loop."""
+
+    @pytest.fixture
+    def slow_history(self) -> Any:
+        """Create a history() stub that blocks its thread like a slow download."""
+        import pandas as pd
+
+        def _history(**kwargs: Any) -> Any:
+            time.sleep(0.3)
+            return pd.DataFrame(
+                {'Open': [1.0], 'High': [1.0], 'Low': [1.0], 'Close': [1.0], 'Volume': [10]},
+                index=pd.date_range('2023-01-03', periods=1)
+            )
+        return _history
+
+    @patch('src.data_sources.yahoo_finance.yf.Ticker')
+    @pytest.mark.asyncio
+    async def test_event_loop_progresses_during_slow_fetch(self, mock_ticker: Mock, slow_history: Any) -> None:
+        """Test other coroutines keep running while a download blocks its worker thread."""
+        mock_ticker.return_value.history.side_effect = slow_history
+        ticks = 0
+
+        async def _ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(_ticker())
+        result = await YahooFinanceAdapter().get_daily_prices("AAPL")
+        ticker_task.cancel()
+
+        assert len(result) == 1
+        assert ticks >= 10
+
+    @patch('src.data_sources.yahoo_finance.yf.Ticker')
+    @pytest.mark.asyncio
+    async def test_calls_run_on_given_executor(self, mock_ticker: Mock, slow_history: Any) -> None:
+        """Test blocking calls run on the adapter's executor threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        threads = []
+        mock_ticker.side_effect = lambda symbol: threads.append(threading.current_thread().name) or Mock(
+            history=Mock(side_effect=slow_history)
+        )
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='test-yf') as executor:
+            adapter = YahooFinanceAdapter(executor=executor)
+            await asyncio.gather(adapter.get_daily_prices("AAPL"), adapter.get_daily_prices("MSFT"))
+
+        assert len(threads) == 2
+        assert all(name.startswith('test-yf') for name in threads)
+
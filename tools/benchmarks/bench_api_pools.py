@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Load test the API repository dependency: per-request DataRepository vs
+process-wide pools created by the app lifespan.
+
+Each simulated request resolves the repository the way the API dependency
+does and runs a one-month market data query, from a thread pool sized like
+FastAPI's default worker threads. Prints p50/p99 latency for both modes.
+
+Usage:
+    python tools/benchmarks/bench_api_pools.py --requests 2000 --concurrency 40
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.config import settings
+from src.data_sources.base import MarketData
+from src.storage.connections import create_storage_resources
+from src.storage.repository import DataRepository
+
+QUERY_START = datetime(2023, 1, 1)
+QUERY_END = datetime(2023, 1, 31)
+
+
+def seed(repository: DataRepository) -> None:
+    """Seed one year of daily bars."""
+    bars = [
+        MarketData(
+            symbol="AAPL",
+            timestamp=QUERY_START + timedelta(days=d),
+            open=100.0, high=101.0, low=99.0, close=100.5,
+            volume=1_000_000, source="benchmark"
+        )
+        for d in range(365)
+    ]
+    repository.bulk_save_market_data(bars)
+
+
+def run(label: str, make_repository: Callable[[], DataRepository], requests: int, concurrency: int) -> None:
+    """Issue requests concurrently and print latency percentiles."""
+    def _request() -> float:
+        started = time.perf_counter()
+        repository = make_repository()
+        repository.get_market_data("AAPL", QUERY_START, QUERY_END)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        latencies: List[float] = list(pool.map(lambda _: _request(), range(requests)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<22} p50={quantiles[49] * 1000:8.2f}ms  p99={quantiles[98] * 1000:8.2f}ms  "
+          f"throughput={requests / elapsed:8.0f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.DATABASE_URL = f"sqlite:///{Path(tmp) / 'load.db'}"
+        resources = create_storage_resources()
+        # Redis is optional for this comparison; the DB/DDL/client setup cost dominates
+        resources.cache = None
+        seed(DataRepository(resources))
+
+        def per_request() -> DataRepository:
+            repository = DataRepository()
+            repository.cache = None
+            return repository
+
+        run("per-request (before)", per_request, args.requests, args.concurrency)
+        run("shared pools (after)", lambda: DataRepository(resources), args.requests, args.concurrency)
+        resources.close()
+
+
+if __name__ == "__main__":
+    main()
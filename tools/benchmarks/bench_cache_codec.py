@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON and binary codecs used for cached market data ranges.
+
+Encodes a month bucket of bars with each codec and reports bytes per bar,
+then decode throughput in bars per second for JSON, binary bar dicts and
+the zero-copy binary column view. When Redis is reachable, MEMORY USAGE of
+the stored keys is reported as well.
+
+Usage:
+    python tools/benchmarks/bench_cache_codec.py --bars 390 --iterations 2000
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import redis
+
+from src.config import settings
+from src.data_sources.base import MarketData
+from src.storage.codec import CODEC_BINARY, CODEC_JSON, decode_bars, encode_bars, unpack_bar_columns
+
+
+def make_bars(count: int) -> List[Dict[str, Any]]:
+    """Build minute bars shaped like the range cache entries."""
+    start = datetime(2023, 1, 3, 9, 30)
+    return [
+        MarketData(
+            symbol="AAPL",
+            timestamp=start + timedelta(minutes=i),
+            open=100.0 + i * 0.01, high=101.0 + i * 0.01, low=99.0 + i * 0.01, close=100.5 + i * 0.01,
+            volume=1_000_000 + i, source="benchmark"
+        ).model_dump(mode='json')
+        for i in range(count)
+    ]
+
+
+def throughput(decode: Callable[[], Any], bars: int, iterations: int) -> float:
+    """Get decoded bars per second."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode()
+    return bars * iterations / (time.perf_counter() - started)
+
+
+def redis_memory(payloads: Dict[str, Any]) -> Dict[str, int]:
+    """Store each payload and read back Redis' MEMORY USAGE, if Redis is reachable."""
+    client = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+    try:
+        usage = {}
+        for codec, payload in payloads.items():
+            key = f"portfolio_analyzer:benchmark:codec:{codec}"
+            client.set(key, payload, ex=60)
+            usage[codec] = int(client.memory_usage(key) or 0)
+            client.delete(key)
+        return usage
+    except redis.RedisError:
+        return {}
+    finally:
+        client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, default=390, help="bars per cached bucket")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bars = make_bars(args.bars)
+    payloads = {codec: encode_bars(bars, codec) for codec in (CODEC_JSON, CODEC_BINARY)}
+    json_payload = payloads[CODEC_JSON].encode()  # type: ignore[union-attr]
+    binary_payload = payloads[CODEC_BINARY]
+
+    print(f"{'payload':<18} {'bytes/bar':>10}")
+    print(f"{'json':<18} {len(json_payload) / args.bars:>10.1f}")
+    print(f"{'binary':<18} {len(binary_payload) / args.bars:>10.1f}")
+
+    usage = redis_memory({CODEC_JSON: json_payload, CODEC_BINARY: binary_payload})
+    if usage:
+        print(f"\n{'redis MEMORY USAGE':<18} {'bytes/bar':>10}")
+        for codec, used in usage.items():
+            print(f"{codec:<18} {used / args.bars:>10.1f}")
+    else:
+        print("\nRedis not reachable; skipping MEMORY USAGE")
+
+    print(f"\n{'decode':<18} {'bars/s':>14}")
+    results = {
+        'json': throughput(lambda: decode_bars(json_payload), args.bars, args.iterations),
+        'binary dicts': throughput(lambda: decode_bars(binary_payload), args.bars, args.iterations),
+        'binary columns': throughput(lambda: unpack_bar_columns(binary_payload), args.bars, args.iterations)  # type: ignore[arg-type]
+    }
+    for label, rate in results.items():
+        print(f"{label:<18} {rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput of the batch portfolio risk engine.
+
+Builds random portfolios over the deterministic synthetic dataset and
+evaluates them in one batch, then times Monte Carlo VaR alone for a
+range of chunk sizes and reports simulated paths per second.
+
+Usage:
+    python tools/benchmarks/bench_risk.py --symbols 50 --portfolios 100 --paths 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.processing.backtest import synthetic_dataset
+from src.processing.risk import align_closes, evaluate_portfolios, monte_carlo_var
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=756, help="daily bars per symbol")
+    parser.add_argument("--portfolios", type=int, default=100)
+    parser.add_argument("--holdings", type=int, default=10, help="symbols held per portfolio")
+    parser.add_argument("--paths", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    matrix = align_closes(synthetic_dataset(args.symbols, args.bars, args.seed))
+    rng = np.random.default_rng(args.seed)
+    portfolios = {
+        f"P{i:03d}": {
+            matrix.symbols[j]: float(rng.integers(1, 100))
+            for j in rng.choice(len(matrix.symbols), size=min(args.holdings, len(matrix.symbols)), replace=False)
+        }
+        for i in range(args.portfolios)
+    }
+
+    started = time.perf_counter()
+    evaluate_portfolios(matrix, portfolios, benchmark=matrix.symbols[0], paths=args.paths, seed=args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'symbols':<34} {args.symbols:>12,}")
+    print(f"{'portfolios':<34} {args.portfolios:>12,}")
+    print(f"{'paths per portfolio':<34} {args.paths:>12,}")
+    print(f"{'batch evaluation time (s)':<34} {elapsed:>12.2f}")
+
+    weights = matrix.shares(list(portfolios.values())) * matrix.closes[-1]
+    weights /= weights.sum(axis=1, keepdims=True)
+    log_returns = np.log1p(matrix.returns)
+    for chunk in (1_000, 10_000, 50_000):
+        result = monte_carlo_var(weights, log_returns, 0.95, args.paths, chunk_paths=chunk, seed=args.seed)
+        print(f"{f'MC paths/s, chunks of {chunk:,}':<34} {result.paths_per_second:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()